@@ -0,0 +1,44 @@
+"""keyset_pagination_indexes
+
+Revision ID: 3f9a1c7d2b4e
+Revises: cac1152596da
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7d2b4e'
+down_revision: Union[str, None] = 'cac1152596da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) for keyset pagination over (created_at, id)
+KEYSET_INDEXES = [
+    ('idx_tenders_created_id', 'tenders', ['created_at', 'id']),
+    ('idx_tenders_company_created_id', 'tenders', ['company_id', 'created_at', 'id']),
+    ('idx_quotes_tender_created_id', 'quotes', ['tender_id', 'created_at', 'id']),
+    ('idx_quotes_supplier_created_id', 'quotes', ['supplier_id', 'created_at', 'id']),
+    ('idx_audit_logs_created_id', 'audit_logs', ['created_at', 'id']),
+    ('idx_audit_logs_company_created_id', 'audit_logs', ['company_id', 'created_at', 'id']),
+    ('idx_form_submissions_created_id', 'form_submissions', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in KEYSET_INDEXES:
+        # The tables are created by create_all, which also builds these indexes
+        if inspector.has_table(table):
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        if inspector.has_table(table):
+            op.drop_index(name, table_name=table, if_exists=True)
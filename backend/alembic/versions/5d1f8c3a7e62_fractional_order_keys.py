@@ -0,0 +1,92 @@
+"""fractional_order_keys
+
+Revision ID: 5d1f8c3a7e62
+Revises: 8b2e6d4f1a93
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.shared.common.ordering import MAX_KEY_LENGTH, spread_keys
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f8c3a7e62'
+down_revision: Union[str, None] = '8b2e6d4f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, order column, list column, index name) of the fractionally ordered lists
+ORDERED_LISTS = [
+    ('kanban_tasks', 'position', 'column_id', 'idx_kanban_tasks_column_position'),
+    ('kanban_columns', 'position', 'board_id', 'idx_kanban_columns_board_position'),
+    ('form_fields', 'order', 'form_id', 'idx_form_fields_form_order'),
+]
+
+
+def _integer_column(inspector, table: str, column: str) -> bool:
+    for info in inspector.get_columns(table):
+        if info['name'] == column:
+            return isinstance(info['type'], sa.Integer)
+    return False
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column, group, index in ORDERED_LISTS:
+        # The tables are created by create_all; nothing to convert on a fresh database
+        if not inspector.has_table(table) or not _integer_column(inspector, table, column):
+            continue
+
+        # Read the integer order before the type change: as text "10" < "2"
+        rows = bind.execute(sa.text(
+            f'SELECT id, {group} AS list_id FROM {table} '
+            f'ORDER BY {group}, "{column}", id'
+        )).all()
+
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" '
+            f'TYPE VARCHAR({MAX_KEY_LENGTH}) COLLATE "C" USING "{column}"::text'
+        )
+
+        updates = []
+        for _, members in groupby(rows, key=lambda row: row.list_id):
+            ids = [row.id for row in members]
+            updates.extend(
+                {'id': row_id, 'key': key} for row_id, key in zip(ids, spread_keys(len(ids)))
+            )
+        if updates:
+            bind.execute(
+                sa.text(f'UPDATE {table} SET "{column}" = :key WHERE id = :id'),
+                updates
+            )
+        op.alter_column(table, column, nullable=False)
+
+        op.create_index(index, table, [group, column], if_not_exists=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column, group, index in reversed(ORDERED_LISTS):
+        if not inspector.has_table(table) or _integer_column(inspector, table, column):
+            continue
+
+        op.drop_index(index, table_name=table, if_exists=True)
+        # Key order becomes the 0-based row number within each list
+        op.execute(
+            f'UPDATE {table} AS t SET "{column}" = ranked.rank::text FROM ('
+            f'  SELECT id, ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY "{column}", id) - 1 AS rank'
+            f'  FROM {table}'
+            f') AS ranked WHERE ranked.id = t.id'
+        )
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE INTEGER USING "{column}"::integer'
+        )
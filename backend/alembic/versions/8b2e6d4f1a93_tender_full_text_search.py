@@ -0,0 +1,83 @@
+"""tender_full_text_search
+
+Revision ID: 8b2e6d4f1a93
+Revises: 3f9a1c7d2b4e
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.domains.tenders.models import (
+    TENDER_SEARCH_CONFIG,
+    TENDER_SEARCH_CONFIG_DDL,
+    TENDER_SEARCH_VECTOR_SQL
+)
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e6d4f1a93'
+down_revision: Union[str, None] = '3f9a1c7d2b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_search_vector(inspector) -> bool:
+    return any(
+        info['name'] == 'search_vector'
+        for info in inspector.get_columns('tenders')
+    )
+
+
+def _index_names(inspector) -> set:
+    return {info['name'] for info in inspector.get_indexes('tenders')}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # The table is created by create_all; a fresh database already has the
+    # column, the indexes and the text search configuration
+    if not inspector.has_table('tenders'):
+        return
+
+    # Portuguese stemming with accent folding ("licitacao" matches "licitação")
+    for statement in TENDER_SEARCH_CONFIG_DDL:
+        op.execute(statement)
+
+    # Generated column: the database keeps it in sync on every write
+    if not _has_search_vector(inspector):
+        op.add_column(
+            'tenders',
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(TENDER_SEARCH_VECTOR_SQL, persisted=True),
+            )
+        )
+
+    indexes = _index_names(inspector)
+    if 'idx_tenders_search_vector' not in indexes:
+        op.create_index(
+            'idx_tenders_search_vector', 'tenders', ['search_vector'],
+            postgresql_using='gin'
+        )
+    if 'idx_tenders_number_trgm' not in indexes:
+        op.create_index(
+            'idx_tenders_number_trgm', 'tenders', ['tender_number'],
+            postgresql_using='gin',
+            postgresql_ops={'tender_number': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tenders'):
+        return
+
+    op.drop_index('idx_tenders_number_trgm', table_name='tenders', if_exists=True)
+    op.drop_index('idx_tenders_search_vector', table_name='tenders', if_exists=True)
+    if _has_search_vector(inspector):
+        op.drop_column('tenders', 'search_vector')
+    op.execute(f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {TENDER_SEARCH_CONFIG}")
@@ -0,0 +1,38 @@
+"""upload_session_metadata
+
+Revision ID: 9e4b2c7d1f58
+Revises: 5d1f8c3a7e62
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b2c7d1f58'
+down_revision: Union[str, None] = '5d1f8c3a7e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_metadata_column(inspector) -> bool:
+    return any(
+        info['name'] == 'upload_metadata'
+        for info in inspector.get_columns('file_upload_sessions')
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # The table is created by create_all; a fresh database already has the column
+    if inspector.has_table('file_upload_sessions') and not _has_metadata_column(inspector):
+        op.add_column('file_upload_sessions', sa.Column('upload_metadata', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('file_upload_sessions') and _has_metadata_column(inspector):
+        op.drop_column('file_upload_sessions', 'upload_metadata')
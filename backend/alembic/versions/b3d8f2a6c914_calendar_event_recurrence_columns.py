@@ -0,0 +1,74 @@
+"""calendar_event_recurrence_columns
+
+Revision ID: b3d8f2a6c914
+Revises: 9e4b2c7d1f58
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f2a6c914'
+down_revision: Union[str, None] = '9e4b2c7d1f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns of a lazily expanded series. A null series_end reads as an
+# open-ended series, so existing masters stay correct without a backfill.
+RECURRENCE_COLUMNS = [
+    ('recurrence_days', sa.JSON()),
+    ('series_end', sa.DateTime(timezone=True)),
+    ('recurrence_id', sa.DateTime(timezone=True)),
+]
+
+RECURRENCE_INDEXES = [
+    ('idx_calendar_events_calendar_start', ['calendar_id', 'start_datetime']),
+    ('idx_calendar_events_calendar_series', ['calendar_id', 'recurrence_type', 'series_end']),
+    ('idx_calendar_events_parent_recurrence', ['parent_event_id', 'recurrence_id']),
+]
+
+
+def _column_names(inspector) -> set:
+    return {info['name'] for info in inspector.get_columns('calendar_events')}
+
+
+def _index_names(inspector) -> set:
+    return {info['name'] for info in inspector.get_indexes('calendar_events')}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # The table is created by create_all; a fresh database already has the columns
+    if not inspector.has_table('calendar_events'):
+        return
+
+    columns = _column_names(inspector)
+    for name, type_ in RECURRENCE_COLUMNS:
+        if name not in columns:
+            op.add_column('calendar_events', sa.Column(name, type_, nullable=True))
+
+    indexes = _index_names(inspector)
+    for name, index_columns in RECURRENCE_INDEXES:
+        if name not in indexes:
+            op.create_index(name, 'calendar_events', index_columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('calendar_events'):
+        return
+
+    indexes = _index_names(inspector)
+    for name, _ in reversed(RECURRENCE_INDEXES):
+        if name in indexes:
+            op.drop_index(name, table_name='calendar_events')
+
+    columns = _column_names(inspector)
+    for name, _ in reversed(RECURRENCE_COLUMNS):
+        if name in columns:
+            op.drop_column('calendar_events', name)
@@ -0,0 +1,53 @@
+"""drop_materialised_recurrences
+
+Revision ID: c47a1e9d3b25
+Revises: b3d8f2a6c914
+Create Date: 2026-10-17 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47a1e9d3b25'
+down_revision: Union[str, None] = 'b3d8f2a6c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables whose rows point at a calendar event and go with it
+EVENT_CHILD_TABLES = [
+    'calendar_event_attendees',
+    'calendar_event_reminders',
+    'calendar_event_attachments',
+    'calendar_event_ai_analysis',
+]
+
+# Instances the old service materialised for a recurring master: a child row
+# with no recurrence_id. Masters are now expanded on read, so these only
+# duplicate occurrences; overrides (recurrence_id set) are kept.
+LEGACY_INSTANCES = (
+    'SELECT child.id FROM calendar_events AS child '
+    'JOIN calendar_events AS master ON master.id = child.parent_event_id '
+    "WHERE child.recurrence_id IS NULL AND master.recurrence_type <> 'NONE'"
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # The tables are created by create_all; a fresh database has no legacy rows
+    if not inspector.has_table('calendar_events'):
+        return
+
+    for table in EVENT_CHILD_TABLES:
+        if inspector.has_table(table):
+            op.execute(f'DELETE FROM {table} WHERE event_id IN ({LEGACY_INSTANCES})')
+    op.execute(f'DELETE FROM calendar_events WHERE id IN ({LEGACY_INSTANCES})')
+
+
+def downgrade() -> None:
+    # The deleted instances are regenerated from their masters on read
+    pass
@@ -0,0 +1,39 @@
+"""api_key_prefix
+
+Revision ID: d5e9a3c7f1b2
+Revises: c47a1e9d3b25
+Create Date: 2026-10-17 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e9a3c7f1b2'
+down_revision: Union[str, None] = 'c47a1e9d3b25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_prefix_column(inspector) -> bool:
+    return any(
+        info['name'] == 'prefix'
+        for info in inspector.get_columns('api_keys')
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # The table is created by create_all; a fresh database already has the column.
+    # Existing keys keep a null prefix: it is display only and their secret is gone
+    if inspector.has_table('api_keys') and not _has_prefix_column(inspector):
+        op.add_column('api_keys', sa.Column('prefix', sa.String(16), nullable=True))
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('api_keys') and _has_prefix_column(inspector):
+        op.drop_column('api_keys', 'prefix')
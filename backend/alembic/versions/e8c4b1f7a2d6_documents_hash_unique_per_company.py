@@ -0,0 +1,55 @@
+"""documents_hash_unique_per_company
+
+Revision ID: e8c4b1f7a2d6
+Revises: d5e9a3c7f1b2
+Create Date: 2026-10-17 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4b1f7a2d6'
+down_revision: Union[str, None] = 'd5e9a3c7f1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'idx_documents_company_file_hash'
+
+
+def _global_hash_constraints(inspector) -> list:
+    return [
+        constraint['name']
+        for constraint in inspector.get_unique_constraints('documents')
+        if constraint['column_names'] == ['file_hash']
+    ]
+
+
+def _has_index(inspector) -> bool:
+    return any(index['name'] == INDEX_NAME for index in inspector.get_indexes('documents'))
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # The table is created by create_all; a fresh database already has the composite index.
+    # Blobs are shared across companies, so the same hash may appear once per company
+    if not inspector.has_table('documents'):
+        return
+    for name in _global_hash_constraints(inspector):
+        op.drop_constraint(name, 'documents', type_='unique')
+    if not _has_index(inspector):
+        op.create_index(INDEX_NAME, 'documents', ['company_id', 'file_hash'], unique=True)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('documents'):
+        return
+    if _has_index(inspector):
+        op.drop_index(INDEX_NAME, table_name='documents')
+    # Fails if two companies now hold documents with the same content
+    if not _global_hash_constraints(inspector):
+        op.create_unique_constraint('documents_file_hash_key', 'documents', ['file_hash'])
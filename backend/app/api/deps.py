@@ -19,6 +19,9 @@ logger = get_logger_with_context(component="dependencies")
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
+# Alias usado pelos endpoints de domínio
+get_db_session = get_db
+
 
 async def get_current_user_token(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -1,123 +1,113 @@
 """
 Middleware stack para a aplicação
+
+As responsabilidades transversais (request ID, headers de segurança, rate
+limiting, métricas, instrumentação de banco/cache e log de requisições)
+rodam num único middleware ASGI puro: os headers são acrescentados na
+mensagem ``http.response.start`` e o corpo passa adiante sem cópia, então
+respostas em streaming (downloads) não são bufferizadas nem executadas em
+outra task.
 """
 
+import asyncio
+import math
 import time
-from typing import Callable
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
 
-from fastapi import Request, Response, status
+from fastapi import Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from jose import JWTError, jwt
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.instrumentation import (
+    RequestMetrics,
+    begin_request_metrics,
+    end_request_metrics,
+)
 from app.core.logging import get_logger_with_context
-from app.core.redis_client import CacheService, get_redis
+from app.core.rate_limit import (
+    RateLimitResult,
+    RateLimitRule,
+    default_rate_limit_rule,
+    rate_limiter,
+)
+from app.domains.monitoring.recorder import api_metrics_recorder
 
+# Headers de segurança
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+}
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware para headers de segurança"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Headers de segurança
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
-        
-        return response
+# Rotas sem rate limiting
+RATE_LIMIT_EXEMPT_PATHS = {"/health", "/metrics"}
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware para rate limiting"""
+class RateLimitPolicyCache:
+    """Regras das políticas cadastradas, recarregadas periodicamente"""
     
-    def __init__(self, app, calls: int = 60, period: int = 60):
-        super().__init__(app)
-        self.calls = calls
-        self.period = period
+    def __init__(self):
+        self.rules: List[RateLimitRule] = []
+        self.loaded_at = 0.0
+        self._lock = asyncio.Lock()
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Pula rate limiting para health checks
-        if request.url.path in ["/health", "/metrics"]:
-            return await call_next(request)
+    async def get(self) -> List[RateLimitRule]:
+        if time.monotonic() - self.loaded_at < settings.rate_limit_policy_refresh_seconds:
+            return self.rules
         
-        # Identifica cliente
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-        identifier = f"{client_ip}:{user_agent}"
+        async with self._lock:
+            if time.monotonic() - self.loaded_at >= settings.rate_limit_policy_refresh_seconds:
+                await self._load()
+        return self.rules
+    
+    async def _load(self) -> None:
+        from app.core.database import AsyncSessionLocal
+        from app.domains.monitoring.repository import RateLimitPoliciesRepository
         
         try:
-            redis_client = await get_redis()
-            cache_service = CacheService(redis_client)
-            
-            is_allowed, current_count = await cache_service.rate_limit_check(
-                identifier, self.calls, self.period
-            )
-            
-            if not is_allowed:
-                logger = get_logger_with_context(
-                    component="rate_limit",
-                    client_ip=client_ip,
-                    current_count=current_count,
-                    limit=self.calls
-                )
-                logger.warning("Rate limit exceeded")
-                
-                return Response(
-                    content="Rate limit exceeded",
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    headers={
-                        "X-RateLimit-Limit": str(self.calls),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str(int(time.time()) + self.period),
-                    }
-                )
-            
-            response = await call_next(request)
-            
-            # Adiciona headers de rate limit
-            remaining = max(0, self.calls - current_count)
-            response.headers["X-RateLimit-Limit"] = str(self.calls)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(int(time.time()) + self.period)
-            
-            return response
-            
+            async with AsyncSessionLocal() as session:
+                policies = await RateLimitPoliciesRepository(session).get_enforced_policies()
+            self.rules = [
+                rule for rule in map(RateLimitRule.from_policy, policies) if rule is not None
+            ]
         except Exception as exc:
-            # Em caso de erro no Redis, permite a requisição
+            # Mantém as regras anteriores até a próxima tentativa
             logger = get_logger_with_context(component="rate_limit")
-            logger.error("Rate limit middleware error", error=str(exc))
-            return await call_next(request)
+            logger.error("Failed to load rate limit policies", error=str(exc))
+        self.loaded_at = time.monotonic()
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware para adicionar ID único às requisições"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        import uuid
-        
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
+def _request_identity(headers: Headers) -> Tuple[Optional[str], Optional[str]]:
+    """Usuário e empresa do token Bearer, sem consultar o banco"""
+    authorization = headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None, None
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None, None
+    return payload.get("sub"), payload.get("company_id")
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Middleware para coleta de métricas"""
+class RequestPipelineMiddleware:
+    """Request ID, headers de segurança, rate limiting, métricas e log num só passo"""
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, rate_limit: bool = True, log_requests: bool = False):
+        self.app = app
+        self.rate_limit = rate_limit
+        self.log_requests = log_requests
+        self.policies = RateLimitPolicyCache()
+        self.default_rule = default_rate_limit_rule()
         self.setup_metrics()
     
     def setup_metrics(self):
@@ -140,35 +130,249 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             'http_requests_active',
             'Active HTTP requests'
         )
+        
+        # Instrumentação por requisição (rótulo = rota, não o path concreto)
+        self.request_db_queries = Histogram(
+            'http_request_db_queries',
+            'Database queries per HTTP request',
+            ['method', 'endpoint'],
+            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+        )
+        
+        self.request_db_duration = Histogram(
+            'http_request_db_duration_seconds',
+            'Database time per HTTP request',
+            ['method', 'endpoint']
+        )
+        
+        self.request_cache_lookups = Histogram(
+            'http_request_cache_lookups',
+            'Cache lookups per HTTP request',
+            ['method', 'endpoint', 'result'],
+            buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+        )
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        self.active_requests.inc()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+        response_size = 0
         
+        # Consultas e cache da requisição (request.state.metrics)
+        metrics, metrics_token = begin_request_metrics()
+        
+        request_id = str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["metrics"] = metrics
+        extra_headers = {**SECURITY_HEADERS, "X-Request-ID": request_id}
+        
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.update(extra_headers)
+                if settings.debug:
+                    headers["Server-Timing"] = metrics.server_timing()
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+        
+        self.active_requests.inc()
         try:
-            response = await call_next(request)
+            if self.rate_limit and path not in RATE_LIMIT_EXEMPT_PATHS:
+                result = await self._check_rate_limit(scope)
+                if result is not None:
+                    extra_headers.update(_rate_limit_headers(result))
+                    if not result.allowed:
+                        extra_headers["Retry-After"] = str(math.ceil(result.retry_after))
+                        response = Response(
+                            content="Rate limit exceeded",
+                            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                            headers=extra_headers
+                        )
+                        status_code = response.status_code
+                        await response(scope, receive, send)
+                        return
             
-            # Coleta métricas
-            duration = time.time() - start_time
-            method = request.method
-            endpoint = request.url.path
-            status_code = response.status_code
+            await self.app(scope, receive, send_with_headers)
+        
+        except Exception as exc:
+            if self.log_requests:
+                _request_logger(scope).error(
+                    "Request failed",
+                    error=str(exc),
+                    process_time=f"{time.perf_counter() - start_time:.4f}s",
+                    exc_info=True,
+                )
+            raise
+        
+        finally:
+            end_request_metrics(metrics_token)
+            self.active_requests.dec()
+            duration = time.perf_counter() - start_time
             
+            # Coleta métricas
             self.request_count.labels(
                 method=method,
-                endpoint=endpoint,
+                endpoint=path,
                 status_code=status_code
             ).inc()
             
             self.request_duration.labels(
                 method=method,
-                endpoint=endpoint
+                endpoint=path
             ).observe(duration)
             
-            return response
+            route = _route_path(scope)
+            self._observe_request_metrics(method, route, metrics)
             
-        finally:
-            self.active_requests.dec()
+            if self.log_requests:
+                _request_logger(scope).info(
+                    "Request completed",
+                    status_code=status_code,
+                    process_time=f"{duration:.4f}s",
+                    db_queries=metrics.db_queries,
+                    db_time_ms=metrics.db_time_ms,
+                    cache_hits=metrics.cache_hits,
+                    cache_misses=metrics.cache_misses,
+                )
+            
+            threshold = settings.request_query_warning_threshold
+            if threshold > 0 and metrics.db_queries >= threshold:
+                # Candidato a N+1: muitas consultas, em geral a mesma repetida
+                _request_logger(scope).warning(
+                    "Request issued too many queries",
+                    route=route,
+                    db_queries=metrics.db_queries,
+                    max_repeated_query=metrics.max_repeated_query,
+                    db_time_ms=metrics.db_time_ms,
+                )
+            
+            response_time_ms = int(duration * 1000)
+            if api_metrics_recorder.enabled and api_metrics_recorder.should_record(response_time_ms):
+                api_metrics_recorder.record(_api_metrics_row(
+                    scope, route, status_code, response_time_ms, response_size, metrics
+                ))
+    
+    def _observe_request_metrics(self, method: str, route: str, metrics: RequestMetrics) -> None:
+        self.request_db_queries.labels(method=method, endpoint=route).observe(metrics.db_queries)
+        self.request_db_duration.labels(method=method, endpoint=route).observe(metrics.db_time)
+        self.request_cache_lookups.labels(
+            method=method, endpoint=route, result="hit"
+        ).observe(metrics.cache_hits)
+        self.request_cache_lookups.labels(
+            method=method, endpoint=route, result="miss"
+        ).observe(metrics.cache_misses)
+    
+    async def _check_rate_limit(self, scope: Scope) -> Optional[RateLimitResult]:
+        """Resultado do rate limiting, ou None se isento ou indisponível"""
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+        user_id, company_id = _request_identity(Headers(scope=scope))
+        
+        try:
+            rules = await self.policies.get()
+            rule = next(
+                (
+                    rule for rule in rules
+                    if rule.matches(scope["path"], scope["method"], company_id)
+                ),
+                self.default_rule
+            )
+            if rule.is_exempt(client_ip, user_id):
+                return None
+            
+            result = await rate_limiter.check(
+                rule, rule.subject(client_ip, user_id, company_id)
+            )
+        except Exception as exc:
+            # Em caso de erro no Redis, permite a requisição
+            logger = get_logger_with_context(component="rate_limit")
+            logger.error("Rate limit middleware error", error=str(exc))
+            return None
+        
+        if not result.allowed:
+            logger = get_logger_with_context(
+                component="rate_limit",
+                client_ip=client_ip,
+                user_id=user_id,
+                policy=rule.name,
+                limit=result.limit
+            )
+            logger.warning("Rate limit exceeded")
+        
+        return result
+
+
+def _rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(int(time.time() + result.reset_after)),
+    }
+
+
+def _route_path(scope: Scope) -> str:
+    """Template da rota atendida (baixa cardinalidade), ou o path se não houve rota"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope["path"]
+
+
+def _parse_uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _api_metrics_row(
+    scope: Scope,
+    route: str,
+    status_code: int,
+    response_time_ms: int,
+    response_size: int,
+    metrics: RequestMetrics,
+) -> Dict[str, Any]:
+    """Linha de APIMetrics de uma requisição amostrada"""
+    headers = Headers(scope=scope)
+    user_id, company_id = _request_identity(headers)
+    query = scope.get("query_string", b"").decode("latin-1")
+    return {
+        "request_id": scope["state"].get("request_id"),
+        "endpoint": route[:255],
+        "method": scope["method"],
+        "path": scope["path"][:500],
+        "query_params": dict(parse_qsl(query)) if query else None,
+        "status_code": status_code,
+        "response_time_ms": response_time_ms,
+        "response_size_bytes": response_size,
+        "user_id": _parse_uuid(user_id),
+        "company_id": _parse_uuid(company_id),
+        "ip_address": scope["client"][0] if scope.get("client") else None,
+        "user_agent": headers.get("user-agent"),
+        "referer": (headers.get("referer") or "")[:500] or None,
+        "db_queries_count": metrics.db_queries,
+        "db_query_time_ms": metrics.db_time_ms,
+        "cache_hits": metrics.cache_hits,
+        "cache_misses": metrics.cache_misses,
+    }
+
+
+def _request_logger(scope: Scope):
+    headers = Headers(scope=scope)
+    query = scope.get("query_string", b"").decode("latin-1")
+    return get_logger_with_context(
+        method=scope["method"],
+        url=scope["path"] + (f"?{query}" if query else ""),
+        user_agent=headers.get("user-agent"),
+        client_ip=scope["client"][0] if scope.get("client") else None,
+    )
 
 
 def setup_middleware(app):
@@ -190,22 +394,5 @@ def setup_middleware(app):
             allowed_hosts=["localhost", "127.0.0.1", "0.0.0.0"]
         )
     
-    # Headers de segurança
-    app.add_middleware(SecurityHeadersMiddleware)
-    
-    # Rate limiting
-    app.add_middleware(
-        RateLimitMiddleware,
-        calls=settings.rate_limit_per_minute,
-        period=60
-    )
-    
-    # Request ID
-    app.add_middleware(RequestIDMiddleware)
-    
-    # Métricas
-    app.add_middleware(MetricsMiddleware)
-    
-    # Logging de requisições (deve ser o último)
-    from app.core.logging import log_request_middleware
-    app.add_middleware(log_request_middleware())
+    # Request ID, headers de segurança, rate limiting, métricas e logging
+    app.add_middleware(RequestPipelineMiddleware, log_requests=True)
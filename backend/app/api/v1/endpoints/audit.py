@@ -6,11 +6,12 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session, get_current_user
+from app.core.exceptions import ValidationException
 from app.domains.auth.models import User
 from app.domains.audit.repository import (
     AuditLogRepository,
@@ -18,6 +19,7 @@ from app.domains.audit.repository import (
     FormSubmissionRepository,
     DataRetentionPolicyRepository
 )
+from app.shared.common.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.domains.audit.schemas import (
     AuditLogResponse,
     AuditLogCreate,
@@ -51,6 +53,7 @@ async def create_audit_log(
 
 @router.get("/logs", response_model=List[AuditLogResponse])
 async def get_audit_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[datetime] = None,
@@ -60,33 +63,33 @@ async def get_audit_logs(
     entity_id: Optional[UUID] = None,
     user_id: Optional[UUID] = None,
     severity: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
     """Get audit logs with filtering."""
     audit_repo = AuditLogRepository(db)
     
-    filters = {}
-    if start_date:
-        filters["start_date"] = start_date
-    if end_date:
-        filters["end_date"] = end_date
-    if action:
-        filters["action"] = action
-    if entity_type:
-        filters["entity_type"] = entity_type
-    if entity_id:
-        filters["entity_id"] = entity_id
-    if user_id:
-        filters["user_id"] = user_id
-    if severity:
-        filters["severity"] = severity
-        
-    logs = await audit_repo.get_filtered_logs(
-        skip=skip, 
-        limit=limit, 
-        filters=filters
-    )
+    try:
+        logs, _ = await audit_repo.search_audit_logs(
+            user_id=user_id,
+            event_type=action,
+            resource_type=entity_type,
+            resource_id=str(entity_id) if entity_id else None,
+            severity=severity,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=skip,
+            cursor=cursor,
+            with_total=False
+        )
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    cursor_value = next_cursor(logs, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
     return [AuditLogResponse.model_validate(log) for log in logs]
 
 
@@ -110,19 +113,30 @@ async def get_audit_log(
 async def get_entity_audit_trail(
     entity_type: str,
     entity_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
     """Get audit trail for a specific entity."""
     audit_repo = AuditLogRepository(db)
-    trail = await audit_repo.get_entity_trail(
-        entity_type=entity_type,
-        entity_id=entity_id,
-        skip=skip,
-        limit=limit
-    )
+    try:
+        trail, _ = await audit_repo.search_audit_logs(
+            resource_type=entity_type,
+            resource_id=str(entity_id),
+            limit=limit,
+            offset=skip,
+            cursor=cursor,
+            with_total=False
+        )
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    cursor_value = next_cursor(trail, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
     return [AuditLogResponse.model_validate(log) for log in trail]
 
 
@@ -294,6 +308,7 @@ async def create_form_submission(
 
 @router.get("/forms/submissions", response_model=List[FormSubmissionResponse])
 async def list_form_submissions(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     template_id: Optional[UUID] = None,
@@ -301,29 +316,31 @@ async def list_form_submissions(
     submitted_by: Optional[UUID] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
     """List form submissions."""
     submission_repo = FormSubmissionRepository(db)
     
-    filters = {}
-    if template_id:
-        filters["template_id"] = template_id
-    if status:
-        filters["status"] = status
-    if submitted_by:
-        filters["submitted_by"] = submitted_by
-    if start_date:
-        filters["start_date"] = start_date
-    if end_date:
-        filters["end_date"] = end_date
-        
-    submissions = await submission_repo.get_filtered_submissions(
-        skip=skip, 
-        limit=limit, 
-        filters=filters
-    )
+    try:
+        submissions, _ = await submission_repo.search_submissions(
+            form_template_id=template_id,
+            status=status,
+            created_by=str(submitted_by) if submitted_by else None,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=skip,
+            cursor=cursor,
+            with_total=False
+        )
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    
+    cursor_value = next_cursor(submissions, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
     return [FormSubmissionResponse.model_validate(submission) for submission in submissions]
 
 
@@ -236,16 +236,7 @@ async def revoke_api_key(
 ) -> Any:
     """Revoke an API key."""
     auth_service = AuthService(session)
-    
-    # Get API key and verify ownership
-    api_key = await auth_service.api_key_repo.get_by_id(api_key_id)
-    if not api_key or api_key.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="API key not found"
-        )
-    
-    await auth_service.api_key_repo.soft_delete(api_key_id)
+    await auth_service.revoke_api_key(current_user.id, api_key_id)
     return {"message": "API key revoked successfully"}
 
 
@@ -13,7 +13,7 @@ from app.core.database import get_async_session
 from app.domains.auth.service import get_current_user
 from app.domains.auth.models import User
 from app.domains.calendar.service import (
-    CalendarService, EventService, EventAttendeeService
+    CalendarService, EventService, EventAttendeeService, FreeBusyService
 )
 from app.domains.calendar.schemas import (
     CalendarResponse, CalendarCreate, CalendarUpdate,
@@ -22,6 +22,7 @@ from app.domains.calendar.schemas import (
     CalendarShareResponse, CalendarShareCreate, CalendarShareUpdate,
     AvailabilitySlotResponse, AvailabilitySlotCreate, AvailabilitySlotUpdate,
     CalendarAnalytics, AvailabilityResponse, AvailabilityCheck,
+    FreeSlotSearch, FreeSlot,
     BookingRequest, BookingResponse
 )
 from app.domains.calendar.models import EventStatus, EventPriority, CalendarType
@@ -214,6 +215,32 @@ async def delete_event(
     return SuccessResponse(message="Evento removido com sucesso")
 
 
+@router.put("/events/{event_id}/occurrences/{recurrence_id}", response_model=EventResponse)
+async def update_event_occurrence(
+    event_id: UUID,
+    recurrence_id: datetime,
+    event_data: EventUpdate,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Altera uma ocorrência de evento recorrente"""
+    service = EventService(session)
+    return await service.update_occurrence(event_id, recurrence_id, event_data, current_user.id)
+
+
+@router.delete("/events/{event_id}/occurrences/{recurrence_id}", response_model=SuccessResponse)
+async def cancel_event_occurrence(
+    event_id: UUID,
+    recurrence_id: datetime,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Cancela uma ocorrência de evento recorrente"""
+    service = EventService(session)
+    await service.cancel_occurrence(event_id, recurrence_id, current_user.id)
+    return SuccessResponse(message="Ocorrência cancelada com sucesso")
+
+
 @router.get("/calendars/{calendar_id}/events", response_model=List[EventResponse])
 async def get_calendar_events(
     calendar_id: UUID,
@@ -306,6 +333,17 @@ async def check_availability(
     )
 
 
+@router.post("/availability/search", response_model=List[FreeSlot])
+async def search_free_slots(
+    search_data: FreeSlotSearch,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Busca os primeiros horários livres comuns aos calendários"""
+    service = EventService(session)
+    return await service.find_free_slots(search_data, current_user.id)
+
+
 @router.post("/calendars/{calendar_id}/book", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def book_time_slot(
     calendar_id: UUID,
@@ -407,6 +445,40 @@ async def get_public_calendar_events(
     )
 
 
+@router.get("/public/calendars/{calendar_id}/free-slots", response_model=List[FreeSlot])
+async def get_public_free_slots(
+    calendar_id: UUID,
+    start_date: datetime = Query(...),
+    end_date: datetime = Query(...),
+    duration_minutes: int = Query(30, ge=5, le=1440),
+    limit: int = Query(20, ge=1, le=100),
+    step_minutes: Optional[int] = Query(None, ge=5, le=1440),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Lista horários livres de calendário público (páginas de agendamento)"""
+    from app.domains.calendar.repository import CalendarRepository
+    
+    # Verificar se calendário é público
+    cal_repo = CalendarRepository(session)
+    calendar = await cal_repo.get_by_id(calendar_id)
+    
+    if not calendar or not calendar.is_public:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendário público não encontrado"
+        )
+    
+    service = FreeBusyService(session)
+    return await service.find_free_slots(
+        [calendar_id],
+        start_date,
+        end_date,
+        duration_minutes,
+        limit,
+        step_minutes
+    )
+
+
 @router.post("/public/calendars/{calendar_id}/book", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def book_public_time_slot(
     calendar_id: UUID,
@@ -4,14 +4,16 @@ Documents and AI Processing API endpoints.
 
 from datetime import datetime
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session, get_current_user
+from app.core.redis_client import get_redis
 from app.domains.auth.models import User
+from app.domains.documents.bulk import BulkProgress
 from app.domains.documents.service import AIProcessingService
 from app.domains.documents.schemas import (
     DocumentCreate,
@@ -27,7 +29,9 @@ from app.domains.documents.schemas import (
     AIPromptTemplateCreate,
     AIAnalyticsResponse,
     BulkProcessingRequest,
+    BulkProcessingStatusResponse,
 )
+from app.tasks.celery_app import celery_app
 
 router = APIRouter()
 
@@ -216,20 +220,44 @@ async def summarize_document(
     return result
 
 
-@router.post("/bulk-process", response_model=List[AIJobResponse])
+@router.post("/bulk-process", response_model=BulkProcessingStatusResponse, status_code=202)
 async def bulk_process_documents(
     request: BulkProcessingRequest,
-    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Process multiple documents in bulk."""
-    service = AIProcessingService(db)
-    jobs = await service.bulk_process_documents(
-        document_ids=request.document_ids,
-        operations=request.operations,
-        priority=request.priority
+    """Queue multiple documents for AI processing; poll the batch for progress."""
+    batch_id = str(uuid4())
+    redis = await get_redis()
+    progress = BulkProgress(redis.client)
+    await progress.start(batch_id, len(request.document_ids), str(current_user.id))
+    
+    # The batch id doubles as the dispatcher's task id
+    celery_app.send_task(
+        "ai_tasks.bulk_process_documents",
+        args=[
+            [str(document_id) for document_id in request.document_ids],
+            request.operations,
+            {**request.options, "priority": request.priority},
+            str(current_user.id),
+        ],
+        task_id=batch_id,
     )
-    return [AIJobResponse.model_validate(job) for job in jobs]
+    return await progress.get(batch_id)
+
+
+@router.get("/bulk-process/{batch_id}", response_model=BulkProcessingStatusResponse)
+async def get_bulk_processing_status(
+    batch_id: UUID,
+    current_user: User = Depends(get_current_user),
+):
+    """Get the aggregated progress of a bulk processing batch."""
+    redis = await get_redis()
+    batch = await BulkProgress(redis.client).get(str(batch_id))
+    
+    if not batch or batch.get("user_id") != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+        
+    return batch
 
 
 # AI Jobs endpoints
@@ -2,45 +2,166 @@
 File Management API endpoints.
 """
 
+import secrets
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Header, Path, Query, Request, UploadFile, File, Form
+from fastapi.responses import RedirectResponse, Response, StreamingResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-import io
 
 from app.api.deps import get_db_session, get_current_user
+from app.core.config import settings
+from app.core.exceptions import NotFoundException
+from app.core.storage import StoredBlob, blob_store, iter_upload
 from app.domains.auth.models import User
+from app.domains.documents.models import Document
+from app.domains.documents.repository import DocumentRepository
+from app.domains.documents.schemas import DocumentResponse, DocumentUpdate
+from app.domains.files.models import AccessResult, AccessType, FileUploadSession
 from app.domains.files.repository import (
-    FileRepository,
     FileAccessLogRepository,
     FileShareRepository,
     FileQuotaRepository,
     FileVersionRepository,
     FileUploadSessionRepository
 )
+from app.domains.files.uploads import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, ChunkError, UploadSpool
 from app.domains.files.schemas import (
-    FileResponse,
-    FileCreate,
-    FileUpdate,
     FileShareResponse,
     FileShareCreate,
     FileVersionResponse,
     FileQuotaResponse,
     FileUploadSessionResponse,
     FileUploadSessionCreate,
-    ChunkUploadRequest,
+    FileUploadChunkResponse,
 )
 
 router = APIRouter()
 
 
-@router.post("/upload", response_model=FileResponse)
+async def _check_quota(quota_repo: FileQuotaRepository, user: User, size: int) -> None:
+    """Raise 413 if storing ``size`` more bytes would exceed the user's quota."""
+    allowed, reason = await quota_repo.check_quota_availability(user.company_id, user.id, size)
+    if not allowed:
+        raise HTTPException(status_code=413, detail=f"Upload would exceed quota: {reason}")
+
+
+async def _discard_new_blob(blob: StoredBlob) -> None:
+    """Drop a blob this request created when the upload is rejected after storing it."""
+    if blob.created:
+        await blob_store.delete(blob.digest)
+
+
+async def _release_blob(file_repo: DocumentRepository, version_repo: FileVersionRepository, digest: str) -> None:
+    """Delete a blob once no document or file version references it any more."""
+    if await file_repo.is_hash_referenced(digest) or await version_repo.is_hash_referenced(digest):
+        return
+    await blob_store.delete(digest)
+
+
+def _is_owner(document: Document, user: User) -> bool:
+    return document.created_by == str(user.id)
+
+
+async def _new_document(
+    file_repo: DocumentRepository,
+    user: User,
+    blob: StoredBlob,
+    filename: str,
+    mime_type: Optional[str],
+    folder_path: Optional[str] = None,
+    description: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    is_public: bool = False,
+) -> Document:
+    """Build the document row for a stored blob (metadata only; bytes live in the blob store)."""
+    # file_hash is unique per company; other companies may hold the same blob
+    existing = await file_repo.get_by_hash(user.company_id, blob.digest)
+    if existing:
+        raise HTTPException(
+            status_code=409,
+            detail=f"An identical file is already stored as document {existing.id}"
+        )
+    
+    return Document(
+        filename=filename,
+        original_filename=filename,
+        file_path=blob.digest,
+        file_size=blob.size,
+        mime_type=mime_type or "application/octet-stream",
+        file_hash=blob.digest,
+        company_id=user.company_id,
+        folder_path=folder_path,
+        description=description,
+        tags=tags or [],
+        is_public=is_public,
+        created_by=str(user.id),
+    )
+
+
+def _upload_session_response(upload_session: FileUploadSession, total_chunks: int) -> FileUploadSessionResponse:
+    """Map an upload session row (chunk list, byte counters) to its API shape."""
+    received_chunks = len(upload_session.uploaded_chunks or [])
+    uploaded_bytes = upload_session.uploaded_bytes or 0
+    total_size = upload_session.total_size
+    return FileUploadSessionResponse(
+        id=upload_session.id,
+        user_id=upload_session.user_id,
+        session_token=upload_session.session_token,
+        filename=upload_session.filename,
+        file_size=total_size,
+        chunk_size=upload_session.chunk_size,
+        mime_type=upload_session.mime_type,
+        total_chunks=total_chunks,
+        uploaded_chunks=received_chunks,
+        uploaded_bytes=uploaded_bytes,
+        status=upload_session.status,
+        upload_progress=round(uploaded_bytes * 100 / total_size, 2) if total_size else 0.0,
+        expires_at=upload_session.expires_at,
+        created_at=upload_session.created_at,
+        updated_at=upload_session.updated_at,
+    )
+
+
+def _parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range: bytes=...`` header into inclusive offsets.
+
+    Returns None to serve the whole file (no header, malformed or multi-range
+    requests) and raises 416 when the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start > end and first and last:
+        return None
+    if start >= size or end < start:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+
+@router.post("/upload", response_model=DocumentResponse)
 async def upload_file(
     file: UploadFile = File(...),
-    parent_folder_id: Optional[UUID] = Form(None),
+    folder_path: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     tags: Optional[str] = Form(None),
     is_public: bool = Form(False),
@@ -49,41 +170,43 @@ async def upload_file(
 ):
     """Upload a file."""
     try:
-        file_repo = FileRepository(db)
+        file_repo = DocumentRepository(db)
         quota_repo = FileQuotaRepository(db)
         
-        # Check user quota
-        file_size = 0
-        content = await file.read()
-        file_size = len(content)
+        # Check user quota (the multipart body is already spooled, so its size is known)
+        if file.size is not None:
+            await _check_quota(quota_repo, current_user, file.size)
         
-        quota_check = await quota_repo.check_quota(current_user.id, file_size)
-        if not quota_check["can_upload"]:
-            raise HTTPException(
-                status_code=413, 
-                detail=f"Upload would exceed quota. Available: {quota_check['available_space']} bytes"
+        # Stream into the content-addressed blob store in fixed-size chunks
+        blob = await blob_store.put_stream(iter_upload(file))
+        try:
+            if file.size is None:
+                await _check_quota(quota_repo, current_user, blob.size)
+            
+            document = await _new_document(
+                file_repo,
+                current_user,
+                blob,
+                filename=file.filename,
+                mime_type=file.content_type,
+                folder_path=folder_path,
+                description=description,
+                tags=tags.split(',') if tags else [],
+                is_public=is_public
             )
+        except HTTPException:
+            await _discard_new_blob(blob)
+            raise
         
-        # Create file record
-        file_data = FileCreate(
-            name=file.filename,
-            size=file_size,
-            mime_type=file.content_type,
-            content=content,
-            uploaded_by=current_user.id,
-            parent_folder_id=parent_folder_id,
-            description=description,
-            tags=tags.split(',') if tags else [],
-            is_public=is_public
-        )
-        
-        file_record = await file_repo.create(file_data)
+        file_record = await file_repo.add(document)
         
         # Update quota usage
-        await quota_repo.update_usage(current_user.id, file_size)
+        await quota_repo.update_usage(current_user.company_id, current_user.id, blob.size, 1)
         
-        return FileResponse.model_validate(file_record)
+        return DocumentResponse.model_validate(file_record)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -94,82 +217,178 @@ async def start_chunked_upload(
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Start a chunked file upload session."""
+    """Start a chunked file upload session backed by a sparse spool file."""
     upload_repo = FileUploadSessionRepository(db)
     quota_repo = FileQuotaRepository(db)
     
-    # Check quota
-    quota_check = await quota_repo.check_quota(current_user.id, session_data.total_size)
-    if not quota_check["can_upload"]:
+    if not MIN_CHUNK_SIZE <= session_data.chunk_size <= MAX_CHUNK_SIZE:
         raise HTTPException(
-            status_code=413, 
-            detail=f"Upload would exceed quota. Available: {quota_check['available_space']} bytes"
+            status_code=422,
+            detail=f"chunk_size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes"
         )
     
-    session = await upload_repo.start_session(session_data, current_user.id)
-    return FileUploadSessionResponse.model_validate(session)
+    # Check quota
+    await _check_quota(quota_repo, current_user, session_data.file_size)
+    
+    # The file metadata is kept on the session and applied on completion
+    upload_session = await upload_repo.create_session(
+        session_token=secrets.token_urlsafe(32),
+        filename=session_data.filename,
+        total_size=session_data.file_size,
+        user_id=current_user.id,
+        company_id=current_user.company_id,
+        chunk_size=session_data.chunk_size,
+        mime_type=session_data.mime_type,
+        target_folder=session_data.folder_path,
+        upload_metadata={
+            "description": session_data.description,
+            "tags": session_data.tags,
+            "is_public": session_data.is_public,
+        }
+    )
+    spool = UploadSpool(upload_session.session_token, upload_session.total_size, upload_session.chunk_size)
+    await spool.create()
+    
+    return _upload_session_response(upload_session, spool.total_chunks)
 
 
-@router.post("/upload/chunked/{session_id}/chunk")
+@router.get("/upload/chunked/{session_token}")
+async def get_chunked_upload_status(
+    session_token: str,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Report which chunks were received, so an interrupted client can resume."""
+    upload_repo = FileUploadSessionRepository(db)
+    
+    session = await upload_repo.get_by_token(session_token)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    
+    spool = UploadSpool(session_token, session.total_size, session.chunk_size)
+    received = set(session.uploaded_chunks or [])
+    return {
+        "session_token": session_token,
+        "chunk_size": session.chunk_size,
+        "total_chunks": spool.total_chunks,
+        "uploaded_bytes": session.uploaded_bytes,
+        "missing_chunks": [n for n in range(spool.total_chunks) if n not in received],
+        "expires_at": session.expires_at,
+    }
+
+
+@router.put("/upload/chunked/{session_token}/chunks/{chunk_number}", response_model=FileUploadChunkResponse)
 async def upload_chunk(
-    session_id: UUID,
-    chunk_request: ChunkUploadRequest,
+    request: Request,
+    session_token: str,
+    chunk_number: int = Path(..., ge=0),
+    chunk_sha256: str = Header(..., alias="X-Chunk-SHA256"),
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Upload a file chunk."""
+    """
+    Upload one chunk as the raw request body (0-based ``chunk_number``).
+    
+    Chunks may be sent in parallel and in any order; each is written at its
+    offset in the session's spool file and verified against ``X-Chunk-SHA256``.
+    Re-sending a chunk is safe.
+    """
     upload_repo = FileUploadSessionRepository(db)
     
-    result = await upload_repo.upload_chunk(
-        session_id, 
-        chunk_request.chunk_number, 
-        chunk_request.chunk_data
-    )
+    session = await upload_repo.get_by_token(session_token)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    spool = UploadSpool(session_token, session.total_size, session.chunk_size)
+    # Release the DB connection while the body streams in over a slow link
+    await db.commit()
     
-    if not result:
+    try:
+        chunk_length = await spool.write_chunk(chunk_number, request.stream(), chunk_sha256)
+    except ChunkError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="Upload session storage no longer exists")
+    
+    progress = await upload_repo.update_chunk_progress(session_token, chunk_number, chunk_length)
+    if progress is None:
         raise HTTPException(status_code=404, detail="Upload session not found")
-        
-    return result
+    
+    received_chunks, uploaded_bytes = progress
+    return FileUploadChunkResponse(
+        chunk_number=chunk_number,
+        uploaded_successfully=True,
+        total_uploaded=received_chunks,
+        upload_progress=round(uploaded_bytes * 100 / spool.total_size, 2) if spool.total_size else 100.0,
+        upload_complete=received_chunks >= spool.total_chunks
+    )
 
 
-@router.post("/upload/chunked/{session_id}/complete", response_model=FileResponse)
+@router.post("/upload/chunked/{session_token}/complete", response_model=DocumentResponse)
 async def complete_chunked_upload(
-    session_id: UUID,
+    session_token: str,
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Complete a chunked file upload."""
+    """
+    Complete a chunked upload: the spool is moved into the blob store as is.
+    
+    The session row stays locked until the document row is committed, and
+    only then is the session marked completed; a concurrent completion waits
+    and gets 404.
+    """
     upload_repo = FileUploadSessionRepository(db)
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     quota_repo = FileQuotaRepository(db)
     
-    # Complete the upload session
-    session = await upload_repo.complete_session(session_id)
-    if not session:
+    upload_session = await upload_repo.lock_for_completion(session_token)
+    if not upload_session or upload_session.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Upload session not found")
     
-    # Create the final file record
-    file_data = FileCreate(
-        name=session.file_name,
-        size=session.total_size,
-        mime_type=session.mime_type,
-        content=session.assembled_content,  # Assembled from chunks
-        uploaded_by=current_user.id,
-        parent_folder_id=session.metadata.get("parent_folder_id"),
-        description=session.metadata.get("description"),
-        tags=session.metadata.get("tags", []),
-        is_public=session.metadata.get("is_public", False)
-    )
+    spool = UploadSpool(session_token, upload_session.total_size, upload_session.chunk_size)
+    try:
+        digests = await spool.verified_digests()
+    except ChunkError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
-    file_record = await file_repo.create(file_data)
+    try:
+        blob = await spool.finalize(digests)
+    except Exception as e:
+        await upload_repo.mark_failed(session_token, f"Failed to store upload: {e}")
+        await spool.discard()
+        raise HTTPException(status_code=500, detail=f"Failed to store upload: {e}")
+    
+    # Create the final file record with the metadata given at start
+    metadata = upload_session.upload_metadata or {}
+    try:
+        file_record = await _new_document(
+            file_repo,
+            current_user,
+            blob,
+            filename=upload_session.filename,
+            mime_type=upload_session.mime_type,
+            folder_path=upload_session.target_folder,
+            description=metadata.get("description"),
+            tags=metadata.get("tags", []),
+            is_public=metadata.get("is_public", False)
+        )
+    except HTTPException as e:
+        # The spool is already in the blob store; the session cannot be retried
+        await upload_repo.mark_failed(session_token, str(e.detail))
+        await _discard_new_blob(blob)
+        raise
+    
+    db.add(file_record)
+    upload_session.is_completed = True
+    await db.commit()
+    await db.refresh(file_record)
     
     # Update quota usage
-    await quota_repo.update_usage(current_user.id, session.total_size)
+    await quota_repo.update_usage(current_user.company_id, current_user.id, blob.size, 1)
     
-    return FileResponse.model_validate(file_record)
+    return DocumentResponse.model_validate(file_record)
 
 
-@router.get("/", response_model=List[FileResponse])
+@router.get("/", response_model=List[DocumentResponse])
 async def list_files(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
@@ -183,7 +402,7 @@ async def list_files(
     current_user: User = Depends(get_current_user),
 ):
     """List files with filtering and pagination."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     
     filters = {"uploaded_by": current_user.id}
     if parent_folder_id:
@@ -202,17 +421,17 @@ async def list_files(
         sort_by=sort_by,
         sort_order=sort_order
     )
-    return [FileResponse.model_validate(file) for file in files]
+    return [DocumentResponse.model_validate(file) for file in files]
 
 
-@router.get("/{file_id}", response_model=FileResponse)
+@router.get("/{file_id}", response_model=DocumentResponse)
 async def get_file(
     file_id: UUID,
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
     """Get file metadata."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     access_repo = FileAccessLogRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -220,29 +439,34 @@ async def get_file(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check access permissions
-    if file_record.uploaded_by != current_user.id and not file_record.is_public:
+    if not _is_owner(file_record, current_user) and not file_record.is_public:
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Log access
     await access_repo.log_access(
-        file_id=file_id,
+        document_id=file_id,
+        file_path=file_record.file_path,
+        filename=file_record.filename,
+        access_type=AccessType.VIEW,
+        access_result=AccessResult.SUCCESS,
         user_id=current_user.id,
-        access_type="metadata",
+        company_id=current_user.company_id,
         ip_address="127.0.0.1",  # TODO: Get from request
         user_agent="API"  # TODO: Get from request
     )
     
-    return FileResponse.model_validate(file_record)
+    return DocumentResponse.model_validate(file_record)
 
 
 @router.get("/{file_id}/download")
 async def download_file(
     file_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Download file content."""
-    file_repo = FileRepository(db)
+    """Download file content, honouring single-range ``Range`` requests."""
+    file_repo = DocumentRepository(db)
     access_repo = FileAccessLogRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -250,50 +474,89 @@ async def download_file(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check access permissions
-    if file_record.uploaded_by != current_user.id and not file_record.is_public:
+    if not _is_owner(file_record, current_user) and not file_record.is_public:
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Log download
     await access_repo.log_access(
-        file_id=file_id,
+        document_id=file_id,
+        file_path=file_record.file_path,
+        filename=file_record.filename,
+        access_type=AccessType.DOWNLOAD,
+        access_result=AccessResult.SUCCESS,
         user_id=current_user.id,
-        access_type="download",
+        company_id=current_user.company_id,
         ip_address="127.0.0.1",  # TODO: Get from request
         user_agent="API"  # TODO: Get from request
     )
     
-    # Return file content as stream
-    file_stream = io.BytesIO(file_record.content)
+    digest = file_record.file_hash
+    # Blobs are content-addressed, so the digest is a strong validator
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={file_record.filename}",
+        "ETag": f'"{digest}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers={"ETag": headers["ETag"]})
+    
+    # Hand the transfer to S3 (presigned URL) or nginx (X-Accel-Redirect) when configured
+    redirect_url = await blob_store.redirect_url(digest, file_record.filename, file_record.mime_type)
+    if redirect_url:
+        return RedirectResponse(redirect_url, status_code=307)
+    
+    internal_path = blob_store.internal_redirect(digest)
+    if internal_path:
+        return Response(
+            media_type=file_record.mime_type,
+            headers={**headers, "X-Accel-Redirect": internal_path}
+        )
+    
+    try:
+        size = await blob_store.size(digest)
+    except NotFoundException:
+        raise HTTPException(status_code=404, detail="File content not found")
+    
+    byte_range = None
+    if request.headers.get("if-range", headers["ETag"]) == headers["ETag"]:
+        byte_range = _parse_range(request.headers.get("range"), size)
+    
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
     
     return StreamingResponse(
-        file_stream,
+        blob_store.iter_range(digest, start, end),
+        status_code=status_code,
         media_type=file_record.mime_type,
-        headers={
-            "Content-Disposition": f"attachment; filename={file_record.name}"
-        }
+        headers=headers
     )
 
 
-@router.put("/{file_id}", response_model=FileResponse)
+@router.put("/{file_id}", response_model=DocumentResponse)
 async def update_file(
     file_id: UUID,
-    file_update: FileUpdate,
+    file_update: DocumentUpdate,
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
     """Update file metadata."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
     if not file_record:
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
-    updated_file = await file_repo.update(file_id, file_update)
-    return FileResponse.model_validate(updated_file)
+    updated_file = await file_repo.update(file_id, file_update.model_dump(exclude_unset=True))
+    return DocumentResponse.model_validate(updated_file)
 
 
 @router.delete("/{file_id}")
@@ -303,7 +566,8 @@ async def delete_file(
     current_user: User = Depends(get_current_user),
 ):
     """Delete a file."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
+    version_repo = FileVersionRepository(db)
     quota_repo = FileQuotaRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -311,14 +575,16 @@ async def delete_file(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Delete file
+    # Delete file; the blob is shared, so it goes only with its last reference
+    digest = file_record.file_hash
     success = await file_repo.delete(file_id)
     if success:
+        await _release_blob(file_repo, version_repo, digest)
         # Update quota usage
-        await quota_repo.update_usage(current_user.id, -file_record.size)
+        await quota_repo.update_usage(current_user.company_id, current_user.id, -file_record.file_size, -1)
         
     return {"message": "File deleted successfully"}
 
@@ -332,7 +598,7 @@ async def create_file_share(
     current_user: User = Depends(get_current_user),
 ):
     """Create a file share link."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     share_repo = FileShareRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -340,7 +606,7 @@ async def create_file_share(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
     share = await share_repo.create_share(file_id, share_data, current_user.id)
@@ -354,7 +620,7 @@ async def list_file_shares(
     current_user: User = Depends(get_current_user),
 ):
     """List file shares."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     share_repo = FileShareRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -362,7 +628,7 @@ async def list_file_shares(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
     shares = await share_repo.get_file_shares(file_id)
@@ -393,7 +659,7 @@ async def access_shared_file(
 ):
     """Access a file via share token."""
     share_repo = FileShareRepository(db)
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     access_repo = FileAccessLogRepository(db)
     
     # Validate share token
@@ -420,7 +686,7 @@ async def access_shared_file(
     await share_repo.increment_access_count(share.id)
     
     return {
-        "file": FileResponse.model_validate(file_record),
+        "file": DocumentResponse.model_validate(file_record),
         "share_info": {
             "can_download": share.permissions.get("can_download", True),
             "expires_at": share.expires_at,
@@ -438,7 +704,7 @@ async def list_file_versions(
     current_user: User = Depends(get_current_user),
 ):
     """List file versions."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     version_repo = FileVersionRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -446,7 +712,7 @@ async def list_file_versions(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
     versions = await version_repo.get_file_versions(file_id)
@@ -462,7 +728,7 @@ async def create_file_version(
     current_user: User = Depends(get_current_user),
 ):
     """Create a new file version."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     version_repo = FileVersionRepository(db)
     quota_repo = FileQuotaRepository(db)
     
@@ -471,33 +737,38 @@ async def create_file_version(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Read new file content
-    content = await file.read()
-    file_size = len(content)
-    
     # Check quota
-    quota_check = await quota_repo.check_quota(current_user.id, file_size)
-    if not quota_check["can_upload"]:
-        raise HTTPException(
-            status_code=413, 
-            detail=f"Upload would exceed quota. Available: {quota_check['available_space']} bytes"
-        )
+    if file.size is not None:
+        await _check_quota(quota_repo, current_user, file.size)
+    
+    # Stream the new content into the blob store
+    blob = await blob_store.put_stream(iter_upload(file))
+    file_size = blob.size
+    if file.size is None:
+        try:
+            await _check_quota(quota_repo, current_user, file_size)
+        except HTTPException:
+            await _discard_new_blob(blob)
+            raise
     
     # Create version
     version = await version_repo.create_version(
-        file_id=file_id,
-        content=content,
-        size=file_size,
+        document_id=file_id,
+        filename=file.filename,
+        file_path=blob.digest,
+        file_size=file_size,
+        file_hash=blob.digest,
         mime_type=file.content_type,
-        created_by=current_user.id,
-        version_notes=version_notes
+        created_by=str(current_user.id),
+        change_description=version_notes,
+        storage_location=settings.storage_backend
     )
     
     # Update quota
-    await quota_repo.update_usage(current_user.id, file_size)
+    await quota_repo.update_usage(current_user.company_id, current_user.id, file_size)
     
     return FileVersionResponse.model_validate(version)
 
@@ -510,7 +781,7 @@ async def restore_file_version(
     current_user: User = Depends(get_current_user),
 ):
     """Restore a file to a specific version."""
-    file_repo = FileRepository(db)
+    file_repo = DocumentRepository(db)
     version_repo = FileVersionRepository(db)
     
     file_record = await file_repo.get_by_id(file_id)
@@ -518,7 +789,7 @@ async def restore_file_version(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Check permissions
-    if file_record.uploaded_by != current_user.id:
+    if not _is_owner(file_record, current_user):
         raise HTTPException(status_code=403, detail="Access denied")
     
     success = await version_repo.restore_version(file_id, version_id, current_user.id)
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_session
@@ -20,7 +20,7 @@ from app.domains.kanban.schemas import (
     BoardColumnCreate, BoardColumnUpdate, TaskResponse, TaskCreate, 
     TaskUpdate, TaskCommentResponse, TaskCommentCreate, TaskTimeLogResponse,
     TaskTimeLogCreate, BoardMemberResponse, BoardMemberCreate,
-    BoardAnalyticsResponse, TaskMoveRequest, TaskAssignRequest
+    BoardAnalyticsResponse, TaskMoveRequest, TaskAssignRequest, ColumnBulkReorder
 )
 from app.shared.common.responses import SuccessResponse
 
@@ -62,6 +62,25 @@ async def get_board_with_columns(
     return await service.get_board_with_columns(board_id, current_user.id)
 
 
+@router.get("/boards/{board_id}/snapshot")
+async def get_board_snapshot(
+    board_id: UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Snapshot compacto do board (colunas, tarefas, membros e usuários) com ETag"""
+    service = BoardService(session)
+    snapshot = await service.get_board_snapshot(board_id, current_user.id)
+    
+    headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=304, headers=headers)
+    
+    # Payload já serializado (e guardado assim no cache): sem nova validação
+    return Response(content=snapshot.payload, media_type="application/json", headers=headers)
+
+
 @router.put("/boards/{board_id}", response_model=BoardResponse)
 async def update_board(
     board_id: UUID,
@@ -120,6 +139,18 @@ async def search_boards(
     )
 
 
+@router.put("/boards/{board_id}/columns/reorder", response_model=List[BoardColumnResponse])
+async def reorder_board_columns(
+    board_id: UUID,
+    reorder_data: ColumnBulkReorder,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Reordena colunas do board"""
+    service = BoardService(session)
+    return await service.reorder_columns(board_id, reorder_data, current_user.id)
+
+
 @router.get("/boards/{board_id}/analytics", response_model=BoardAnalyticsResponse)
 async def get_board_analytics(
     board_id: UUID,
@@ -225,12 +256,7 @@ async def move_task(
 ):
     """Move tarefa para nova coluna/posição"""
     service = TaskService(session)
-    return await service.move_task(
-        task_id, 
-        move_data.column_id, 
-        move_data.position, 
-        current_user.id
-    )
+    return await service.move_task(task_id, move_data, current_user.id)
 
 
 @router.post("/tasks/{task_id}/assign", response_model=TaskResponse)
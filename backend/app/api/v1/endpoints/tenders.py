@@ -6,53 +6,117 @@ from typing import List, Any, Optional, Dict
 from uuid import UUID
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_session, get_current_active_user
+from app.core.exceptions import ValidationException
+from app.core.storage import blob_store, iter_upload
 from app.domains.auth.models import User
+from app.domains.tenders.models import TenderStatus, TenderType
+from app.domains.tenders.repository import TenderInvitationRepository, TenderWatchRepository
 from app.domains.tenders.service import TenderService
 from app.domains.tenders.schemas import (
-    TenderCreate, TenderUpdate, TenderResponse, TenderListResponse,
+    TenderCreate, TenderUpdate, TenderResponse, TenderListResponse, TenderSearchFilters,
     QuoteCreate, QuoteUpdate, QuoteResponse, QuoteListResponse,
-    TenderDocumentResponse, TenderInvitationCreate, TenderInvitationResponse,
-    TenderWatchResponse, TenderStatsResponse
+    TenderDocumentCreate, TenderDocumentResponse, TenderInvitationCreate, TenderInvitationResponse,
+    TenderWatchCreate, TenderWatchResponse, TenderStatsResponse
 )
+from app.shared.common.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter()
-tender_service = TenderService()
 
 
 # Tender endpoints
 @router.get("/", response_model=TenderListResponse)
 async def get_tenders(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    status: Optional[str] = Query(None),
-    tender_type: Optional[str] = Query(None),
+    status_filter: Optional[TenderStatus] = Query(None, alias="status"),
+    tender_type: Optional[TenderType] = Query(None),
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
 ) -> TenderListResponse:
     """Get list of tenders with filtering and pagination."""
+    filters = TenderSearchFilters(
+        search_query=search,
+        status=status_filter,
+        tender_type=tender_type,
+        category=category
+    )
+    
     try:
-        result = await tender_service.get_tenders(
-            session=session,
-            current_user=current_user,
+        tenders = await TenderService(session).search_tenders(
+            filters,
+            user_id=current_user.id,
             skip=skip,
             limit=limit,
-            status=status,
-            tender_type=tender_type,
-            category=category,
-            search=search
+            cursor=cursor
         )
-        return result
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving tenders: {str(e)}"
         )
+    
+    # A text search without cursor is ranked by relevance, not by date
+    if cursor or not search:
+        cursor_value = next_cursor(tenders, limit)
+        if cursor_value:
+            response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return TenderListResponse(items=[TenderResponse.model_validate(tender) for tender in tenders])
+
+
+@router.get("/search", response_model=List[TenderResponse])
+async def search_tenders(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text (title, description or tender number)"),
+    status_filter: Optional[TenderStatus] = Query(None, alias="status"),
+    tender_type: Optional[TenderType] = Query(None),
+    category: Optional[str] = Query(None),
+    company_id: Optional[UUID] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; returns results by date instead of relevance"),
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+) -> List[TenderResponse]:
+    """Full-text tender search with relevance ranking and highlighted snippets."""
+    filters = TenderSearchFilters(
+        search_query=q,
+        status=status_filter,
+        tender_type=tender_type,
+        category=category,
+        company_id=company_id
+    )
+    
+    try:
+        tenders = await TenderService(session).search_tenders(
+            filters,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching tenders: {str(e)}"
+        )
+    
+    if cursor:
+        cursor_value = next_cursor(tenders, limit)
+        if cursor_value:
+            response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return tenders
 
 
 @router.post("/", response_model=TenderResponse, status_code=status.HTTP_201_CREATED)
@@ -63,10 +127,10 @@ async def create_tender(
 ) -> TenderResponse:
     """Create a new tender."""
     try:
-        tender = await tender_service.create_tender(
-            session=session,
-            current_user=current_user,
-            tender_data=tender_data
+        tender = await TenderService(session).create_tender(
+            tender_data,
+            current_user.company_id,
+            current_user.id
         )
         return tender
     except ValueError as e:
@@ -89,11 +153,7 @@ async def get_tender(
 ) -> TenderResponse:
     """Get tender by ID."""
     try:
-        tender = await tender_service.get_tender_by_id(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        tender = await TenderService(session).get_tender(tender_id, current_user.id)
         if not tender:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -118,11 +178,10 @@ async def update_tender(
 ) -> TenderResponse:
     """Update tender."""
     try:
-        tender = await tender_service.update_tender(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id,
-            tender_data=tender_data
+        tender = await TenderService(session).update_tender(
+            tender_id,
+            tender_data,
+            current_user.id
         )
         if not tender:
             raise HTTPException(
@@ -152,11 +211,7 @@ async def delete_tender(
 ) -> None:
     """Delete tender."""
     try:
-        deleted = await tender_service.delete_tender(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        deleted = await TenderService(session).delete_tender(tender_id, current_user.id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -179,11 +234,7 @@ async def publish_tender(
 ) -> TenderResponse:
     """Publish a tender (change status from draft to published)."""
     try:
-        tender = await tender_service.publish_tender(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        tender = await TenderService(session).publish_tender(tender_id, current_user.id)
         if not tender:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -212,11 +263,7 @@ async def close_tender(
 ) -> TenderResponse:
     """Close a tender (change status to closed)."""
     try:
-        tender = await tender_service.close_tender(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        tender = await TenderService(session).close_tender(tender_id, current_user.id)
         if not tender:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -241,26 +288,34 @@ async def close_tender(
 @router.get("/{tender_id}/quotes", response_model=QuoteListResponse)
 async def get_tender_quotes(
     tender_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
 ) -> QuoteListResponse:
     """Get all quotes for a tender."""
     try:
-        result = await tender_service.get_tender_quotes(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id,
+        quotes = await TenderService(session).get_tender_quotes(
+            tender_id,
+            current_user.id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
-        return result
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving quotes: {str(e)}"
         )
+    
+    cursor_value = next_cursor(quotes, limit)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
+    return QuoteListResponse(items=[QuoteResponse.model_validate(quote) for quote in quotes])
 
 
 @router.post("/{tender_id}/quotes", response_model=QuoteResponse, status_code=status.HTTP_201_CREATED)
@@ -272,11 +327,11 @@ async def create_quote(
 ) -> QuoteResponse:
     """Create a new quote for a tender."""
     try:
-        quote = await tender_service.create_quote(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id,
-            quote_data=quote_data
+        quote = await TenderService(session).create_quote(
+            tender_id,
+            quote_data,
+            current_user.company_id,
+            current_user.id
         )
         return quote
     except ValueError as e:
@@ -299,11 +354,7 @@ async def get_quote(
 ) -> QuoteResponse:
     """Get quote by ID."""
     try:
-        quote = await tender_service.get_quote_by_id(
-            session=session,
-            current_user=current_user,
-            quote_id=quote_id
-        )
+        quote = await TenderService(session).get_quote(quote_id, current_user.id)
         if not quote:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -328,11 +379,10 @@ async def update_quote(
 ) -> QuoteResponse:
     """Update quote."""
     try:
-        quote = await tender_service.update_quote(
-            session=session,
-            current_user=current_user,
-            quote_id=quote_id,
-            quote_data=quote_data
+        quote = await TenderService(session).update_quote(
+            quote_id,
+            quote_data,
+            current_user.id
         )
         if not quote:
             raise HTTPException(
@@ -362,7 +412,7 @@ async def delete_quote(
 ) -> None:
     """Delete quote."""
     try:
-        deleted = await tender_service.delete_quote(
+        deleted = await TenderService(session).delete_quote(
             session=session,
             current_user=current_user,
             quote_id=quote_id
@@ -389,11 +439,7 @@ async def submit_quote(
 ) -> QuoteResponse:
     """Submit a quote (change status from draft to submitted)."""
     try:
-        quote = await tender_service.submit_quote(
-            session=session,
-            current_user=current_user,
-            quote_id=quote_id
-        )
+        quote = await TenderService(session).submit_quote(quote_id, current_user.id)
         if not quote:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -422,7 +468,7 @@ async def award_quote(
 ) -> QuoteResponse:
     """Award a quote (change status to awarded)."""
     try:
-        quote = await tender_service.award_quote(
+        quote = await TenderService(session).award_quote(
             session=session,
             current_user=current_user,
             quote_id=quote_id
@@ -456,11 +502,7 @@ async def get_tender_documents(
 ) -> List[TenderDocumentResponse]:
     """Get all documents for a tender."""
     try:
-        documents = await tender_service.get_tender_documents(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        documents = await TenderService(session).get_tender_documents(tender_id, current_user.id)
         return documents
     except Exception as e:
         raise HTTPException(
@@ -476,20 +518,34 @@ async def upload_tender_document(
     name: Optional[str] = None,
     description: Optional[str] = None,
     is_public: bool = True,
+    document_type: str = "attachment",
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
 ) -> TenderDocumentResponse:
     """Upload a document for a tender."""
     try:
-        document = await tender_service.upload_tender_document(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id,
-            file=file,
-            name=name,
-            description=description,
-            is_public=is_public
-        )
+        # Stored in the content-addressed blob store; the digest is the file URL
+        blob = await blob_store.put_stream(iter_upload(file))
+        try:
+            document = await TenderService(session).create_tender_document(
+                tender_id,
+                TenderDocumentCreate(
+                    name=name or file.filename,
+                    description=description,
+                    document_type=document_type,
+                    is_public=is_public,
+                    file_url=blob.digest,
+                    file_name=file.filename,
+                    file_size=blob.size,
+                    mime_type=file.content_type
+                ),
+                current_user.id
+            )
+        except Exception:
+            # Nothing references content first stored by this rejected upload
+            if blob.created:
+                await blob_store.delete(blob.digest)
+            raise
         return document
     except ValueError as e:
         raise HTTPException(
@@ -512,7 +568,7 @@ async def delete_tender_document(
 ) -> None:
     """Delete a tender document."""
     try:
-        deleted = await tender_service.delete_tender_document(
+        deleted = await TenderService(session).delete_tender_document(
             session=session,
             current_user=current_user,
             tender_id=tender_id,
@@ -541,12 +597,17 @@ async def get_tender_invitations(
 ) -> List[TenderInvitationResponse]:
     """Get all invitations for a tender."""
     try:
-        invitations = await tender_service.get_tender_invitations(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        # Only the tender's own company sees whom it invited
+        tender = await TenderService(session).get_tender(tender_id, current_user.id)
+        if tender.company_id != current_user.company_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this tender's invitations"
+            )
+        invitations = await TenderInvitationRepository(session).get_tender_invitations(tender_id)
         return invitations
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -563,7 +624,7 @@ async def create_tender_invitation(
 ) -> TenderInvitationResponse:
     """Create a new invitation for a tender."""
     try:
-        invitation = await tender_service.create_tender_invitation(
+        invitation = await TenderService(session).create_tender_invitation(
             session=session,
             current_user=current_user,
             tender_id=tender_id,
@@ -591,7 +652,7 @@ async def accept_tender_invitation(
 ) -> TenderInvitationResponse:
     """Accept a tender invitation."""
     try:
-        invitation = await tender_service.accept_tender_invitation(
+        invitation = await TenderService(session).accept_tender_invitation(
             session=session,
             current_user=current_user,
             tender_id=tender_id,
@@ -626,7 +687,7 @@ async def reject_tender_invitation(
 ) -> TenderInvitationResponse:
     """Reject a tender invitation."""
     try:
-        invitation = await tender_service.reject_tender_invitation(
+        invitation = await TenderService(session).reject_tender_invitation(
             session=session,
             current_user=current_user,
             tender_id=tender_id,
@@ -661,10 +722,10 @@ async def watch_tender(
 ) -> TenderWatchResponse:
     """Start watching a tender for updates."""
     try:
-        watch = await tender_service.watch_tender(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
+        watch = await TenderService(session).watch_tender(
+            tender_id,
+            current_user.id,
+            TenderWatchCreate()
         )
         return watch
     except ValueError as e:
@@ -687,11 +748,7 @@ async def unwatch_tender(
 ) -> None:
     """Stop watching a tender."""
     try:
-        unwatched = await tender_service.unwatch_tender(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
-        )
+        unwatched = await TenderService(session).unwatch_tender(tender_id, current_user.id)
         if not unwatched:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -714,10 +771,8 @@ async def get_tender_watch(
 ) -> Optional[TenderWatchResponse]:
     """Get current user's watch for a tender."""
     try:
-        watch = await tender_service.get_tender_watch(
-            session=session,
-            current_user=current_user,
-            tender_id=tender_id
+        watch = await TenderWatchRepository(session).get_by_tender_and_user(
+            tender_id, current_user.id
         )
         return watch
     except Exception as e:
@@ -736,7 +791,7 @@ async def get_tender_stats(
 ) -> TenderStatsResponse:
     """Get statistics for a tender."""
     try:
-        stats = await tender_service.get_tender_stats(
+        stats = await TenderService(session).get_tender_stats(
             session=session,
             current_user=current_user,
             tender_id=tender_id
@@ -763,9 +818,9 @@ async def get_tenders_overview_stats(
 ) -> Dict[str, Any]:
     """Get overview statistics for all accessible tenders."""
     try:
-        stats = await tender_service.get_tenders_overview_stats(
-            session=session,
-            current_user=current_user
+        stats = await TenderService(session).get_tender_stats(
+            current_user.company_id,
+            current_user.id
         )
         return stats
     except Exception as e:
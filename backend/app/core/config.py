@@ -37,6 +37,12 @@ class Settings(BaseSettings):
     # Security
     secret_key: str = Field(alias="SECRET_KEY")
     algorithm: str = Field(default="HS256", alias="ALGORITHM")
+    # Chave dos digests HMAC das chaves de API (padrão: SECRET_KEY)
+    api_key_hmac_secret: Optional[str] = Field(default=None, alias="API_KEY_HMAC_SECRET")
+    # Cache local de chaves verificadas e gravação em lote do uso
+    api_key_cache_ttl: int = Field(default=60, alias="API_KEY_CACHE_TTL")
+    api_key_cache_size: int = Field(default=10000, alias="API_KEY_CACHE_SIZE")
+    api_key_usage_flush_seconds: int = Field(default=10, alias="API_KEY_USAGE_FLUSH_SECONDS")
     access_token_expire_minutes: int = Field(
         default=30, 
         alias="ACCESS_TOKEN_EXPIRE_MINUTES"
@@ -47,6 +53,12 @@ class Settings(BaseSettings):
     postgres_db: str = Field(alias="POSTGRES_DB")
     postgres_port: int = Field(default=5432, alias="POSTGRES_PORT")
     database_url_override: Optional[str] = Field(default=None, alias="DATABASE_URL")
+    # Pool de threads para chamadas síncronas remanescentes ao banco
+    db_sync_executor_workers: int = Field(default=8, alias="DB_SYNC_EXECUTOR_WORKERS")
+
+    # Pool de processos para bcrypt e limite de operações enfileiradas
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(default=32, alias="PASSWORD_HASH_MAX_PENDING")
 
     # MongoDB
     mongodb_url: str = Field(alias="MONGODB_URL")
@@ -72,6 +84,21 @@ class Settings(BaseSettings):
         default=60, 
         alias="RATE_LIMIT_PER_MINUTE"
     )
+    # Fração das requisições restantes admitida localmente, sem ir ao Redis
+    # (0 desativa; deve ficar abaixo de 1 / número de processos)
+    rate_limit_local_fraction: float = Field(
+        default=0.1,
+        alias="RATE_LIMIT_LOCAL_FRACTION"
+    )
+    rate_limit_local_lease_ms: int = Field(
+        default=1000,
+        alias="RATE_LIMIT_LOCAL_LEASE_MS"
+    )
+    # Intervalo de recarga das políticas de rate limiting (segundos)
+    rate_limit_policy_refresh_seconds: int = Field(
+        default=30,
+        alias="RATE_LIMIT_POLICY_REFRESH_SECONDS"
+    )
 
     # Health Check
     health_check_interval: int = Field(
@@ -79,6 +106,43 @@ class Settings(BaseSettings):
         alias="HEALTH_CHECK_INTERVAL"
     )
 
+    # Cache de estatísticas por empresa (segundos; 0 desativa)
+    stats_cache_ttl: int = Field(default=30, alias="STATS_CACHE_TTL")
+
+    # Livre/ocupado dos calendários: TTL dos bitmaps por dia (segundos; 0 desativa)
+    # e janela máxima de uma busca de horários livres (dias)
+    calendar_freebusy_cache_ttl: int = Field(default=600, alias="CALENDAR_FREEBUSY_CACHE_TTL")
+    calendar_freebusy_max_days: int = Field(default=62, alias="CALENDAR_FREEBUSY_MAX_DAYS")
+
+    # Snapshot dos boards Kanban: TTL do payload em cache (segundos; 0 desativa)
+    kanban_snapshot_cache_ttl: int = Field(default=300, alias="KANBAN_SNAPSHOT_CACHE_TTL")
+
+    # Instrumentação por requisição: aviso de consultas em excesso (0 desativa),
+    # amostragem em APIMetrics (fração; 0 desativa), requisições lentas sempre
+    # gravadas (ms; 0 desativa) e intervalo da gravação em lote (segundos)
+    request_query_warning_threshold: int = Field(default=50, alias="REQUEST_QUERY_WARNING_THRESHOLD")
+    api_metrics_sample_rate: float = Field(default=0.0, alias="API_METRICS_SAMPLE_RATE")
+    api_metrics_slow_request_ms: int = Field(default=0, alias="API_METRICS_SLOW_REQUEST_MS")
+    api_metrics_flush_seconds: int = Field(default=10, alias="API_METRICS_FLUSH_SECONDS")
+
+    # Execução de relatórios: limite de linhas e tamanho máximo do resultado em cache
+    report_max_rows: int = Field(default=10000, alias="REPORT_MAX_ROWS")
+    report_cache_max_bytes: int = Field(default=5 * 1024 * 1024, alias="REPORT_CACHE_MAX_BYTES")
+
+    # Armazenamento de arquivos endereçado por SHA-256 (local ou s3)
+    storage_backend: str = Field(default="local", alias="STORAGE_BACKEND")
+    storage_chunk_size: int = Field(default=1024 * 1024, alias="STORAGE_CHUNK_SIZE")
+    storage_local_path: str = Field(default="/app/data/blobs", alias="STORAGE_LOCAL_PATH")
+    # Prefixo interno do nginx para X-Accel-Redirect (vazio = a app envia os bytes)
+    storage_accel_redirect_prefix: Optional[str] = Field(default=None, alias="STORAGE_ACCEL_REDIRECT_PREFIX")
+    storage_s3_endpoint_url: Optional[str] = Field(default=None, alias="STORAGE_S3_ENDPOINT_URL")
+    storage_s3_bucket: str = Field(default="cotai-files", alias="STORAGE_S3_BUCKET")
+    storage_s3_region: str = Field(default="us-east-1", alias="STORAGE_S3_REGION")
+    storage_s3_access_key: Optional[str] = Field(default=None, alias="STORAGE_S3_ACCESS_KEY")
+    storage_s3_secret_key: Optional[str] = Field(default=None, alias="STORAGE_S3_SECRET_KEY")
+    storage_s3_part_size: int = Field(default=8 * 1024 * 1024, alias="STORAGE_S3_PART_SIZE")
+    storage_s3_presigned_downloads: bool = Field(default=False, alias="STORAGE_S3_PRESIGNED_DOWNLOADS")
+
     # === LLM/AI Configuration ===
     ollama_api_url: str = Field(default="http://localhost:11434", alias="OLLAMA_API_URL")
     ollama_default_model: str = Field(default="llama3:8b", alias="OLLAMA_DEFAULT_MODEL")
@@ -86,6 +150,12 @@ class Settings(BaseSettings):
     ollama_max_retries: int = Field(default=3, alias="OLLAMA_MAX_RETRIES")
     ollama_retry_delay: float = Field(default=2.0, alias="OLLAMA_RETRY_DELAY")
     
+    # Pool de conexões HTTP com o Ollama
+    ollama_pool_max_connections: int = Field(default=20, alias="OLLAMA_POOL_MAX_CONNECTIONS")
+    ollama_pool_max_keepalive: int = Field(default=10, alias="OLLAMA_POOL_MAX_KEEPALIVE")
+    ollama_keepalive_expiry: float = Field(default=30.0, alias="OLLAMA_KEEPALIVE_EXPIRY")
+    ollama_http2: bool = Field(default=False, alias="OLLAMA_HTTP2")
+    
     # GPU e Performance
     ollama_gpu_layers: int = Field(default=35, alias="OLLAMA_GPU_LAYERS")
     ollama_context_length: int = Field(default=4096, alias="OLLAMA_CONTEXT_LENGTH")
@@ -98,6 +168,19 @@ class Settings(BaseSettings):
     chunk_size_tokens: int = Field(default=3000, alias="CHUNK_SIZE_TOKENS")
     chunk_overlap_tokens: int = Field(default=200, alias="CHUNK_OVERLAP_TOKENS")
     
+    # Cache de extração de texto (endereçado por conteúdo)
+    extraction_cache_enabled: bool = Field(default=True, alias="EXTRACTION_CACHE_ENABLED")
+    extraction_cache_dir: str = Field(default="/tmp/cotai/extraction_cache", alias="EXTRACTION_CACHE_DIR")
+    extraction_cache_max_size_mb: int = Field(default=2048, alias="EXTRACTION_CACHE_MAX_SIZE_MB")
+    
+    # OCR (pool de processos; 0 = número de CPUs / sem limite de páginas)
+    ocr_max_workers: int = Field(default=0, alias="OCR_MAX_WORKERS")
+    ocr_quality: str = Field(default="balanced", alias="OCR_QUALITY")
+    ocr_dpi: int = Field(default=0, alias="OCR_DPI")
+    ocr_language: str = Field(default="por", alias="OCR_LANGUAGE")
+    ocr_max_pages: int = Field(default=0, alias="OCR_MAX_PAGES")
+    ocr_page_cache_enabled: bool = Field(default=True, alias="OCR_PAGE_CACHE_ENABLED")
+    
     # Prompts e Modelos
     prompt_version: str = Field(default="v1.0", alias="PROMPT_VERSION")
     prompt_templates_path: str = Field(default="app/ai/prompts", alias="PROMPT_TEMPLATES_PATH")
@@ -121,6 +204,13 @@ class Settings(BaseSettings):
     # Monitoring Configuration  
     ai_metrics_retention_days: int = Field(default=30, alias="AI_METRICS_RETENTION_DAYS")
     ai_processing_timeout: float = Field(default=300.0, alias="AI_PROCESSING_TIMEOUT")
+    # Intervalo de gravação em lote das métricas de IA no Redis (segundos)
+    ai_metrics_flush_interval: float = Field(default=5.0, alias="AI_METRICS_FLUSH_INTERVAL")
+    # Processamento em lote: documentos por tarefa, máximo de tarefas por lote
+    # e retenção do progresso no Redis (segundos)
+    ai_bulk_chunk_size: int = Field(default=50, alias="AI_BULK_CHUNK_SIZE")
+    ai_bulk_max_chunks: int = Field(default=500, alias="AI_BULK_MAX_CHUNKS")
+    ai_bulk_progress_ttl: int = Field(default=604800, alias="AI_BULK_PROGRESS_TTL")
     
     # Property aliases for backward compatibility
     @property
@@ -143,6 +233,10 @@ class Settings(BaseSettings):
     def AI_PROCESSING_TIMEOUT(self) -> float:
         return self.ai_processing_timeout
     
+    @property
+    def AI_METRICS_FLUSH_INTERVAL(self) -> float:
+        return self.ai_metrics_flush_interval
+    
     # Main application properties for compatibility
     @property
     def API_V1_STR(self) -> str:
@@ -197,11 +291,12 @@ class Settings(BaseSettings):
 
     @property
     def database_url_sync(self) -> str:
-        """URL do banco de dados para operações síncronas"""
-        return self.database_url.replace(
-            "postgresql+asyncpg://", 
-            "postgresql://"
-        )
+        """URL do banco de dados para operações síncronas (driver psycopg2)"""
+        # Driver explícito: sem ele, o SQLAlchemy 2.1 assume psycopg (v3)
+        for scheme in ("postgresql+asyncpg://", "postgresql://"):
+            if self.database_url.startswith(scheme):
+                return "postgresql+psycopg2://" + self.database_url[len(scheme):]
+        return self.database_url
 
 
 @lru_cache()
@@ -2,18 +2,26 @@
 Configuração do banco de dados PostgreSQL com SQLAlchemy 2.0
 """
 
-from typing import AsyncGenerator
-
-from sqlalchemy import MetaData
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypeVar
+
+from sqlalchemy import MetaData, create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
+from app.core.instrumentation import install_query_instrumentation
 from app.core.logging import get_logger_with_context
 
 logger = get_logger_with_context(component="database")
 
+T = TypeVar("T")
+
 # Convenção de nomenclatura para constraints
 convention = {
     "ix": "ix_%(column_0_label)s",
@@ -40,6 +48,7 @@ engine = create_async_engine(
     pool_size=20,
     max_overflow=0,
 )
+install_query_instrumentation(engine.sync_engine)
 
 # Session maker assíncrono
 AsyncSessionLocal = async_sessionmaker(
@@ -48,6 +57,109 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Adaptador interino para código ainda síncrono: engine síncrono cujo pool
+# tem o mesmo tamanho do pool de threads, de modo que nenhuma thread espera
+# por conexão e o event loop nunca executa I/O bloqueante
+sync_engine = create_engine(
+    settings.database_url_sync,
+    echo=settings.debug,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    pool_size=settings.db_sync_executor_workers,
+    max_overflow=0,
+)
+install_query_instrumentation(sync_engine)
+
+SyncSessionLocal = sessionmaker(
+    bind=sync_engine,
+    class_=Session,
+    expire_on_commit=False,
+)
+
+sync_executor = ThreadPoolExecutor(
+    max_workers=settings.db_sync_executor_workers,
+    thread_name_prefix="db-sync",
+)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executa uma chamada bloqueante no pool de threads limitado. Reservado ao
+    acesso síncrono ao banco: cada thread corresponde a uma conexão do pool
+    """
+    loop = asyncio.get_running_loop()
+    # Propaga o contexto (métricas da requisição) para a thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        sync_executor, functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+async def run_in_sync_session(
+    func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Executa ``func(session, *args, **kwargs)`` em uma Session síncrona
+    dentro do pool de threads limitado
+    """
+
+    def _run() -> T:
+        with SyncSessionLocal() as session:
+            try:
+                return func(session, *args, **kwargs)
+            except Exception:
+                session.rollback()
+                raise
+
+    return await run_blocking(_run)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Agenda ``callback`` para depois do próximo commit da sessão (feito por
+    ``commit_session``); descartado se a sessão terminar sem commit
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+async def commit_session(session: AsyncSession) -> None:
+    """Commit seguido dos callbacks registrados com ``after_commit``"""
+    await session.commit()
+    callbacks = session.info.pop("after_commit", [])
+    for callback in callbacks:
+        try:
+            await callback()
+        except Exception as exc:
+            logger.error("After-commit callback failed", error=str(exc))
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency de sessão por requisição, sem commit implícito: no FastAPI
+    0.104 o código após o ``yield`` roda depois do envio da resposta, então
+    os services fazem ``commit_session`` antes de retornar. O que ficar sem
+    commit é descartado
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            session.info.pop("after_commit", None)
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """Sessão assíncrona para uso fora das requisições (tasks, scripts)"""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency para obter sessão do banco de dados"""
@@ -81,6 +193,7 @@ async def close_db() -> None:
     """Fecha as conexões do banco de dados"""
     try:
         await engine.dispose()
+        await run_blocking(sync_engine.dispose)
         logger.info("Database connections closed")
     except Exception as exc:
         logger.error("Error closing database connections", error=str(exc))
@@ -107,6 +107,17 @@ class DatabaseException(CotAiException):
         )
 
 
+class ServiceUnavailableException(CotAiException):
+    """Exceção para recursos temporariamente saturados"""
+    
+    def __init__(self, message: str, retry_after: int = None):
+        super().__init__(
+            message=message,
+            code="SERVICE_UNAVAILABLE",
+            details={"retry_after": retry_after}
+        )
+
+
 # Handlers de exceção
 
 async def cotai_exception_handler(request: Request, exc: CotAiException) -> JSONResponse:
@@ -121,6 +132,7 @@ async def cotai_exception_handler(request: Request, exc: CotAiException) -> JSON
         "BUSINESS_RULE_VIOLATION": status.HTTP_422_UNPROCESSABLE_ENTITY,
         "EXTERNAL_SERVICE_ERROR": status.HTTP_502_BAD_GATEWAY,
         "DATABASE_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "SERVICE_UNAVAILABLE": status.HTTP_503_SERVICE_UNAVAILABLE,
         "INTERNAL_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
     }
     
@@ -0,0 +1,107 @@
+"""
+Hashing de credenciais (bcrypt) fora do event loop
+
+O bcrypt leva centenas de milissegundos de CPU por chamada. As operações
+rodam num pool de processos limitado; quando a fila passa do limite
+configurado, novas chamadas são recusadas de imediato em vez de acumularem
+atrás de uma onda de logins.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.logging import get_logger_with_context
+
+logger = get_logger_with_context(component="hashing")
+
+# Contexto usado nos processos do pool
+_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    try:
+        return _pwd_context.verify(password, hashed)
+    except (ValueError, TypeError):
+        # Hash ausente ou em formato desconhecido
+        return False
+
+
+class CredentialHasher:
+    """Hash e verificação de senhas num pool de processos com backpressure"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._setup_metrics()
+
+    def _setup_metrics(self) -> None:
+        from prometheus_client import Counter, Gauge
+
+        self.queue_depth = Gauge(
+            'credential_hash_queue_depth',
+            'Credential hashing operations queued or running'
+        )
+        self.rejected = Counter(
+            'credential_hash_rejected_total',
+            'Credential hashing operations rejected by backpressure'
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: o processo da API já tem threads e conexões abertas
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected.inc()
+            logger.warning("Credential hashing queue full", pending=self.pending)
+            raise ServiceUnavailableException(
+                "Too many authentication requests, try again shortly",
+                retry_after=1,
+            )
+
+        self.pending += 1
+        self.queue_depth.set(self.pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            self.queue_depth.set(self.pending)
+
+    async def hash(self, password: str) -> str:
+        """Gera o hash bcrypt da senha"""
+        return await self._submit(_hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Verifica a senha contra o hash armazenado"""
+        return await self._submit(_verify, password, hashed)
+
+    def close(self) -> None:
+        """Encerra o pool de processos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instância global por processo
+password_hasher = CredentialHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
@@ -0,0 +1,113 @@
+"""
+Instrumentação de banco e cache por requisição
+
+O middleware abre um ``RequestMetrics`` no início de cada requisição e o
+guarda num ContextVar. Os eventos de cursor do SQLAlchemy (engines assíncrono
+e síncrono) e as leituras de cache somam nele a quantidade e o tempo das
+consultas e os hits/misses, sem passar nada pelas camadas de serviço. Fora de
+uma requisição (tasks Celery, scripts) não há contexto e os hooks só retornam.
+"""
+
+import functools
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class RequestMetrics:
+    """Consultas e acessos a cache de uma requisição"""
+
+    db_queries: int = 0
+    db_time: float = 0.0  # segundos
+    cache_hits: int = 0
+    cache_misses: int = 0
+    statements: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def db_time_ms(self) -> int:
+        return int(self.db_time * 1000)
+
+    @property
+    def max_repeated_query(self) -> int:
+        """Execuções da consulta mais repetida (sinal de N+1)"""
+        return max(self.statements.values(), default=0)
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries", '
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"'
+        )
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def begin_request_metrics() -> Tuple[RequestMetrics, Token]:
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request_metrics(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def record_cache_lookup(hit: bool, count: int = 1) -> None:
+    """Conta ``count`` leituras de cache como hit ou miss"""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += count
+    else:
+        metrics.cache_misses += count
+
+
+def instrument_cache_lookups(service: Any, method: str) -> None:
+    """
+    Envolve ``service.method`` (leitura assíncrona que devolve None no miss)
+    para contar hits e misses; chamadas repetidas não empilham wrappers
+    """
+    original = getattr(service, method)
+    if getattr(original, "__instrumented__", False):
+        return
+
+    @functools.wraps(original)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await original(*args, **kwargs)
+        record_cache_lookup(result is not None)
+        return result
+
+    wrapper.__instrumented__ = True
+    setattr(service, method, wrapper)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None and context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics = _current.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if metrics is None or started_at is None:
+        return
+    metrics.db_queries += 1
+    metrics.db_time += time.perf_counter() - started_at
+    # O texto compilado vem do cache de compilação: mesma consulta, mesma string
+    metrics.statements[statement] = metrics.statements.get(statement, 0) + 1
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """Registra os hooks de cursor (para AsyncEngine, passar ``engine.sync_engine``)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
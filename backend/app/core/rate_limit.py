@@ -0,0 +1,312 @@
+"""
+Rate limiting atômico (GCRA) com pré-admissão local
+
+Cada verificação é um único script Lua no Redis: o estado de cada janela é o
+TAT (theoretical arrival time) do algoritmo GCRA, então não há contadores de
+janela fixa nem corrida entre INCR e EXPIRE. Todas as janelas de uma regra
+(minuto, hora, dia) são avaliadas e atualizadas juntas, e o relógio é o do
+Redis, comum a todos os processos.
+
+Clientes muito abaixo do limite recebem uma concessão local: uma fração das
+requisições restantes que o processo admite sem ir ao Redis. As requisições
+admitidas localmente são cobradas no próximo script.
+"""
+
+import ipaddress
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger_with_context
+from app.core.redis_client import get_redis
+
+logger = get_logger_with_context(component="rate_limit")
+
+# Número máximo de concessões locais mantidas por processo
+LOCAL_LEASE_MAX_KEYS = 10000
+
+# KEYS: chave de bloqueio, chaves das janelas
+# ARGV: cobrança pendente, bloqueio (ms), e por janela: intervalo (ms), capacidade
+# Retorna: {permitido, restantes, retry_after_ms, reset_after_ms}
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local pending = tonumber(ARGV[1])
+local block_ms = tonumber(ARGV[2])
+local windows = #KEYS - 1
+
+local tats = {}
+for i = 1, windows do
+    local interval = tonumber(ARGV[1 + i * 2])
+    local tat = tonumber(redis.call('GET', KEYS[i + 1]) or now)
+    -- requisições já admitidas localmente são cobradas incondicionalmente
+    tats[i] = math.max(tat, now) + pending * interval
+end
+
+local blocked = redis.call('PTTL', KEYS[1])
+local allowed = blocked <= 0
+local remaining = -1
+local retry_after = 0
+local new_tats = {}
+for i = 1, windows do
+    local interval = tonumber(ARGV[1 + i * 2])
+    local capacity = tonumber(ARGV[2 + i * 2])
+    new_tats[i] = math.max(tats[i], now) + interval
+    local allow_at = new_tats[i] - capacity * interval
+    if allow_at > now then
+        allowed = false
+        retry_after = math.max(retry_after, allow_at - now)
+    end
+    local left = math.floor((now - allow_at) / interval)
+    if remaining < 0 or left < remaining then
+        remaining = left
+    end
+end
+
+if allowed then
+    tats = new_tats
+else
+    remaining = 0
+    if blocked > 0 then
+        retry_after = math.max(retry_after, blocked)
+    elseif block_ms > 0 then
+        redis.call('SET', KEYS[1], 1, 'PX', block_ms)
+        retry_after = math.max(retry_after, block_ms)
+    end
+end
+
+local reset_after = 0
+for i = 1, windows do
+    local ttl = math.ceil(tats[i] - now)
+    if ttl > 0 then
+        redis.call('SET', KEYS[i + 1], tats[i], 'PX', ttl)
+    end
+    reset_after = math.max(reset_after, ttl)
+end
+
+return {allowed and 1 or 0, math.max(remaining, 0), math.ceil(retry_after), reset_after}
+"""
+
+
+class RateLimitRule:
+    """Regra de rate limiting: janelas, escopo e condições de aplicação"""
+
+    def __init__(
+        self,
+        name: str,
+        key_prefix: str,
+        windows: List[Tuple[int, int, int]],
+        applies_to: str = "USER",
+        endpoint_pattern: Optional[str] = None,
+        method: Optional[str] = None,
+        company_id: Optional[str] = None,
+        exempt_ips: Optional[List[str]] = None,
+        exempt_users: Optional[List[str]] = None,
+        block_seconds: int = 0,
+    ):
+        self.name = name
+        self.key_prefix = key_prefix
+        # (período em segundos, limite, capacidade de burst)
+        self.windows = windows
+        self.applies_to = applies_to.upper()
+        self.pattern = re.compile(endpoint_pattern) if endpoint_pattern else None
+        self.method = method.upper() if method else None
+        self.company_id = company_id
+        self.exempt_networks = [
+            ipaddress.ip_network(value, strict=False) for value in (exempt_ips or [])
+        ]
+        self.exempt_users = {str(user_id) for user_id in (exempt_users or [])}
+        self.block_seconds = block_seconds
+        # Limite anunciado nos headers: o da janela mais curta
+        self.limit = windows[0][1]
+
+    @classmethod
+    def from_policy(cls, policy: Any) -> Optional["RateLimitRule"]:
+        """
+        Converte uma RateLimitPolicies em regra.
+
+        Políticas condicionadas a papéis de usuário ou planos não podem ser
+        decididas antes da autenticação e são ignoradas, assim como políticas
+        sem nenhum limite.
+        """
+        if policy.user_roles or policy.company_plans:
+            return None
+
+        windows = []
+        for period, limit in (
+            (60, policy.requests_per_minute),
+            (3600, policy.requests_per_hour),
+            (86400, policy.requests_per_day),
+        ):
+            if limit:
+                windows.append((period, limit, limit))
+        if not windows:
+            return None
+
+        # O burst amplia a capacidade da janela mais curta
+        if policy.burst_limit and policy.burst_limit > windows[0][1]:
+            period, limit, _ = windows[0]
+            windows[0] = (period, limit, policy.burst_limit)
+
+        try:
+            return cls(
+                name=policy.name,
+                key_prefix=str(policy.id),
+                windows=windows,
+                applies_to=policy.applies_to,
+                endpoint_pattern=policy.endpoint_pattern,
+                method=policy.method,
+                company_id=None if policy.is_global or not policy.company_id else str(policy.company_id),
+                exempt_ips=policy.exempt_ips,
+                exempt_users=policy.exempt_users,
+                block_seconds=policy.block_duration_seconds or 0,
+            )
+        except (re.error, ValueError) as exc:
+            logger.warning("Invalid rate limit policy ignored", policy=policy.name, error=str(exc))
+            return None
+
+    def matches(self, path: str, method: str, company_id: Optional[str]) -> bool:
+        """Verifica se a regra se aplica à requisição"""
+        if self.company_id and self.company_id != company_id:
+            return False
+        if self.method and self.method != method:
+            return False
+        return self.pattern is None or self.pattern.match(path) is not None
+
+    def is_exempt(self, client_ip: str, user_id: Optional[str]) -> bool:
+        """Verifica isenções por IP ou usuário"""
+        if user_id and user_id in self.exempt_users:
+            return True
+        if not self.exempt_networks:
+            return False
+        try:
+            address = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return False
+        return any(address in network for network in self.exempt_networks)
+
+    def subject(
+        self,
+        client_ip: str,
+        user_id: Optional[str],
+        company_id: Optional[str],
+    ) -> str:
+        """Identificador do balde conforme o escopo da regra"""
+        if self.applies_to == "GLOBAL":
+            return "global"
+        if self.applies_to == "COMPANY" and company_id:
+            return f"company:{company_id}"
+        if self.applies_to in ("USER", "COMPANY") and user_id:
+            return f"user:{user_id}"
+        return f"ip:{client_ip}"
+
+
+class RateLimitResult:
+    """Resultado de uma verificação"""
+
+    def __init__(
+        self,
+        allowed: bool,
+        limit: int,
+        remaining: int,
+        retry_after: float = 0.0,
+        reset_after: float = 0.0,
+    ):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        # Segundos
+        self.retry_after = retry_after
+        self.reset_after = reset_after
+
+
+class _LocalLease:
+    """Requisições que o processo pode admitir sem consultar o Redis"""
+
+    __slots__ = ("tokens", "pending", "remaining", "reset_at", "expires_at")
+
+    def __init__(self, tokens: int, remaining: int, reset_at: float, expires_at: float):
+        self.tokens = tokens
+        self.pending = 0
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.expires_at = expires_at
+
+
+class RateLimiter:
+    """Verificação de limites com um script atômico e concessões locais"""
+
+    def __init__(self):
+        self._script = None
+        self._script_client = None
+        self._leases: "OrderedDict[str, _LocalLease]" = OrderedDict()
+
+    async def check(self, rule: RateLimitRule, subject: str) -> RateLimitResult:
+        """Admite ou rejeita uma requisição do sujeito sob a regra"""
+        key = f"rl:{rule.key_prefix}:{subject}"
+        now = time.monotonic()
+
+        lease = self._leases.get(key)
+        pending = 0
+        if lease is not None:
+            if lease.tokens > 0 and now < lease.expires_at:
+                lease.tokens -= 1
+                lease.pending += 1
+                return RateLimitResult(
+                    allowed=True,
+                    limit=rule.limit,
+                    remaining=max(0, lease.remaining - lease.pending),
+                    reset_after=max(0.0, lease.reset_at - now),
+                )
+            pending = lease.pending
+            del self._leases[key]
+
+        allowed, remaining, retry_ms, reset_ms = await self._evaluate(rule, key, pending)
+        result = RateLimitResult(
+            allowed=bool(allowed),
+            limit=rule.limit,
+            remaining=remaining,
+            retry_after=retry_ms / 1000,
+            reset_after=reset_ms / 1000,
+        )
+
+        tokens = math.floor(remaining * settings.rate_limit_local_fraction) if allowed else 0
+        if tokens > 0:
+            self._leases[key] = _LocalLease(
+                tokens=tokens,
+                remaining=remaining,
+                reset_at=now + result.reset_after,
+                expires_at=now + settings.rate_limit_local_lease_ms / 1000,
+            )
+            if len(self._leases) > LOCAL_LEASE_MAX_KEYS:
+                self._leases.popitem(last=False)
+
+        return result
+
+    async def _evaluate(self, rule: RateLimitRule, key: str, pending: int) -> List[int]:
+        redis = await get_redis()
+        client = redis.client
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(GCRA_SCRIPT)
+            self._script_client = client
+
+        keys = [f"{key}:block"]
+        args: List[Any] = [pending, rule.block_seconds * 1000]
+        for period, limit, capacity in rule.windows:
+            keys.append(f"{key}:{period}")
+            args.extend([period * 1000 / limit, capacity])
+
+        return [int(value) for value in await self._script(keys=keys, args=args)]
+
+
+def default_rate_limit_rule() -> RateLimitRule:
+    """Regra aplicada quando nenhuma política cadastrada corresponde"""
+    limit = settings.rate_limit_per_minute
+    return RateLimitRule(name="default", key_prefix="default", windows=[(60, limit, limit)])
+
+
+# Instância global por processo
+rate_limiter = RateLimiter()
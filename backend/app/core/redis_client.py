@@ -9,6 +9,7 @@ from typing import Any, Optional, Union
 import redis.asyncio as redis
 
 from app.core.config import settings
+from app.core.instrumentation import record_cache_lookup
 from app.core.logging import get_logger_with_context
 
 logger = get_logger_with_context(component="redis")
@@ -55,10 +56,12 @@ class RedisClient:
         try:
             if not self.client:
                 await self.connect()
-            return await self.client.get(key)
+            value = await self.client.get(key)
         except Exception as exc:
             logger.error("Redis GET error", key=key, error=str(exc))
             return None
+        record_cache_lookup(value is not None)
+        return value
     
     async def set(
         self, 
@@ -2,6 +2,8 @@
 Sistema de segurança - JWT, hashing e autenticação
 """
 
+import hashlib
+import hmac
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union
 
@@ -213,10 +215,16 @@ def generate_api_key() -> str:
 
 
 def hash_api_key(api_key: str) -> str:
-    """Cria hash da chave de API"""
-    return create_password_hash(api_key)
+    """
+    Digest HMAC-SHA256 da chave de API.
+
+    As chaves são aleatórias e longas, então um digest com chave secreta
+    basta (sem o custo do bcrypt) e permite buscar a chave por igualdade.
+    """
+    secret = settings.api_key_hmac_secret or settings.secret_key
+    return hmac.new(secret.encode(), api_key.encode(), hashlib.sha256).hexdigest()
 
 
 def verify_api_key(api_key: str, hashed_key: str) -> bool:
-    """Verifica chave de API"""
-    return verify_password(api_key, hashed_key)
+    """Verifica chave de API em tempo constante"""
+    return hmac.compare_digest(hash_api_key(api_key), hashed_key)
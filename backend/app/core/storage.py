@@ -0,0 +1,436 @@
+"""
+Armazenamento de blobs endereçado por conteúdo
+
+Os arquivos são gravados em blocos de tamanho fixo enquanto o SHA-256 é
+calculado; o digest é a chave do blob, de modo que conteúdos idênticos são
+armazenados uma única vez. Backends: sistema de arquivos local e S3
+compatível (MinIO em desenvolvimento).
+
+A E/S de disco roda em ``asyncio.to_thread`` (pool padrão do loop), nunca no
+pool de threads do banco, cujas threads correspondem a conexões.
+"""
+
+import asyncio
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceException, NotFoundException
+from app.core.logging import get_logger_with_context
+
+logger = get_logger_with_context(component="storage")
+
+# Validade das URLs pré-assinadas de download (segundos)
+PRESIGNED_URL_TTL = 300
+
+
+class StoredBlob:
+    """Resultado da gravação de um blob"""
+
+    def __init__(self, digest: str, size: int, created: bool):
+        self.digest = digest
+        self.size = size
+        # False quando o conteúdo já existia (deduplicado)
+        self.created = created
+
+
+async def iter_upload(upload: Any, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Lê um UploadFile em blocos de tamanho fixo"""
+    chunk_size = chunk_size or settings.storage_chunk_size
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class BlobStore(ABC):
+    """Interface dos backends de armazenamento de blobs"""
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        """Grava o conteúdo em blocos e retorna o blob pelo seu SHA-256"""
+
+    @abstractmethod
+    async def put_file(self, path: Path, digest: str) -> StoredBlob:
+        """Adota um arquivo já gravado em disco sob o digest informado
+
+        O arquivo é consumido (movido ou removido após o envio).
+        """
+
+    @abstractmethod
+    async def size(self, digest: str) -> int:
+        """Tamanho do blob em bytes (NotFoundException se não existir)"""
+
+    @abstractmethod
+    def iter_range(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Lê os bytes [start, end] (inclusivo) em blocos"""
+
+    @abstractmethod
+    async def delete(self, digest: str) -> None:
+        """Remove o blob"""
+
+    async def redirect_url(self, digest: str, filename: str, media_type: str) -> Optional[str]:
+        """URL para o cliente baixar direto do backend, sem passar pela app"""
+        return None
+
+    def internal_redirect(self, digest: str) -> Optional[str]:
+        """Caminho interno para o proxy servir o arquivo (X-Accel-Redirect)"""
+        return None
+
+    async def close(self) -> None:
+        """Libera recursos do backend"""
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs em disco local, sob <root>/<aa>/<bb>/<sha256>"""
+
+    def __init__(self, root: str, chunk_size: int, accel_prefix: Optional[str] = None):
+        super().__init__(chunk_size)
+        self.root = Path(root)
+        self.tmp_dir = self.root / "tmp"
+        self.accel_prefix = accel_prefix.rstrip("/") if accel_prefix else None
+
+    def _relative_path(self, digest: str) -> str:
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def _path(self, digest: str) -> Path:
+        return self.root / self._relative_path(digest)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        await asyncio.to_thread(self.tmp_dir.mkdir, parents=True, exist_ok=True)
+        tmp_path = self.tmp_dir / uuid4().hex
+        hasher = hashlib.sha256()
+        size = 0
+
+        handle = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+                size += len(chunk)
+            await asyncio.to_thread(handle.close)
+
+            digest = hasher.hexdigest()
+            created = await asyncio.to_thread(self._commit, tmp_path, digest)
+        except BaseException:
+            handle.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        return StoredBlob(digest, size, created)
+
+    async def put_file(self, path: Path, digest: str) -> StoredBlob:
+        size = (await asyncio.to_thread(os.stat, path)).st_size
+        # Mesmo sistema de arquivos: apenas rename, sem reler os dados
+        created = await asyncio.to_thread(self._commit, path, digest)
+        return StoredBlob(digest, size, created)
+
+    def _commit(self, tmp_path: Path, digest: str) -> bool:
+        """Move o arquivo temporário para o endereço final, ou descarta se duplicado"""
+        path = self._path(digest)
+        if path.exists():
+            tmp_path.unlink(missing_ok=True)
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+        return True
+
+    async def size(self, digest: str) -> int:
+        try:
+            stat = await asyncio.to_thread(os.stat, self._path(digest))
+        except FileNotFoundError:
+            raise NotFoundException("Blob", digest)
+        return stat.st_size
+
+    async def iter_range(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        try:
+            fd = await asyncio.to_thread(os.open, self._path(digest), os.O_RDONLY)
+        except FileNotFoundError:
+            raise NotFoundException("Blob", digest)
+
+        try:
+            offset = start
+            while offset <= end:
+                # pread não altera a posição do descritor nem exige seek
+                chunk = await asyncio.to_thread(
+                    os.pread, fd, min(self.chunk_size, end - offset + 1), offset
+                )
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+        finally:
+            os.close(fd)
+
+    async def delete(self, digest: str) -> None:
+        await asyncio.to_thread(self._path(digest).unlink, missing_ok=True)
+
+    def internal_redirect(self, digest: str) -> Optional[str]:
+        if not self.accel_prefix:
+            return None
+        return f"{self.accel_prefix}/{self._relative_path(digest)}"
+
+
+class S3BlobStore(BlobStore):
+    """Blobs em bucket S3 compatível (AWS S3, MinIO), sob blobs/<sha256>
+
+    O upload é multipart em partes de ``part_size`` para uma chave temporária;
+    ao final, a chave é copiada no servidor para o endereço definitivo, ou
+    descartada se o conteúdo já existir.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        chunk_size: int,
+        part_size: int,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        presigned_downloads: bool = False,
+    ):
+        super().__init__(chunk_size)
+        self.bucket = bucket
+        # Partes de multipart upload precisam ter ao menos 5 MiB (exceto a última)
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.presigned_downloads = presigned_downloads
+        self._client = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client_lock = asyncio.Lock()
+
+    def _key(self, digest: str) -> str:
+        return f"blobs/{digest[:2]}/{digest}"
+
+    async def _get_client(self):
+        """Cliente S3 compartilhado, criado sob demanda"""
+        if self._client is not None:
+            return self._client
+
+        async with self._client_lock:
+            if self._client is None:
+                try:
+                    from aiobotocore.session import get_session
+                except ImportError as exc:
+                    raise ExternalServiceException(
+                        "storage", "aiobotocore is required for STORAGE_BACKEND=s3"
+                    ) from exc
+
+                exit_stack = AsyncExitStack()
+                self._client = await exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        endpoint_url=self.endpoint_url,
+                        region_name=self.region,
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                    )
+                )
+                self._exit_stack = exit_stack
+
+                # Em desenvolvimento (MinIO) o bucket pode ainda não existir
+                try:
+                    await self._client.head_bucket(Bucket=self.bucket)
+                except self._client.exceptions.ClientError:
+                    await self._client.create_bucket(Bucket=self.bucket)
+                logger.info("S3 blob store connected", bucket=self.bucket, endpoint=self.endpoint_url)
+        return self._client
+
+    async def _multipart_upload(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        hasher: Optional[Any] = None,
+    ) -> int:
+        """Envia os blocos em partes de ``part_size``; retorna o total de bytes"""
+        client = await self._get_client()
+        upload = await client.create_multipart_upload(Bucket=self.bucket, Key=key)
+        upload_id = upload["UploadId"]
+        parts = []
+        buffer = bytearray()
+        size = 0
+
+        async def flush_part() -> None:
+            part_number = len(parts) + 1
+            response = await client.upload_part(
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                PartNumber=part_number, Body=bytes(buffer),
+            )
+            parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                if hasher is not None:
+                    await asyncio.to_thread(hasher.update, chunk)
+                size += len(chunk)
+                buffer.extend(chunk)
+                if len(buffer) >= self.part_size:
+                    await flush_part()
+            if buffer or not parts:
+                await flush_part()
+
+            await client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+        return size
+
+    async def _iter_file(self, path: Path) -> AsyncIterator[bytes]:
+        """Lê um arquivo local em partes de ``part_size``"""
+        fd = await asyncio.to_thread(os.open, path, os.O_RDONLY)
+        try:
+            offset = 0
+            while True:
+                chunk = await asyncio.to_thread(os.pread, fd, self.part_size, offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+        finally:
+            os.close(fd)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        client = await self._get_client()
+        tmp_key = f"tmp/{uuid4().hex}"
+        hasher = hashlib.sha256()
+        size = await self._multipart_upload(tmp_key, chunks, hasher)
+
+        digest = hasher.hexdigest()
+        key = self._key(digest)
+        try:
+            created = not await self._exists(key)
+            if created:
+                await client.copy_object(
+                    Bucket=self.bucket, Key=key,
+                    CopySource={"Bucket": self.bucket, "Key": tmp_key},
+                )
+        finally:
+            await client.delete_object(Bucket=self.bucket, Key=tmp_key)
+
+        return StoredBlob(digest, size, created)
+
+    async def put_file(self, path: Path, digest: str) -> StoredBlob:
+        key = self._key(digest)
+        try:
+            created = not await self._exists(key)
+            if created:
+                size = await self._multipart_upload(key, self._iter_file(path))
+            else:
+                size = (await asyncio.to_thread(os.stat, path)).st_size
+        finally:
+            await asyncio.to_thread(Path(path).unlink, missing_ok=True)
+        return StoredBlob(digest, size, created)
+
+    async def _exists(self, key: str) -> bool:
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.bucket, Key=key)
+        except client.exceptions.ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def size(self, digest: str) -> int:
+        client = await self._get_client()
+        try:
+            response = await client.head_object(Bucket=self.bucket, Key=self._key(digest))
+        except client.exceptions.ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise NotFoundException("Blob", digest)
+            raise
+        return response["ContentLength"]
+
+    async def iter_range(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        client = await self._get_client()
+        try:
+            response = await client.get_object(
+                Bucket=self.bucket, Key=self._key(digest), Range=f"bytes={start}-{end}"
+            )
+        except client.exceptions.NoSuchKey:
+            raise NotFoundException("Blob", digest)
+
+        async with response["Body"] as body:
+            while True:
+                chunk = await body.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def delete(self, digest: str) -> None:
+        client = await self._get_client()
+        await client.delete_object(Bucket=self.bucket, Key=self._key(digest))
+
+    async def redirect_url(self, digest: str, filename: str, media_type: str) -> Optional[str]:
+        if not self.presigned_downloads:
+            return None
+        client = await self._get_client()
+        return await client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._key(digest),
+                "ResponseContentType": media_type,
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=PRESIGNED_URL_TTL,
+        )
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            exit_stack, self._exit_stack, self._client = self._exit_stack, None, None
+            await exit_stack.aclose()
+
+
+def _write_chunk(handle: Any, hasher: Any, chunk: bytes) -> None:
+    """Atualiza o hash e grava o bloco (executa no pool de threads)"""
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+def create_blob_store() -> BlobStore:
+    """Instancia o backend configurado em STORAGE_BACKEND"""
+    if settings.storage_backend == "s3":
+        return S3BlobStore(
+            bucket=settings.storage_s3_bucket,
+            chunk_size=settings.storage_chunk_size,
+            part_size=settings.storage_s3_part_size,
+            endpoint_url=settings.storage_s3_endpoint_url,
+            region=settings.storage_s3_region,
+            access_key=settings.storage_s3_access_key,
+            secret_key=settings.storage_s3_secret_key,
+            presigned_downloads=settings.storage_s3_presigned_downloads,
+        )
+    if settings.storage_backend == "local":
+        return LocalBlobStore(
+            root=settings.storage_local_path,
+            chunk_size=settings.storage_chunk_size,
+            accel_prefix=settings.storage_accel_redirect_prefix,
+        )
+    raise ValueError(f"Unsupported STORAGE_BACKEND: {settings.storage_backend}")
+
+
+# Instância global do armazenamento de blobs
+blob_store = create_blob_store()
+
+
+async def close_blob_store() -> None:
+    """Fecha o backend de armazenamento"""
+    await blob_store.close()
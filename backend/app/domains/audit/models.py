@@ -135,6 +135,9 @@ class AuditLog(BaseModel, TimestampMixin):
         Index('idx_audit_logs_user_date', 'user_id', 'created_at'),
         Index('idx_audit_logs_company_date', 'company_id', 'created_at'),
         Index('idx_audit_logs_resource_date', 'resource_type', 'resource_id', 'created_at'),
+        # Keyset pagination over (created_at, id)
+        Index('idx_audit_logs_created_id', 'created_at', 'id'),
+        Index('idx_audit_logs_company_created_id', 'company_id', 'created_at', 'id'),
     )
 
 
@@ -257,6 +260,8 @@ class FormSubmission(BaseModel, TimestampMixin, UserTrackingMixin):
         # Composite indexes
         Index('idx_form_submissions_template_status', 'form_template_id', 'status'),
         Index('idx_form_submissions_user_date', 'created_by', 'created_at'),
+        # Keyset pagination over (created_at, id)
+        Index('idx_form_submissions_created_id', 'created_at', 'id'),
     )
 
 
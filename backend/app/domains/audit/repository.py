@@ -4,8 +4,8 @@ Based on the database architecture plan.
 """
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import desc, asc, func, and_, or_, text
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import desc, asc, func, and_, or_, text, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.shared.common.repository import BaseRepository
 from app.core.exceptions import NotFoundError, ValidationError
@@ -18,10 +18,10 @@ from .models import (
 class AuditLogRepository(BaseRepository[AuditLog]):
     """Repository for comprehensive audit logging and compliance tracking."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, AuditLog)
+    def __init__(self, session: AsyncSession):
+        super().__init__(AuditLog, session)
     
-    def log_event(
+    async def log_event(
         self,
         event_type: AuditEventType,
         description: str,
@@ -39,9 +39,9 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             severity=severity,
             **kwargs
         )
-        return self.create(audit_log)
+        return await self.add(audit_log)
     
-    def log_user_action(
+    async def log_user_action(
         self,
         user_id: str,
         company_id: str,
@@ -85,9 +85,9 @@ class AuditLogRepository(BaseRepository[AuditLog]):
                     changed_fields.append(key)
             audit_data['changed_fields'] = changed_fields
         
-        return self.log_event(**audit_data)
+        return await self.log_event(**audit_data)
     
-    def log_security_event(
+    async def log_security_event(
         self,
         description: str,
         severity: AuditSeverity,
@@ -97,7 +97,7 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         **kwargs
     ) -> AuditLog:
         """Log a security-related event."""
-        return self.log_event(
+        return await self.log_event(
             event_type=AuditEventType.LOGIN,  # Could be more specific
             description=description,
             severity=severity,
@@ -108,7 +108,7 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             **kwargs
         )
     
-    def get_user_activity(
+    async def get_user_activity(
         self,
         user_id: str,
         company_id: Optional[str] = None,
@@ -118,32 +118,34 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         """Get user activity within specified timeframe."""
         since = datetime.utcnow() - timedelta(hours=hours)
         
-        query = self.db.query(AuditLog).filter(
+        query = select(AuditLog).where(
             AuditLog.user_id == user_id,
             AuditLog.created_at >= since
         )
         
         if company_id:
-            query = query.filter(AuditLog.company_id == company_id)
+            query = query.where(AuditLog.company_id == company_id)
         
         if event_types:
-            query = query.filter(AuditLog.event_type.in_(event_types))
+            query = query.where(AuditLog.event_type.in_(event_types))
         
-        return query.order_by(desc(AuditLog.created_at)).all()
+        return await self.fetch_all(query.order_by(desc(AuditLog.created_at)))
     
-    def get_resource_history(
+    async def get_resource_history(
         self,
         resource_type: str,
         resource_id: str,
         limit: int = 100
     ) -> List[AuditLog]:
         """Get audit history for a specific resource."""
-        return self.db.query(AuditLog).filter(
-            AuditLog.resource_type == resource_type,
-            AuditLog.resource_id == resource_id
-        ).order_by(desc(AuditLog.created_at)).limit(limit).all()
+        return await self.fetch_all(
+            select(AuditLog).where(
+                AuditLog.resource_type == resource_type,
+                AuditLog.resource_id == resource_id
+            ).order_by(desc(AuditLog.created_at)).limit(limit)
+        )
     
-    def get_security_events(
+    async def get_security_events(
         self,
         company_id: Optional[str] = None,
         severity: Optional[AuditSeverity] = None,
@@ -152,20 +154,20 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         """Get security events within specified timeframe."""
         since = datetime.utcnow() - timedelta(hours=hours)
         
-        query = self.db.query(AuditLog).filter(
+        query = select(AuditLog).where(
             AuditLog.created_at >= since,
             AuditLog.event_category == "Security"
         )
         
         if company_id:
-            query = query.filter(AuditLog.company_id == company_id)
+            query = query.where(AuditLog.company_id == company_id)
         
         if severity:
-            query = query.filter(AuditLog.severity == severity)
+            query = query.where(AuditLog.severity == severity)
         
-        return query.order_by(desc(AuditLog.created_at)).all()
+        return await self.fetch_all(query.order_by(desc(AuditLog.created_at)))
     
-    def get_failed_login_attempts(
+    async def get_failed_login_attempts(
         self,
         ip_address: Optional[str] = None,
         user_email: Optional[str] = None,
@@ -174,21 +176,21 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         """Get failed login attempts."""
         since = datetime.utcnow() - timedelta(hours=hours)
         
-        query = self.db.query(AuditLog).filter(
+        query = select(AuditLog).where(
             AuditLog.created_at >= since,
             AuditLog.event_type == AuditEventType.LOGIN,
             AuditLog.is_error == True
         )
         
         if ip_address:
-            query = query.filter(AuditLog.ip_address == ip_address)
+            query = query.where(AuditLog.ip_address == ip_address)
         
         if user_email:
-            query = query.filter(AuditLog.user_email == user_email)
+            query = query.where(AuditLog.user_email == user_email)
         
-        return query.order_by(desc(AuditLog.created_at)).all()
+        return await self.fetch_all(query.order_by(desc(AuditLog.created_at)))
     
-    def get_compliance_report(
+    async def get_compliance_report(
         self,
         company_id: str,
         start_date: datetime,
@@ -196,52 +198,52 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         compliance_tags: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """Generate compliance report."""
-        query = self.db.query(AuditLog).filter(
+        query = select(AuditLog).where(
             AuditLog.company_id == company_id,
             AuditLog.created_at >= start_date,
             AuditLog.created_at <= end_date
         )
         
         if compliance_tags:
-            query = query.filter(
+            query = query.where(
                 AuditLog.compliance_tags.overlap(compliance_tags)
             )
         
-        total_events = query.count()
+        total_events = await self.fetch_count(query)
         
         # Event type distribution
-        event_types = self.db.query(
+        event_types = await self.fetch_rows(select(
             AuditLog.event_type,
             func.count(AuditLog.id).label('count')
-        ).filter(
+        ).where(
             AuditLog.company_id == company_id,
             AuditLog.created_at >= start_date,
             AuditLog.created_at <= end_date
-        ).group_by(AuditLog.event_type).all()
+        ).group_by(AuditLog.event_type))
         
         # Severity distribution
-        severity_dist = self.db.query(
+        severity_dist = await self.fetch_rows(select(
             AuditLog.severity,
             func.count(AuditLog.id).label('count')
-        ).filter(
+        ).where(
             AuditLog.company_id == company_id,
             AuditLog.created_at >= start_date,
             AuditLog.created_at <= end_date
-        ).group_by(AuditLog.severity).all()
+        ).group_by(AuditLog.severity))
         
         # Top users by activity
-        top_users = self.db.query(
+        top_users = await self.fetch_rows(select(
             AuditLog.user_id,
             AuditLog.user_email,
             func.count(AuditLog.id).label('activity_count')
-        ).filter(
+        ).where(
             AuditLog.company_id == company_id,
             AuditLog.created_at >= start_date,
             AuditLog.created_at <= end_date,
             AuditLog.user_id.is_not(None)
         ).group_by(
             AuditLog.user_id, AuditLog.user_email
-        ).order_by(desc('activity_count')).limit(10).all()
+        ).order_by(desc('activity_count')).limit(10))
         
         return {
             'period': {
@@ -261,53 +263,70 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             ]
         }
     
-    def search_audit_logs(
+    async def search_audit_logs(
         self,
         company_id: Optional[str] = None,
         user_id: Optional[str] = None,
         event_type: Optional[AuditEventType] = None,
         resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        severity: Optional[str] = None,
         ip_address: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         search_text: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> Tuple[List[AuditLog], int]:
-        """Search audit logs with various filters."""
-        query = self.db.query(AuditLog)
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Tuple[List[AuditLog], Optional[int]]:
+        """
+        Search audit logs with various filters.
+        
+        The total is only counted for offset pages when ``with_total`` is set;
+        cursor pages return ``None`` instead of scanning the whole match set.
+        """
+        query = select(AuditLog)
         
         if company_id:
-            query = query.filter(AuditLog.company_id == company_id)
+            query = query.where(AuditLog.company_id == company_id)
         
         if user_id:
-            query = query.filter(AuditLog.user_id == user_id)
+            query = query.where(AuditLog.user_id == user_id)
         
         if event_type:
-            query = query.filter(AuditLog.event_type == event_type)
+            query = query.where(AuditLog.event_type == event_type)
         
         if resource_type:
-            query = query.filter(AuditLog.resource_type == resource_type)
+            query = query.where(AuditLog.resource_type == resource_type)
+        
+        if resource_id:
+            query = query.where(AuditLog.resource_id == resource_id)
+        
+        if severity:
+            query = query.where(AuditLog.severity == severity)
         
         if ip_address:
-            query = query.filter(AuditLog.ip_address == ip_address)
+            query = query.where(AuditLog.ip_address == ip_address)
         
         if start_date:
-            query = query.filter(AuditLog.created_at >= start_date)
+            query = query.where(AuditLog.created_at >= start_date)
         
         if end_date:
-            query = query.filter(AuditLog.created_at <= end_date)
+            query = query.where(AuditLog.created_at <= end_date)
         
         if search_text:
-            query = query.filter(
+            query = query.where(
                 or_(
                     AuditLog.description.ilike(f'%{search_text}%'),
                     AuditLog.resource_name.ilike(f'%{search_text}%')
                 )
             )
         
-        total_count = query.count()
-        results = query.order_by(desc(AuditLog.created_at)).offset(offset).limit(limit).all()
+        total_count = None
+        if with_total and not cursor:
+            total_count = await self.fetch_count(query)
+        results = await self.fetch_all(self.paginate(query, offset, limit, cursor))
         
         return results, total_count
 
@@ -315,10 +334,10 @@ class AuditLogRepository(BaseRepository[AuditLog]):
 class FormTemplateRepository(BaseRepository[FormTemplate]):
     """Repository for dynamic form template management."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FormTemplate)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FormTemplate, session)
     
-    def create_template(
+    async def create_template(
         self,
         name: str,
         slug: str,
@@ -336,29 +355,29 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
             company_id=company_id,
             **kwargs
         )
-        return self.create(template)
+        return await self.add(template)
     
-    def get_by_slug(
+    async def get_by_slug(
         self,
         slug: str,
         company_id: Optional[str] = None
     ) -> Optional[FormTemplate]:
         """Get form template by slug."""
-        query = self.db.query(FormTemplate).filter(
+        query = select(FormTemplate).where(
             FormTemplate.slug == slug
         )
         
         if company_id:
-            query = query.filter(
+            query = query.where(
                 or_(
                     FormTemplate.company_id == company_id,
                     FormTemplate.is_public == True
                 )
             )
         
-        return query.first()
+        return await self.fetch_first(query)
     
-    def get_published_templates(
+    async def get_published_templates(
         self,
         company_id: Optional[str] = None,
         include_public: bool = True
@@ -366,7 +385,7 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
         """Get published form templates."""
         from app.domains.forms.models import FormStatus
         
-        query = self.db.query(FormTemplate).filter(
+        query = select(FormTemplate).where(
             FormTemplate.status == FormStatus.PUBLISHED
         )
         
@@ -374,43 +393,43 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
             filters = [FormTemplate.company_id == company_id]
             if include_public:
                 filters.append(FormTemplate.is_public == True)
-            query = query.filter(or_(*filters))
+            query = query.where(or_(*filters))
         
-        return query.order_by(FormTemplate.name).all()
+        return await self.fetch_all(query.order_by(FormTemplate.name))
     
-    def get_company_templates(
+    async def get_company_templates(
         self,
         company_id: str,
         status: Optional[str] = None
     ) -> List[FormTemplate]:
         """Get form templates for a company."""
-        query = self.db.query(FormTemplate).filter(
+        query = select(FormTemplate).where(
             FormTemplate.company_id == company_id
         )
         
         if status:
-            query = query.filter(FormTemplate.status == status)
+            query = query.where(FormTemplate.status == status)
         
-        return query.order_by(FormTemplate.name).all()
+        return await self.fetch_all(query.order_by(FormTemplate.name))
     
-    def increment_submission_count(self, template_id: str) -> bool:
+    async def increment_submission_count(self, template_id: str) -> bool:
         """Increment submission count for a template."""
-        template = self.get_by_id(template_id)
+        template = await self.get_by_id(template_id)
         if not template:
             return False
         
         template.submission_count += 1
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def update_analytics(
+    async def update_analytics(
         self,
         template_id: str,
         completion_rate: Optional[int] = None,
         avg_completion_time: Optional[int] = None
     ) -> bool:
         """Update template analytics."""
-        template = self.get_by_id(template_id)
+        template = await self.get_by_id(template_id)
         if not template:
             return False
         
@@ -420,10 +439,10 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
         if avg_completion_time is not None:
             template.avg_completion_time_minutes = avg_completion_time
         
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def check_access_permission(
+    async def check_access_permission(
         self,
         template_id: str,
         user_id: str,
@@ -431,7 +450,7 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
         company_id: str
     ) -> bool:
         """Check if user has access to form template."""
-        template = self.get_by_id(template_id)
+        template = await self.get_by_id(template_id)
         if not template:
             return False
         
@@ -453,30 +472,30 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
         
         return False
     
-    def get_template_statistics(self, template_id: str) -> Dict[str, Any]:
+    async def get_template_statistics(self, template_id: str) -> Dict[str, Any]:
         """Get statistics for a form template."""
-        template = self.get_by_id(template_id)
+        template = await self.get_by_id(template_id)
         if not template:
             return {}
         
         # Get submission statistics
-        submission_stats = self.db.query(
+        submission_stats = (await self.fetch_rows(select(
             func.count(FormSubmission.id).label('total_submissions'),
             func.count(
                 func.nullif(FormSubmission.status != SubmissionStatus.DRAFT, False)
             ).label('completed_submissions'),
             func.avg(FormSubmission.completion_time_minutes).label('avg_completion_time')
-        ).filter(
+        ).where(
             FormSubmission.form_template_id == template_id
-        ).first()
+        )))[0]
         
         # Status distribution
-        status_distribution = self.db.query(
+        status_distribution = await self.fetch_rows(select(
             FormSubmission.status,
             func.count(FormSubmission.id).label('count')
-        ).filter(
+        ).where(
             FormSubmission.form_template_id == template_id
-        ).group_by(FormSubmission.status).all()
+        ).group_by(FormSubmission.status))
         
         return {
             'template_info': {
@@ -500,10 +519,10 @@ class FormTemplateRepository(BaseRepository[FormTemplate]):
 class FormSubmissionRepository(BaseRepository[FormSubmission]):
     """Repository for form submission management and tracking."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FormSubmission)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FormSubmission, session)
     
-    def create_submission(
+    async def create_submission(
         self,
         form_template_id: str,
         form_data: Dict,
@@ -520,15 +539,15 @@ class FormSubmissionRepository(BaseRepository[FormSubmission]):
             started_at=datetime.utcnow(),
             **kwargs
         )
-        return self.create(submission)
+        return await self.add(submission)
     
-    def submit_form(
+    async def submit_form(
         self,
         submission_id: str,
         completion_time_minutes: Optional[int] = None
     ) -> bool:
         """Mark a form submission as submitted."""
-        submission = self.get_by_id(submission_id)
+        submission = await self.get_by_id(submission_id)
         if not submission:
             return False
         
@@ -541,45 +560,45 @@ class FormSubmissionRepository(BaseRepository[FormSubmission]):
             time_diff = datetime.utcnow() - submission.started_at
             submission.completion_time_minutes = int(time_diff.total_seconds() / 60)
         
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def get_template_submissions(
+    async def get_template_submissions(
         self,
         form_template_id: str,
         status: Optional[SubmissionStatus] = None,
         limit: int = 100
     ) -> List[FormSubmission]:
         """Get submissions for a form template."""
-        query = self.db.query(FormSubmission).filter(
+        query = select(FormSubmission).where(
             FormSubmission.form_template_id == form_template_id
         )
         
         if status:
-            query = query.filter(FormSubmission.status == status)
+            query = query.where(FormSubmission.status == status)
         
-        return query.order_by(desc(FormSubmission.created_at)).limit(limit).all()
+        return await self.fetch_all(query.order_by(desc(FormSubmission.created_at)).limit(limit))
     
-    def get_user_submissions(
+    async def get_user_submissions(
         self,
         user_id: str,
         company_id: Optional[str] = None,
         status: Optional[SubmissionStatus] = None
     ) -> List[FormSubmission]:
         """Get submissions by a user."""
-        query = self.db.query(FormSubmission).filter(
+        query = select(FormSubmission).where(
             FormSubmission.created_by == user_id
         )
         
         if company_id:
-            query = query.filter(FormSubmission.company_id == company_id)
+            query = query.where(FormSubmission.company_id == company_id)
         
         if status:
-            query = query.filter(FormSubmission.status == status)
+            query = query.where(FormSubmission.status == status)
         
-        return query.order_by(desc(FormSubmission.created_at)).all()
+        return await self.fetch_all(query.order_by(desc(FormSubmission.created_at)))
     
-    def update_review_status(
+    async def update_review_status(
         self,
         submission_id: str,
         status: SubmissionStatus,
@@ -587,7 +606,7 @@ class FormSubmissionRepository(BaseRepository[FormSubmission]):
         review_notes: Optional[str] = None
     ) -> bool:
         """Update submission review status."""
-        submission = self.get_by_id(submission_id)
+        submission = await self.get_by_id(submission_id)
         if not submission:
             return False
         
@@ -613,61 +632,73 @@ class FormSubmissionRepository(BaseRepository[FormSubmission]):
         # Mark as modified for SQLAlchemy to detect JSON change
         submission.approval_history = submission.approval_history[:]
         
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def get_pending_reviews(
+    async def get_pending_reviews(
         self,
         company_id: Optional[str] = None,
         reviewer_id: Optional[str] = None
     ) -> List[FormSubmission]:
         """Get submissions pending review."""
-        query = self.db.query(FormSubmission).filter(
+        query = select(FormSubmission).where(
             FormSubmission.status == SubmissionStatus.UNDER_REVIEW
         )
         
         if company_id:
-            query = query.filter(FormSubmission.company_id == company_id)
+            query = query.where(FormSubmission.company_id == company_id)
         
         if reviewer_id:
-            query = query.filter(FormSubmission.reviewed_by == reviewer_id)
+            query = query.where(FormSubmission.reviewed_by == reviewer_id)
         
-        return query.order_by(FormSubmission.submitted_at).all()
+        return await self.fetch_all(query.order_by(FormSubmission.submitted_at))
     
-    def search_submissions(
+    async def search_submissions(
         self,
         form_template_id: Optional[str] = None,
         company_id: Optional[str] = None,
         status: Optional[SubmissionStatus] = None,
         submitter_email: Optional[str] = None,
+        created_by: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> Tuple[List[FormSubmission], int]:
-        """Search form submissions with filters."""
-        query = self.db.query(FormSubmission)
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Tuple[List[FormSubmission], Optional[int]]:
+        """
+        Search form submissions with filters.
+        
+        Like ``search_audit_logs``, cursor pages skip the total count.
+        """
+        query = select(FormSubmission)
         
         if form_template_id:
-            query = query.filter(FormSubmission.form_template_id == form_template_id)
+            query = query.where(FormSubmission.form_template_id == form_template_id)
         
         if company_id:
-            query = query.filter(FormSubmission.company_id == company_id)
+            query = query.where(FormSubmission.company_id == company_id)
         
         if status:
-            query = query.filter(FormSubmission.status == status)
+            query = query.where(FormSubmission.status == status)
         
         if submitter_email:
-            query = query.filter(FormSubmission.submitter_email == submitter_email)
+            query = query.where(FormSubmission.submitter_email == submitter_email)
+        
+        if created_by:
+            query = query.where(FormSubmission.created_by == created_by)
         
         if start_date:
-            query = query.filter(FormSubmission.created_at >= start_date)
+            query = query.where(FormSubmission.created_at >= start_date)
         
         if end_date:
-            query = query.filter(FormSubmission.created_at <= end_date)
+            query = query.where(FormSubmission.created_at <= end_date)
         
-        total_count = query.count()
-        results = query.order_by(desc(FormSubmission.created_at)).offset(offset).limit(limit).all()
+        total_count = None
+        if with_total and not cursor:
+            total_count = await self.fetch_count(query)
+        results = await self.fetch_all(self.paginate(query, offset, limit, cursor))
         
         return results, total_count
 
@@ -675,10 +706,10 @@ class FormSubmissionRepository(BaseRepository[FormSubmission]):
 class DataRetentionPolicyRepository(BaseRepository[DataRetentionPolicy]):
     """Repository for data retention policy management."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, DataRetentionPolicy)
+    def __init__(self, session: AsyncSession):
+        super().__init__(DataRetentionPolicy, session)
     
-    def create_policy(
+    async def create_policy(
         self,
         name: str,
         data_type: str,
@@ -696,44 +727,46 @@ class DataRetentionPolicyRepository(BaseRepository[DataRetentionPolicy]):
             company_id=company_id,
             **kwargs
         )
-        return self.create(policy)
+        return await self.add(policy)
     
-    def get_active_policies(
+    async def get_active_policies(
         self,
         data_type: Optional[str] = None,
         company_id: Optional[str] = None
     ) -> List[DataRetentionPolicy]:
         """Get active retention policies."""
-        query = self.db.query(DataRetentionPolicy).filter(
+        query = select(DataRetentionPolicy).where(
             DataRetentionPolicy.is_active == True
         )
         
         if data_type:
-            query = query.filter(DataRetentionPolicy.data_type == data_type)
+            query = query.where(DataRetentionPolicy.data_type == data_type)
         
         if company_id:
-            query = query.filter(
+            query = query.where(
                 or_(
                     DataRetentionPolicy.company_id == company_id,
                     DataRetentionPolicy.applies_to_all_companies == True
                 )
             )
         
-        return query.all()
+        return await self.fetch_all(query)
     
-    def get_due_policies(self) -> List[DataRetentionPolicy]:
+    async def get_due_policies(self) -> List[DataRetentionPolicy]:
         """Get policies that are due for execution."""
         now = datetime.utcnow()
         
-        return self.db.query(DataRetentionPolicy).filter(
-            DataRetentionPolicy.is_active == True,
-            or_(
-                DataRetentionPolicy.next_execution.is_(None),
-                DataRetentionPolicy.next_execution <= now
+        return await self.fetch_all(
+            select(DataRetentionPolicy).where(
+                DataRetentionPolicy.is_active == True,
+                or_(
+                    DataRetentionPolicy.next_execution.is_(None),
+                    DataRetentionPolicy.next_execution <= now
+                )
             )
-        ).all()
+        )
     
-    def update_execution_stats(
+    async def update_execution_stats(
         self,
         policy_id: str,
         records_processed: int,
@@ -741,7 +774,7 @@ class DataRetentionPolicyRepository(BaseRepository[DataRetentionPolicy]):
         records_deleted: int
     ) -> bool:
         """Update policy execution statistics."""
-        policy = self.get_by_id(policy_id)
+        policy = await self.get_by_id(policy_id)
         if not policy:
             return False
         
@@ -751,25 +784,25 @@ class DataRetentionPolicyRepository(BaseRepository[DataRetentionPolicy]):
         policy.records_archived += records_archived
         policy.records_deleted += records_deleted
         
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def get_retention_summary(
+    async def get_retention_summary(
         self,
         company_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get retention policy summary."""
-        query = self.db.query(DataRetentionPolicy)
+        query = select(DataRetentionPolicy)
         
         if company_id:
-            query = query.filter(
+            query = query.where(
                 or_(
                     DataRetentionPolicy.company_id == company_id,
                     DataRetentionPolicy.applies_to_all_companies == True
                 )
             )
         
-        policies = query.all()
+        policies = await self.fetch_all(query)
         
         total_policies = len(policies)
         active_policies = sum(1 for p in policies if p.is_active)
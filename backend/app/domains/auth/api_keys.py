@@ -0,0 +1,212 @@
+"""
+High-throughput API-key authentication.
+
+Keys are stored as keyed HMAC-SHA256 digests, so a presented key is
+resolved with a single indexed equality lookup and no per-request bcrypt.
+Verified keys are kept in a small in-process TTL/LRU cache; revocations are
+pushed to every process over Redis pub/sub. Usage counters are accumulated
+in memory and written in batches instead of one UPDATE per request.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger_with_context
+from app.core.redis_client import get_redis
+from app.core.security import hash_api_key
+
+logger = get_logger_with_context(component="api_keys")
+
+API_KEY_PREFIX = "cotai_"
+
+# Pub/sub channel carrying the digests of revoked keys
+REVOCATION_CHANNEL = "auth:api_keys:revoked"
+
+
+class VerifiedApiKey:
+    """Detached snapshot of a verified API key, safe to share across requests."""
+
+    __slots__ = (
+        "id", "user_id", "name", "scopes", "permissions",
+        "rate_limit", "expires_at", "allowed_ips",
+    )
+
+    def __init__(self, api_key: Any):
+        self.id = api_key.id
+        self.user_id = api_key.user_id
+        self.name = api_key.name
+        self.scopes = list(api_key.scopes or [])
+        self.permissions = dict(api_key.permissions or {})
+        self.rate_limit = api_key.rate_limit
+        self.expires_at = api_key.expires_at
+        self.allowed_ips = list(api_key.allowed_ips or [])
+
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= datetime.now(timezone.utc)
+
+
+class VerifiedKeyCache:
+    """TTL/LRU map from key digest to verified key."""
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, VerifiedApiKey]]" = OrderedDict()
+
+    def get(self, digest: str) -> Optional[VerifiedApiKey]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        expires_at, api_key = entry
+        if expires_at <= time.monotonic():
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return api_key
+
+    def put(self, digest: str, api_key: VerifiedApiKey) -> None:
+        self._entries[digest] = (time.monotonic() + self.ttl, api_key)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def evict(self, digest: str) -> None:
+        self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class UsageRecorder:
+    """Accumulates per-key usage and flushes it in one batched UPDATE."""
+
+    def __init__(self):
+        self._pending: Dict[UUID, List[Any]] = {}
+
+    def record(self, api_key_id: UUID) -> None:
+        now = datetime.now(timezone.utc)
+        entry = self._pending.get(api_key_id)
+        if entry is None:
+            self._pending[api_key_id] = [1, now]
+        else:
+            entry[0] += 1
+            entry[1] = now
+
+    async def flush(self) -> int:
+        """Write the accumulated usage; returns the number of keys updated."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        from app.domains.auth.repository import ApiKeyRepository
+
+        try:
+            async with AsyncSessionLocal() as session:
+                await ApiKeyRepository(session).record_usage_batch(
+                    [(key_id, count, last_used) for key_id, (count, last_used) in pending.items()]
+                )
+        except Exception as exc:
+            # Put the counts back so the next flush retries them
+            for key_id, (count, last_used) in pending.items():
+                entry = self._pending.setdefault(key_id, [0, last_used])
+                entry[0] += count
+                entry[1] = max(entry[1], last_used)
+            logger.error("Failed to flush API key usage", error=str(exc))
+            return 0
+        return len(pending)
+
+
+class ApiKeyAuthenticator:
+    """Verifies API keys against the cache, falling back to the database."""
+
+    def __init__(self):
+        self.cache = VerifiedKeyCache(settings.api_key_cache_ttl, settings.api_key_cache_size)
+        self.usage = UsageRecorder()
+        self._tasks: List[asyncio.Task] = []
+
+    async def verify(self, repo: Any, api_key: str) -> Optional[VerifiedApiKey]:
+        """Return the verified key, or None if it is unknown, inactive or expired."""
+        if not api_key.startswith(API_KEY_PREFIX):
+            return None
+
+        digest = hash_api_key(api_key)
+        verified = self.cache.get(digest)
+        if verified is None:
+            stored = await repo.get_by_digest(digest)
+            if stored is None:
+                stored = await self._upgrade_legacy_digest(repo, api_key, digest)
+            if stored is None:
+                return None
+            verified = VerifiedApiKey(stored)
+            self.cache.put(digest, verified)
+
+        if verified.is_expired():
+            self.cache.evict(digest)
+            return None
+
+        self.usage.record(verified.id)
+        return verified
+
+    async def _upgrade_legacy_digest(self, repo: Any, api_key: str, digest: str) -> Optional[Any]:
+        """Keys created before HMAC digests were stored as plain SHA-256."""
+        stored = await repo.get_by_digest(hashlib.sha256(api_key.encode()).hexdigest())
+        if stored is not None:
+            await repo.update_digest(stored.id, digest)
+        return stored
+
+    async def revoke(self, digest: str) -> None:
+        """Drop a key from this process's cache and tell the other processes."""
+        self.cache.evict(digest)
+        try:
+            redis = await get_redis()
+            await redis.client.publish(REVOCATION_CHANNEL, digest)
+        except Exception as exc:
+            # The TTL still bounds how long other processes accept the key
+            logger.error("Failed to publish API key revocation", error=str(exc))
+
+    def start(self) -> None:
+        """Start the revocation listener and the usage flusher."""
+        self._tasks = [
+            asyncio.create_task(self._listen_for_revocations()),
+            asyncio.create_task(self._flush_usage_periodically()),
+        ]
+
+    async def stop(self) -> None:
+        """Stop the background tasks and write any pending usage."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.usage.flush()
+
+    async def _listen_for_revocations(self) -> None:
+        while True:
+            try:
+                redis = await get_redis()
+                async with redis.client.pubsub() as pubsub:
+                    await pubsub.subscribe(REVOCATION_CHANNEL)
+                    # Revocations may have been missed while disconnected
+                    self.cache.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.cache.evict(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error("API key revocation listener error", error=str(exc))
+                await asyncio.sleep(5)
+
+    async def _flush_usage_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.api_key_usage_flush_seconds)
+            await self.usage.flush()
+
+
+# Per-process instance
+api_key_auth = ApiKeyAuthenticator()
@@ -227,6 +227,7 @@ class ApiKey(BaseModel, TimestampMixin, SoftDeleteMixin):
     # API Key details
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
+    prefix = Column(String(16), nullable=True)  # Display only, e.g. "cotai_ab12cd"
     key_hash = Column(String(255), nullable=False, unique=True, index=True)
     
     # Permissions and scope
@@ -3,15 +3,15 @@ Authentication repository for database operations.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select, update, delete
+from sqlalchemy import and_, bindparam, func, or_, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.auth.models import User, RefreshToken, ApiKey, UserSession
 from app.shared.common.base_repository import BaseRepository
-from app.core.security import get_password_hash, verify_password
+from app.core.hashing import password_hasher
 
 
 class UserRepository(BaseRepository[User]):
@@ -54,7 +54,7 @@ class UserRepository(BaseRepository[User]):
         **kwargs
     ) -> User:
         """Create a new user with hashed password."""
-        hashed_password = get_password_hash(password)
+        hashed_password = await password_hasher.hash(password)
         
         user_data = {
             "email": email,
@@ -69,11 +69,11 @@ class UserRepository(BaseRepository[User]):
     
     async def verify_password(self, user: User, password: str) -> bool:
         """Verify user password."""
-        return verify_password(password, user.hashed_password)
+        return await password_hasher.verify(password, user.hashed_password)
     
     async def update_password(self, user_id: UUID, new_password: str) -> bool:
         """Update user password."""
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await password_hasher.hash(new_password)
         
         result = await self.session.execute(
             update(User)
@@ -209,6 +209,32 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_digest(self, key_hash: str) -> Optional[ApiKey]:
+        """Get a usable API key by its digest (unique index lookup)."""
+        result = await self.session.execute(
+            select(ApiKey).where(
+                and_(
+                    ApiKey.key_hash == key_hash,
+                    ApiKey.is_active == True,
+                    ApiKey.deleted_at.is_(None),
+                    or_(
+                        ApiKey.expires_at.is_(None),
+                        ApiKey.expires_at > datetime.utcnow()
+                    )
+                )
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def update_digest(self, api_key_id: UUID, key_hash: str) -> None:
+        """Replace the stored digest of an API key."""
+        await self.session.execute(
+            update(ApiKey)
+            .where(ApiKey.id == api_key_id)
+            .values(key_hash=key_hash)
+        )
+        await self.session.commit()
+    
     async def get_user_api_keys(self, user_id: UUID) -> List[ApiKey]:
         """Get all API keys for a user."""
         result = await self.session.execute(
@@ -232,6 +258,30 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
             )
         )
         await self.session.commit()
+    
+    async def record_usage_batch(
+        self,
+        usages: List[Tuple[UUID, int, datetime]]
+    ) -> None:
+        """Apply accumulated (api_key_id, count, last_used_at) usage in one statement."""
+        # Core executemany on the table: one prepared statement for the batch
+        table = ApiKey.__table__
+        await self.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("key_id"))
+            .values(
+                usage_count=table.c.usage_count + bindparam("uses"),
+                last_used_at=func.greatest(
+                    func.coalesce(table.c.last_used_at, bindparam("used_at")),
+                    bindparam("used_at")
+                )
+            ),
+            [
+                {"key_id": key_id, "uses": count, "used_at": last_used}
+                for key_id, count, last_used in usages
+            ]
+        )
+        await self.session.commit()
 
 
 class UserSessionRepository(BaseRepository[UserSession]):
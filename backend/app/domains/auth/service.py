@@ -29,12 +29,23 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     verify_token,
-    get_password_hash,
+    hash_api_key,
 )
+from app.domains.auth.api_keys import API_KEY_PREFIX, VerifiedApiKey, api_key_auth
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
 from app.shared.common.base_service import BaseService
 
 
+def _hashing_busy(exc: ServiceUnavailableException) -> HTTPException:
+    """Map credential hashing backpressure to a 503 with Retry-After."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=exc.message,
+        headers={"Retry-After": str(exc.details.get("retry_after") or 1)}
+    )
+
+
 class AuthService(BaseService):
     """Authentication service for user management and authentication."""
     
@@ -56,15 +67,18 @@ class AuthService(BaseService):
             )
         
         # Create user
-        user = await self.user_repo.create_user(
-            email=user_data.email,
-            password=user_data.password,
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            phone=user_data.phone,
-            timezone=user_data.timezone,
-            language=user_data.language,
-        )
+        try:
+            user = await self.user_repo.create_user(
+                email=user_data.email,
+                password=user_data.password,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                phone=user_data.phone,
+                timezone=user_data.timezone,
+                language=user_data.language,
+            )
+        except ServiceUnavailableException as exc:
+            raise _hashing_busy(exc)
         
         self.logger.info(f"User created: {user.email}")
         return user
@@ -86,8 +100,13 @@ class AuthService(BaseService):
                 detail="Account is temporarily locked"
             )
         
-        # Verify password
-        if not await self.user_repo.verify_password(user, password):
+        # Verify password (on the hashing pool)
+        try:
+            password_ok = await self.user_repo.verify_password(user, password)
+        except ServiceUnavailableException as exc:
+            raise _hashing_busy(exc)
+        
+        if not password_ok:
             # Increment failed attempts
             await self.user_repo.increment_failed_login(user.id)
             
@@ -134,7 +153,7 @@ class AuthService(BaseService):
         
         # Create access token
         access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email}
+            data={"sub": str(user.id), "email": user.email, "company_id": str(user.company_id)}
         )
         
         # Create refresh token if remember_me is True
@@ -204,7 +223,7 @@ class AuthService(BaseService):
         
         # Create new access token
         access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email}
+            data={"sub": str(user.id), "email": user.email, "company_id": str(user.company_id)}
         )
         
         return Token(
@@ -274,15 +293,17 @@ class AuthService(BaseService):
                 detail="User not found"
             )
         
-        # Verify current password
-        if not await self.user_repo.verify_password(user, current_password):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current password is incorrect"
-            )
-        
-        # Update password
-        await self.user_repo.update_password(user_id, new_password)
+        # Verify current password and hash the new one on the hashing pool
+        try:
+            if not await self.user_repo.verify_password(user, current_password):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Current password is incorrect"
+                )
+            
+            await self.user_repo.update_password(user_id, new_password)
+        except ServiceUnavailableException as exc:
+            raise _hashing_busy(exc)
         
         # Revoke all sessions except current
         await self.logout_all_sessions(user_id)
@@ -296,9 +317,9 @@ class AuthService(BaseService):
     ) -> Tuple[ApiKey, str]:
         """Create a new API key."""
         # Generate API key
-        key = f"cotai_{secrets.token_urlsafe(32)}"
+        key = f"{API_KEY_PREFIX}{secrets.token_urlsafe(32)}"
         prefix = key[:12]  # "cotai_" + first 6 chars
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        key_hash = hash_api_key(key)
         
         # Create API key record
         api_key = await self.api_key_repo.create({
@@ -314,23 +335,27 @@ class AuthService(BaseService):
         self.logger.info(f"API key created: {api_key.name} for user {user_id}")
         return api_key, key
     
-    async def verify_api_key(self, api_key: str) -> Optional[ApiKey]:
-        """Verify API key and return the key object."""
-        if not api_key.startswith("cotai_"):
-            return None
-        
-        prefix = api_key[:12]
-        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-        
-        # Get API key by prefix
-        stored_key = await self.api_key_repo.get_by_prefix(prefix)
-        if not stored_key or stored_key.key_hash != key_hash:
-            return None
-        
-        # Update usage statistics
-        await self.api_key_repo.update_usage(stored_key.id)
+    async def verify_api_key(self, api_key: str) -> Optional[VerifiedApiKey]:
+        """
+        Verify an API key.
+        
+        Served from the verified-key cache when possible; usage statistics
+        are recorded in memory and flushed in batches.
+        """
+        return await api_key_auth.verify(self.api_key_repo, api_key)
+    
+    async def revoke_api_key(self, user_id: UUID, api_key_id: UUID) -> None:
+        """Revoke an API key in the database and in every process's cache."""
+        api_key = await self.api_key_repo.get_by_id(api_key_id)
+        if not api_key or api_key.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="API key not found"
+            )
         
-        return stored_key
+        await self.api_key_repo.soft_delete(api_key_id)
+        await api_key_auth.revoke(api_key.key_hash)
+        self.logger.info(f"API key revoked: {api_key_id} for user {user_id}")
     
     async def get_user_sessions(self, user_id: UUID) -> List[UserSession]:
         """Get all active sessions for a user."""
@@ -0,0 +1,325 @@
+"""
+Livre/ocupado do domínio Calendar
+
+O livre/ocupado de um calendário numa janela é montado de uma vez: os eventos
+confirmados (com as ocorrências dos recorrentes) viram um conjunto ordenado
+de intervalos ocupados, as regras de ``AvailabilitySlot`` viram intervalos
+disponíveis no fuso do calendário, e as perguntas ("este horário está livre?",
+"quais os primeiros N horários livres de D minutos?") são respondidas em
+memória, sem uma consulta por horário candidato.
+
+Para a busca de horários livres, o resultado fica em Redis como um bitmap
+por calendário e dia (UTC), um bit por minuto (1 = livre). As chaves levam
+uma versão por calendário, incrementada a cada escrita de evento, então a
+invalidação é um único INCR.
+"""
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.core.instrumentation import record_cache_lookup
+from app.core.logging import get_logger_with_context
+from app.core.redis_client import RedisClient, redis_client
+from app.domains.calendar.recurrence import get_zone
+
+logger = get_logger_with_context(component="calendar_freebusy")
+
+Interval = Tuple[datetime, datetime]
+
+MINUTES_PER_DAY = 24 * 60
+
+_MINUTE = timedelta(minutes=1)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Ordena e une intervalos sobrepostos ou encostados"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(base: Sequence[Interval], remove: Sequence[Interval]) -> List[Interval]:
+    """``base`` menos ``remove``; ambos ordenados e unidos"""
+    result: List[Interval] = []
+    index = 0
+    for start, end in base:
+        while index < len(remove) and remove[index][1] <= start:
+            index += 1
+        cursor = start
+        probe = index
+        while probe < len(remove) and remove[probe][0] < end:
+            if remove[probe][0] > cursor:
+                result.append((cursor, remove[probe][0]))
+            cursor = max(cursor, remove[probe][1])
+            probe += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def intersect_intervals(first: Sequence[Interval], second: Sequence[Interval]) -> List[Interval]:
+    """Interseção de dois conjuntos ordenados e unidos"""
+    result: List[Interval] = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _slot_offset(value: Any) -> timedelta:
+    """Horário de um AvailabilitySlot ("HH:MM", aceita "24:00") como deslocamento no dia"""
+    if isinstance(value, time):
+        return timedelta(hours=value.hour, minutes=value.minute)
+    hours, _, minutes = str(value).partition(":")
+    return timedelta(hours=int(hours), minutes=int(minutes or 0))
+
+
+def availability_intervals(
+    slots: Iterable[Any],
+    zone: ZoneInfo,
+    window_start: datetime,
+    window_end: datetime,
+) -> List[Interval]:
+    """Intervalos (UTC) cobertos pelas regras semanais de disponibilidade"""
+    rules: Dict[int, List[Tuple[timedelta, timedelta]]] = {}
+    for slot in slots:
+        rules.setdefault(slot.day_of_week, []).append(
+            (_slot_offset(slot.start_time), _slot_offset(slot.end_time))
+        )
+    if not rules:
+        return []
+
+    intervals: List[Interval] = []
+    day = window_start.astimezone(zone).date() - timedelta(days=1)
+    last_day = window_end.astimezone(zone).date()
+    while day <= last_day:
+        midnight = datetime.combine(day, time())
+        for start_offset, end_offset in rules.get(day.weekday(), ()):
+            # Horário local de parede: a conversão respeita o horário de verão
+            start = (midnight + start_offset).replace(tzinfo=zone).astimezone(timezone.utc)
+            end = (midnight + end_offset).replace(tzinfo=zone).astimezone(timezone.utc)
+            start, end = max(start, window_start), min(end, window_end)
+            if start < end:
+                intervals.append((start, end))
+        day += timedelta(days=1)
+    return merge_intervals(intervals)
+
+
+@dataclass
+class CalendarFreeBusy:
+    """Livre/ocupado de um calendário numa janela"""
+
+    calendar_id: UUID
+    window_start: datetime
+    window_end: datetime
+    available: List[Interval]
+    busy: List[Interval]
+    events: List[Any] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        calendar_id: UUID,
+        timezone_name: Optional[str],
+        slots: Sequence[Any],
+        events: Sequence[Any],
+        window_start: datetime,
+        window_end: datetime,
+    ) -> "CalendarFreeBusy":
+        window_start, window_end = _as_utc(window_start), _as_utc(window_end)
+        # O intervalo entre agendamentos alarga cada evento ocupado
+        buffer = timedelta(minutes=max((slot.buffer_minutes or 0 for slot in slots), default=0))
+        busy = merge_intervals(
+            (_as_utc(event.start_datetime) - buffer, _as_utc(event.end_datetime) + buffer)
+            for event in events
+        )
+        available = availability_intervals(slots, get_zone(timezone_name), window_start, window_end)
+        return cls(calendar_id, window_start, window_end, available, busy, list(events))
+
+    def free(self) -> List[Interval]:
+        return subtract_intervals(self.available, self.busy)
+
+    def conflicts(self, start: datetime, end: datetime) -> List[Any]:
+        """Eventos que se sobrepõem a [start, end)"""
+        start, end = _as_utc(start), _as_utc(end)
+        return [
+            event for event in self.events
+            if _as_utc(event.start_datetime) < end and _as_utc(event.end_datetime) > start
+        ]
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """[start, end) cabe num intervalo disponível e não toca nenhum ocupado"""
+        start, end = _as_utc(start), _as_utc(end)
+        index = bisect.bisect_right(self.available, (start, datetime.max.replace(tzinfo=timezone.utc))) - 1
+        if index < 0 or self.available[index][1] < end:
+            return False
+        # Ocupados unidos: os fins também são crescentes
+        index = bisect.bisect_right([busy_end for _, busy_end in self.busy], start)
+        return index >= len(self.busy) or self.busy[index][0] >= end
+
+
+def utc_days(window_start: datetime, window_end: datetime) -> List[date]:
+    """Dias UTC que a janela [window_start, window_end) toca"""
+    first = _as_utc(window_start).date()
+    last = (_as_utc(window_end) - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time(), tzinfo=timezone.utc)
+
+
+def to_day_bitmaps(free: Sequence[Interval], days: Sequence[date]) -> Dict[date, int]:
+    """Bitmaps de minutos livres por dia; minutos parciais contam como ocupados"""
+    bitmaps = {day: 0 for day in days}
+    for start, end in free:
+        for day in utc_days(start, end):
+            if day not in bitmaps:
+                continue
+            base = _day_start(day)
+            first = max(math.ceil((start - base) / _MINUTE), 0)
+            last = min(math.floor((end - base) / _MINUTE), MINUTES_PER_DAY)
+            if first < last:
+                bitmaps[day] |= ((1 << (last - first)) - 1) << first
+    return bitmaps
+
+
+def bitmap_intervals(day: date, bitmap: int) -> List[Interval]:
+    """Intervalos livres (UTC) de um bitmap diário"""
+    base = _day_start(day)
+    intervals: List[Interval] = []
+    offset = 0
+    while bitmap:
+        # Pula zeros e mede a sequência de uns seguinte
+        zeros = (bitmap & -bitmap).bit_length() - 1
+        bitmap >>= zeros
+        offset += zeros
+        ones = (bitmap ^ (bitmap + 1)).bit_length() - 1
+        intervals.append((base + offset * _MINUTE, base + (offset + ones) * _MINUTE))
+        bitmap >>= ones
+        offset += ones
+    return intervals
+
+
+def first_free_slots(
+    free: Sequence[Interval],
+    duration: timedelta,
+    limit: int,
+    step: timedelta,
+) -> List[Interval]:
+    """Primeiros ``limit`` horários de ``duration`` alinhados a ``step`` (UTC)"""
+    slots: List[Interval] = []
+    for start, end in free:
+        # Alinha ao passo contado desde o início do dia UTC
+        base = _day_start(start.date())
+        cursor = base + math.ceil((start - base) / step) * step
+        while cursor + duration <= end:
+            slots.append((cursor, cursor + duration))
+            if len(slots) >= limit:
+                return slots
+            cursor += step
+    return slots
+
+
+class FreeBusyCache:
+    """Bitmaps livre/ocupado por calendário e dia (UTC) em Redis"""
+
+    VERSION_KEY = "calendar:freebusy:{calendar_id}:version"
+    DAY_KEY = "calendar:freebusy:{calendar_id}:{version}:{day}"
+
+    def __init__(self, redis: RedisClient = redis_client):
+        self.redis = redis
+
+    @property
+    def enabled(self) -> bool:
+        return settings.calendar_freebusy_cache_ttl > 0
+
+    async def _client(self) -> Any:
+        if not self.redis.client:
+            await self.redis.connect()
+        return self.redis.client
+
+    async def load(
+        self,
+        calendar_ids: Sequence[UUID],
+        days: Sequence[date],
+    ) -> Tuple[Dict[UUID, str], Dict[UUID, Dict[date, int]]]:
+        """Versões atuais e bitmaps em cache (duas idas ao Redis)"""
+        try:
+            client = await self._client()
+            raw_versions = await client.mget(
+                [self.VERSION_KEY.format(calendar_id=calendar_id) for calendar_id in calendar_ids]
+            )
+            versions = {
+                calendar_id: version or "0"
+                for calendar_id, version in zip(calendar_ids, raw_versions)
+            }
+            keys = [
+                (calendar_id, day)
+                for calendar_id in calendar_ids
+                for day in days
+            ]
+            values = await client.mget([
+                self.DAY_KEY.format(calendar_id=calendar_id, version=versions[calendar_id], day=day.isoformat())
+                for calendar_id, day in keys
+            ])
+        except Exception as exc:
+            logger.warning("Free/busy cache unavailable", error=str(exc))
+            return {}, {}
+
+        bitmaps: Dict[UUID, Dict[date, int]] = {calendar_id: {} for calendar_id in calendar_ids}
+        for (calendar_id, day), value in zip(keys, values):
+            if value is not None:
+                bitmaps[calendar_id][day] = int(value, 16)
+        hits = sum(len(days) for days in bitmaps.values())
+        record_cache_lookup(True, hits)
+        record_cache_lookup(False, len(keys) - hits)
+        return versions, bitmaps
+
+    async def store(self, calendar_id: UUID, version: str, bitmaps: Dict[date, int]) -> None:
+        try:
+            client = await self._client()
+            async with client.pipeline(transaction=False) as pipe:
+                for day, bitmap in bitmaps.items():
+                    pipe.set(
+                        self.DAY_KEY.format(calendar_id=calendar_id, version=version, day=day.isoformat()),
+                        format(bitmap, "x"),
+                        ex=settings.calendar_freebusy_cache_ttl,
+                    )
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Free/busy cache store failed", calendar_id=str(calendar_id), error=str(exc))
+
+    async def invalidate(self, calendar_id: UUID) -> None:
+        """Nova versão do calendário: os bitmaps antigos expiram sozinhos"""
+        await self.redis.increment(self.VERSION_KEY.format(calendar_id=calendar_id))
+
+
+# Instância global
+free_busy_cache = FreeBusyCache()
@@ -7,7 +7,7 @@ from enum import Enum
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import Text, String, Boolean, Integer, JSON, ForeignKey, DateTime, Float
+from sqlalchemy import Text, String, Boolean, Integer, JSON, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, JSONB
 
@@ -216,6 +216,9 @@ class Event(BaseModel, TimestampMixin):
     recurrence_interval: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     recurrence_end_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     recurrence_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    recurrence_days: Mapped[Optional[List[int]]] = mapped_column(JSON, nullable=True)  # 0-6 (segunda a domingo)
+    # Fim da última ocorrência da série (nulo = sem fim); filtra mestres por janela
+    series_end: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Relacionamento com evento pai (para eventos recorrentes)
     parent_event_id: Mapped[Optional[UUID]] = mapped_column(
@@ -223,6 +226,8 @@ class Event(BaseModel, TimestampMixin):
         ForeignKey("calendar_events.id"),
         nullable=True
     )
+    # Exceções: início original da ocorrência do mestre que esta linha substitui
+    recurrence_id: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Configurações
     is_private: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -242,6 +247,16 @@ class Event(BaseModel, TimestampMixin):
     reminders = relationship("EventReminder", back_populates="event", cascade="all, delete-orphan")
     attachments = relationship("EventAttachment", back_populates="event", cascade="all, delete-orphan")
     ai_analysis_logs = relationship("EventAIAnalysis", back_populates="event", cascade="all, delete-orphan")
+    
+    @property
+    def is_recurring(self) -> bool:
+        return self.recurrence_type not in (None, RecurrenceType.NONE)
+    
+    __table_args__ = (
+        Index('idx_calendar_events_calendar_start', 'calendar_id', 'start_datetime'),
+        Index('idx_calendar_events_calendar_series', 'calendar_id', 'recurrence_type', 'series_end'),
+        Index('idx_calendar_events_parent_recurrence', 'parent_event_id', 'recurrence_id'),
+    )
 
 
 class EventAttendee(BaseModel, TimestampMixin):
@@ -0,0 +1,292 @@
+"""
+Motor de recorrência do domínio Calendar
+
+Um evento recorrente é guardado como uma única linha mestre com a regra
+(no estilo RRULE: FREQ, INTERVAL, COUNT, UNTIL, BYDAY) e, quando alguma
+ocorrência é alterada ou cancelada, uma linha de exceção apontando para o
+mestre (``parent_event_id``) com ``recurrence_id`` igual ao início original
+da ocorrência. As ocorrências são expandidas sob demanda, apenas dentro da
+janela consultada, no fuso do calendário (o horário local se mantém através
+das mudanças de horário de verão).
+"""
+
+import calendar as _calendar
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.domains.calendar.models import Event, EventStatus, RecurrenceType
+
+_WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Períodos consecutivos sem nenhuma data válida antes de desistir
+# (ex.: dia 31 mensal pula meses curtos; 29/02 anual só existe a cada 4 anos)
+_MAX_EMPTY_PERIODS = 48
+
+
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    """Fuso do calendário, com UTC quando ausente ou inválido"""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _shift_months(value: datetime, months: int) -> Optional[datetime]:
+    """Soma meses mantendo o dia; None quando o dia não existe no mês (RFC 5545)"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > _calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """Regra de recorrência de um evento mestre"""
+
+    freq: RecurrenceType
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    by_weekday: Tuple[int, ...] = ()
+
+    @classmethod
+    def from_event(cls, event: Any) -> Optional["RecurrenceRule"]:
+        freq = event.recurrence_type
+        if freq in (None, RecurrenceType.NONE, RecurrenceType.CUSTOM):
+            return None
+        return cls(
+            freq=RecurrenceType(freq),
+            interval=max(event.recurrence_interval or 1, 1),
+            count=event.recurrence_count,
+            until=event.recurrence_end_date,
+            by_weekday=tuple(sorted(set(event.recurrence_days or ()))),
+        )
+
+    def to_rrule(self) -> str:
+        """Representação RRULE (RFC 5545) da regra"""
+        parts = [f"FREQ={self.freq.value.upper()}", f"INTERVAL={self.interval}"]
+        if self.by_weekday:
+            parts.append("BYDAY=" + ",".join(_WEEKDAY_CODES[day] for day in self.by_weekday))
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        if self.until:
+            parts.append("UNTIL=" + _as_utc(self.until).strftime("%Y%m%dT%H%M%SZ"))
+        return ";".join(parts)
+
+    # Aritmética em horário local "ingênuo"; conversões só nas bordas
+
+    def _candidates(self, dtstart: datetime, period: int) -> List[datetime]:
+        """Inícios candidatos do período ``period`` (0 = período do dtstart)"""
+        step = period * self.interval
+        if self.freq == RecurrenceType.DAILY:
+            return [dtstart + timedelta(days=step)]
+        if self.freq == RecurrenceType.WEEKLY:
+            base = dtstart + timedelta(weeks=step)
+            if not self.by_weekday:
+                return [base]
+            monday = base - timedelta(days=base.weekday())
+            return [monday + timedelta(days=day) for day in self.by_weekday]
+        if self.freq == RecurrenceType.MONTHLY:
+            shifted = _shift_months(dtstart, step)
+        else:
+            shifted = _shift_months(dtstart, 12 * step)
+        return [shifted] if shifted else []
+
+    def _period_of(self, dtstart: datetime, moment: datetime) -> int:
+        """Período que contém ``moment`` (pode ser aproximado para baixo)"""
+        if moment <= dtstart:
+            return 0
+        if self.freq == RecurrenceType.DAILY:
+            return (moment - dtstart).days // self.interval
+        if self.freq == RecurrenceType.WEEKLY:
+            return (moment - dtstart).days // (7 * self.interval)
+        months = (moment.year - dtstart.year) * 12 + moment.month - dtstart.month
+        if self.freq == RecurrenceType.YEARLY:
+            return max(months // 12, 0) // self.interval
+        return max(months, 0) // self.interval
+
+    def _until_date(self, zone: ZoneInfo):
+        # UNTIL vale até o fim do dia, no fuso do calendário
+        return _as_utc(self.until).astimezone(zone).date() if self.until else None
+
+    def _iter_local(
+        self,
+        dtstart: datetime,
+        zone: ZoneInfo,
+        not_before: Optional[datetime] = None
+    ) -> Iterator[datetime]:
+        """Inícios locais em ordem; com ``not_before`` pula direto para perto dele"""
+        until_date = self._until_date(zone)
+        period = 0
+        # Sem COUNT o índice da ocorrência não importa e a expansão pode
+        # começar no período da janela em vez de no dtstart
+        if not_before is not None and self.count is None:
+            period = max(self._period_of(dtstart, not_before) - 1, 0)
+
+        emitted = 0
+        if period == 0:
+            # DTSTART é sempre a primeira ocorrência
+            yield dtstart
+            emitted = 1
+
+        empty = 0
+        while self.count is None or emitted < self.count:
+            candidates = [c for c in self._candidates(dtstart, period) if c > dtstart]
+            period += 1
+            if not candidates:
+                empty += 1
+                if empty > _MAX_EMPTY_PERIODS:
+                    return
+                continue
+            empty = 0
+            for candidate in candidates:
+                if until_date and candidate.date() > until_date:
+                    return
+                yield candidate
+                emitted += 1
+                if self.count is not None and emitted >= self.count:
+                    return
+
+    def occurrences(
+        self,
+        dtstart: datetime,
+        duration: timedelta,
+        window_start: datetime,
+        window_end: datetime,
+        zone: ZoneInfo,
+    ) -> Iterator[datetime]:
+        """Inícios (UTC) das ocorrências que se sobrepõem a [window_start, window_end)"""
+        local_start = _as_utc(dtstart).astimezone(zone).replace(tzinfo=None)
+        local_window = (_as_utc(window_start) - duration).astimezone(zone).replace(tzinfo=None)
+        window_start, window_end = _as_utc(window_start), _as_utc(window_end)
+
+        for local in self._iter_local(local_start, zone, not_before=local_window):
+            start = local.replace(tzinfo=zone).astimezone(timezone.utc)
+            if start >= window_end:
+                return
+            if start + duration > window_start:
+                yield start
+
+    def series_end(self, dtstart: datetime, duration: timedelta, zone: ZoneInfo) -> Optional[datetime]:
+        """Fim (UTC) da última ocorrência; None para séries sem fim"""
+        if self.count is None and self.until is None:
+            return None
+        if self.count is None:
+            # Limite superior: fim do dia do UNTIL, no fuso do calendário
+            last_day = datetime.combine(self._until_date(zone), time.max).replace(tzinfo=zone)
+            return last_day.astimezone(timezone.utc) + duration
+        local_start = _as_utc(dtstart).astimezone(zone).replace(tzinfo=None)
+        last = local_start
+        for last in self._iter_local(local_start, zone):
+            pass
+        return last.replace(tzinfo=zone).astimezone(timezone.utc) + duration
+
+
+class EventOccurrence:
+    """Ocorrência expandida de um evento mestre (não persistida)"""
+
+    def __init__(self, master: Event, start: datetime, end: datetime):
+        self.master = master
+        self.start_datetime = start
+        self.end_datetime = end
+        # Identifica a ocorrência junto com o id do mestre
+        self.recurrence_id = start
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.master, name)
+
+
+class OccurrenceCache:
+    """
+    Cache em processo das expansões, agrupado por calendário
+
+    A chave inclui ``updated_at`` do mestre, então uma edição do mestre em
+    qualquer processo já invalida a entrada; exceções são aplicadas depois
+    da leitura do cache e não precisam de invalidação.
+    """
+
+    def __init__(self, max_calendars: int = 256, max_entries: int = 512):
+        self.max_calendars = max_calendars
+        self.max_entries = max_entries
+        self._calendars: "OrderedDict[UUID, OrderedDict]" = OrderedDict()
+
+    def starts(
+        self,
+        master: Event,
+        rule: RecurrenceRule,
+        window_start: datetime,
+        window_end: datetime,
+        zone: ZoneInfo,
+    ) -> List[datetime]:
+        entries = self._calendars.get(master.calendar_id)
+        if entries is None:
+            entries = self._calendars[master.calendar_id] = OrderedDict()
+            while len(self._calendars) > self.max_calendars:
+                self._calendars.popitem(last=False)
+        self._calendars.move_to_end(master.calendar_id)
+
+        key = (master.id, master.updated_at, window_start, window_end, zone.key)
+        cached = entries.get(key)
+        if cached is None:
+            duration = master.end_datetime - master.start_datetime
+            cached = list(rule.occurrences(
+                master.start_datetime, duration, window_start, window_end, zone
+            ))
+            entries[key] = cached
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(key)
+        return cached
+
+    def invalidate(self, calendar_id: UUID) -> None:
+        self._calendars.pop(calendar_id, None)
+
+
+# Instância por processo
+occurrence_cache = OccurrenceCache()
+
+
+def expand_masters(
+    masters: Iterable[Tuple[Event, Optional[str]]],
+    exceptions: Iterable[Event],
+    window_start: datetime,
+    window_end: datetime,
+) -> List[Any]:
+    """
+    Ocorrências dos mestres (com o fuso do calendário) dentro da janela,
+    sem as que têm exceção: as alteradas voltam como eventos simples na
+    consulta normal e as canceladas simplesmente somem
+    """
+    overridden = {(row.parent_event_id, _as_utc(row.recurrence_id)) for row in exceptions}
+
+    occurrences: List[Any] = []
+    for master, tz_name in masters:
+        rule = RecurrenceRule.from_event(master)
+        if rule is None:
+            continue
+        duration = master.end_datetime - master.start_datetime
+        for start in occurrence_cache.starts(master, rule, window_start, window_end, get_zone(tz_name)):
+            if (master.id, start) in overridden:
+                continue
+            occurrences.append(EventOccurrence(master, start, start + duration))
+    return occurrences
+
+
+def is_cancelled_exception(event: Event) -> bool:
+    return event.recurrence_id is not None and event.status == EventStatus.CANCELLED
+
+
+def event_sort_key(event: Any) -> Tuple[datetime, str]:
+    return _as_utc(event.start_datetime), str(event.id)
@@ -8,14 +8,15 @@ from uuid import UUID
 
 from sqlalchemy import select, func, text, desc, asc, and_, or_, between
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm import aliased, selectinload, joinedload
 from sqlalchemy.sql import Select
 
 from app.domains.calendar.models import (
     Calendar, Event, EventAttendee, EventReminder, EventAttachment,
     CalendarShare, AvailabilitySlot, EventStatus, EventPriority,
-    AttendeeStatus, CalendarType, AvailabilityType
+    AttendeeStatus, CalendarType, AvailabilityType, RecurrenceType
 )
+from app.domains.calendar.recurrence import event_sort_key, expand_masters
 from app.shared.common.base_repository import BaseRepository
 
 
@@ -57,6 +58,12 @@ class CalendarRepository(BaseRepository[Calendar]):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def get_timezones(self, calendar_ids: List[UUID]) -> Dict[UUID, str]:
+        """Fuso de cada calendário"""
+        query = select(Calendar.id, Calendar.timezone).where(Calendar.id.in_(calendar_ids))
+        result = await self.session.execute(query)
+        return {calendar_id: tz_name for calendar_id, tz_name in result.all()}
+    
     async def search_calendars(
         self, 
         search_term: str,
@@ -108,6 +115,12 @@ class EventRepository(BaseRepository[Event]):
         status: Optional[EventStatus] = None
     ) -> List[Event]:
         """Busca eventos por calendário"""
+        if start_date and end_date:
+            conditions = [Event.calendar_id == calendar_id]
+            if status:
+                conditions.append(Event.status == status)
+            return await self._expand_in_range(conditions, start_date, end_date)
+        
         query = select(Event).where(Event.calendar_id == calendar_id)
         
         if start_date:
@@ -131,32 +144,99 @@ class EventRepository(BaseRepository[Event]):
         user_id: Optional[UUID] = None,
         include_private: bool = False
     ) -> List[Event]:
-        """Busca eventos em um período"""
-        query = (
-            select(Event)
-            .where(
-                and_(
-                    Event.start_datetime <= end_date,
-                    Event.end_datetime >= start_date
-                )
-            )
-        )
+        """Busca eventos em um período, com as ocorrências dos recorrentes"""
+        conditions = []
         
         if calendar_ids:
-            query = query.where(Event.calendar_id.in_(calendar_ids))
+            conditions.append(Event.calendar_id.in_(calendar_ids))
         
         if user_id and not include_private:
             # Excluir eventos privados que não são do usuário
-            query = query.where(
+            conditions.append(
                 or_(
                     Event.is_private == False,
                     Event.created_by == user_id
                 )
             )
         
-        query = query.order_by(Event.start_datetime)
+        return await self._expand_in_range(conditions, start_date, end_date)
+    
+    async def _expand_in_range(
+        self,
+        conditions: List[Any],
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Event]:
+        """
+        Eventos simples que se sobrepõem à janela mais as ocorrências
+        (EventOccurrence) dos mestres recorrentes ativos nela: o custo
+        acompanha o número de mestres na janela, não o de ocorrências
+        """
+        parent = aliased(Event)
+        single_query = select(Event).where(
+            *conditions,
+            Event.recurrence_type == RecurrenceType.NONE,
+            Event.start_datetime < end_date,
+            Event.end_datetime > start_date,
+            # Exceções canceladas só removem a ocorrência do mestre
+            or_(
+                Event.recurrence_id.is_(None),
+                Event.status != EventStatus.CANCELLED
+            ),
+            # Instâncias materializadas pelo modelo antigo (filho sem
+            # recurrence_id de um mestre recorrente) duplicariam a expansão
+            ~(
+                Event.recurrence_id.is_(None)
+                & select(parent.id).where(
+                    parent.id == Event.parent_event_id,
+                    parent.recurrence_type != RecurrenceType.NONE
+                ).exists()
+            )
+        )
+        result = await self.session.execute(single_query)
+        events = list(result.scalars().all())
+        
+        master_query = (
+            select(Event, Calendar.timezone)
+            .join(Calendar, Calendar.id == Event.calendar_id)
+            .where(
+                *conditions,
+                Event.recurrence_type != RecurrenceType.NONE,
+                Event.start_datetime < end_date,
+                or_(
+                    Event.series_end.is_(None),
+                    Event.series_end > start_date
+                )
+            )
+        )
+        masters = (await self.session.execute(master_query)).all()
+        
+        if masters:
+            longest = max(master.end_datetime - master.start_datetime for master, _ in masters)
+            exceptions_query = select(Event).where(
+                Event.parent_event_id.in_([master.id for master, _ in masters]),
+                Event.recurrence_id.is_not(None),
+                Event.recurrence_id < end_date,
+                Event.recurrence_id > start_date - longest
+            )
+            exceptions = (await self.session.execute(exceptions_query)).scalars().all()
+            events.extend(expand_masters(masters, exceptions, start_date, end_date))
+        
+        events.sort(key=event_sort_key)
+        return events
+    
+    async def get_exception(
+        self,
+        master_id: UUID,
+        recurrence_id: datetime
+    ) -> Optional[Event]:
+        """Busca a exceção de uma ocorrência do mestre"""
+        query = select(Event).where(
+            Event.parent_event_id == master_id,
+            Event.recurrence_id == recurrence_id
+        )
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return result.scalar_one_or_none()
     
     async def get_with_details(self, event_id: UUID) -> Optional[Event]:
         """Busca evento com detalhes completos"""
@@ -245,24 +325,29 @@ class EventRepository(BaseRepository[Event]):
         end_datetime: datetime,
         exclude_event_id: Optional[UUID] = None
     ) -> List[Event]:
-        """Verifica conflitos de horário"""
-        query = (
-            select(Event)
-            .where(
-                and_(
-                    Event.calendar_id == calendar_id,
-                    Event.status == EventStatus.CONFIRMED,
-                    Event.start_datetime < end_datetime,
-                    Event.end_datetime > start_datetime
-                )
-            )
-        )
+        """Verifica conflitos de horário, incluindo ocorrências de recorrentes"""
+        conditions = [
+            Event.calendar_id == calendar_id,
+            Event.status == EventStatus.CONFIRMED
+        ]
         
         if exclude_event_id:
-            query = query.where(Event.id != exclude_event_id)
+            conditions.append(Event.id != exclude_event_id)
         
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        return await self._expand_in_range(conditions, start_datetime, end_datetime)
+    
+    async def get_busy_events(
+        self,
+        calendar_ids: List[UUID],
+        start_datetime: datetime,
+        end_datetime: datetime
+    ) -> List[Event]:
+        """Eventos que ocupam horário nos calendários, numa única passada"""
+        conditions = [
+            Event.calendar_id.in_(calendar_ids),
+            Event.status == EventStatus.CONFIRMED
+        ]
+        return await self._expand_in_range(conditions, start_datetime, end_datetime)
     
     async def get_events_analytics(
         self, 
@@ -506,6 +591,18 @@ class AvailabilitySlotRepository(BaseRepository[AvailabilitySlot]):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def get_active_by_calendar_ids(
+        self,
+        calendar_ids: List[UUID]
+    ) -> List[AvailabilitySlot]:
+        """Busca slots ativos de vários calendários"""
+        query = select(AvailabilitySlot).where(
+            AvailabilitySlot.calendar_id.in_(calendar_ids),
+            AvailabilitySlot.is_active == True
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+    
     async def get_by_day_of_week(
         self, 
         calendar_id: UUID, 
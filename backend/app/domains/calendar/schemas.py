@@ -105,10 +105,12 @@ class EventResponse(EventBase, BaseResponse, TimestampSchema):
     is_recurring: bool
     recurrence_type: Optional[RecurrenceType] = None
     recurrence_interval: Optional[int] = None
-    recurrence_end_date: Optional[date] = None
+    recurrence_end_date: Optional[datetime] = None
     recurrence_count: Optional[int] = None
     recurrence_days: Optional[List[int]] = None
     parent_event_id: Optional[UUID] = None
+    # Início original da ocorrência (ocorrências expandidas e exceções)
+    recurrence_id: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -297,6 +299,22 @@ class AvailabilityResponse(BaseModel):
     available_slots: List[Dict[str, datetime]] = []
 
 
+class FreeSlotSearch(BaseModel):
+    """Schema for searching free slots common to several calendars"""
+    calendar_ids: List[UUID] = Field(..., min_items=1, max_items=20)
+    start_datetime: datetime
+    end_datetime: datetime
+    duration_minutes: int = Field(..., ge=5, le=1440)
+    limit: int = Field(10, ge=1, le=100)
+    step_minutes: Optional[int] = Field(None, ge=5, le=1440)
+
+
+class FreeSlot(BaseModel):
+    """Schema for a free slot"""
+    start_datetime: datetime
+    end_datetime: datetime
+
+
 # Bulk Operations
 class EventBulkCreate(BaseModel):
     """Schema for bulk creating events"""
@@ -3,7 +3,7 @@ Service do domínio Calendar
 """
 
 import uuid
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time, timezone
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
@@ -15,6 +15,11 @@ from app.domains.calendar.models import (
     CalendarShare, AvailabilitySlot, EventStatus, EventPriority,
     AttendeeStatus, CalendarType, AvailabilityType, RecurrenceType
 )
+from app.domains.calendar.freebusy import (
+    CalendarFreeBusy, Interval, bitmap_intervals, first_free_slots,
+    free_busy_cache, intersect_intervals, merge_intervals, to_day_bitmaps, utc_days
+)
+from app.domains.calendar.recurrence import RecurrenceRule, get_zone, occurrence_cache
 from app.domains.calendar.repository import (
     CalendarRepository, EventRepository, EventAttendeeRepository,
     EventReminderRepository, CalendarShareRepository, AvailabilitySlotRepository
@@ -23,12 +28,14 @@ from app.domains.calendar.schemas import (
     CalendarCreate, CalendarUpdate, EventCreate, EventUpdate,
     EventAttendeeCreate, EventAttendeeUpdate, EventReminderCreate,
     CalendarShareCreate, CalendarShareUpdate, AvailabilitySlotCreate,
-    AvailabilitySlotUpdate, BookingRequest
+    AvailabilitySlotUpdate, BookingRequest, FreeSlotSearch
 )
 from app.shared.common.exceptions import (
     NotFoundException, ValidationException, 
     PermissionDeniedException, ConflictException
 )
+from app.core.config import settings
+from app.core.database import after_commit, commit_session
 
 
 class CalendarService:
@@ -50,7 +57,9 @@ class CalendarService:
             owner_id=user_id
         )
         
-        return await self.repository.create(calendar)
+        calendar = await self.repository.create(calendar)
+        await commit_session(self.session)
+        return calendar
     
     async def get_calendar(self, calendar_id: UUID, user_id: UUID) -> Calendar:
         """Busca calendário por ID"""
@@ -84,7 +93,14 @@ class CalendarService:
         for field, value in update_data.items():
             setattr(calendar, field, value)
         
-        return await self.repository.update(calendar)
+        calendar = await self.repository.update(calendar)
+        
+        # O fuso desloca as regras de disponibilidade
+        if 'timezone' in update_data:
+            after_commit(self.session, lambda: free_busy_cache.invalidate(calendar_id))
+        
+        await commit_session(self.session)
+        return calendar
     
     async def delete_calendar(self, calendar_id: UUID, user_id: UUID) -> None:
         """Remove calendário"""
@@ -99,6 +115,7 @@ class CalendarService:
             raise NotFoundException("Calendário não encontrado")
         
         await self.repository.delete(calendar)
+        await commit_session(self.session)
     
     async def get_user_calendars(self, user_id: UUID) -> List[Calendar]:
         """Busca calendários do usuário (próprios + compartilhados)"""
@@ -149,7 +166,9 @@ class CalendarService:
             shared_by=user_id
         )
         
-        return await self.share_repository.create(share)
+        share = await self.share_repository.create(share)
+        await commit_session(self.session)
+        return share
     
     async def update_calendar_share(
         self, 
@@ -176,7 +195,9 @@ class CalendarService:
         for field, value in update_data.items():
             setattr(share, field, value)
         
-        return await self.share_repository.update(share)
+        share = await self.share_repository.update(share)
+        await commit_session(self.session)
+        return share
     
     async def remove_calendar_share(
         self, 
@@ -199,6 +220,7 @@ class CalendarService:
             raise NotFoundException("Compartilhamento não encontrado")
         
         await self.share_repository.delete(share)
+        await commit_session(self.session)
     
     async def get_calendar_analytics(
         self, 
@@ -268,6 +290,131 @@ class CalendarService:
             )
 
 
+class FreeBusyService:
+    """Service de livre/ocupado e busca de horários livres"""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.calendar_repository = CalendarRepository(session)
+        self.event_repository = EventRepository(session)
+        self.availability_repository = AvailabilitySlotRepository(session)
+    
+    async def get_free_busy(
+        self,
+        calendar_ids: List[UUID],
+        start_datetime: datetime,
+        end_datetime: datetime
+    ) -> Dict[UUID, CalendarFreeBusy]:
+        """Livre/ocupado dos calendários na janela, direto do banco"""
+        timezones = await self.calendar_repository.get_timezones(calendar_ids)
+        if not timezones:
+            return {}
+        
+        slots: Dict[UUID, List[AvailabilitySlot]] = {calendar_id: [] for calendar_id in timezones}
+        for slot in await self.availability_repository.get_active_by_calendar_ids(list(timezones)):
+            slots[slot.calendar_id].append(slot)
+        
+        # Eventos logo antes/depois da janela ainda ocupam pelo intervalo entre agendamentos
+        buffer = timedelta(minutes=max(
+            (slot.buffer_minutes or 0 for calendar_slots in slots.values() for slot in calendar_slots),
+            default=0
+        ))
+        events: Dict[UUID, List[Event]] = {calendar_id: [] for calendar_id in timezones}
+        for event in await self.event_repository.get_busy_events(
+            list(timezones),
+            start_datetime - buffer,
+            end_datetime + buffer
+        ):
+            events[event.calendar_id].append(event)
+        
+        return {
+            calendar_id: CalendarFreeBusy.build(
+                calendar_id,
+                tz_name,
+                slots[calendar_id],
+                events[calendar_id],
+                start_datetime,
+                end_datetime
+            )
+            for calendar_id, tz_name in timezones.items()
+        }
+    
+    async def find_free_slots(
+        self,
+        calendar_ids: List[UUID],
+        start_datetime: datetime,
+        end_datetime: datetime,
+        duration_minutes: int,
+        limit: int = 10,
+        step_minutes: Optional[int] = None
+    ) -> List[Dict[str, datetime]]:
+        """Primeiros horários livres de ``duration_minutes`` comuns a todos os calendários"""
+        if start_datetime.tzinfo is None:
+            start_datetime = start_datetime.replace(tzinfo=timezone.utc)
+        if end_datetime.tzinfo is None:
+            end_datetime = end_datetime.replace(tzinfo=timezone.utc)
+        
+        if end_datetime <= start_datetime:
+            raise ValidationException(
+                "Data de término deve ser posterior à data de início"
+            )
+        if end_datetime - start_datetime > timedelta(days=settings.calendar_freebusy_max_days):
+            raise ValidationException(
+                f"Janela de busca limitada a {settings.calendar_freebusy_max_days} dias"
+            )
+        
+        calendar_ids = list(dict.fromkeys(calendar_ids))
+        days = utc_days(start_datetime, end_datetime)
+        
+        versions: Dict[UUID, str] = {}
+        bitmaps: Dict[UUID, Dict[date, int]] = {}
+        if free_busy_cache.enabled:
+            versions, bitmaps = await free_busy_cache.load(calendar_ids, days)
+        
+        missing = [
+            calendar_id for calendar_id in calendar_ids
+            if len(bitmaps.get(calendar_id, {})) < len(days)
+        ]
+        if missing:
+            # Dias inteiros: o bitmap de um dia serve para qualquer janela
+            computed = await self.get_free_busy(
+                missing,
+                datetime.combine(days[0], time(), tzinfo=timezone.utc),
+                datetime.combine(days[-1], time(), tzinfo=timezone.utc) + timedelta(days=1)
+            )
+            for calendar_id in missing:
+                free_busy = computed.get(calendar_id)
+                if free_busy is None:
+                    raise NotFoundException("Calendário não encontrado")
+                bitmaps[calendar_id] = to_day_bitmaps(free_busy.free(), days)
+                if calendar_id in versions:
+                    # Gravado na versão lida antes do banco: uma escrita no
+                    # meio do caminho deixa este resultado inalcançável
+                    await free_busy_cache.store(calendar_id, versions[calendar_id], bitmaps[calendar_id])
+        
+        common: List[Interval] = [(start_datetime, end_datetime)]
+        for calendar_id in calendar_ids:
+            free = merge_intervals(
+                interval
+                for day in days
+                for interval in bitmap_intervals(day, bitmaps[calendar_id][day])
+            )
+            common = intersect_intervals(common, free)
+            if not common:
+                return []
+        
+        slots = first_free_slots(
+            common,
+            timedelta(minutes=duration_minutes),
+            limit,
+            timedelta(minutes=step_minutes or duration_minutes)
+        )
+        return [
+            {"start_datetime": slot_start, "end_datetime": slot_end}
+            for slot_start, slot_end in slots
+        ]
+
+
 class EventService:
     """Service para Event"""
     
@@ -275,15 +422,28 @@ class EventService:
         self.session = session
         self.repository = EventRepository(session)
         self.calendar_service = CalendarService(session)
+        self.free_busy_service = FreeBusyService(session)
         self.attendee_repository = EventAttendeeRepository(session)
         self.reminder_repository = EventReminderRepository(session)
     
     async def create_event(
         self, 
         event_data: EventCreate, 
-        user_id: UUID
+        user_id: UUID,
+        check_conflicts: bool = True
     ) -> Event:
         """Cria novo evento"""
+        event = await self._add_event(event_data, user_id, check_conflicts)
+        await commit_session(self.session)
+        return event
+    
+    async def _add_event(
+        self,
+        event_data: EventCreate,
+        user_id: UUID,
+        check_conflicts: bool
+    ) -> Event:
+        """Valida e insere o evento, sem commit"""
         # Verificar permissão no calendário
         await self.calendar_service._check_calendar_permission(
             event_data.calendar_id, 
@@ -297,43 +457,65 @@ class EventService:
                 "Data de término deve ser posterior à data de início"
             )
         
-        # Verificar conflitos
-        conflicts = await self.repository.check_conflicts(
-            event_data.calendar_id,
-            event_data.start_datetime,
-            event_data.end_datetime
-        )
-        
-        if conflicts:
-            raise ConflictException(
-                f"Conflito de horário com {len(conflicts)} evento(s)"
+        # Verificar conflitos (agendamentos já verificaram a disponibilidade)
+        if check_conflicts:
+            conflicts = await self.repository.check_conflicts(
+                event_data.calendar_id,
+                event_data.start_datetime,
+                event_data.end_datetime
             )
+            
+            if conflicts:
+                raise ConflictException(
+                    f"Conflito de horário com {len(conflicts)} evento(s)"
+                )
         
-        # Criar evento principal
+        # Recorrentes: uma única linha mestre com a regra; as ocorrências
+        # são expandidas nas consultas por janela
         event_dict = event_data.model_dump()
+        is_recurring = event_dict.pop('is_recurring', False) and event_data.recurrence_type
+        recurrence_end_date = event_dict.pop('recurrence_end_date', None)
+        
+        if not is_recurring:
+            event_dict.update(
+                recurrence_type=RecurrenceType.NONE,
+                recurrence_interval=None,
+                recurrence_count=None,
+                recurrence_days=None
+            )
         
-        # Remover campos de recorrência para o evento principal
-        recurrence_fields = [
-            'is_recurring', 'recurrence_type', 'recurrence_interval',
-            'recurrence_end_date', 'recurrence_count', 'recurrence_days'
-        ]
-        
-        for field in recurrence_fields:
-            event_dict.pop(field, None)
+        event = Event(**event_dict, created_by=user_id)
         
-        event = Event(
-            **event_dict,
-            created_by=user_id,
-            is_recurring=event_data.is_recurring
-        )
+        if is_recurring:
+            calendar = await self.calendar_service.repository.get_by_id(event_data.calendar_id)
+            await self._apply_recurrence(event, recurrence_end_date, calendar.timezone)
         
         event = await self.repository.create(event)
+        self._invalidate_calendar(event.calendar_id)
+        return event
+    
+    async def _apply_recurrence(
+        self,
+        event: Event,
+        recurrence_end_date: Optional[date],
+        timezone_name: Optional[str]
+    ) -> None:
+        """Grava o fim da regra e o fim da série no evento mestre"""
+        zone = get_zone(timezone_name)
+        event.recurrence_end_date = (
+            datetime.combine(recurrence_end_date, time(23, 59, 59), tzinfo=zone)
+            if recurrence_end_date else None
+        )
         
-        # Criar instâncias recorrentes se necessário
-        if event_data.is_recurring and event_data.recurrence_type:
-            await self._create_recurring_instances(event, event_data, user_id)
+        rule = RecurrenceRule.from_event(event)
+        if rule is None:
+            raise ValidationException("Tipo de recorrência não suportado")
         
-        return event
+        event.series_end = rule.series_end(
+            event.start_datetime,
+            event.end_datetime - event.start_datetime,
+            zone
+        )
     
     async def get_event(self, event_id: UUID, user_id: UUID) -> Event:
         """Busca evento por ID"""
@@ -428,7 +610,21 @@ class EventService:
         for field, value in update_data.items():
             setattr(event, field, value)
         
-        return await self.repository.update(event)
+        if event.recurrence_type != RecurrenceType.NONE and (
+            'start_datetime' in update_data or 'end_datetime' in update_data
+        ):
+            calendar = await self.calendar_service.repository.get_by_id(event.calendar_id)
+            rule = RecurrenceRule.from_event(event)
+            event.series_end = rule.series_end(
+                event.start_datetime,
+                event.end_datetime - event.start_datetime,
+                get_zone(calendar.timezone)
+            ) if rule else None
+        
+        event = await self.repository.update(event)
+        self._invalidate_calendar(event.calendar_id)
+        await commit_session(self.session)
+        return event
     
     async def delete_event(self, event_id: UUID, user_id: UUID) -> None:
         """Remove evento"""
@@ -449,7 +645,124 @@ class EventService:
                 "Apenas o criador pode deletar o evento"
             )
         
+        # Exceções de um mestre recorrente saem junto com ele
+        for exception in await self.repository.get_recurring_events(event_id):
+            await self.repository.delete(exception)
+        
         await self.repository.delete(event)
+        self._invalidate_calendar(event.calendar_id)
+        await commit_session(self.session)
+    
+    def _invalidate_calendar(self, calendar_id: UUID) -> None:
+        """
+        Descarta expansões e bitmaps livre/ocupado depois do commit da escrita:
+        antes dele, uma busca concorrente leria a nova versão e guardaria
+        bitmaps montados com as linhas anteriores
+        """
+        async def invalidate() -> None:
+            occurrence_cache.invalidate(calendar_id)
+            await free_busy_cache.invalidate(calendar_id)
+        
+        after_commit(self.session, invalidate)
+    
+    async def update_occurrence(
+        self,
+        event_id: UUID,
+        recurrence_id: datetime,
+        event_data: EventUpdate,
+        user_id: UUID
+    ) -> Event:
+        """Altera uma única ocorrência de evento recorrente (linha de exceção)"""
+        if recurrence_id.tzinfo is None:
+            recurrence_id = recurrence_id.replace(tzinfo=timezone.utc)
+        master = await self._get_recurring_master(event_id, recurrence_id, user_id)
+        
+        exception = await self.repository.get_exception(event_id, recurrence_id)
+        if exception is None:
+            duration = master.end_datetime - master.start_datetime
+            exception = Event(
+                calendar_id=master.calendar_id,
+                created_by=master.created_by,
+                title=master.title,
+                description=master.description,
+                location=master.location,
+                start_datetime=recurrence_id,
+                end_datetime=recurrence_id + duration,
+                is_all_day=master.is_all_day,
+                event_type=master.event_type,
+                status=master.status,
+                priority=master.priority,
+                is_private=master.is_private,
+                color=master.color,
+                meeting_link=master.meeting_link,
+                parent_event_id=master.id,
+                recurrence_id=recurrence_id
+            )
+        
+        for field, value in event_data.model_dump(exclude_unset=True).items():
+            setattr(exception, field, value)
+        
+        if exception.end_datetime <= exception.start_datetime:
+            raise ValidationException(
+                "Data de término deve ser posterior à data de início"
+            )
+        
+        if exception.id is None:
+            exception = await self.repository.create(exception)
+        else:
+            exception = await self.repository.update(exception)
+        
+        self._invalidate_calendar(master.calendar_id)
+        await commit_session(self.session)
+        return exception
+    
+    async def cancel_occurrence(
+        self,
+        event_id: UUID,
+        recurrence_id: datetime,
+        user_id: UUID
+    ) -> None:
+        """Cancela uma única ocorrência de evento recorrente"""
+        await self.update_occurrence(
+            event_id,
+            recurrence_id,
+            EventUpdate(status=EventStatus.CANCELLED),
+            user_id
+        )
+    
+    async def _get_recurring_master(
+        self,
+        event_id: UUID,
+        recurrence_id: datetime,
+        user_id: UUID
+    ) -> Event:
+        master = await self.repository.get_by_id(event_id)
+        if not master:
+            raise NotFoundException("Evento não encontrado")
+        
+        await self.calendar_service._check_calendar_permission(
+            master.calendar_id,
+            user_id,
+            require_edit=True
+        )
+        
+        if master.recurrence_type == RecurrenceType.NONE:
+            raise ValidationException("Evento não é recorrente")
+        
+        # A ocorrência precisa existir na série
+        calendar = await self.calendar_service.repository.get_by_id(master.calendar_id)
+        rule = RecurrenceRule.from_event(master)
+        occurrences = rule.occurrences(
+            master.start_datetime,
+            master.end_datetime - master.start_datetime,
+            recurrence_id,
+            recurrence_id + timedelta(seconds=1),
+            get_zone(calendar.timezone)
+        ) if rule else []
+        if recurrence_id not in occurrences:
+            raise NotFoundException("Ocorrência não encontrada")
+        
+        return master
     
     async def get_calendar_events(
         self, 
@@ -524,23 +837,16 @@ class EventService:
         """Verifica disponibilidade para agendamento"""
         await self.calendar_service._check_calendar_access(calendar_id, user_id)
         
-        # Verificar conflitos
-        conflicts = await self.repository.check_conflicts(
-            calendar_id,
-            start_datetime,
-            end_datetime
-        )
-        
-        # Verificar slots de disponibilidade
-        availability_repository = AvailabilitySlotRepository(self.session)
-        available_slots = await availability_repository.check_availability(
-            calendar_id,
+        free_busy = (await self.free_busy_service.get_free_busy(
+            [calendar_id],
             start_datetime,
             end_datetime
-        )
+        )).get(calendar_id)
+        if free_busy is None:
+            raise NotFoundException("Calendário não encontrado")
         
         return {
-            "is_available": len(conflicts) == 0 and len(available_slots) > 0,
+            "is_available": free_busy.is_free(start_datetime, end_datetime),
             "conflicts": [
                 {
                     "event_id": conflict.id,
@@ -548,11 +854,32 @@ class EventService:
                     "start_datetime": conflict.start_datetime.isoformat(),
                     "end_datetime": conflict.end_datetime.isoformat()
                 }
-                for conflict in conflicts
+                for conflict in free_busy.conflicts(start_datetime, end_datetime)
             ],
-            "available_slots": len(available_slots) > 0
+            "available_slots": [
+                {"start_datetime": free_start, "end_datetime": free_end}
+                for free_start, free_end in free_busy.free()
+            ]
         }
     
+    async def find_free_slots(
+        self,
+        search: FreeSlotSearch,
+        user_id: UUID
+    ) -> List[Dict[str, datetime]]:
+        """Busca os primeiros horários livres comuns aos calendários"""
+        for calendar_id in dict.fromkeys(search.calendar_ids):
+            await self.calendar_service._check_calendar_access(calendar_id, user_id)
+        
+        return await self.free_busy_service.find_free_slots(
+            search.calendar_ids,
+            search.start_datetime,
+            search.end_datetime,
+            search.duration_minutes,
+            search.limit,
+            search.step_minutes
+        )
+    
     async def book_time_slot(
         self, 
         booking_data: BookingRequest,
@@ -574,15 +901,14 @@ class EventService:
         elif not calendar.is_public:
             raise PermissionDeniedException("Calendário não é público")
         
-        # Verificar disponibilidade
-        availability = await self.check_availability(
-            booking_data.calendar_id,
+        # Verificar disponibilidade direto no banco (o cache serve só a busca)
+        free_busy = (await self.free_busy_service.get_free_busy(
+            [calendar.id],
             booking_data.start_datetime,
-            booking_data.end_datetime,
-            calendar.owner_id  # Usar owner para verificação
-        )
+            booking_data.end_datetime
+        ))[calendar.id]
         
-        if not availability["is_available"]:
+        if not free_busy.is_free(booking_data.start_datetime, booking_data.end_datetime):
             raise ConflictException("Horário não disponível")
         
         # Criar evento
@@ -601,7 +927,8 @@ class EventService:
         event_create.metadata["confirmation_code"] = confirmation_code
         event_create.metadata["booked_by_email"] = booking_data.attendee_email
         
-        event = await self.create_event(event_create, calendar.owner_id)
+        # Evento e participante no mesmo commit
+        event = await self._add_event(event_create, calendar.owner_id, check_conflicts=False)
         
         # Adicionar participante
         attendee = EventAttendee(
@@ -614,72 +941,8 @@ class EventService:
         )
         
         await self.attendee_repository.create(attendee)
-        
+        await commit_session(self.session)
         return event
-    
-    async def _create_recurring_instances(
-        self, 
-        parent_event: Event, 
-        event_data: EventCreate, 
-        user_id: UUID
-    ) -> None:
-        """Cria instâncias de evento recorrente"""
-        if not event_data.recurrence_type:
-            return
-        
-        instances_created = 0
-        max_instances = event_data.recurrence_count or 52  # Máximo 1 ano
-        
-        current_date = event_data.start_datetime
-        delta = timedelta(days=1)
-        
-        # Configurar intervalo baseado no tipo de recorrência
-        if event_data.recurrence_type == RecurrenceType.DAILY:
-            delta = timedelta(days=event_data.recurrence_interval or 1)
-        elif event_data.recurrence_type == RecurrenceType.WEEKLY:
-            delta = timedelta(weeks=event_data.recurrence_interval or 1)
-        elif event_data.recurrence_type == RecurrenceType.MONTHLY:
-            delta = timedelta(days=30 * (event_data.recurrence_interval or 1))
-        elif event_data.recurrence_type == RecurrenceType.YEARLY:
-            delta = timedelta(days=365 * (event_data.recurrence_interval or 1))
-        
-        while instances_created < max_instances:
-            current_date += delta
-            
-            # Verificar data limite
-            if event_data.recurrence_end_date and current_date.date() > event_data.recurrence_end_date:
-                break
-            
-            # Verificar dias da semana se especificado
-            if event_data.recurrence_days and current_date.weekday() not in event_data.recurrence_days:
-                continue
-            
-            # Calcular data de término
-            duration = event_data.end_datetime - event_data.start_datetime
-            end_datetime = current_date + duration
-            
-            # Criar instância
-            instance = Event(
-                calendar_id=parent_event.calendar_id,
-                title=parent_event.title,
-                description=parent_event.description,
-                location=parent_event.location,
-                start_datetime=current_date,
-                end_datetime=end_datetime,
-                is_all_day=parent_event.is_all_day,
-                status=parent_event.status,
-                priority=parent_event.priority,
-                is_private=parent_event.is_private,
-                meeting_url=parent_event.meeting_url,
-                timezone=parent_event.timezone,
-                metadata=parent_event.metadata,
-                is_recurring=False,
-                parent_event_id=parent_event.id,
-                created_by=user_id
-            )
-            
-            await self.repository.create(instance)
-            instances_created += 1
 
 
 class EventAttendeeService:
@@ -727,7 +990,9 @@ class EventAttendeeService:
             invited_by=user_id
         )
         
-        return await self.repository.create(attendee)
+        attendee = await self.repository.create(attendee)
+        await commit_session(self.session)
+        return attendee
     
     async def update_attendee_status(
         self, 
@@ -763,4 +1028,6 @@ class EventAttendeeService:
         if status_data.response_comment:
             attendee.response_comment = status_data.response_comment
         
-        return await self.repository.update(attendee)
+        attendee = await self.repository.update(attendee)
+        await commit_session(self.session)
+        return attendee
@@ -1,13 +1,17 @@
 """
 Celery task management repositories for async processing, worker monitoring, and scheduling.
 Based on the database architecture plan.
+
+These repositories still use a blocking Session. From async code, run them
+through ``app.core.database.run_in_sync_session`` so they execute on the
+bounded DB thread pool instead of the event loop.
 """
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy import desc, asc, func, and_, or_, text
 from sqlalchemy.orm import Session, joinedload
 
-from app.shared.common.repository import BaseRepository
+from app.shared.common.repository import SyncBaseRepository
 from app.core.exceptions import NotFoundError, ValidationError
 from .models import (
     CeleryTask, CeleryWorker, TaskQueue, TaskSchedule,
@@ -15,11 +19,11 @@ from .models import (
 )
 
 
-class CeleryTaskRepository(BaseRepository[CeleryTask]):
+class CeleryTaskRepository(SyncBaseRepository[CeleryTask]):
     """Repository for Celery task tracking and management."""
     
     def __init__(self, db: Session):
-        super().__init__(db, CeleryTask)
+        super().__init__(CeleryTask, db)
     
     def create_task(
         self,
@@ -293,11 +297,11 @@ class CeleryTaskRepository(BaseRepository[CeleryTask]):
         return count
 
 
-class CeleryWorkerRepository(BaseRepository[CeleryWorker]):
+class CeleryWorkerRepository(SyncBaseRepository[CeleryWorker]):
     """Repository for Celery worker monitoring and management."""
     
     def __init__(self, db: Session):
-        super().__init__(db, CeleryWorker)
+        super().__init__(CeleryWorker, db)
     
     def register_worker(
         self,
@@ -489,11 +493,11 @@ class CeleryWorkerRepository(BaseRepository[CeleryWorker]):
         }
 
 
-class TaskQueueRepository(BaseRepository[TaskQueue]):
+class TaskQueueRepository(SyncBaseRepository[TaskQueue]):
     """Repository for task queue monitoring and management."""
     
     def __init__(self, db: Session):
-        super().__init__(db, TaskQueue)
+        super().__init__(TaskQueue, db)
     
     def get_or_create_queue(
         self,
@@ -623,11 +627,11 @@ class TaskQueueRepository(BaseRepository[TaskQueue]):
         ]
 
 
-class TaskScheduleRepository(BaseRepository[TaskSchedule]):
+class TaskScheduleRepository(SyncBaseRepository[TaskSchedule]):
     """Repository for scheduled task management."""
     
     def __init__(self, db: Session):
-        super().__init__(db, TaskSchedule)
+        super().__init__(TaskSchedule, db)
     
     def create_schedule(
         self,
@@ -0,0 +1,112 @@
+"""
+Progress tracking for bulk document processing batches.
+
+Each batch keeps its counters in one Redis hash. Chunk and retry tasks update
+it with HINCRBY, so progress is aggregated without reading job rows back and
+the status endpoint is answered with a single HGETALL.
+"""
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+PROGRESS_KEY = "documents:bulk:{batch_id}"
+
+_COUNTERS = ("total", "completed", "failed", "retrying", "chunks", "chunks_done")
+
+
+def plan_chunks(items: Sequence[T]) -> List[List[T]]:
+    """
+    Split a batch into chunk tasks.
+
+    Chunks hold ``ai_bulk_chunk_size`` items, growing as needed so a batch
+    never fans out into more than ``ai_bulk_max_chunks`` tasks.
+    """
+    if not items:
+        return []
+    size = max(
+        settings.ai_bulk_chunk_size,
+        math.ceil(len(items) / settings.ai_bulk_max_chunks),
+    )
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+class BulkProgress:
+    """Redis-backed counters of a bulk processing batch."""
+
+    def __init__(self, redis: Any):
+        # Raw redis.asyncio client (decode_responses=True)
+        self.redis = redis
+
+    @staticmethod
+    def key(batch_id: str) -> str:
+        return PROGRESS_KEY.format(batch_id=batch_id)
+
+    async def start(self, batch_id: str, total: int, user_id: str) -> None:
+        key = self.key(batch_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "batch_id": batch_id,
+                "user_id": user_id,
+                "status": "queued",
+                "total": total,
+                "completed": 0,
+                "failed": 0,
+                "retrying": 0,
+                "chunks": 0,
+                "chunks_done": 0,
+                "created_at": datetime.utcnow().isoformat(),
+            })
+            pipe.expire(key, settings.ai_bulk_progress_ttl)
+            await pipe.execute()
+
+    async def dispatched(self, batch_id: str, chunks: int) -> None:
+        await self.redis.hset(self.key(batch_id), mapping={"status": "running", "chunks": chunks})
+
+    async def record(
+        self,
+        batch_id: str,
+        completed: int = 0,
+        failed: int = 0,
+        retrying: int = 0,
+        chunks_done: int = 0,
+    ) -> None:
+        """Apply counter deltas; ``retrying`` may be negative."""
+        key = self.key(batch_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for field, delta in (
+                ("completed", completed),
+                ("failed", failed),
+                ("retrying", retrying),
+                ("chunks_done", chunks_done),
+            ):
+                if delta:
+                    pipe.hincrby(key, field, delta)
+            pipe.expire(key, settings.ai_bulk_progress_ttl)
+            await pipe.execute()
+
+    async def abort(self, batch_id: str, error: str) -> None:
+        await self.redis.hset(self.key(batch_id), mapping={"status": "failed", "error": error})
+
+    async def get(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.redis.hgetall(self.key(batch_id))
+        if not data:
+            return None
+
+        progress: Dict[str, Any] = dict(data)
+        for field in _COUNTERS:
+            progress[field] = int(data.get(field, 0))
+
+        processed = progress["completed"] + progress["failed"]
+        total = progress["total"]
+        progress["processed"] = processed
+        progress["progress_percentage"] = int(processed * 100 / total) if total else 100
+
+        # Completion is derived from the counters: retried documents can
+        # finish after every chunk task has returned
+        if progress["status"] == "running" and processed >= total:
+            progress["status"] = "completed_with_errors" if progress["failed"] else "completed"
+        return progress
@@ -64,7 +64,7 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
     status = Column(String(50), nullable=False, default=DocumentStatus.UPLOADED)
     
     # File metadata
-    file_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 hash
+    file_hash = Column(String(64), nullable=False)  # SHA-256 hash (unique per company)
     checksum = Column(String(32))  # MD5 checksum for integrity
     
     # Organization
@@ -101,6 +101,7 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
         Index('idx_documents_status', 'status'),
         Index('idx_documents_document_type', 'document_type'),
         Index('idx_documents_file_hash', 'file_hash'),
+        Index('idx_documents_company_file_hash', 'company_id', 'file_hash', unique=True),
         Index('idx_documents_created_by', 'created_by'),
         Index('idx_documents_created_at', 'created_at'),
     )
@@ -2,10 +2,10 @@
 Document repository for CRUD operations.
 """
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, and_, or_, func, desc, insert, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -29,6 +29,23 @@ class DocumentRepository(BaseRepository[Document]):
     def __init__(self, session: AsyncSession):
         super().__init__(Document, session)
     
+    async def get_by_hash(self, company_id: UUID, file_hash: str) -> Optional[Document]:
+        """Get a company's document stored under a content hash (unique per company)."""
+        return await self.fetch_first(
+            select(Document).where(
+                and_(
+                    Document.company_id == company_id,
+                    Document.file_hash == file_hash
+                )
+            )
+        )
+    
+    async def is_hash_referenced(self, file_hash: str) -> bool:
+        """Whether any document, in any company, still points at a blob."""
+        return await self.fetch_first(
+            select(Document.id).where(Document.file_hash == file_hash)
+        ) is not None
+    
     async def get_by_company(
         self, 
         company_id: UUID,
@@ -253,6 +270,54 @@ class AIProcessingJobRepository(BaseRepository[AIProcessingJob]):
                 update_data['error_message'] = error_message
         
         return await self.update(job, update_data)
+    
+    async def create_jobs_bulk(self, jobs: List[Dict[str, Any]]) -> None:
+        """Insert many job rows with a single INSERT statement."""
+        # Core insert on the table: the driver sends the rows in multi-row
+        # VALUES batches instead of one round trip per job
+        await self.session.execute(insert(AIProcessingJob.__table__), jobs)
+        await self.session.commit()
+    
+    async def mark_jobs_started(self, job_ids: List[UUID], worker_id: Optional[str] = None) -> None:
+        """Move many jobs to in-progress in one UPDATE."""
+        await self.session.execute(
+            update(AIProcessingJob.__table__)
+            .where(AIProcessingJob.__table__.c.id.in_(job_ids))
+            .values(
+                status=ProcessingStatus.IN_PROGRESS,
+                started_at=datetime.utcnow(),
+                worker_id=worker_id
+            )
+        )
+        await self.session.commit()
+    
+    async def finish_jobs_batch(
+        self,
+        outcomes: List[Tuple[UUID, ProcessingStatus, Optional[Dict[str, Any]], Optional[str]]]
+    ) -> None:
+        """Apply final (job_id, status, result_data, error_message) outcomes in one statement."""
+        table = AIProcessingJob.__table__
+        await self.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("job_id"))
+            .values(
+                status=bindparam("new_status"),
+                result_data=bindparam("new_result"),
+                error_message=bindparam("new_error"),
+                completed_at=bindparam("finished_at")
+            ),
+            [
+                {
+                    "job_id": job_id,
+                    "new_status": status,
+                    "new_result": result_data,
+                    "new_error": error_message,
+                    "finished_at": datetime.utcnow(),
+                }
+                for job_id, status, result_data, error_message in outcomes
+            ]
+        )
+        await self.session.commit()
 
 
 class TenderAIAnalysisRepository(BaseRepository[TenderAIAnalysis]):
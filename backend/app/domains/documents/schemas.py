@@ -222,6 +222,32 @@ class DocumentBulkUploadResponse(BaseModel):
     errors: List[str] = Field(default=[], description="Lista de erros")
 
 
+class BulkProcessingRequest(BaseModel):
+    """Schema for bulk AI processing of existing documents."""
+    
+    document_ids: List[UUID] = Field(..., min_length=1, max_length=100000, description="Documentos a processar")
+    operations: List[str] = Field(..., min_length=1, description="Operações de IA")
+    priority: int = Field(default=5, ge=1, le=10, description="Prioridade dos jobs")
+    options: Dict[str, Any] = Field(default_factory=dict, description="Opções das operações")
+
+
+class BulkProcessingStatusResponse(BaseModel):
+    """Aggregated progress of a bulk processing batch."""
+    
+    batch_id: str = Field(..., description="ID do lote")
+    status: str = Field(..., description="queued, running, completed, completed_with_errors ou failed")
+    total: int = Field(..., description="Total de documentos")
+    completed: int = Field(..., description="Documentos concluídos")
+    failed: int = Field(..., description="Documentos que falharam após as retentativas")
+    retrying: int = Field(..., description="Documentos aguardando retentativa")
+    processed: int = Field(..., description="Concluídos + falhos")
+    progress_percentage: int = Field(..., description="Percentual processado")
+    chunks: int = Field(..., description="Tarefas do lote")
+    chunks_done: int = Field(..., description="Tarefas finalizadas")
+    created_at: datetime = Field(..., description="Criação do lote")
+    error: Optional[str] = Field(default=None, description="Erro que abortou o lote")
+
+
 # Search and filter schemas
 class DocumentSearchRequest(BaseModel):
     """Schema for document search."""
@@ -34,6 +34,14 @@ class AccessResult(str, Enum):
     VIRUS_DETECTED = "virus_detected"
 
 
+class UploadStatus(str, Enum):
+    """Status of a chunked upload session."""
+    UPLOADING = "uploading"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
+
+
 class FileAccessLog(BaseModel, TimestampMixin):
     """Audit log for file access and operations."""
     __tablename__ = "file_access_logs"
@@ -270,6 +278,9 @@ class FileUploadSession(BaseModel, TimestampMixin):
     target_folder = Column(String(500))
     replace_existing = Column(Boolean, default=False)
     
+    # Metadata applied to the file on completion (description, tags, is_public)
+    upload_metadata = Column(JSON)
+    
     # Session status
     is_completed = Column(Boolean, default=False)
     is_failed = Column(Boolean, default=False)
@@ -285,6 +296,16 @@ class FileUploadSession(BaseModel, TimestampMixin):
     user = relationship("User")
     company = relationship("Company")
 
+    @property
+    def status(self) -> UploadStatus:
+        if self.is_failed:
+            return UploadStatus.FAILED
+        if self.is_completed:
+            return UploadStatus.COMPLETED
+        if self.expires_at <= datetime.utcnow():
+            return UploadStatus.EXPIRED
+        return UploadStatus.UPLOADING
+
     __table_args__ = (
         Index('idx_file_upload_sessions_session_token', 'session_token'),
         Index('idx_file_upload_sessions_user_id', 'user_id'),
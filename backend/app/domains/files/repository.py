@@ -4,8 +4,9 @@ Based on the database architecture plan.
 """
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import desc, asc, func, and_, or_, text
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import desc, asc, func, and_, or_, text, select, update, delete, case, cast, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.shared.common.repository import BaseRepository
 from app.core.exceptions import NotFoundError, ValidationError
@@ -13,15 +14,16 @@ from .models import (
     FileAccessLog, FileShare, FileQuota, FileVersion, 
     FileUploadSession, AccessType, AccessResult
 )
+from .uploads import discard_spool
 
 
 class FileAccessLogRepository(BaseRepository[FileAccessLog]):
     """Repository for file access logging and audit trails."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FileAccessLog)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FileAccessLog, session)
     
-    def log_access(
+    async def log_access(
         self,
         document_id: str,
         file_path: str,
@@ -43,9 +45,9 @@ class FileAccessLogRepository(BaseRepository[FileAccessLog]):
             company_id=company_id,
             **kwargs
         )
-        return self.create(access_log)
+        return await self.add(access_log)
     
-    def get_user_access_history(
+    async def get_user_access_history(
         self,
         user_id: str,
         company_id: str,
@@ -53,71 +55,73 @@ class FileAccessLogRepository(BaseRepository[FileAccessLog]):
         access_type: Optional[AccessType] = None
     ) -> List[FileAccessLog]:
         """Get user's file access history."""
-        query = self.db.query(FileAccessLog).filter(
+        query = select(FileAccessLog).where(
             FileAccessLog.user_id == user_id,
             FileAccessLog.company_id == company_id
         )
         
         if access_type:
-            query = query.filter(FileAccessLog.access_type == access_type)
+            query = query.where(FileAccessLog.access_type == access_type)
         
-        return query.order_by(desc(FileAccessLog.created_at)).limit(limit).all()
+        return await self.fetch_all(query.order_by(desc(FileAccessLog.created_at)).limit(limit))
     
-    def get_document_access_logs(
+    async def get_document_access_logs(
         self,
         document_id: str,
         limit: int = 100
     ) -> List[FileAccessLog]:
         """Get access logs for a specific document."""
-        return self.db.query(FileAccessLog).filter(
-            FileAccessLog.document_id == document_id
-        ).order_by(desc(FileAccessLog.created_at)).limit(limit).all()
+        return await self.fetch_all(
+            select(FileAccessLog).where(
+                FileAccessLog.document_id == document_id
+            ).order_by(desc(FileAccessLog.created_at)).limit(limit)
+        )
     
-    def get_access_stats(
+    async def get_access_stats(
         self,
         company_id: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Get file access statistics."""
-        query = self.db.query(FileAccessLog).filter(
+        query = select(FileAccessLog).where(
             FileAccessLog.company_id == company_id
         )
         
         if start_date:
-            query = query.filter(FileAccessLog.created_at >= start_date)
+            query = query.where(FileAccessLog.created_at >= start_date)
         if end_date:
-            query = query.filter(FileAccessLog.created_at <= end_date)
+            query = query.where(FileAccessLog.created_at <= end_date)
         
         # Access type statistics
-        access_type_stats = self.db.query(
+        access_type_stats = await self.fetch_rows(select(
             FileAccessLog.access_type,
             func.count(FileAccessLog.id).label('count')
-        ).filter(
+        ).where(
             FileAccessLog.company_id == company_id
-        ).group_by(FileAccessLog.access_type).all()
+        ).group_by(FileAccessLog.access_type))
         
         # Access result statistics
-        result_stats = self.db.query(
+        result_stats = await self.fetch_rows(select(
             FileAccessLog.access_result,
             func.count(FileAccessLog.id).label('count')
-        ).filter(
+        ).where(
             FileAccessLog.company_id == company_id
-        ).group_by(FileAccessLog.access_result).all()
+        ).group_by(FileAccessLog.access_result))
         
         # Top accessed files
-        top_files = self.db.query(
+        top_files = await self.fetch_rows(select(
             FileAccessLog.document_id,
             FileAccessLog.filename,
             func.count(FileAccessLog.id).label('access_count')
-        ).filter(
+        ).where(
             FileAccessLog.company_id == company_id
         ).group_by(
             FileAccessLog.document_id, FileAccessLog.filename
-        ).order_by(desc('access_count')).limit(10).all()
+        ).order_by(desc('access_count')).limit(10))
         
         return {
-            'total_accesses': query.count(),
+            'total_accesses': await self.fetch_count(query),
             'access_types': {stat.access_type: stat.count for stat in access_type_stats},
             'access_results': {stat.access_result: stat.count for stat in result_stats},
             'top_files': [
@@ -130,7 +134,7 @@ class FileAccessLogRepository(BaseRepository[FileAccessLog]):
             ]
         }
     
-    def get_security_incidents(
+    async def get_security_incidents(
         self,
         company_id: str,
         hours: int = 24
@@ -138,24 +142,26 @@ class FileAccessLogRepository(BaseRepository[FileAccessLog]):
         """Get recent security incidents (denied access, virus detected, etc.)."""
         since = datetime.utcnow() - timedelta(hours=hours)
         
-        return self.db.query(FileAccessLog).filter(
-            FileAccessLog.company_id == company_id,
-            FileAccessLog.created_at >= since,
-            FileAccessLog.access_result.in_([
-                AccessResult.DENIED,
-                AccessResult.VIRUS_DETECTED,
-                AccessResult.ERROR
-            ])
-        ).order_by(desc(FileAccessLog.created_at)).all()
+        return await self.fetch_all(
+            select(FileAccessLog).where(
+                FileAccessLog.company_id == company_id,
+                FileAccessLog.created_at >= since,
+                FileAccessLog.access_result.in_([
+                    AccessResult.DENIED,
+                    AccessResult.VIRUS_DETECTED,
+                    AccessResult.ERROR
+                ])
+            ).order_by(desc(FileAccessLog.created_at))
+        )
 
 
 class FileShareRepository(BaseRepository[FileShare]):
     """Repository for file sharing and link management."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FileShare)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FileShare, session)
     
-    def create_share(
+    async def create_share(
         self,
         document_id: str,
         share_token: str,
@@ -169,44 +175,48 @@ class FileShareRepository(BaseRepository[FileShare]):
             created_by=created_by,
             **share_config
         )
-        return self.create(share)
+        return await self.add(share)
     
-    def get_by_token(self, share_token: str) -> Optional[FileShare]:
+    async def get_by_token(self, share_token: str) -> Optional[FileShare]:
         """Get share by token."""
-        return self.db.query(FileShare).filter(
-            FileShare.share_token == share_token,
-            FileShare.is_active == True
-        ).first()
+        return await self.fetch_first(
+            select(FileShare).where(
+                FileShare.share_token == share_token,
+                FileShare.is_active == True
+            )
+        )
     
-    def get_active_shares(
+    async def get_active_shares(
         self,
         document_id: str
     ) -> List[FileShare]:
         """Get all active shares for a document."""
         now = datetime.utcnow()
         
-        return self.db.query(FileShare).filter(
-            FileShare.document_id == document_id,
-            FileShare.is_active == True,
-            or_(
-                FileShare.expires_at.is_(None),
-                FileShare.expires_at > now
+        return await self.fetch_all(
+            select(FileShare).where(
+                FileShare.document_id == document_id,
+                FileShare.is_active == True,
+                or_(
+                    FileShare.expires_at.is_(None),
+                    FileShare.expires_at > now
+                )
             )
-        ).all()
+        )
     
-    def get_user_shares(
+    async def get_user_shares(
         self,
         created_by: str,
         include_expired: bool = False
     ) -> List[FileShare]:
         """Get all shares created by a user."""
-        query = self.db.query(FileShare).filter(
+        query = select(FileShare).where(
             FileShare.created_by == created_by
         )
         
         if not include_expired:
             now = datetime.utcnow()
-            query = query.filter(
+            query = query.where(
                 FileShare.is_active == True,
                 or_(
                     FileShare.expires_at.is_(None),
@@ -214,11 +224,11 @@ class FileShareRepository(BaseRepository[FileShare]):
                 )
             )
         
-        return query.order_by(desc(FileShare.created_at)).all()
+        return await self.fetch_all(query.order_by(desc(FileShare.created_at)))
     
-    def increment_access_count(self, share_id: str) -> bool:
+    async def increment_access_count(self, share_id: str) -> bool:
         """Increment access count for a share."""
-        share = self.get_by_id(share_id)
+        share = await self.get_by_id(share_id)
         if not share:
             return False
         
@@ -229,17 +239,17 @@ class FileShareRepository(BaseRepository[FileShare]):
             share.current_access_count >= share.max_access_count):
             share.is_active = False
         
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def validate_share_access(
+    async def validate_share_access(
         self,
         share_token: str,
         user_email: Optional[str] = None,
         password: Optional[str] = None
     ) -> Tuple[bool, str, Optional[FileShare]]:
         """Validate access to a shared file."""
-        share = self.get_by_token(share_token)
+        share = await self.get_by_token(share_token)
         
         if not share:
             return False, "Share not found", None
@@ -285,58 +295,64 @@ class FileShareRepository(BaseRepository[FileShare]):
         
         return True, "Access granted", share
     
-    def get_expiring_shares(
+    async def get_expiring_shares(
         self,
         hours: int = 24
     ) -> List[FileShare]:
         """Get shares that will expire soon."""
         expires_before = datetime.utcnow() + timedelta(hours=hours)
         
-        return self.db.query(FileShare).filter(
-            FileShare.is_active == True,
-            FileShare.expires_at.is_not(None),
-            FileShare.expires_at <= expires_before
-        ).all()
+        return await self.fetch_all(
+            select(FileShare).where(
+                FileShare.is_active == True,
+                FileShare.expires_at.is_not(None),
+                FileShare.expires_at <= expires_before
+            )
+        )
 
 
 class FileQuotaRepository(BaseRepository[FileQuota]):
     """Repository for file quota management and tracking."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FileQuota)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FileQuota, session)
     
-    def get_company_quota(self, company_id: str) -> Optional[FileQuota]:
+    async def get_company_quota(self, company_id: str) -> Optional[FileQuota]:
         """Get company-wide quota."""
-        return self.db.query(FileQuota).filter(
-            FileQuota.company_id == company_id,
-            FileQuota.user_id.is_(None)
-        ).first()
+        return await self.fetch_first(
+            select(FileQuota).where(
+                FileQuota.company_id == company_id,
+                FileQuota.user_id.is_(None)
+            )
+        )
     
-    def get_user_quota(
+    async def get_user_quota(
         self,
         company_id: str,
         user_id: str
     ) -> Optional[FileQuota]:
         """Get user-specific quota."""
-        return self.db.query(FileQuota).filter(
-            FileQuota.company_id == company_id,
-            FileQuota.user_id == user_id
-        ).first()
+        return await self.fetch_first(
+            select(FileQuota).where(
+                FileQuota.company_id == company_id,
+                FileQuota.user_id == user_id
+            )
+        )
     
-    def get_effective_quota(
+    async def get_effective_quota(
         self,
         company_id: str,
         user_id: Optional[str] = None
     ) -> Optional[FileQuota]:
         """Get effective quota (user-specific or company-wide)."""
         if user_id:
-            user_quota = self.get_user_quota(company_id, user_id)
+            user_quota = await self.get_user_quota(company_id, user_id)
             if user_quota:
                 return user_quota
         
-        return self.get_company_quota(company_id)
+        return await self.get_company_quota(company_id)
     
-    def update_usage(
+    async def update_usage(
         self,
         company_id: str,
         user_id: Optional[str],
@@ -344,7 +360,7 @@ class FileQuotaRepository(BaseRepository[FileQuota]):
         file_count_change: int = 0
     ) -> bool:
         """Update quota usage."""
-        quota = self.get_effective_quota(company_id, user_id)
+        quota = await self.get_effective_quota(company_id, user_id)
         if not quota:
             return False
         
@@ -360,10 +376,10 @@ class FileQuotaRepository(BaseRepository[FileQuota]):
             quota.warning_sent = True
         
         quota.last_calculated = datetime.utcnow()
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def check_quota_availability(
+    async def check_quota_availability(
         self,
         company_id: str,
         user_id: Optional[str],
@@ -371,7 +387,7 @@ class FileQuotaRepository(BaseRepository[FileQuota]):
         required_files: int = 1
     ) -> Tuple[bool, str]:
         """Check if quota allows for new files."""
-        quota = self.get_effective_quota(company_id, user_id)
+        quota = await self.get_effective_quota(company_id, user_id)
         if not quota:
             return False, "No quota policy found"
         
@@ -388,20 +404,22 @@ class FileQuotaRepository(BaseRepository[FileQuota]):
         
         return True, "Quota available"
     
-    def get_over_quota_accounts(self) -> List[FileQuota]:
+    async def get_over_quota_accounts(self) -> List[FileQuota]:
         """Get accounts that are over quota."""
-        return self.db.query(FileQuota).filter(
-            FileQuota.is_over_quota == True
-        ).all()
+        return await self.fetch_all(
+            select(FileQuota).where(
+                FileQuota.is_over_quota == True
+            )
+        )
     
-    def calculate_usage_stats(
+    async def calculate_usage_stats(
         self,
         company_id: str
     ) -> Dict[str, Any]:
         """Calculate quota usage statistics for a company."""
-        quotas = self.db.query(FileQuota).filter(
+        quotas = await self.fetch_all(select(FileQuota).where(
             FileQuota.company_id == company_id
-        ).all()
+        ))
         
         total_allocated = sum(q.total_quota_bytes for q in quotas)
         total_used = sum(q.used_bytes for q in quotas)
@@ -424,10 +442,10 @@ class FileQuotaRepository(BaseRepository[FileQuota]):
 class FileVersionRepository(BaseRepository[FileVersion]):
     """Repository for file version management."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FileVersion)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FileVersion, session)
     
-    def create_version(
+    async def create_version(
         self,
         document_id: str,
         filename: str,
@@ -440,15 +458,20 @@ class FileVersionRepository(BaseRepository[FileVersion]):
     ) -> FileVersion:
         """Create a new file version."""
         # Get next version number
-        latest_version = self.db.query(func.max(FileVersion.version_number)).filter(
-            FileVersion.document_id == document_id
-        ).scalar() or 0
+        result = await self.session.execute(
+            select(func.max(FileVersion.version_number)).where(
+                FileVersion.document_id == document_id
+            )
+        )
+        latest_version = result.scalar() or 0
         
         # Mark current version as not current
-        self.db.query(FileVersion).filter(
-            FileVersion.document_id == document_id,
-            FileVersion.is_current == True
-        ).update({'is_current': False})
+        await self.session.execute(
+            update(FileVersion).where(
+                FileVersion.document_id == document_id,
+                FileVersion.is_current == True
+            ).values(is_current=False)
+        )
         
         version = FileVersion(
             document_id=document_id,
@@ -463,71 +486,85 @@ class FileVersionRepository(BaseRepository[FileVersion]):
             **kwargs
         )
         
-        return self.create(version)
+        return await self.add(version)
     
-    def get_document_versions(
+    async def get_document_versions(
         self,
         document_id: str,
         include_archived: bool = False
     ) -> List[FileVersion]:
         """Get all versions of a document."""
-        query = self.db.query(FileVersion).filter(
+        query = select(FileVersion).where(
             FileVersion.document_id == document_id
         )
         
         if not include_archived:
-            query = query.filter(FileVersion.is_archived == False)
+            query = query.where(FileVersion.is_archived == False)
         
-        return query.order_by(desc(FileVersion.version_number)).all()
+        return await self.fetch_all(query.order_by(desc(FileVersion.version_number)))
+    
+    async def is_hash_referenced(self, file_hash: str) -> bool:
+        """Whether any file version still points at a blob."""
+        return await self.fetch_first(
+            select(FileVersion.id).where(FileVersion.file_hash == file_hash)
+        ) is not None
     
-    def get_current_version(self, document_id: str) -> Optional[FileVersion]:
+    async def get_current_version(self, document_id: str) -> Optional[FileVersion]:
         """Get current version of a document."""
-        return self.db.query(FileVersion).filter(
-            FileVersion.document_id == document_id,
-            FileVersion.is_current == True
-        ).first()
+        return await self.fetch_first(
+            select(FileVersion).where(
+                FileVersion.document_id == document_id,
+                FileVersion.is_current == True
+            )
+        )
     
-    def get_version(
+    async def get_version(
         self,
         document_id: str,
         version_number: int
     ) -> Optional[FileVersion]:
         """Get specific version of a document."""
-        return self.db.query(FileVersion).filter(
-            FileVersion.document_id == document_id,
-            FileVersion.version_number == version_number
-        ).first()
+        return await self.fetch_first(
+            select(FileVersion).where(
+                FileVersion.document_id == document_id,
+                FileVersion.version_number == version_number
+            )
+        )
     
-    def set_current_version(
+    async def set_current_version(
         self,
         document_id: str,
         version_number: int
     ) -> bool:
         """Set a specific version as current."""
         # Mark all versions as not current
-        self.db.query(FileVersion).filter(
-            FileVersion.document_id == document_id
-        ).update({'is_current': False})
+        await self.session.execute(
+            update(FileVersion).where(
+                FileVersion.document_id == document_id
+            ).values(is_current=False)
+        )
         
         # Mark specified version as current
-        result = self.db.query(FileVersion).filter(
-            FileVersion.document_id == document_id,
-            FileVersion.version_number == version_number
-        ).update({'is_current': True})
+        result = await self.session.execute(
+            update(FileVersion).where(
+                FileVersion.document_id == document_id,
+                FileVersion.version_number == version_number
+            ).values(is_current=True)
+        )
         
-        self.db.commit()
-        return result > 0
+        await self.session.commit()
+        return result.rowcount > 0
     
-    def archive_old_versions(
+    async def archive_old_versions(
         self,
         document_id: str,
         keep_versions: int = 5
     ) -> int:
         """Archive old versions, keeping only the most recent ones."""
-        versions = self.db.query(FileVersion).filter(
+        versions = await self.fetch_all(select(FileVersion).where(
             FileVersion.document_id == document_id,
             FileVersion.is_archived == False
-        ).order_by(desc(FileVersion.version_number)).all()
+        ).order_by(desc(FileVersion.version_number)))
         
         if len(versions) <= keep_versions:
             return 0
@@ -541,17 +578,17 @@ class FileVersionRepository(BaseRepository[FileVersion]):
                 version.is_archived = True
                 archived_count += 1
         
-        self.db.commit()
+        await self.session.commit()
         return archived_count
 
 
 class FileUploadSessionRepository(BaseRepository[FileUploadSession]):
     """Repository for managing chunked/resumable file uploads."""
     
-    def __init__(self, db: Session):
-        super().__init__(db, FileUploadSession)
+    def __init__(self, session: AsyncSession):
+        super().__init__(FileUploadSession, session)
     
-    def create_session(
+    async def create_session(
         self,
         session_token: str,
         filename: str,
@@ -575,114 +612,153 @@ class FileUploadSessionRepository(BaseRepository[FileUploadSession]):
             **kwargs
         )
         
-        return self.create(session)
+        return await self.add(session)
     
-    def get_by_token(self, session_token: str) -> Optional[FileUploadSession]:
+    async def get_by_token(self, session_token: str) -> Optional[FileUploadSession]:
         """Get upload session by token."""
-        return self.db.query(FileUploadSession).filter(
+        return await self.fetch_first(
+            select(FileUploadSession).where(
+                FileUploadSession.session_token == session_token,
+                FileUploadSession.expires_at > datetime.utcnow(),
+                FileUploadSession.is_completed == False,
+                FileUploadSession.is_failed == False
+            )
+        )
+    
+    async def lock_for_completion(self, session_token: str) -> Optional[FileUploadSession]:
+        """
+        Lock an open session row until the transaction ends.
+        
+        A concurrent completion waits on the lock and then finds the session
+        completed (or failed), so only one request finalises the spool.
+        """
+        return await self.fetch_first(
+            select(FileUploadSession)
+            .where(self._active_session(session_token))
+            .with_for_update()
+        )
+    
+    def _active_session(self, session_token: str):
+        """Criteria matching an open, unexpired session."""
+        return and_(
             FileUploadSession.session_token == session_token,
             FileUploadSession.expires_at > datetime.utcnow(),
             FileUploadSession.is_completed == False,
             FileUploadSession.is_failed == False
-        ).first()
+        )
     
-    def update_chunk_progress(
+    async def update_chunk_progress(
         self,
         session_token: str,
         chunk_number: int,
         chunk_size: int
-    ) -> bool:
-        """Update progress after a chunk is uploaded."""
-        session = self.get_by_token(session_token)
-        if not session:
-            return False
-        
-        # Add chunk to uploaded chunks list
-        if chunk_number not in session.uploaded_chunks:
-            session.uploaded_chunks.append(chunk_number)
-            session.uploaded_bytes += chunk_size
-        
-        # Check if upload is complete
-        expected_chunks = (session.total_size + session.chunk_size - 1) // session.chunk_size
-        if len(session.uploaded_chunks) >= expected_chunks:
-            session.is_completed = True
-        
-        # Mark as modified for SQLAlchemy to detect JSON change
-        session.uploaded_chunks = session.uploaded_chunks[:]
-        
-        self.db.commit()
-        return True
-    
-    def mark_completed(self, session_token: str) -> bool:
-        """Mark upload session as completed."""
-        session = self.get_by_token(session_token)
-        if not session:
-            return False
-        
-        session.is_completed = True
-        self.db.commit()
-        return True
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Record a received chunk in a single atomic UPDATE.
+        
+        Chunks arrive in parallel, so the list is appended in SQL (under the
+        row lock) instead of read-modify-write; re-sent chunks are counted
+        once. Returns (chunks received, bytes received), or None if the
+        session is not active.
+        """
+        chunks = cast(FileUploadSession.uploaded_chunks, JSONB)
+        chunk = func.to_jsonb(chunk_number)
+        already_received = chunks.contains(chunk)
+        
+        result = await self.session.execute(
+            update(FileUploadSession)
+            .where(self._active_session(session_token))
+            .values(
+                uploaded_chunks=case(
+                    (already_received, FileUploadSession.uploaded_chunks),
+                    else_=cast(chunks.op("||")(chunk), JSON)
+                ),
+                uploaded_bytes=FileUploadSession.uploaded_bytes + case(
+                    (already_received, 0),
+                    else_=chunk_size
+                )
+            )
+            .returning(
+                func.json_array_length(FileUploadSession.uploaded_chunks),
+                FileUploadSession.uploaded_bytes
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await self.session.commit()
+        return (row[0], row[1]) if row else None
+    
+    async def mark_completed(self, session_token: str) -> bool:
+        """Mark upload session as completed (only the first caller wins)."""
+        result = await self.session.execute(
+            update(FileUploadSession)
+            .where(self._active_session(session_token))
+            .values(is_completed=True)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount == 1
     
-    def mark_failed(
+    async def mark_failed(
         self,
         session_token: str,
         failure_reason: str
     ) -> bool:
         """Mark upload session as failed."""
-        session = self.get_by_token(session_token)
+        session = await self.get_by_token(session_token)
         if not session:
             return False
         
         session.is_failed = True
         session.failure_reason = failure_reason
-        self.db.commit()
+        await self.session.commit()
         return True
     
-    def get_user_sessions(
+    async def get_user_sessions(
         self,
         user_id: str,
         active_only: bool = True
     ) -> List[FileUploadSession]:
         """Get upload sessions for a user."""
-        query = self.db.query(FileUploadSession).filter(
+        query = select(FileUploadSession).where(
             FileUploadSession.user_id == user_id
         )
         
         if active_only:
-            query = query.filter(
+            query = query.where(
                 FileUploadSession.expires_at > datetime.utcnow(),
                 FileUploadSession.is_completed == False,
                 FileUploadSession.is_failed == False
             )
         
-        return query.order_by(desc(FileUploadSession.created_at)).all()
+        return await self.fetch_all(query.order_by(desc(FileUploadSession.created_at)))
     
-    def cleanup_expired_sessions(self) -> int:
-        """Clean up expired upload sessions."""
-        expired_sessions = self.db.query(FileUploadSession).filter(
-            FileUploadSession.expires_at <= datetime.utcnow()
-        ).all()
-        
-        count = len(expired_sessions)
-        
-        for session in expired_sessions:
-            # Clean up temporary files if they exist
-            # This would be implemented based on storage backend
-            self.db.delete(session)
+    async def cleanup_expired_sessions(self) -> int:
+        """Clean up expired upload sessions and their spooled chunks."""
+        result = await self.session.execute(
+            delete(FileUploadSession).where(
+                FileUploadSession.expires_at <= datetime.utcnow()
+            ).returning(FileUploadSession.session_token)
+        )
+        session_tokens = result.scalars().all()
+        await self.session.commit()
         
-        self.db.commit()
-        return count
+        for session_token in session_tokens:
+            await discard_spool(session_token)
+        return len(session_tokens)
     
-    def get_incomplete_sessions(
+    async def get_incomplete_sessions(
         self,
         older_than_hours: int = 1
     ) -> List[FileUploadSession]:
         """Get sessions that are incomplete and stale."""
         cutoff_time = datetime.utcnow() - timedelta(hours=older_than_hours)
         
-        return self.db.query(FileUploadSession).filter(
-            FileUploadSession.created_at < cutoff_time,
-            FileUploadSession.is_completed == False,
-            FileUploadSession.is_failed == False,
-            FileUploadSession.expires_at > datetime.utcnow()
-        ).all()
+        return await self.fetch_all(
+            select(FileUploadSession).where(
+                FileUploadSession.created_at < cutoff_time,
+                FileUploadSession.is_completed == False,
+                FileUploadSession.is_failed == False,
+                FileUploadSession.expires_at > datetime.utcnow()
+            )
+        )
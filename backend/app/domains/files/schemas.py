@@ -159,22 +159,18 @@ class FileUploadSessionBase(BaseModel):
     """Base schema for file upload sessions."""
     model_config = ConfigDict(from_attributes=True)
     
-    session_token: str = Field(..., description="Token da sessão")
     filename: str = Field(..., description="Nome do arquivo")
     file_size: int = Field(..., description="Tamanho total do arquivo")
     chunk_size: int = Field(..., description="Tamanho do chunk")
-    total_chunks: int = Field(..., description="Total de chunks")
-    uploaded_chunks: int = Field(default=0, description="Chunks carregados")
-    status: UploadStatus = Field(..., description="Status do upload")
-    upload_progress: float = Field(default=0.0, description="Progresso do upload")
-    expires_at: datetime = Field(..., description="Data de expiração")
-    final_file_path: Optional[str] = Field(default=None, description="Caminho final do arquivo")
-    upload_metadata: Optional[Dict[str, Any]] = Field(default=None, description="Metadados do upload")
+    mime_type: Optional[str] = Field(default=None, description="Tipo MIME")
 
 
 class FileUploadSessionCreate(FileUploadSessionBase):
-    """Schema for creating file upload sessions."""
-    user_id: UUID = Field(..., description="ID do usuário")
+    """Schema for starting a chunked upload; the metadata is applied on completion."""
+    folder_path: Optional[str] = Field(default=None, description="Pasta de destino")
+    description: Optional[str] = Field(default=None, description="Descrição do arquivo")
+    tags: List[str] = Field(default_factory=list, description="Tags do arquivo")
+    is_public: bool = Field(default=False, description="Se o arquivo é público")
 
 
 class FileUploadSessionUpdate(BaseModel):
@@ -192,6 +188,13 @@ class FileUploadSessionResponse(FileUploadSessionBase):
     """Schema for file upload session responses."""
     id: UUID
     user_id: UUID
+    session_token: str = Field(..., description="Token da sessão")
+    total_chunks: int = Field(..., description="Total de chunks")
+    uploaded_chunks: int = Field(default=0, description="Chunks carregados")
+    uploaded_bytes: int = Field(default=0, description="Bytes carregados")
+    status: UploadStatus = Field(..., description="Status do upload")
+    upload_progress: float = Field(default=0.0, description="Progresso do upload")
+    expires_at: datetime = Field(..., description="Data de expiração")
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,251 @@
+"""
+Disk-backed assembly for chunked/resumable uploads.
+
+Each session owns a sparse spool file preallocated to the final size. Chunks
+are written at their own offset with ``pwrite`` (so they may arrive in
+parallel and in any order), verified against the client's SHA-256, and their
+digests recorded next to the spool.
+
+The blob is addressed by the SHA-256 of its content, as single-request
+uploads are. A running hash follows the contiguous prefix of verified chunks
+while they arrive, so finalising only reads back what it has not reached
+(nothing, when chunks come in order) before handing the spool to the blob
+store, which on the local backend is a rename.
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+from app.core.config import settings
+from app.core.storage import StoredBlob, blob_store
+
+# Bounds for the client-chosen chunk size
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Bytes buffered from the request body before each pwrite
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class ChunkError(ValueError):
+    """A chunk was rejected (bad number, length or checksum)."""
+
+
+def chunk_count(total_size: int, chunk_size: int) -> int:
+    """Number of chunks for a file (an empty file still has one)."""
+    return max(1, (total_size + chunk_size - 1) // chunk_size)
+
+
+class _ContentHash:
+    """Running SHA-256 over the leading chunks of a spool, in order."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hasher = hashlib.sha256()
+        # Digests of the chunks fed to the hasher, so a re-sent chunk is noticed
+        self.digests: List[str] = []
+
+
+# Per-process running hashes by session token; a completion handled by
+# another worker simply hashes the whole spool
+_content_hashes: Dict[str, _ContentHash] = {}
+
+
+class UploadSpool:
+    """Spool file and chunk digests of one upload session."""
+
+    def __init__(self, session_token: str, total_size: int, chunk_size: int):
+        self.session_token = session_token
+        self.root = Path(settings.storage_local_path) / "uploads"
+        self.path = self.root / f"{session_token}.part"
+        self.digests_dir = self.root / f"{session_token}.chunks"
+        self.total_size = total_size
+        self.chunk_size = chunk_size
+        self.total_chunks = chunk_count(total_size, chunk_size)
+
+    def chunk_length(self, chunk_number: int) -> int:
+        """Expected length of a chunk (the last one may be shorter)."""
+        if not 0 <= chunk_number < self.total_chunks:
+            raise ChunkError(f"Chunk number must be between 0 and {self.total_chunks - 1}")
+        return min(self.chunk_size, self.total_size - chunk_number * self.chunk_size)
+
+    async def create(self) -> None:
+        """Preallocate the sparse spool file."""
+        await asyncio.to_thread(self._create)
+
+    def _create(self) -> None:
+        self.digests_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        try:
+            # ftruncate extends without allocating blocks; chunks fill the holes
+            os.ftruncate(fd, self.total_size)
+        finally:
+            os.close(fd)
+
+    async def write_chunk(
+        self,
+        chunk_number: int,
+        body: AsyncIterator[bytes],
+        expected_sha256: str,
+    ) -> int:
+        """
+        Write a chunk at its offset and verify its checksum.
+
+        The body is streamed; anything beyond the chunk's length is rejected
+        before it is written, so a chunk can never overwrite its neighbours.
+        Returns the chunk length.
+
+        Raises:
+            ChunkError: wrong number, length or checksum
+            FileNotFoundError: the spool no longer exists
+        """
+        length = self.chunk_length(chunk_number)
+        offset = chunk_number * self.chunk_size
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+        written = 0
+
+        fd = await asyncio.to_thread(os.open, self.path, os.O_WRONLY)
+        # A re-sent chunk overwrites the region, so its old digest no longer holds
+        await asyncio.to_thread(self._digest_path(chunk_number).unlink, missing_ok=True)
+        try:
+            async for piece in body:
+                if written + len(buffer) + len(piece) > length:
+                    raise ChunkError(f"Chunk {chunk_number} exceeds {length} bytes")
+                buffer.extend(piece)
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await asyncio.to_thread(_write_at, fd, hasher, bytes(buffer), offset + written)
+                    written += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(_write_at, fd, hasher, bytes(buffer), offset + written)
+                written += len(buffer)
+        finally:
+            os.close(fd)
+
+        if written != length:
+            raise ChunkError(f"Chunk {chunk_number} has {written} bytes, expected {length}")
+
+        digest = hasher.hexdigest()
+        if digest != expected_sha256.lower():
+            raise ChunkError(f"Checksum mismatch for chunk {chunk_number}")
+
+        await asyncio.to_thread(self._record_digest, chunk_number, digest)
+        await asyncio.to_thread(self._advance_content_hash)
+        return length
+
+    def _digest_path(self, chunk_number: int) -> Path:
+        return self.digests_dir / str(chunk_number)
+
+    def _record_digest(self, chunk_number: int, digest: str) -> None:
+        # Unique temp name: the same chunk may be re-sent in parallel
+        fd, tmp_name = tempfile.mkstemp(dir=self.digests_dir, prefix=f"{chunk_number}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(digest)
+            os.replace(tmp_name, self._digest_path(chunk_number))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _advance_content_hash(self) -> None:
+        """Feed the running hash every verified chunk that now continues it."""
+        try:
+            spool = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        state = _content_hashes.setdefault(self.session_token, _ContentHash())
+        with state.lock, spool:
+            while len(state.digests) < self.total_chunks:
+                chunk_number = len(state.digests)
+                try:
+                    digest = self._digest_path(chunk_number).read_text()
+                except FileNotFoundError:
+                    return
+                # The chunk may be re-sent while it is read: only bytes that
+                # still match its recorded digest are kept
+                candidate = state.hasher.copy()
+                chunk_hasher = hashlib.sha256()
+                spool.seek(chunk_number * self.chunk_size)
+                remaining = self.chunk_length(chunk_number)
+                while remaining:
+                    block = spool.read(min(remaining, WRITE_BUFFER_SIZE))
+                    if not block:
+                        return
+                    candidate.update(block)
+                    chunk_hasher.update(block)
+                    remaining -= len(block)
+                if chunk_hasher.hexdigest() != digest:
+                    return
+                state.hasher = candidate
+                state.digests.append(digest)
+
+    async def verified_digests(self) -> List[str]:
+        """
+        Digests of all chunks, in order.
+
+        Raises:
+            ChunkError: a chunk is missing or is being re-sent
+        """
+        return await asyncio.to_thread(self._read_digests)
+
+    def _read_digests(self) -> List[str]:
+        digests = []
+        for chunk_number in range(self.total_chunks):
+            try:
+                digests.append(self._digest_path(chunk_number).read_text())
+            except FileNotFoundError:
+                raise ChunkError(f"Chunk {chunk_number} is missing")
+        return digests
+
+    async def finalize(self, digests: List[str]) -> StoredBlob:
+        """Hand the assembled spool to the blob store and drop the chunk digests."""
+        content_sha256 = await asyncio.to_thread(self._content_sha256, digests)
+        blob = await blob_store.put_file(self.path, content_sha256)
+        await asyncio.to_thread(shutil.rmtree, self.digests_dir, True)
+        return blob
+
+    def _content_sha256(self, digests: List[str]) -> str:
+        """SHA-256 of the assembled file, reading back only what the running hash missed."""
+        hasher, consumed = hashlib.sha256(), 0
+        state = _content_hashes.pop(self.session_token, None)
+        if state is not None:
+            with state.lock:
+                # A chunk re-sent with other content after it was hashed voids the prefix
+                if state.digests == digests[:len(state.digests)]:
+                    hasher, consumed = state.hasher.copy(), len(state.digests)
+
+        with open(self.path, "rb") as spool:
+            spool.seek(consumed * self.chunk_size)
+            while block := spool.read(WRITE_BUFFER_SIZE):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    async def discard(self) -> None:
+        """Remove the spool file and chunk digests."""
+        await asyncio.to_thread(self._discard)
+
+    def _discard(self) -> None:
+        _content_hashes.pop(self.session_token, None)
+        self.path.unlink(missing_ok=True)
+        shutil.rmtree(self.digests_dir, ignore_errors=True)
+
+
+def _write_at(fd: int, hasher, data: bytes, offset: int) -> None:
+    """Hash and write a block at an absolute offset (runs in the thread pool)."""
+    hasher.update(data)
+    view = memoryview(data)
+    while view:
+        sent = os.pwrite(fd, view, offset)
+        view = view[sent:]
+        offset += sent
+
+
+async def discard_spool(session_token: str) -> None:
+    """Remove a session's spool, e.g. once the session has expired."""
+    await UploadSpool(session_token, total_size=0, chunk_size=MIN_CHUNK_SIZE).discard()
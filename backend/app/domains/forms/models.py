@@ -7,11 +7,12 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Text, String, Boolean, Integer, JSON
+from sqlalchemy import Text, String, Boolean, Integer, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 
 from app.shared.common.base_models import BaseModel, TimestampMixin
+from app.shared.common.ordering import order_key_type
 
 
 class FormFieldType(str, Enum):
@@ -96,14 +97,18 @@ class FormField(BaseModel, TimestampMixin):
     options: Mapped[Optional[list]] = mapped_column(JSON, default=list)  # Para select, radio, etc
     default_value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
-    # Ordem e visibilidade
-    order: Mapped[int] = mapped_column(Integer, default=0)
+    # Ordem (chave fracionária, ver app.shared.common.ordering) e visibilidade
+    order: Mapped[str] = mapped_column(order_key_type(), nullable=False)
     is_visible: Mapped[bool] = mapped_column(Boolean, default=True)
     
     # Metadados
     settings: Mapped[Optional[dict]] = mapped_column(JSON, default=dict)
       # Relacionamentos
     form = relationship("Form", back_populates="fields")
+    
+    __table_args__ = (
+        Index("idx_form_fields_form_order", "form_id", "order"),
+    )
 
 
 # FormSubmission moved to audit domain for compliance and advanced tracking
@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 
 from app.domains.forms.models import Form, FormField, FormAnalytics, FormStatus
 from app.shared.common.base_repository import BaseRepository
+from app.shared.common.ordering import ranked_keys, reorder_statement, sync_order_keys
 
 
 class FormRepository(BaseRepository[Form]):
@@ -118,24 +119,27 @@ class FormFieldRepository(BaseRepository[FormField]):
         )
         
         if ordered:
-            query = query.order_by(FormField.order)
+            query = query.order_by(FormField.order, FormField.id)
             
         result = await self.session.execute(query)
         return result.scalars().all()
     
-    async def reorder_fields(self, form_id: UUID, field_orders: List[Dict[str, Any]]) -> None:
-        """Reorder fields for a form."""
-        for field_order in field_orders:
-            await self.session.execute(
-                update(FormField)
-                .where(
-                    and_(
-                        FormField.id == field_order["field_id"],
-                        FormField.form_id == form_id
-                    )
-                )
-                .values(order=field_order["order"])
-            )
+    async def get_last_order(self, form_id: UUID) -> Optional[str]:
+        """Get the highest order key of a form's fields."""
+        query = select(func.max(FormField.order)).where(FormField.form_id == form_id)
+        result = await self.session.execute(query)
+        return result.scalar()
+    
+    async def reorder_fields(self, form_id: UUID, fields: List[FormField]) -> None:
+        """Write the order of a form's fields (already in final order) in one statement."""
+        if not fields:
+            return
+        
+        keys = ranked_keys([field.id for field in fields])
+        await self.session.execute(
+            reorder_statement(FormField, "order", keys, FormField.form_id == form_id)
+        )
+        sync_order_keys(fields, "order", keys)
     
     async def bulk_delete(self, field_ids: List[UUID]) -> None:
         """Soft delete multiple fields."""
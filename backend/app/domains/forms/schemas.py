@@ -27,7 +27,6 @@ class FormFieldBase(BaseModel):
     pattern: Optional[str] = Field(None, max_length=500)
     options: List[str] = Field(default_factory=list)
     default_value: Optional[str] = None
-    order: int = 0
     is_visible: bool = True
     settings: Dict[str, Any] = Field(default_factory=dict)
 
@@ -51,7 +50,6 @@ class FormFieldUpdate(BaseModel):
     pattern: Optional[str] = Field(None, max_length=500)
     options: Optional[List[str]] = None
     default_value: Optional[str] = None
-    order: Optional[int] = None
     is_visible: Optional[bool] = None
     settings: Optional[Dict[str, Any]] = None
 
@@ -62,6 +60,7 @@ class FormFieldResponse(FormFieldBase):
     
     id: UUID
     form_id: UUID
+    order: str
     created_at: datetime
     updated_at: datetime
 
@@ -28,6 +28,7 @@ from app.domains.forms.schemas import (
     FieldReorder,
 )
 from app.shared.common.base_service import BaseService
+from app.shared.common.ordering import apply_requested_order, key_between, spread_keys
 
 
 class FormService(BaseService[Form, FormCreate, FormUpdate]):
@@ -52,7 +53,8 @@ class FormService(BaseService[Form, FormCreate, FormUpdate]):
             
             # Create fields if provided
             if form_data.fields:
-                for order, field_data in enumerate(form_data.fields):
+                orders = spread_keys(len(form_data.fields))
+                for order, field_data in zip(orders, form_data.fields):
                     field_dict = field_data.model_dump()
                     field_dict['form_id'] = created_form.id
                     field_dict['order'] = order
@@ -209,13 +211,12 @@ class FormFieldService:
                 detail="Form not found"
             )
         
-        # Get current fields count for ordering
-        existing_fields = await self.field_repo.get_by_form(form_id)
-        next_order = len(existing_fields)
+        # New fields go after the last one
+        last_order = await self.field_repo.get_last_order(form_id)
         
         field_dict = field_data.model_dump()
         field_dict['form_id'] = form_id
-        field_dict['order'] = next_order
+        field_dict['order'] = key_between(last_order, None)
         
         field = FormField(**field_dict)
         created_field = await self.field_repo.create(field)
@@ -258,17 +259,18 @@ class FormFieldService:
                 detail="Form not found"
             )
         
-        # Convert to format expected by repository
-        field_order_data = [
-            {"field_id": fo.field_id, "order": fo.order}
-            for fo in field_orders
-        ]
+        fields = await self.field_repo.get_by_form(form_id, ordered=True)
+        by_id = {field.id: field for field in fields}
+        ordered_ids = apply_requested_order(
+            list(by_id),
+            [(fo.field_id, fo.order) for fo in field_orders]
+        )
         
-        await self.field_repo.reorder_fields(form_id, field_order_data)
+        ordered_fields = [by_id[field_id] for field_id in ordered_ids]
+        await self.field_repo.reorder_fields(form_id, ordered_fields)
         await self.field_repo.session.commit()
-          # Return updated fields
-        updated_fields = await self.field_repo.get_by_form(form_id, ordered=True)
-        return [FormFieldResponse.model_validate(field) for field in updated_fields]
+        
+        return [FormFieldResponse.model_validate(field) for field in ordered_fields]
 
 
 # FormSubmissionService moved to audit domain for compliance tracking
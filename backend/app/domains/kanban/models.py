@@ -7,11 +7,12 @@ from enum import Enum
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import Text, String, Boolean, Integer, JSON, ForeignKey, Float, DateTime
+from sqlalchemy import Text, String, Boolean, Integer, JSON, ForeignKey, Float, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, JSONB
 
 from app.shared.common.base_models import BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin
+from app.shared.common.ordering import order_key_type
 
 
 class TaskPriority(str, Enum):
@@ -122,8 +123,8 @@ class BoardColumn(BaseModel, TimestampMixin):
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
-    # Configurações
-    position: Mapped[int] = mapped_column(Integer, default=0)
+    # Configurações (chave fracionária, ver app.shared.common.ordering)
+    position: Mapped[str] = mapped_column(order_key_type(), nullable=False)
     color: Mapped[Optional[str]] = mapped_column(String(7), nullable=True)
     is_visible: Mapped[bool] = mapped_column(Boolean, default=True)
     task_limit: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # WIP limit
@@ -137,6 +138,10 @@ class BoardColumn(BaseModel, TimestampMixin):
     # Relacionamentos
     board = relationship("Board", back_populates="columns")
     tasks = relationship("Task", back_populates="column")
+    
+    __table_args__ = (
+        Index("idx_kanban_columns_board_position", "board_id", "position"),
+    )
 
 
 class Task(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
@@ -177,8 +182,8 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
     priority: Mapped[TaskPriority] = mapped_column(default=TaskPriority.MEDIUM, index=True)
     complexity: Mapped[TaskComplexity] = mapped_column(default=TaskComplexity.SIMPLE)
     
-    # Posicionamento
-    position: Mapped[int] = mapped_column(Integer, default=0)
+    # Posicionamento (chave fracionária, ver app.shared.common.ordering)
+    position: Mapped[str] = mapped_column(order_key_type(), nullable=False)
     
     # Datas
     due_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
@@ -226,6 +231,10 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
                               back_populates="task",
                               cascade="all, delete-orphan")
     ai_analyses = relationship("TaskAIAnalysis", back_populates="task", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("idx_kanban_tasks_column_position", "column_id", "position"),
+    )
 
 
 class TaskComment(BaseModel, TimestampMixin):
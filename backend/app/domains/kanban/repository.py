@@ -3,19 +3,21 @@ Repository do domínio Kanban
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, func, text, desc, asc, and_, or_
+from sqlalchemy import select, func, desc, asc, and_, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.sql import Select
 
+from app.domains.auth.models import User
 from app.domains.kanban.models import (
     Board, BoardColumn, Task, TaskComment, TaskAttachment, 
     TaskTimeLog, BoardMember, TaskStatus, TaskPriority
 )
 from app.shared.common.base_repository import BaseRepository
+from app.shared.common.ordering import ranked_keys, reorder_statement, sync_order_keys
 
 
 class BoardRepository(BaseRepository[Board]):
@@ -59,6 +61,72 @@ class BoardRepository(BaseRepository[Board]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_snapshot_data(self, board_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Board, membros, colunas, tarefas (com contagens) e usuários envolvidos
+        em um número fixo de consultas, independente do tamanho do board
+        """
+        board = await self.get_with_members(board_id)
+        if not board or board.deleted_at is not None:
+            return None
+        
+        columns = (await self.session.execute(
+            select(BoardColumn)
+            .where(BoardColumn.board_id == board_id)
+            .order_by(BoardColumn.position, BoardColumn.id)
+        )).scalars().all()
+        
+        # Contagens agregadas por tarefa, unidas às tarefas numa única consulta
+        comments = (
+            select(TaskComment.task_id, func.count().label("total"))
+            .group_by(TaskComment.task_id)
+            .subquery()
+        )
+        attachments = (
+            select(TaskAttachment.task_id, func.count().label("total"))
+            .group_by(TaskAttachment.task_id)
+            .subquery()
+        )
+        time_logs = (
+            select(TaskTimeLog.task_id, func.sum(TaskTimeLog.hours_spent).label("total"))
+            .group_by(TaskTimeLog.task_id)
+            .subquery()
+        )
+        tasks = (await self.session.execute(
+            select(
+                Task.id, Task.column_id, Task.title, Task.status, Task.priority,
+                Task.position, Task.assigned_to, Task.due_date, Task.story_points,
+                Task.progress_percentage, Task.is_blocked, Task.color, Task.tags,
+                Task.labels, Task.updated_at,
+                func.coalesce(comments.c.total, 0).label("comment_count"),
+                func.coalesce(attachments.c.total, 0).label("attachment_count"),
+                func.coalesce(time_logs.c.total, 0).label("minutes_logged"),
+            )
+            .join(BoardColumn, Task.column_id == BoardColumn.id)
+            .outerjoin(comments, comments.c.task_id == Task.id)
+            .outerjoin(attachments, attachments.c.task_id == Task.id)
+            .outerjoin(time_logs, time_logs.c.task_id == Task.id)
+            .where(BoardColumn.board_id == board_id, Task.deleted_at.is_(None))
+            .order_by(Task.column_id, Task.position, Task.id)
+        )).all()
+        
+        user_ids = {member.user_id for member in board.members}
+        user_ids.update(task.assigned_to for task in tasks if task.assigned_to)
+        users = []
+        if user_ids:
+            users = (await self.session.execute(
+                select(User.id, User.first_name, User.last_name, User.avatar_url)
+                .where(User.id.in_(user_ids))
+            )).all()
+        
+        return {
+            "board": board,
+            "members": board.members,
+            "columns": columns,
+            "tasks": tasks,
+            "users": users,
+        }
+    
     async def get_public_boards(self, limit: int = 50) -> List[Board]:
         """Busca boards públicos"""
         query = (
@@ -123,18 +191,22 @@ class BoardColumnRepository(BaseRepository[BoardColumn]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
-    async def reorder_columns(self, board_id: UUID, column_orders: List[Dict[str, Any]]) -> None:
-        """Reordena colunas do board"""
-        for order_data in column_orders:
-            column_id = order_data["column_id"]
-            position = order_data["position"]
-            
-            await self.session.execute(
-                text("UPDATE boardcolumn SET position = :position WHERE id = :id AND board_id = :board_id"),
-                {"position": position, "id": column_id, "board_id": board_id}
-            )
+    async def get_last_position(self, board_id: UUID) -> Optional[str]:
+        """Maior chave de ordenação das colunas do board"""
+        query = select(func.max(BoardColumn.position)).where(BoardColumn.board_id == board_id)
+        result = await self.session.execute(query)
+        return result.scalar()
+    
+    async def reorder_columns(self, board_id: UUID, columns: List[BoardColumn]) -> None:
+        """Grava a ordem das colunas (já na ordem final) numa única instrução"""
+        if not columns:
+            return
         
-        await self.session.commit()
+        keys = ranked_keys([column.id for column in columns])
+        await self.session.execute(
+            reorder_statement(BoardColumn, "position", keys, BoardColumn.board_id == board_id)
+        )
+        sync_order_keys(columns, "position", keys)
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -152,7 +224,7 @@ class TaskRepository(BaseRepository[Task]):
         query = (
             select(Task)
             .where(Task.column_id == column_id)
-            .order_by(Task.position)
+            .order_by(Task.position, Task.id)
         )
         
         if status:
@@ -248,27 +320,113 @@ class TaskRepository(BaseRepository[Task]):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def get_positions(self, column_id: UUID, task_ids: List[UUID]) -> Dict[UUID, str]:
+        """Chaves de ordenação das tarefas da coluna"""
+        query = select(Task.id, Task.position).where(
+            Task.column_id == column_id,
+            Task.id.in_(task_ids),
+            Task.deleted_at.is_(None)
+        )
+        result = await self.session.execute(query)
+        return {task_id: position for task_id, position in result.all()}
+    
+    async def get_adjacent_position(
+        self,
+        column_id: UUID,
+        position: str,
+        exclude_task_id: UUID,
+        after: bool = True
+    ) -> Optional[str]:
+        """Chave vizinha (seguinte ou anterior) a ``position`` na coluna"""
+        query = select(Task.position).where(
+            Task.column_id == column_id,
+            Task.id != exclude_task_id,
+            Task.deleted_at.is_(None)
+        )
+        if after:
+            query = query.where(Task.position > position).order_by(Task.position.asc())
+        else:
+            query = query.where(Task.position < position).order_by(Task.position.desc())
+        
+        result = await self.session.execute(query.limit(1))
+        return result.scalar()
+    
+    async def get_bounds_at(
+        self,
+        column_id: UUID,
+        index: int,
+        exclude_task_id: Optional[UUID] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Chaves antes e depois do índice ``index`` da coluna"""
+        query = select(Task.position).where(
+            Task.column_id == column_id,
+            Task.deleted_at.is_(None)
+        )
+        if exclude_task_id:
+            query = query.where(Task.id != exclude_task_id)
+        
+        query = (
+            query.order_by(Task.position, Task.id)
+            .offset(max(index - 1, 0))
+            .limit(2 if index > 0 else 1)
+        )
+        positions = (await self.session.execute(query)).scalars().all()
+        
+        if index == 0:
+            return None, positions[0] if positions else None
+        if not positions:
+            # Índice além do fim: vai para o final da coluna
+            return await self.get_last_position(column_id, exclude_task_id), None
+        return positions[0], positions[1] if len(positions) > 1 else None
+    
+    async def get_last_position(
+        self,
+        column_id: UUID,
+        exclude_task_id: Optional[UUID] = None
+    ) -> Optional[str]:
+        """Maior chave de ordenação da coluna"""
+        query = select(func.max(Task.position)).where(
+            Task.column_id == column_id,
+            Task.deleted_at.is_(None)
+        )
+        if exclude_task_id:
+            query = query.where(Task.id != exclude_task_id)
+        
+        result = await self.session.execute(query)
+        return result.scalar()
+    
     async def move_task(
         self, 
         task_id: UUID, 
         new_column_id: UUID, 
-        new_position: int
+        new_position: str,
+        **values: Any
     ) -> None:
-        """Move tarefa para nova coluna/posição"""
-        # Atualiza a tarefa
+        """
+        Move tarefa para nova coluna/posição: uma única linha atualizada,
+        sem commit (a transação é de quem chama)
+        """
         await self.session.execute(
-            text("""
-                UPDATE task 
-                SET column_id = :column_id, position = :position 
-                WHERE id = :id
-            """),
-            {
-                "column_id": new_column_id, 
-                "position": new_position, 
-                "id": task_id
-            }
+            update(Task)
+            .where(Task.id == task_id)
+            .values(column_id=new_column_id, position=new_position, **values)
         )
-        await self.session.commit()
+    
+    async def rebalance_column(self, column_id: UUID) -> int:
+        """Redistribui as chaves da coluna numa única instrução"""
+        # Bloqueia as linhas da coluna contra movimentos concorrentes
+        query = (
+            select(Task.id)
+            .where(Task.column_id == column_id)
+            .order_by(Task.position, Task.id)
+            .with_for_update()
+        )
+        task_ids = (await self.session.execute(query)).scalars().all()
+        if task_ids:
+            await self.session.execute(
+                reorder_statement(Task, "position", ranked_keys(task_ids), Task.column_id == column_id)
+            )
+        return len(task_ids)
     
     async def get_tasks_analytics(
         self, 
@@ -53,7 +53,6 @@ class BoardColumnBase(BaseModel):
     """Base schema for BoardColumn"""
     title: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = None
-    position: int = 0
     color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
     is_visible: bool = True
     task_limit: Optional[int] = Field(None, ge=0)
@@ -70,7 +69,6 @@ class BoardColumnUpdate(BaseModel):
     """Schema for updating a board column"""
     title: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
-    position: Optional[int] = None
     color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
     is_visible: Optional[bool] = None
     task_limit: Optional[int] = Field(None, ge=0)
@@ -81,6 +79,7 @@ class BoardColumnUpdate(BaseModel):
 class BoardColumnResponse(BoardColumnBase, BaseResponseSchema, TimestampSchema):
     """Schema for board column response"""
     board_id: UUID
+    position: str
     task_count: Optional[int] = 0
     
     model_config = ConfigDict(from_attributes=True)
@@ -93,7 +92,6 @@ class TaskBase(BaseModel):
     description: Optional[str] = None
     status: TaskStatus = TaskStatus.TODO
     priority: TaskPriority = TaskPriority.MEDIUM
-    position: int = 0
     due_date: Optional[datetime] = None
     start_date: Optional[datetime] = None
     estimated_hours: Optional[int] = Field(None, ge=0)
@@ -118,7 +116,6 @@ class TaskUpdate(BaseModel):
     assigned_to: Optional[UUID] = None
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
-    position: Optional[int] = None
     due_date: Optional[datetime] = None
     start_date: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -134,6 +131,7 @@ class TaskResponse(TaskBase, BaseResponseSchema, TimestampSchema):
     """Schema for task response"""
     board_id: UUID
     column_id: UUID
+    position: str
     assigned_to: Optional[UUID] = None
     created_by: UUID
     parent_task_id: Optional[UUID] = None
@@ -145,9 +143,17 @@ class TaskResponse(TaskBase, BaseResponseSchema, TimestampSchema):
 
 # Action Schemas
 class TaskMoveRequest(BaseModel):
-    """Schema for moving a task"""
+    """
+    Schema for moving a task.
+    
+    Drag-and-drop clients send the neighbours the task was dropped between;
+    ``position`` (index in the target column) is still accepted. With
+    neither, the task goes to the end of the column.
+    """
     column_id: UUID
-    position: int
+    previous_task_id: Optional[UUID] = None
+    next_task_id: Optional[UUID] = None
+    position: Optional[int] = Field(None, ge=0)
 
 
 class TaskAssignRequest(BaseModel):
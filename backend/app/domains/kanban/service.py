@@ -9,6 +9,8 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.database import after_commit, commit_session
+
 from app.domains.kanban.models import (
     Board, BoardColumn, Task, TaskComment, TaskAttachment, 
     TaskTimeLog, BoardMember, TaskStatus, TaskPriority
@@ -18,15 +20,22 @@ from app.domains.kanban.repository import (
     TaskCommentRepository, TaskAttachmentRepository, 
     TaskTimeLogRepository, BoardMemberRepository
 )
+from app.domains.kanban.snapshot import (
+    BoardSnapshot, board_snapshot_cache, build_snapshot_payload, serialize_snapshot
+)
 from app.domains.kanban.schemas import (
     BoardCreate, BoardUpdate, BoardColumnCreate, BoardColumnUpdate,
     TaskCreate, TaskUpdate, TaskCommentCreate, TaskAttachmentCreate,
-    TaskTimeLogCreate, BoardMemberCreate
+    TaskTimeLogCreate, BoardMemberCreate, TaskMoveRequest, ColumnBulkReorder
 )
 from app.shared.common.exceptions import (
     NotFoundException, ValidationException, 
     PermissionDeniedException, ConflictException
 )
+from app.shared.common.ordering import (
+    MAX_KEY_LENGTH, apply_requested_order, key_between, needs_rebalance, spread_keys
+)
+from app.tasks.celery_app import celery_app
 
 
 class BoardService:
@@ -37,6 +46,7 @@ class BoardService:
         self.repository = BoardRepository(session)
         self.column_repository = BoardColumnRepository(session)
         self.member_repository = BoardMemberRepository(session)
+        self.snapshot_cache = board_snapshot_cache
     
     async def create_board(
         self, 
@@ -63,21 +73,22 @@ class BoardService:
         
         # Criar colunas padrão
         default_columns = [
-            {"title": "To Do", "position": 0, "color": "#f87171"},
-            {"title": "In Progress", "position": 1, "color": "#fbbf24"},
-            {"title": "Done", "position": 2, "color": "#34d399"}
+            {"title": "To Do", "color": "#f87171"},
+            {"title": "In Progress", "color": "#fbbf24"},
+            {"title": "Done", "color": "#34d399"}
         ]
         
-        for col_data in default_columns:
+        for col_data, position in zip(default_columns, spread_keys(len(default_columns))):
             column = BoardColumn(
                 board_id=board.id,
                 title=col_data["title"],
-                position=col_data["position"],
+                position=position,
                 color=col_data["color"],
                 created_by=user_id
             )
             await self.column_repository.create(column)
         
+        await commit_session(self.session)
         return board
     
     async def get_board(self, board_id: UUID, user_id: UUID) -> Board:
@@ -101,6 +112,27 @@ class BoardService:
         
         return board
     
+    async def get_board_snapshot(self, board_id: UUID, user_id: UUID) -> BoardSnapshot:
+        """Snapshot completo do board (cache Redis validado pela versão do board)"""
+        await self._check_board_access(board_id, user_id)
+        
+        version, snapshot = None, None
+        if self.snapshot_cache.enabled:
+            version, snapshot = await self.snapshot_cache.load(board_id)
+            if snapshot:
+                return snapshot
+        
+        # A versão foi lida antes das consultas: uma escrita concorrente
+        # incrementa a versão e o snapshot guardado aqui não é servido
+        data = await self.repository.get_snapshot_data(board_id)
+        if not data:
+            raise NotFoundException("Board não encontrado")
+        
+        snapshot = serialize_snapshot(version, build_snapshot_payload(data))
+        if version is not None:
+            await self.snapshot_cache.store(board_id, snapshot)
+        return snapshot
+    
     async def update_board(
         self, 
         board_id: UUID, 
@@ -118,7 +150,10 @@ class BoardService:
         for field, value in update_data.items():
             setattr(board, field, value)
         
-        return await self.repository.update(board)
+        board = await self.repository.update(board)
+        self._invalidate_board(board_id)
+        await commit_session(self.session)
+        return board
     
     async def delete_board(self, board_id: UUID, user_id: UUID) -> None:
         """Remove board"""
@@ -129,6 +164,8 @@ class BoardService:
             raise NotFoundException("Board não encontrado")
         
         await self.repository.delete(board)
+        self._invalidate_board(board_id)
+        await commit_session(self.session)
     
     async def get_company_boards(
         self, 
@@ -179,7 +216,10 @@ class BoardService:
             created_by=user_id
         )
         
-        return await self.member_repository.create(member)
+        member = await self.member_repository.create(member)
+        self._invalidate_board(board_id)
+        await commit_session(self.session)
+        return member
     
     async def remove_member(
         self, 
@@ -202,6 +242,30 @@ class BoardService:
             raise NotFoundException("Membro não encontrado")
         
         await self.member_repository.delete(member_to_remove)
+        self._invalidate_board(board_id)
+        await commit_session(self.session)
+    
+    async def reorder_columns(
+        self,
+        board_id: UUID,
+        reorder_data: ColumnBulkReorder,
+        user_id: UUID
+    ) -> List[BoardColumn]:
+        """Reordena colunas do board (uma única instrução)"""
+        await self._check_board_permission(board_id, user_id, ["admin", "editor"])
+        
+        columns = await self.column_repository.get_by_board_id(board_id)
+        by_id = {column.id: column for column in columns}
+        ordered_ids = apply_requested_order(
+            list(by_id),
+            [(item.column_id, item.position) for item in reorder_data.columns]
+        )
+        
+        ordered = [by_id[column_id] for column_id in ordered_ids]
+        await self.column_repository.reorder_columns(board_id, ordered)
+        self._invalidate_board(board_id)
+        await commit_session(self.session)
+        return ordered
     
     async def get_board_analytics(
         self, 
@@ -220,6 +284,14 @@ class BoardService:
             end_date
         )
     
+    def _invalidate_board(self, board_id: UUID) -> None:
+        """
+        Invalida o snapshot do board depois do commit da escrita: antes dele,
+        uma leitura concorrente montaria (e guardaria) o estado anterior
+        """
+        if self.snapshot_cache.enabled:
+            after_commit(self.session, lambda: self.snapshot_cache.invalidate(board_id))
+    
     async def _check_board_access(self, board_id: UUID, user_id: UUID) -> None:
         """Verifica se usuário tem acesso ao board"""
         # Verificar se é membro ou se o board é público
@@ -275,17 +347,19 @@ class TaskService:
             ["admin", "editor", "member"]
         )
         
-        # Buscar próxima posição
-        tasks = await self.repository.get_by_column_id(task_data.column_id)
-        next_position = len(tasks)
+        # Nova tarefa vai para o final da coluna
+        last_position = await self.repository.get_last_position(task_data.column_id)
         
         task = Task(
             **task_data.model_dump(),
-            position=next_position,
+            position=key_between(last_position, None),
             created_by=user_id
         )
         
-        return await self.repository.create(task)
+        task = await self.repository.create(task)
+        self.board_service._invalidate_board(column.board_id)
+        await commit_session(self.session)
+        return task
     
     async def get_task(self, task_id: UUID, user_id: UUID) -> Task:
         """Busca tarefa por ID"""
@@ -334,7 +408,10 @@ class TaskService:
         for field, value in update_data.items():
             setattr(task, field, value)
         
-        return await self.repository.update(task)
+        task = await self.repository.update(task)
+        self.board_service._invalidate_board(column.board_id)
+        await commit_session(self.session)
+        return task
     
     async def delete_task(self, task_id: UUID, user_id: UUID) -> None:
         """Remove tarefa"""
@@ -351,12 +428,13 @@ class TaskService:
         )
         
         await self.repository.delete(task)
+        self.board_service._invalidate_board(column.board_id)
+        await commit_session(self.session)
     
     async def move_task(
         self, 
         task_id: UUID, 
-        new_column_id: UUID, 
-        new_position: int,
+        move_data: TaskMoveRequest,
         user_id: UUID
     ) -> Task:
         """Move tarefa para nova coluna/posição"""
@@ -366,7 +444,7 @@ class TaskService:
         
         # Verificar acesso às colunas
         old_column = await self.column_repository.get_by_id(task.column_id)
-        new_column = await self.column_repository.get_by_id(new_column_id)
+        new_column = await self.column_repository.get_by_id(move_data.column_id)
         
         if not new_column:
             raise NotFoundException("Nova coluna não encontrada")
@@ -383,18 +461,68 @@ class TaskService:
             ["admin", "editor", "member"]
         )
         
-        # Mover tarefa
-        await self.repository.move_task(task_id, new_column_id, new_position)
+        position = await self._resolve_position(task_id, move_data)
         
         # Atualizar status se necessário
         if new_column.title.lower() == "done":
-            task.status = TaskStatus.DONE
+            new_status = TaskStatus.DONE
         elif new_column.title.lower() == "in progress":
-            task.status = TaskStatus.IN_PROGRESS
+            new_status = TaskStatus.IN_PROGRESS
         else:
-            task.status = TaskStatus.TODO
+            new_status = TaskStatus.TODO
+        
+        # Mover tarefa: posição, coluna e status num único UPDATE da linha
+        await self.repository.move_task(task_id, new_column.id, position, status=new_status)
+        self.board_service._invalidate_board(new_column.board_id)
         
-        return await self.repository.update(task)
+        # O worker de redistribuição precisa enxergar a nova chave
+        await commit_session(self.session)
+        
+        if needs_rebalance(position):
+            celery_app.send_task(
+                "ordering_tasks.rebalance_kanban_column",
+                args=[str(new_column.id)]
+            )
+        
+        return task
+    
+    async def _resolve_position(
+        self,
+        task_id: UUID,
+        move_data: TaskMoveRequest,
+        rebalanced: bool = False
+    ) -> str:
+        """Chave de ordenação entre os vizinhos de destino"""
+        column_id = move_data.column_id
+        previous_id, next_id = move_data.previous_task_id, move_data.next_task_id
+        
+        if previous_id or next_id:
+            if task_id in (previous_id, next_id):
+                raise ValidationException("Tarefa não pode ser vizinha de si mesma")
+            
+            anchors = await self.repository.get_positions(
+                column_id,
+                [anchor for anchor in (previous_id, next_id) if anchor]
+            )
+            if (previous_id and previous_id not in anchors) or (next_id and next_id not in anchors):
+                raise ValidationException("Tarefa vizinha não encontrada na coluna")
+            
+            low, high = anchors.get(previous_id), anchors.get(next_id)
+            if next_id is None:
+                high = await self.repository.get_adjacent_position(column_id, low, task_id, after=True)
+            elif previous_id is None:
+                low = await self.repository.get_adjacent_position(column_id, high, task_id, after=False)
+        elif move_data.position is not None:
+            low, high = await self.repository.get_bounds_at(column_id, move_data.position, task_id)
+        else:
+            low, high = await self.repository.get_last_position(column_id, task_id), None
+        
+        position = key_between(low, high)
+        if len(position) > MAX_KEY_LENGTH and not rebalanced:
+            # Redistribuição em segundo plano atrasada: faz aqui mesmo
+            await self.repository.rebalance_column(column_id)
+            return await self._resolve_position(task_id, move_data, rebalanced=True)
+        return position
     
     async def assign_task(
         self, 
@@ -426,7 +554,16 @@ class TaskService:
             )
         
         task.assigned_to = assignee_id
-        return await self.repository.update(task)
+        task = await self.repository.update(task)
+        self.board_service._invalidate_board(column.board_id)
+        await commit_session(self.session)
+        return task
+    
+    async def _invalidate_task_board(self, task: Task) -> None:
+        """Invalida o snapshot do board da tarefa (comentários, anexos, tempo)"""
+        column = await self.column_repository.get_by_id(task.column_id)
+        if column:
+            self.board_service._invalidate_board(column.board_id)
     
     async def get_user_tasks(
         self, 
@@ -465,7 +602,7 @@ class TaskTimeLogService:
     ) -> TaskTimeLog:
         """Inicia log de tempo"""
         # Verificar acesso à tarefa
-        await self.task_service.get_task(time_log_data.task_id, user_id)
+        task = await self.task_service.get_task(time_log_data.task_id, user_id)
         
         # Verificar se já tem log ativo
         active_log = await self.repository.get_active_log(
@@ -481,7 +618,10 @@ class TaskTimeLogService:
             start_time=datetime.utcnow()
         )
         
-        return await self.repository.create(time_log)
+        time_log = await self.repository.create(time_log)
+        await self.task_service._invalidate_task_board(task)
+        await commit_session(self.session)
+        return time_log
     
     async def stop_time_log(self, task_id: UUID, user_id: UUID) -> TaskTimeLog:
         """Para log de tempo ativo"""
@@ -490,7 +630,13 @@ class TaskTimeLogService:
             raise NotFoundException("Nenhum log ativo encontrado")
         
         active_log.end_time = datetime.utcnow()
-        return await self.repository.update(active_log)
+        active_log = await self.repository.update(active_log)
+        
+        task = await self.task_service.repository.get_by_id(task_id)
+        if task:
+            await self.task_service._invalidate_task_board(task)
+        await commit_session(self.session)
+        return active_log
     
     async def get_task_time_summary(
         self, 
@@ -525,14 +671,17 @@ class TaskCommentService:
     ) -> TaskComment:
         """Cria comentário"""
         # Verificar acesso à tarefa
-        await self.task_service.get_task(comment_data.task_id, user_id)
+        task = await self.task_service.get_task(comment_data.task_id, user_id)
         
         comment = TaskComment(
             **comment_data.model_dump(),
             created_by=user_id
         )
         
-        return await self.repository.create(comment)
+        comment = await self.repository.create(comment)
+        await self.task_service._invalidate_task_board(task)
+        await commit_session(self.session)
+        return comment
     
     async def get_task_comments(
         self, 
@@ -0,0 +1,182 @@
+"""
+Snapshot do board Kanban
+
+O snapshot é a visão completa de um board (colunas, tarefas com contagens,
+membros e usuários) serializada num JSON compacto, montado em número fixo de
+consultas e guardado em Redis junto com sua ETag.
+
+Cada board tem um contador de versão, incrementado a cada alteração de
+tarefa, coluna, comentário, anexo, log de tempo ou membro. O snapshot em
+cache leva a versão lida antes da montagem e só é servido se ainda for a
+atual; a invalidação é um único INCR.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.instrumentation import record_cache_lookup
+from app.core.logging import get_logger_with_context
+from app.core.redis_client import RedisClient, redis_client
+
+logger = get_logger_with_context(component="kanban_snapshot")
+
+
+@dataclass
+class BoardSnapshot:
+    """Payload serializado de um board e sua ETag"""
+
+    version: Optional[str]
+    etag: str
+    payload: str
+
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def build_snapshot_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload compacto a partir de ``BoardRepository.get_snapshot_data``"""
+    board = data["board"]
+    tasks_by_column: Dict[UUID, List[Dict[str, Any]]] = {}
+    for task in data["tasks"]:
+        tasks_by_column.setdefault(task.column_id, []).append({
+            "id": str(task.id),
+            "title": task.title,
+            "status": _value(task.status),
+            "priority": _value(task.priority),
+            "position": task.position,
+            "assigned_to": str(task.assigned_to) if task.assigned_to else None,
+            "due_date": _iso(task.due_date),
+            "story_points": task.story_points,
+            "progress": task.progress_percentage,
+            "is_blocked": task.is_blocked,
+            "color": task.color,
+            "tags": task.tags or [],
+            "labels": task.labels or [],
+            "comments": task.comment_count,
+            "attachments": task.attachment_count,
+            "minutes_logged": int(task.minutes_logged),
+            "updated_at": _iso(task.updated_at),
+        })
+
+    columns = []
+    for column in data["columns"]:
+        tasks = tasks_by_column.get(column.id, [])
+        columns.append({
+            "id": str(column.id),
+            "title": column.title,
+            "position": column.position,
+            "color": column.color,
+            "is_visible": column.is_visible,
+            "task_limit": column.task_limit,
+            "task_count": len(tasks),
+            "tasks": tasks,
+        })
+
+    return {
+        "board": {
+            "id": str(board.id),
+            "title": board.title,
+            "description": board.description,
+            "board_type": _value(board.board_type),
+            "color": board.color,
+            "is_public": board.is_public,
+            "updated_at": _iso(board.updated_at),
+        },
+        "columns": columns,
+        "members": [
+            {"user_id": str(member.user_id), "role": member.role}
+            for member in data["members"]
+        ],
+        "users": {
+            str(user.id): {
+                "name": f"{user.first_name} {user.last_name}".strip(),
+                "avatar_url": user.avatar_url,
+            }
+            for user in data["users"]
+        },
+        "counts": {
+            "columns": len(columns),
+            "tasks": len(data["tasks"]),
+            "members": len(data["members"]),
+        },
+    }
+
+
+def serialize_snapshot(version: Optional[str], payload: Dict[str, Any]) -> BoardSnapshot:
+    """JSON sem espaços; a ETag é o hash do próprio conteúdo"""
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    return BoardSnapshot(version=version, etag=f'"{digest}"', payload=body)
+
+
+class BoardSnapshotCache:
+    """Snapshots de boards em Redis com invalidação por versão"""
+
+    VERSION_KEY = "kanban:board:{board_id}:version"
+    SNAPSHOT_KEY = "kanban:board:{board_id}:snapshot"
+
+    def __init__(self, redis: RedisClient = redis_client):
+        self.redis = redis
+
+    @property
+    def enabled(self) -> bool:
+        return settings.kanban_snapshot_cache_ttl > 0
+
+    async def _client(self) -> Any:
+        if not self.redis.client:
+            await self.redis.connect()
+        return self.redis.client
+
+    async def load(self, board_id: UUID) -> Tuple[Optional[str], Optional[BoardSnapshot]]:
+        """
+        Versão atual e snapshot em cache, se ainda válido (uma ida ao Redis).
+        Sem Redis a versão volta None e o snapshot montado não é guardado.
+        """
+        try:
+            client = await self._client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.get(self.VERSION_KEY.format(board_id=board_id))
+                pipe.hgetall(self.SNAPSHOT_KEY.format(board_id=board_id))
+                version, cached = await pipe.execute()
+        except Exception as exc:
+            logger.warning("Board snapshot cache unavailable", error=str(exc))
+            return None, None
+
+        version = version or "0"
+        if cached and cached.get("version") == version:
+            record_cache_lookup(True)
+            return version, BoardSnapshot(version, cached["etag"], cached["payload"])
+        record_cache_lookup(False)
+        return version, None
+
+    async def store(self, board_id: UUID, snapshot: BoardSnapshot) -> None:
+        key = self.SNAPSHOT_KEY.format(board_id=board_id)
+        try:
+            client = await self._client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={
+                    "version": snapshot.version,
+                    "etag": snapshot.etag,
+                    "payload": snapshot.payload,
+                })
+                pipe.expire(key, settings.kanban_snapshot_cache_ttl)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Board snapshot cache store failed", board_id=str(board_id), error=str(exc))
+
+    async def invalidate(self, board_id: UUID) -> None:
+        """Nova versão do board: o snapshot guardado deixa de ser servido"""
+        await self.redis.increment(self.VERSION_KEY.format(board_id=board_id))
+
+
+# Instância global
+board_snapshot_cache = BoardSnapshotCache()
@@ -0,0 +1,83 @@
+"""
+Sampled persistence of per-request metrics into APIMetrics.
+
+The request pipeline hands finished requests to ``api_metrics_recorder``;
+sampled ones are buffered in memory and written in one batched INSERT by a
+background task, so recording never adds a database round trip to a request.
+"""
+
+import asyncio
+import random
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger_with_context
+
+logger = get_logger_with_context(component="api_metrics")
+
+# Rows buffered between flushes; newer samples are dropped past this
+MAX_BUFFERED_ROWS = 5000
+
+
+class APIMetricsRecorder:
+    """Buffers sampled request metrics and flushes them periodically."""
+
+    def __init__(self):
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.api_metrics_sample_rate > 0 or settings.api_metrics_slow_request_ms > 0
+
+    def should_record(self, response_time_ms: int) -> bool:
+        """Slow requests are always kept; the rest by sample rate."""
+        slow_ms = settings.api_metrics_slow_request_ms
+        if slow_ms > 0 and response_time_ms >= slow_ms:
+            return True
+        rate = settings.api_metrics_sample_rate
+        return rate > 0 and random.random() < rate
+
+    def record(self, row: Dict[str, Any]) -> None:
+        if len(self._pending) < MAX_BUFFERED_ROWS:
+            self._pending.append(row)
+
+    async def flush(self) -> int:
+        """Write the buffered rows; returns the number of rows written."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, []
+
+        from app.domains.monitoring.repository import APIMetricsRepository
+
+        try:
+            async with AsyncSessionLocal() as session:
+                return await APIMetricsRepository(session).record_api_calls_batch(pending)
+        except Exception as exc:
+            # Drop the batch: re-queuing a row that violates a constraint (e.g. a
+            # deleted user's id) would make every later flush fail as well
+            logger.error("Failed to flush API metrics; batch dropped", error=str(exc), rows=len(pending))
+            return 0
+
+    def start(self) -> None:
+        """Start the periodic flusher (no-op when sampling is disabled)."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.api_metrics_flush_seconds)
+            await self.flush()
+
+
+# Per-process instance
+api_metrics_recorder = APIMetricsRecorder()
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import select, and_, func, desc, text
+from sqlalchemy import select, insert, and_, func, desc, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.shared.common.repository import BaseRepository
@@ -51,7 +51,15 @@ class APIMetricsRepository(BaseRepository[APIMetrics]):
             timestamp=datetime.utcnow()
         )
         
-        return await self.create(metric)
+        return await self.add(metric)
+    
+    async def record_api_calls_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert sampled request metrics in a single statement."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(APIMetrics), rows)
+        await self.session.commit()
+        return len(rows)
     
     async def get_endpoint_metrics(
         self,
@@ -195,7 +203,7 @@ class SystemMetricsRepository(BaseRepository[SystemMetrics]):
             timestamp=datetime.utcnow()
         )
         
-        return await self.create(metric)
+        return await self.add(metric)
     
     async def get_metrics_by_type(
         self,
@@ -308,7 +316,7 @@ class ServiceHealthRepository(BaseRepository[ServiceHealth]):
             timestamp=datetime.utcnow()
         )
         
-        return await self.create(health)
+        return await self.add(health)
     
     async def get_service_status(self, service_name: str) -> Optional[ServiceHealth]:
         """Get latest status for a service."""
@@ -413,7 +421,7 @@ class RateLimitTrackingRepository(BaseRepository[RateLimitTracking]):
             timestamp=datetime.utcnow()
         )
         
-        return await self.create(event)
+        return await self.add(event)
     
     async def get_current_usage(
         self,
@@ -487,7 +495,7 @@ class SecurityEventsRepository(BaseRepository[SecurityEvents]):
             timestamp=datetime.utcnow()
         )
         
-        return await self.create(event)
+        return await self.add(event)
     
     async def get_security_events(
         self,
@@ -600,7 +608,15 @@ class RateLimitPoliciesRepository(BaseRepository[RateLimitPolicies]):
     
     def __init__(self, session: AsyncSession):
         super().__init__(RateLimitPolicies, session)
-    
+
+    async def get_enforced_policies(self) -> List[RateLimitPolicies]:
+        """Get all active policies in evaluation order (lowest priority first)."""
+        return await self.fetch_all(
+            select(RateLimitPolicies)
+            .where(RateLimitPolicies.is_active == True)
+            .order_by(RateLimitPolicies.priority, RateLimitPolicies.created_at)
+        )
+
     async def get_active_policies(
         self,
         endpoint: Optional[str] = None,
@@ -5,10 +5,12 @@ Based on the database architecture plan.
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
+import asyncio
 import psutil
 import time
 
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import NotFoundError, ValidationError, ServiceError
 from app.domains.monitoring.repository import (
     APIMetricsRepository, SystemMetricsRepository, ServiceHealthRepository,
@@ -20,7 +22,7 @@ from app.domains.monitoring.models import HealthStatus, SecurityEventType
 class MonitoringService:
     """Service for comprehensive system monitoring and observability."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.api_metrics_repo = APIMetricsRepository(db)
         self.system_metrics_repo = SystemMetricsRepository(db)
@@ -29,7 +31,7 @@ class MonitoringService:
         self.security_events_repo = SecurityEventsRepository(db)
         self.rate_limit_policies_repo = RateLimitPoliciesRepository(db)
     
-    def record_api_metrics(
+    async def record_api_metrics(
         self,
         endpoint: str,
         method: str,
@@ -41,7 +43,7 @@ class MonitoringService:
     ) -> str:
         """Record API request metrics."""
         
-        metrics = self.api_metrics_repo.record_request(
+        metrics = await self.api_metrics_repo.record_request(
             endpoint=endpoint,
             method=method,
             status_code=status_code,
@@ -53,7 +55,7 @@ class MonitoringService:
         
         return str(metrics.id)
     
-    def get_api_metrics_summary(
+    async def get_api_metrics_summary(
         self,
         hours: int = 24,
         endpoint: Optional[str] = None,
@@ -61,13 +63,13 @@ class MonitoringService:
     ) -> Dict[str, Any]:
         """Get API metrics summary."""
         
-        return self.api_metrics_repo.get_metrics_summary(
+        return await self.api_metrics_repo.get_metrics_summary(
             hours=hours,
             endpoint=endpoint,
             company_id=company_id
         )
     
-    def get_slow_endpoints(
+    async def get_slow_endpoints(
         self,
         threshold_ms: int = 1000,
         hours: int = 24,
@@ -75,13 +77,13 @@ class MonitoringService:
     ) -> List[Dict[str, Any]]:
         """Get endpoints with slow response times."""
         
-        return self.api_metrics_repo.get_slow_endpoints(
+        return await self.api_metrics_repo.get_slow_endpoints(
             threshold_ms=threshold_ms,
             hours=hours,
             limit=limit
         )
     
-    def get_error_hotspots(
+    async def get_error_hotspots(
         self,
         hours: int = 24,
         min_error_count: int = 5,
@@ -89,15 +91,27 @@ class MonitoringService:
     ) -> List[Dict[str, Any]]:
         """Get endpoints with high error rates."""
         
-        return self.api_metrics_repo.get_error_hotspots(
+        return await self.api_metrics_repo.get_error_hotspots(
             hours=hours,
             min_error_count=min_error_count,
             limit=limit
         )
     
-    def record_system_metrics(self) -> str:
+    async def record_system_metrics(self) -> str:
         """Record current system metrics."""
         
+        # psutil blocks for the sampling interval; keep it off the event loop
+        # (and off the DB executor, whose threads map to pooled connections)
+        sample = await asyncio.to_thread(self._sample_system_metrics)
+        
+        metrics = await self.system_metrics_repo.record_metrics(**sample)
+        
+        return str(metrics.id)
+    
+    @staticmethod
+    def _sample_system_metrics() -> Dict[str, Any]:
+        """Sample host metrics with psutil (blocking)."""
+        
         # Collect system metrics using psutil
         cpu_percent = psutil.cpu_percent(interval=1)
         memory = psutil.virtual_memory()
@@ -116,28 +130,26 @@ class MonitoringService:
             # Windows doesn't have load average
             load_average_1m = load_average_5m = load_average_15m = None
         
-        metrics = self.system_metrics_repo.record_metrics(
-            cpu_usage_percent=cpu_percent,
-            memory_usage_percent=memory.percent,
-            memory_used_mb=memory.used // (1024 * 1024),
-            memory_total_mb=memory.total // (1024 * 1024),
-            disk_usage_percent=disk.percent,
-            disk_used_gb=disk.used // (1024 * 1024 * 1024),
-            disk_total_gb=disk.total // (1024 * 1024 * 1024),
-            network_bytes_sent=network.bytes_sent,
-            network_bytes_received=network.bytes_recv,
-            load_average_1m=load_average_1m,
-            load_average_5m=load_average_5m,
-            load_average_15m=load_average_15m
-        )
-        
-        return str(metrics.id)
+        return {
+            "cpu_usage_percent": cpu_percent,
+            "memory_usage_percent": memory.percent,
+            "memory_used_mb": memory.used // (1024 * 1024),
+            "memory_total_mb": memory.total // (1024 * 1024),
+            "disk_usage_percent": disk.percent,
+            "disk_used_gb": disk.used // (1024 * 1024 * 1024),
+            "disk_total_gb": disk.total // (1024 * 1024 * 1024),
+            "network_bytes_sent": network.bytes_sent,
+            "network_bytes_received": network.bytes_recv,
+            "load_average_1m": load_average_1m,
+            "load_average_5m": load_average_5m,
+            "load_average_15m": load_average_15m
+        }
     
-    def get_system_health_status(self) -> Dict[str, Any]:
+    async def get_system_health_status(self) -> Dict[str, Any]:
         """Get current system health status."""
         
         # Get latest system metrics
-        latest_metrics = self.system_metrics_repo.get_latest_metrics()
+        latest_metrics = await self.system_metrics_repo.get_latest_metrics()
         
         if not latest_metrics:
             return {
@@ -195,16 +207,16 @@ class MonitoringService:
             "issues": health_issues
         }
     
-    def get_system_metrics_history(
+    async def get_system_metrics_history(
         self,
         hours: int = 24,
         interval_minutes: int = 5
     ) -> List[Dict[str, Any]]:
         """Get system metrics history."""
         
-        return self.system_metrics_repo.get_metrics_history(hours, interval_minutes)
+        return await self.system_metrics_repo.get_metrics_history(hours, interval_minutes)
     
-    def check_service_health(
+    async def check_service_health(
         self,
         service_name: str,
         endpoint: Optional[str] = None
@@ -217,7 +229,7 @@ class MonitoringService:
             # Perform health check based on service type
             if service_name == "database":
                 # Check database connectivity
-                self.db.execute("SELECT 1")
+                await self.db.execute(text("SELECT 1"))
                 status = HealthStatus.HEALTHY
                 message = "Database connection successful"
                 
@@ -243,7 +255,7 @@ class MonitoringService:
         response_time_ms = int((time.time() - start_time) * 1000)
         
         # Record health check result
-        health_record = self.service_health_repo.record_health_check(
+        health_record = await self.service_health_repo.record_health_check(
             service_name=service_name,
             status=status,
             response_time_ms=response_time_ms,
@@ -259,14 +271,14 @@ class MonitoringService:
             "timestamp": health_record.created_at.isoformat()
         }
     
-    def get_service_status_summary(self) -> Dict[str, Any]:
+    async def get_service_status_summary(self) -> Dict[str, Any]:
         """Get status summary for all monitored services."""
         
         services = ["database", "redis", "celery", "api"]
         service_statuses = {}
         
         for service in services:
-            latest_check = self.service_health_repo.get_latest_health_check(service)
+            latest_check = await self.service_health_repo.get_latest_health_check(service)
             if latest_check:
                 service_statuses[service] = {
                     "status": latest_check.status,
@@ -298,7 +310,7 @@ class MonitoringService:
             "healthy_services": len(services) - len(unhealthy_services)
         }
     
-    def track_rate_limit(
+    async def track_rate_limit(
         self,
         identifier: str,
         identifier_type: str,
@@ -308,7 +320,7 @@ class MonitoringService:
         """Track and check rate limiting."""
         
         # Get applicable rate limit policy
-        policy = self.rate_limit_policies_repo.get_applicable_policy(
+        policy = await self.rate_limit_policies_repo.get_applicable_policy(
             endpoint=endpoint,
             identifier_type=identifier_type,
             company_id=company_id
@@ -319,7 +331,7 @@ class MonitoringService:
             return True, {"rate_limited": False, "message": "No rate limit policy"}
         
         # Check current rate limit status
-        is_allowed, remaining_requests, reset_time = self.rate_limit_repo.check_rate_limit(
+        is_allowed, remaining_requests, reset_time = await self.rate_limit_repo.check_rate_limit(
             identifier=identifier,
             identifier_type=identifier_type,
             endpoint=endpoint,
@@ -328,7 +340,7 @@ class MonitoringService:
         )
         
         # Record the rate limit check
-        self.rate_limit_repo.record_request(
+        await self.rate_limit_repo.record_request(
             identifier=identifier,
             identifier_type=identifier_type,
             endpoint=endpoint,
@@ -346,16 +358,16 @@ class MonitoringService:
             }
         }
     
-    def get_rate_limit_statistics(
+    async def get_rate_limit_statistics(
         self,
         hours: int = 24,
         company_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get rate limiting statistics."""
         
-        return self.rate_limit_repo.get_rate_limit_statistics(hours, company_id)
+        return await self.rate_limit_repo.get_rate_limit_statistics(hours, company_id)
     
-    def record_security_event(
+    async def record_security_event(
         self,
         event_type: SecurityEventType,
         description: str,
@@ -367,7 +379,7 @@ class MonitoringService:
     ) -> str:
         """Record a security event."""
         
-        event = self.security_events_repo.record_event(
+        event = await self.security_events_repo.record_event(
             event_type=event_type,
             description=description,
             severity=severity,
@@ -379,7 +391,7 @@ class MonitoringService:
         
         return str(event.id)
     
-    def get_security_events(
+    async def get_security_events(
         self,
         hours: int = 24,
         severity: Optional[str] = None,
@@ -388,7 +400,7 @@ class MonitoringService:
     ) -> List[Dict[str, Any]]:
         """Get recent security events."""
         
-        events = self.security_events_repo.get_recent_events(
+        events = await self.security_events_repo.get_recent_events(
             hours=hours,
             severity=severity,
             event_type=event_type,
@@ -409,35 +421,35 @@ class MonitoringService:
             for event in events
         ]
     
-    def get_security_summary(
+    async def get_security_summary(
         self,
         hours: int = 24,
         company_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get security events summary."""
         
-        return self.security_events_repo.get_security_summary(hours, company_id)
+        return await self.security_events_repo.get_security_summary(hours, company_id)
     
-    def get_monitoring_dashboard(
+    async def get_monitoring_dashboard(
         self,
         company_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get comprehensive monitoring dashboard data."""
         
         # System health
-        system_health = self.get_system_health_status()
+        system_health = await self.get_system_health_status()
         
         # Service status
-        service_status = self.get_service_status_summary()
+        service_status = await self.get_service_status_summary()
         
         # API metrics
-        api_metrics = self.get_api_metrics_summary(hours=24, company_id=company_id)
+        api_metrics = await self.get_api_metrics_summary(hours=24, company_id=company_id)
         
         # Security events
-        security_summary = self.get_security_summary(hours=24, company_id=company_id)
+        security_summary = await self.get_security_summary(hours=24, company_id=company_id)
         
         # Rate limiting stats
-        rate_limit_stats = self.get_rate_limit_statistics(hours=24, company_id=company_id)
+        rate_limit_stats = await self.get_rate_limit_statistics(hours=24, company_id=company_id)
         
         return {
             "timestamp": datetime.utcnow().isoformat(),
@@ -448,7 +460,7 @@ class MonitoringService:
             "rate_limiting": rate_limit_stats
         }
     
-    def create_rate_limit_policy(
+    async def create_rate_limit_policy(
         self,
         name: str,
         endpoint_pattern: str,
@@ -461,7 +473,7 @@ class MonitoringService:
     ) -> str:
         """Create a new rate limiting policy."""
         
-        policy = self.rate_limit_policies_repo.create_policy(
+        policy = await self.rate_limit_policies_repo.create_policy(
             name=name,
             endpoint_pattern=endpoint_pattern,
             identifier_type=identifier_type,
@@ -474,22 +486,22 @@ class MonitoringService:
         
         return str(policy.id)
     
-    def update_rate_limit_policy(
+    async def update_rate_limit_policy(
         self,
         policy_id: str,
         **updates
     ) -> bool:
         """Update a rate limiting policy."""
         
-        return self.rate_limit_policies_repo.update_policy(policy_id, updates)
+        return await self.rate_limit_policies_repo.update_policy(policy_id, updates)
     
-    def get_rate_limit_policies(
+    async def get_rate_limit_policies(
         self,
         company_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get rate limiting policies."""
         
-        policies = self.rate_limit_policies_repo.get_active_policies(company_id)
+        policies = await self.rate_limit_policies_repo.get_active_policies(company_id)
         
         return [
             {
@@ -505,7 +517,7 @@ class MonitoringService:
             for policy in policies
         ]
     
-    def cleanup_old_metrics(
+    async def cleanup_old_metrics(
         self,
         days: int = 30
     ) -> Dict[str, int]:
@@ -514,16 +526,16 @@ class MonitoringService:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
         # Clean up old API metrics
-        api_deleted = self.api_metrics_repo.cleanup_old_metrics(cutoff_date)
+        api_deleted = await self.api_metrics_repo.cleanup_old_metrics(cutoff_date)
         
         # Clean up old system metrics
-        system_deleted = self.system_metrics_repo.cleanup_old_metrics(cutoff_date)
+        system_deleted = await self.system_metrics_repo.cleanup_old_metrics(cutoff_date)
         
         # Clean up old health checks
-        health_deleted = self.service_health_repo.cleanup_old_health_checks(cutoff_date)
+        health_deleted = await self.service_health_repo.cleanup_old_health_checks(cutoff_date)
         
         # Clean up old rate limit tracking
-        rate_limit_deleted = self.rate_limit_repo.cleanup_old_tracking(cutoff_date)
+        rate_limit_deleted = await self.rate_limit_repo.cleanup_old_tracking(cutoff_date)
         
         return {
             "api_metrics_deleted": api_deleted,
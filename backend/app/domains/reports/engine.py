@@ -0,0 +1,396 @@
+"""
+Motor de execução de relatórios
+
+Compila ``query_config``, filtros e agregações de um relatório em SQL sobre
+a fonte de dados declarada (sempre restrita à empresa), lê as linhas em
+lotes via cursor no servidor e serializa resultados comprimidos para cache.
+
+Formato de ``query_config``::
+
+    {
+        "columns": ["title", "status"],
+        "group_by": ["status", {"field": "created_at", "interval": "month"}],
+        "order_by": ["-total"],
+        "limit": 500
+    }
+
+Filtros: ``{"status": "open"}``, ``{"status": ["open", "closed"]}`` ou
+``{"estimated_value": {"gte": 1000}}``; valores ``{"param": "nome"}`` são
+lidos de ``parameters``. Agregações: ``{"total": "count"}`` ou
+``{"valor": {"function": "sum", "field": "estimated_value"}}``.
+"""
+
+import base64
+import hashlib
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.domains.audit.models import AuditLog, FormSubmission
+from app.domains.documents.models import Document
+from app.domains.kanban.models import Board, Task
+from app.domains.tenders.models import Quote, Tender
+from app.shared.common.exceptions import BusinessException
+
+# Linhas lidas do cursor no servidor a cada lote
+REPORT_STREAM_BATCH_SIZE = 1000
+
+# Versão do formato do resultado; incrementar invalida o cache
+REPORT_RESULT_VERSION = 1
+
+AGGREGATE_FUNCTIONS: Dict[str, Callable[[ColumnElement], ColumnElement]] = {
+    "count": func.count,
+    "count_distinct": lambda column: func.count(column.distinct()),
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+}
+
+DATE_INTERVALS = {"hour", "day", "week", "month", "quarter", "year"}
+
+FILTER_OPERATORS: Dict[str, Callable[[ColumnElement, Any], ColumnElement]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "contains": lambda column, value: column.icontains(value, autoescape=True),
+    "is_null": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+
+class ReportDataSource:
+    """Fonte de dados consultável por relatórios"""
+
+    def __init__(
+        self,
+        model: Any,
+        scope: Callable[[Select, UUID], Select],
+        config_filters: Optional[Dict[str, str]] = None,
+        hidden_columns: tuple = (),
+    ):
+        self.model = model
+        self.scope = scope
+        # Chaves de query_config que restringem a consulta (ex.: board_id)
+        self.config_filters = config_filters or {}
+        self.columns = {
+            column.key: getattr(model, column.key)
+            for column in model.__table__.columns
+            if column.key not in hidden_columns
+        }
+
+    def column(self, name: str) -> ColumnElement:
+        """Coluna permitida pelo nome, ou BusinessException"""
+        try:
+            return self.columns[name]
+        except (KeyError, TypeError):
+            raise BusinessException(f"Campo desconhecido para o relatório: {name}")
+
+
+DATA_SOURCES: Dict[str, ReportDataSource] = {
+    "tenders": ReportDataSource(
+        Tender,
+        lambda query, company_id: query.where(
+            Tender.company_id == company_id, Tender.deleted_at.is_(None)
+        ),
+        hidden_columns=("search_vector",),
+    ),
+    "quotes": ReportDataSource(
+        Quote,
+        lambda query, company_id: query.join(Tender, Quote.tender_id == Tender.id).where(
+            Tender.company_id == company_id, Quote.deleted_at.is_(None)
+        ),
+        config_filters={"tender_id": "tender_id"},
+    ),
+    "tasks": ReportDataSource(
+        Task,
+        lambda query, company_id: query.join(Board, Task.board_id == Board.id).where(
+            Board.company_id == company_id, Task.deleted_at.is_(None)
+        ),
+        config_filters={"board_id": "board_id"},
+    ),
+    "forms": ReportDataSource(
+        FormSubmission,
+        lambda query, company_id: query.where(FormSubmission.company_id == company_id),
+        config_filters={"form_id": "form_template_id"},
+    ),
+    "documents": ReportDataSource(
+        Document,
+        lambda query, company_id: query.where(
+            Document.company_id == company_id, Document.deleted_at.is_(None)
+        ),
+    ),
+    "audit": ReportDataSource(
+        AuditLog,
+        lambda query, company_id: query.where(AuditLog.company_id == company_id),
+    ),
+}
+
+
+def get_data_source(name: str) -> ReportDataSource:
+    """Fonte de dados registrada pelo nome"""
+    source = DATA_SOURCES.get(name)
+    if source is None:
+        raise BusinessException(f"Fonte de dados não suportada: {name}")
+    return source
+
+
+def compile_report_query(
+    data_source: str,
+    query_config: Dict[str, Any],
+    filters: Optional[Dict[str, Any]],
+    aggregations: Optional[Dict[str, Any]],
+    parameters: Optional[Dict[str, Any]],
+    company_id: UUID,
+    max_rows: int,
+) -> Select:
+    """
+    Compila a configuração do relatório em um SELECT restrito à empresa
+
+    Sem agregações nem agrupamento, retorna as colunas pedidas linha a linha;
+    caso contrário, agrupa pelas colunas de ``group_by`` e calcula as
+    agregações. Busca ``limit + 1`` linhas para detectar truncamento.
+    """
+    source = get_data_source(data_source)
+
+    group_columns = [_group_column(source, spec) for spec in query_config.get("group_by") or []]
+    aggregate_columns = [
+        _aggregate_column(source, alias, spec)
+        for alias, spec in (aggregations or {}).items()
+    ]
+
+    if group_columns or aggregate_columns:
+        query = select(*group_columns, *aggregate_columns).select_from(source.model)
+        if group_columns:
+            query = query.group_by(*group_columns)
+    else:
+        names = query_config.get("columns") or list(source.columns)
+        query = select(*(source.column(name).label(name) for name in names))
+
+    query = source.scope(query, company_id)
+
+    for key, field in source.config_filters.items():
+        if query_config.get(key) is not None:
+            column = source.column(field)
+            query = query.where(column == _coerce(column, query_config[key]))
+
+    for field, condition in (filters or {}).items():
+        query = query.where(_filter_clause(source.column(field), condition, parameters))
+
+    output = {column.key: column for column in query.selected_columns}
+    for spec in query_config.get("order_by") or []:
+        if not isinstance(spec, str):
+            raise BusinessException(f"Ordenação inválida: {spec}")
+        descending = spec.startswith("-")
+        name = spec.lstrip("-")
+        column = output.get(name)
+        if column is None:
+            column = source.column(name)
+        query = query.order_by(column.desc() if descending else column.asc())
+
+    return query.limit(report_row_limit(query_config, max_rows) + 1)
+
+
+def report_row_limit(query_config: Dict[str, Any], max_rows: int) -> int:
+    """Limite de linhas do relatório, nunca acima de max_rows"""
+    try:
+        limit = int(query_config.get("limit") or max_rows)
+    except (TypeError, ValueError):
+        raise BusinessException("Limite de linhas inválido")
+    return max(1, min(limit, max_rows))
+
+
+def validate_report_config(
+    data_source: str,
+    query_config: Dict[str, Any],
+    filters: Optional[Dict[str, Any]] = None,
+    aggregations: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Valida a configuração compilando-a sem executar"""
+    compile_report_query(
+        data_source, query_config, filters, aggregations,
+        parameters=None, company_id=UUID(int=0), max_rows=1,
+    )
+
+
+async def stream_report_rows(
+    session: AsyncSession,
+    query: Select,
+    batch_size: int = REPORT_STREAM_BATCH_SIZE,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Lê o resultado em lotes via cursor no servidor, já serializável em JSON"""
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.mappings().partitions(batch_size):
+        yield [
+            {key: _jsonable(value) for key, value in row.items()}
+            for row in partition
+        ]
+
+
+def result_cache_key(
+    report_id: UUID,
+    report_version: Optional[datetime],
+    filters: Optional[Dict[str, Any]],
+    parameters: Optional[Dict[str, Any]],
+) -> str:
+    """Chave de cache do resultado por relatório, versão, filtros e parâmetros"""
+    payload = json.dumps(
+        [
+            REPORT_RESULT_VERSION,
+            report_version.isoformat() if report_version else None,
+            filters or {},
+            parameters or {},
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"report:result:{report_id}:{digest}"
+
+
+def pack_result(result: Dict[str, Any]) -> str:
+    """Serializa o resultado em JSON comprimido (zlib) e codificado em base64"""
+    payload = json.dumps(result, separators=(",", ":"), default=str).encode()
+    return base64.b64encode(zlib.compress(payload, 6)).decode()
+
+
+def unpack_result(packed: str) -> Dict[str, Any]:
+    """Inverso de pack_result"""
+    return json.loads(zlib.decompress(base64.b64decode(packed)))
+
+
+def _group_column(source: ReportDataSource, spec: Any) -> ColumnElement:
+    """Coluna de agrupamento, opcionalmente truncada por intervalo de data"""
+    if isinstance(spec, dict):
+        field = spec.get("field")
+        interval = spec.get("interval")
+        if interval not in DATE_INTERVALS:
+            raise BusinessException(f"Intervalo de agrupamento inválido: {interval}")
+        return func.date_trunc(interval, source.column(field)).label(field)
+    return source.column(spec).label(spec)
+
+
+def _aggregate_column(source: ReportDataSource, alias: str, spec: Any) -> ColumnElement:
+    """Coluna de agregação a partir de "count" ou {"function", "field"}"""
+    if isinstance(spec, str):
+        spec = {"function": spec}
+    if not isinstance(spec, dict):
+        raise BusinessException(f"Agregação inválida: {alias}")
+
+    name = spec.get("function")
+    function = AGGREGATE_FUNCTIONS.get(name)
+    if function is None:
+        raise BusinessException(f"Função de agregação não suportada: {name}")
+
+    field = spec.get("field")
+    if field is None:
+        if name != "count":
+            raise BusinessException(f"Agregação {alias} exige o campo 'field'")
+        column = source.model.id
+    else:
+        column = source.column(field)
+
+    return function(column).label(alias)
+
+
+def _filter_clause(
+    column: ColumnElement,
+    condition: Any,
+    parameters: Optional[Dict[str, Any]],
+) -> ColumnElement:
+    """Converte a condição de um filtro em cláusula SQL"""
+    if isinstance(condition, list):
+        condition = {"in": condition}
+    elif not isinstance(condition, dict) or _is_parameter(condition):
+        condition = {"eq": condition}
+
+    clauses = []
+    for operator, value in condition.items():
+        build = FILTER_OPERATORS.get(operator)
+        if build is None:
+            raise BusinessException(f"Operador de filtro não suportado: {operator}")
+
+        if _is_parameter(value):
+            if parameters is None:
+                # Validação: o valor só é conhecido na execução
+                continue
+            value = _bind_parameter(value, parameters)
+
+        if operator in ("in", "not_in"):
+            value = [_coerce(column, item) for item in value]
+        elif operator not in ("contains", "is_null"):
+            value = _coerce(column, value)
+        clauses.append(build(column, value))
+
+    return and_(true(), *clauses)
+
+
+def _is_parameter(value: Any) -> bool:
+    """Indica se o valor é uma referência {"param": nome}"""
+    return isinstance(value, dict) and "param" in value
+
+
+def _bind_parameter(value: Dict[str, Any], parameters: Dict[str, Any]) -> Any:
+    """Substitui {"param": nome} pelo valor informado na execução"""
+    name = value["param"]
+    if name not in parameters:
+        raise BusinessException(f"Parâmetro obrigatório não informado: {name}")
+    return parameters[name]
+
+
+def _coerce(column: ColumnElement, value: Any) -> Any:
+    """Converte valores vindos de JSON para o tipo Python da coluna"""
+    if value is None:
+        return None
+
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None and not isinstance(value, enum_class):
+        try:
+            return enum_class(value)
+        except ValueError:
+            raise BusinessException(f"Valor inválido para {column.key}: {value}")
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if isinstance(value, python_type):
+        return value
+
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type in (UUID, Decimal, int, float):
+            return python_type(value)
+    except (TypeError, ValueError):
+        raise BusinessException(f"Valor inválido para {column.key}: {value}")
+    return value
+
+
+def _jsonable(value: Any) -> Any:
+    """Converte valores do banco para tipos serializáveis em JSON"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
@@ -2,8 +2,11 @@
 Serviços para domínio de Relatórios e Analytics
 """
 
+import asyncio
 import json
 import secrets
+import time
+import zlib
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
@@ -11,6 +14,12 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.domains.reports.engine import (
+    compile_report_query, pack_result, report_row_limit, result_cache_key,
+    stream_report_rows, unpack_result, validate_report_config
+)
 from app.domains.reports.models import (
     Report, ReportExecution, ReportSchedule, ReportShare,
     Dashboard, DashboardWidget, KPI, KPIHistory, DataExport,
@@ -50,7 +59,12 @@ class ReportService:
         """Cria novo relatório"""
         
         # Validar configuração da query
-        await self._validate_query_config(report_data.query_config, report_data.data_source)
+        await self._validate_query_config(
+            report_data.query_config,
+            report_data.data_source,
+            report_data.filters,
+            report_data.aggregations
+        )
         
         report = Report(
             **report_data.model_dump(),
@@ -82,9 +96,14 @@ class ReportService:
             )
         
         # Validar nova configuração se fornecida
-        if update_data.query_config is not None:
-            data_source = update_data.data_source or report.data_source
-            await self._validate_query_config(update_data.query_config, data_source)
+        config_fields = ("data_source", "query_config", "filters", "aggregations")
+        if any(getattr(update_data, field) is not None for field in config_fields):
+            await self._validate_query_config(
+                update_data.query_config if update_data.query_config is not None else report.query_config,
+                update_data.data_source or report.data_source,
+                update_data.filters if update_data.filters is not None else report.filters,
+                update_data.aggregations if update_data.aggregations is not None else report.aggregations
+            )
         
         update_dict = update_data.model_dump(exclude_unset=True)
         return await self.repository.update(report_id, update_dict)
@@ -152,32 +171,36 @@ class ReportService:
         execution = await self.execution_repository.create(execution)
         
         try:
+            # Filtros da execução sobrepõem os filtros salvos no relatório
+            filters = {**(report.filters or {}), **(execute_request.filters or {})}
+            parameters = execute_request.parameters or {}
+            cache_key = result_cache_key(report.id, report.updated_at, filters, parameters)
+            
             # Verificar cache se não for override
-            if not execute_request.cache_override and report.last_cached_at:
-                cache_age = datetime.utcnow() - report.last_cached_at
-                if cache_age.total_seconds() < (report.cache_duration_minutes * 60):
-                    # Usar dados em cache (simulado)
-                    result_data = await self._get_cached_data(report_id)
-                    if result_data:
-                        await self._complete_execution(execution.id, result_data)
-                        return result_data, execution.id
+            if not execute_request.cache_override:
+                result_data = await self._get_cached_data(cache_key)
+                if result_data:
+                    await self._complete_execution(execution.id, execution_start, result_data, cached=True)
+                    return result_data, execution.id
             
             # Executar query
-            result_data = await self._execute_query(
-                report, 
-                execute_request.filters, 
-                execute_request.parameters
-            )
+            result_data = await self._execute_query(report, filters, parameters)
             
-            # Atualizar cache
-            if not execute_request.cache_override:
+            # Atualizar cache (também no override, que apenas ignora a leitura)
+            if await self._cache_result(cache_key, result_data, report.cache_duration_minutes):
                 await self.repository.update_cache_timestamp(report_id)
             
             # Completar execução
-            await self._complete_execution(execution.id, result_data)
+            await self._complete_execution(execution.id, execution_start, result_data)
             
             return result_data, execution.id
             
+        except BusinessException as e:
+            await self._fail_execution(execution.id, e.message)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=e.message
+            )
         except Exception as e:
             # Marcar execução como falha
             await self._fail_execution(execution.id, str(e))
@@ -261,7 +284,13 @@ class ReportService:
             "execution_trends": []  # TODO: Implementar tendências
         }
 
-    async def _validate_query_config(self, query_config: Dict[str, Any], data_source: str) -> None:
+    async def _validate_query_config(
+        self,
+        query_config: Dict[str, Any],
+        data_source: str,
+        filters: Optional[Dict[str, Any]] = None,
+        aggregations: Optional[Dict[str, Any]] = None
+    ) -> None:
         """Valida configuração da query"""
         if not query_config:
             raise BusinessException("Configuração de query é obrigatória")
@@ -273,7 +302,9 @@ class ReportService:
         elif data_source == "tasks":
             if "project_id" not in query_config and "board_id" not in query_config:
                 raise BusinessException("project_id ou board_id é obrigatório para relatórios de tarefas")
-        # Adicionar mais validações conforme necessário
+        
+        # Campos, filtros e agregações precisam compilar para a fonte de dados
+        validate_report_config(data_source, query_config, filters, aggregations)
 
     async def _execute_query(
         self,
@@ -281,36 +312,84 @@ class ReportService:
         filters: Dict[str, Any],
         parameters: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Executa query do relatório"""
-        # Simulação - implementar integração real com fontes de dados
+        """Executa query do relatório, lendo as linhas em lotes"""
+        started = time.perf_counter()
+        query = compile_report_query(
+            report.data_source,
+            report.query_config,
+            filters,
+            report.aggregations,
+            parameters,
+            report.company_id,
+            settings.report_max_rows
+        )
+        row_limit = report_row_limit(report.query_config, settings.report_max_rows)
+        
+        rows: List[Dict[str, Any]] = []
+        async for batch in stream_report_rows(self.session, query):
+            rows.extend(batch)
+        
+        # A query busca uma linha além do limite para detectar truncamento
+        truncated = len(rows) > row_limit
+        del rows[row_limit:]
+        
         return {
-            "data": [
-                {"id": 1, "name": "Item 1", "value": 100},
-                {"id": 2, "name": "Item 2", "value": 200},
-                {"id": 3, "name": "Item 3", "value": 300}
-            ],
-            "total_rows": 3,
-            "execution_time_ms": 150
+            "data": rows,
+            "columns": list(query.selected_columns.keys()),
+            "total_rows": len(rows),
+            "truncated": truncated,
+            "cached": False,
+            "generated_at": datetime.utcnow().isoformat(),
+            "execution_time_ms": int((time.perf_counter() - started) * 1000)
         }
 
-    async def _get_cached_data(self, report_id: UUID) -> Optional[Dict[str, Any]]:
-        """Obtém dados em cache"""
-        # Implementar sistema de cache real
-        return None
+    async def _get_cached_data(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Obtém resultado em cache (JSON comprimido no Redis)"""
+        packed = await redis_client.get(cache_key)
+        if not packed:
+            return None
+        
+        try:
+            result_data = await asyncio.to_thread(unpack_result, packed)
+        except (ValueError, zlib.error):
+            await redis_client.delete(cache_key)
+            return None
+        
+        result_data["cached"] = True
+        return result_data
+
+    async def _cache_result(
+        self,
+        cache_key: str,
+        result_data: Dict[str, Any],
+        cache_duration_minutes: int
+    ) -> bool:
+        """Armazena o resultado comprimido, respeitando o tamanho máximo"""
+        if not cache_duration_minutes or cache_duration_minutes <= 0:
+            return False
+        
+        packed = await asyncio.to_thread(pack_result, result_data)
+        if len(packed) > settings.report_cache_max_bytes:
+            return False
+        
+        return await redis_client.set(cache_key, packed, cache_duration_minutes * 60)
 
     async def _complete_execution(
         self,
         execution_id: UUID,
-        result_data: Dict[str, Any]
+        execution_start: datetime,
+        result_data: Dict[str, Any],
+        cached: bool = False
     ) -> None:
         """Completa execução com sucesso"""
         execution_end = datetime.utcnow()
         
         update_data = {
             "execution_end": execution_end,
-            "duration_ms": result_data.get("execution_time_ms", 0),
+            "duration_ms": int((execution_end - execution_start).total_seconds() * 1000),
             "status": "completed",
-            "result_data": result_data,
+            # Execuções servidas do cache não duplicam o resultado no banco
+            "result_data": None if cached else result_data,
             "row_count": result_data.get("total_rows", 0)
         }
         
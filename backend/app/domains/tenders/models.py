@@ -9,9 +9,9 @@ from uuid import UUID
 
 from sqlalchemy import (
     Column, String, Text, Boolean, DateTime, Integer, 
-    Numeric, Index, ForeignKey, Enum as SQLEnum
+    Numeric, Index, ForeignKey, Enum as SQLEnum, Computed, DDL, event
 )
-from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 import enum
 
@@ -23,6 +23,32 @@ from app.shared.common.base_models import (
 )
 
 
+# Full-text search: Portuguese stemming with accent folding
+TENDER_SEARCH_CONFIG = "portuguese_unaccent"
+
+TENDER_SEARCH_CONFIG_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{TENDER_SEARCH_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {TENDER_SEARCH_CONFIG} (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION {TENDER_SEARCH_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+)
+
+TENDER_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TENDER_SEARCH_CONFIG}'::regconfig, coalesce(tender_number, '')), 'A') || "
+    f"setweight(to_tsvector('{TENDER_SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TENDER_SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
 class TenderStatus(str, enum.Enum):
     """Tender status enumeration."""
     DRAFT = "draft"
@@ -107,6 +133,13 @@ class Tender(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
       # Metadata
     tags = Column(JSONB, nullable=True)  # Tender tags
     tender_metadata = Column(JSONB, nullable=True)  # Additional metadata
+    
+    # Full-text search document, kept in sync by the database
+    search_vector = Column(TSVECTOR, Computed(TENDER_SEARCH_VECTOR_SQL, persisted=True))
+    
+    # Populated by ranked searches only (not persisted)
+    search_rank = None
+    search_highlight = None
       # Relationships
     company = relationship("Company", backref="tenders")
     ai_analyses = relationship("TenderAIAnalysis", back_populates="tender", cascade="all, delete-orphan")
@@ -118,9 +151,24 @@ class Tender(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
         Index("idx_tenders_deadline", "submission_deadline"),
         Index("idx_tenders_public", "is_public", "status"),
         Index("idx_tenders_published", "published_at"),
+        # Keyset pagination over (created_at, id)
+        Index("idx_tenders_created_id", "created_at", "id"),
+        Index("idx_tenders_company_created_id", "company_id", "created_at", "id"),
+        # Full-text and tender number (trigram) search
+        Index("idx_tenders_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_tenders_number_trgm", "tender_number",
+            postgresql_using="gin",
+            postgresql_ops={"tender_number": "gin_trgm_ops"}
+        ),
     )
 
 
+# The text search configuration must exist before the generated column
+for _statement in TENDER_SEARCH_CONFIG_DDL:
+    event.listen(Tender.__table__, "before_create", DDL(_statement))
+
+
 class TenderDocument(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
     """Tender document model for storing tender-related documents."""
     
@@ -211,6 +259,9 @@ class Quote(BaseModel, TimestampMixin, SoftDeleteMixin, UserTrackingMixin):
         Index("idx_quotes_amount", "total_amount"),
         Index("idx_quotes_submitted", "submitted_at"),
         Index("idx_quotes_evaluation", "score"),
+        # Keyset pagination over (created_at, id)
+        Index("idx_quotes_tender_created_id", "tender_id", "created_at", "id"),
+        Index("idx_quotes_supplier_created_id", "supplier_id", "created_at", "id"),
     )
 
 
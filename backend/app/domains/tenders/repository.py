@@ -7,7 +7,8 @@ from typing import Optional, List, Dict, Any
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select, update, delete, func, desc, asc
+from sqlalchemy import and_, or_, select, update, delete, func, desc, asc, cast
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,10 +21,17 @@ from app.domains.tenders.models import (
     TenderWatch,
     TenderStatus,
     TenderType,
-    QuoteStatus
+    QuoteStatus,
+    TENDER_SEARCH_CONFIG
 )
 from app.shared.common.base_repository import BaseRepository
 
+# Text search configuration as a typed regconfig argument
+SEARCH_CONFIG = cast(TENDER_SEARCH_CONFIG, REGCONFIG)
+
+# ts_headline options for search result snippets
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
 
 class TenderRepository(BaseRepository[Tender]):
     """Repository for tender operations."""
@@ -48,7 +56,8 @@ class TenderRepository(BaseRepository[Tender]):
         company_id: UUID,
         status: Optional[TenderStatus] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Tender]:
         """Get tenders by company."""
         query = select(Tender).where(
@@ -61,7 +70,7 @@ class TenderRepository(BaseRepository[Tender]):
         if status:
             query = query.where(Tender.status == status)
         
-        query = query.offset(skip).limit(limit).order_by(desc(Tender.created_at))
+        query = self.paginate(query, skip, limit, cursor)
         
         result = await self.session.execute(query)
         return result.scalars().all()
@@ -80,18 +89,27 @@ class TenderRepository(BaseRepository[Tender]):
         is_public: Optional[bool] = None,
         company_id: Optional[UUID] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Tender]:
-        """Search tenders with filters."""
+        """Search tenders with filters.
+        
+        A text query matches the full-text index (title, description and
+        tender number) or a tender number substring (trigram index). Results
+        are ranked by relevance with highlighted snippets unless a cursor is
+        given, in which case keyset order by creation date applies.
+        """
         query = select(Tender).where(Tender.deleted_at.is_(None))
         
+        ts_query = None
         if search_query:
-            search_filter = or_(
-                Tender.title.ilike(f"%{search_query}%"),
-                Tender.description.ilike(f"%{search_query}%"),
-                Tender.tender_number.ilike(f"%{search_query}%")
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search_query)
+            query = query.where(
+                or_(
+                    Tender.search_vector.op("@@")(ts_query),
+                    Tender.tender_number.icontains(search_query, autoescape=True)
+                )
             )
-            query = query.where(search_filter)
         
         if tender_type:
             query = query.where(Tender.tender_type == tender_type)
@@ -123,11 +141,57 @@ class TenderRepository(BaseRepository[Tender]):
         if company_id:
             query = query.where(Tender.company_id == company_id)
         
-        query = query.offset(skip).limit(limit).order_by(desc(Tender.created_at))
+        if ts_query is not None and not cursor:
+            return await self._ranked_search(query, search_query, ts_query, skip, limit)
+        
+        query = self.paginate(query, skip, limit, cursor)
         
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def _ranked_search(
+        self,
+        query,
+        search_query: str,
+        ts_query,
+        skip: int,
+        limit: int
+    ) -> List[Tender]:
+        """Rank matching tenders and build snippets for the requested page."""
+        rank = (
+            func.ts_rank_cd(Tender.search_vector, ts_query)
+            + func.similarity(Tender.tender_number, search_query)
+        ).label("rank")
+        
+        # Rank on the index-backed ids only; snippets are built for one page
+        page = (
+            query.with_only_columns(Tender.id, rank)
+            .order_by(desc(rank), desc(Tender.id))
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        headline = func.ts_headline(
+            SEARCH_CONFIG,
+            func.coalesce(Tender.description, Tender.title),
+            ts_query,
+            SEARCH_HEADLINE_OPTIONS
+        )
+        
+        result = await self.session.execute(
+            select(Tender, page.c.rank, headline)
+            .join(page, Tender.id == page.c.id)
+            .order_by(desc(page.c.rank), desc(Tender.id))
+        )
+        
+        tenders = []
+        for tender, rank_value, snippet in result.all():
+            tender.search_rank = float(rank_value or 0)
+            tender.search_highlight = snippet
+            tenders.append(tender)
+        return tenders
+    
+    
     async def get_public_tenders(
         self,
         skip: int = 0,
@@ -192,35 +256,19 @@ class TenderRepository(BaseRepository[Tender]):
     
     async def get_tender_stats(self, company_id: Optional[UUID] = None) -> Dict[str, Any]:
         """Get tender statistics."""
-        base_query = select(func.count(Tender.id)).where(Tender.deleted_at.is_(None))
-        
+        where = [Tender.deleted_at.is_(None)]
         if company_id:
-            base_query = base_query.where(Tender.company_id == company_id)
-        
-        # Total tenders
-        total_count = await self.session.execute(base_query)
-        
-        # Active tenders
-        active_count = await self.session.execute(
-            base_query.where(Tender.status.in_([TenderStatus.PUBLISHED, TenderStatus.ACTIVE]))
-        )
-        
-        # Draft tenders
-        draft_count = await self.session.execute(
-            base_query.where(Tender.status == TenderStatus.DRAFT)
-        )
-        
-        # Closed tenders
-        closed_count = await self.session.execute(
-            base_query.where(Tender.status.in_([TenderStatus.CLOSED, TenderStatus.AWARDED]))
+            where.append(Tender.company_id == company_id)
+        
+        return await self.aggregate_stats(
+            counts={
+                "total_tenders": None,
+                "active_tenders": Tender.status.in_([TenderStatus.PUBLISHED, TenderStatus.ACTIVE]),
+                "draft_tenders": Tender.status == TenderStatus.DRAFT,
+                "closed_tenders": Tender.status.in_([TenderStatus.CLOSED, TenderStatus.AWARDED]),
+            },
+            where=where,
         )
-        
-        return {
-            "total_tenders": total_count.scalar() or 0,
-            "active_tenders": active_count.scalar() or 0,
-            "draft_tenders": draft_count.scalar() or 0,
-            "closed_tenders": closed_count.scalar() or 0,
-        }
 
 
 class QuoteRepository(BaseRepository[Quote]):
@@ -234,7 +282,8 @@ class QuoteRepository(BaseRepository[Quote]):
         tender_id: UUID,
         status: Optional[QuoteStatus] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Quote]:
         """Get quotes for a tender."""
         query = select(Quote).where(
@@ -247,7 +296,7 @@ class QuoteRepository(BaseRepository[Quote]):
         if status:
             query = query.where(Quote.status == status)
         
-        query = query.offset(skip).limit(limit).order_by(desc(Quote.created_at))
+        query = self.paginate(query, skip, limit, cursor)
         
         result = await self.session.execute(query)
         return result.scalars().all()
@@ -257,12 +306,13 @@ class QuoteRepository(BaseRepository[Quote]):
         company_id: UUID,
         status: Optional[QuoteStatus] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Quote]:
-        """Get quotes by company."""
+        """Get quotes submitted by a company (as supplier)."""
         query = select(Quote).where(
             and_(
-                Quote.company_id == company_id,
+                Quote.supplier_id == company_id,
                 Quote.deleted_at.is_(None)
             )
         )
@@ -270,7 +320,7 @@ class QuoteRepository(BaseRepository[Quote]):
         if status:
             query = query.where(Quote.status == status)
         
-        query = query.offset(skip).limit(limit).order_by(desc(Quote.created_at))
+        query = self.paginate(query, skip, limit, cursor)
         
         result = await self.session.execute(query)
         return result.scalars().all()
@@ -285,7 +335,7 @@ class QuoteRepository(BaseRepository[Quote]):
             select(Quote).where(
                 and_(
                     Quote.tender_id == tender_id,
-                    Quote.company_id == company_id,
+                    Quote.supplier_id == company_id,
                     Quote.deleted_at.is_(None)
                 )
             )
@@ -328,49 +378,28 @@ class QuoteRepository(BaseRepository[Quote]):
         return quote
     
     async def get_quote_stats(self, company_id: Optional[UUID] = None) -> Dict[str, Any]:
-        """Get quote statistics."""
-        base_query = select(func.count(Quote.id)).where(Quote.deleted_at.is_(None))
-        
+        """Get quote statistics, for one supplier company when given."""
+        where = [Quote.deleted_at.is_(None)]
         if company_id:
-            base_query = base_query.where(Quote.company_id == company_id)
-        
-        # Total quotes
-        total_count = await self.session.execute(base_query)
-        
-        # Submitted quotes
-        submitted_count = await self.session.execute(
-            base_query.where(Quote.status == QuoteStatus.SUBMITTED)
+            where.append(Quote.supplier_id == company_id)
+        
+        stats = await self.aggregate_stats(
+            counts={
+                "total_quotes": None,
+                "submitted_quotes": Quote.status == QuoteStatus.SUBMITTED,
+                "draft_quotes": Quote.status == QuoteStatus.DRAFT,
+                "awarded_quotes": Quote.status == QuoteStatus.AWARDED,
+            },
+            sums={"total_value": Quote.total_amount},
+            where=where,
         )
         
-        # Draft quotes
-        draft_count = await self.session.execute(
-            base_query.where(Quote.status == QuoteStatus.DRAFT)
-        )
+        total_value = stats["total_value"] or Decimal('0')
+        total_quotes = stats["total_quotes"]
+        stats["total_value"] = total_value
+        stats["average_quote_value"] = total_value / total_quotes if total_quotes > 0 else Decimal('0')
         
-        # Awarded quotes
-        awarded_count = await self.session.execute(
-            base_query.where(Quote.status == QuoteStatus.AWARDED)
-        )
-        
-        # Total value
-        value_query = select(func.sum(Quote.total_amount)).where(Quote.deleted_at.is_(None))
-        if company_id:
-            value_query = value_query.where(Quote.company_id == company_id)
-        
-        total_value_result = await self.session.execute(value_query)
-        total_value = total_value_result.scalar() or Decimal('0')
-        
-        total_quotes = total_count.scalar() or 0
-        average_value = total_value / total_quotes if total_quotes > 0 else Decimal('0')
-        
-        return {
-            "total_quotes": total_quotes,
-            "submitted_quotes": submitted_count.scalar() or 0,
-            "draft_quotes": draft_count.scalar() or 0,
-            "awarded_quotes": awarded_count.scalar() or 0,
-            "total_value": total_value,
-            "average_quote_value": average_value,
-        }
+        return stats
 
 
 class QuoteItemRepository(BaseRepository[QuoteItem]):
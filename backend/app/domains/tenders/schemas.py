@@ -110,6 +110,8 @@ class TenderResponse(TenderBase, TimestampSchema):
     published_at: Optional[datetime] = None
     created_by_id: Optional[UUID] = None
     updated_by_id: Optional[UUID] = None
+    search_rank: Optional[float] = None
+    search_highlight: Optional[str] = None
 
 
 class TenderDetail(TenderResponse):
@@ -137,6 +139,12 @@ class TenderSummary(BaseModel):
     quote_count: Optional[int] = 0
 
 
+class TenderListResponse(BaseModel):
+    """Page of tenders; the next page's cursor is sent in the X-Next-Cursor header."""
+    
+    items: List[TenderResponse]
+
+
 # Quote schemas
 class QuoteItemBase(BaseModel):
     """Base quote item schema."""
@@ -253,6 +261,12 @@ class QuoteSummary(BaseModel):
     delivery_time: Optional[str] = None
 
 
+class QuoteListResponse(BaseModel):
+    """Page of quotes; the next page's cursor is sent in the X-Next-Cursor header."""
+    
+    items: List[QuoteResponse]
+
+
 # Tender document schemas
 class TenderDocumentBase(BaseModel):
     """Base tender document schema."""
@@ -2,9 +2,10 @@
 Tenders service for business logic.
 """
 
+import json
 import secrets
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable
 from decimal import Decimal
 from uuid import UUID
 
@@ -41,6 +42,8 @@ from app.domains.tenders.schemas import (
     TenderWatchCreate
 )
 from app.domains.companies.repository import CompanyUserRepository
+from app.core.config import settings
+from app.core.redis_client import redis_client
 from app.core.exceptions import (
     BusinessError,
     NotFoundError,
@@ -187,7 +190,8 @@ class TenderService(BaseService):
         filters: TenderSearchFilters,
         user_id: Optional[UUID] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Tender]:
         """Search tenders with filters."""
         return await self.tender_repo.search_tenders(
@@ -203,7 +207,8 @@ class TenderService(BaseService):
             is_public=filters.is_public,
             company_id=filters.company_id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
     
     async def get_public_tenders(
@@ -221,19 +226,23 @@ class TenderService(BaseService):
         user_id: UUID,
         status: Optional[TenderStatus] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Tender]:
         """Get tenders for a company."""
         await self._check_company_access(company_id, user_id)
         
         return await self.tender_repo.get_company_tenders(
-            company_id, status, skip, limit
+            company_id, status, skip, limit, cursor
         )
     
     async def get_tender_stats(self, company_id: UUID, user_id: UUID) -> Dict[str, Any]:
         """Get tender statistics for a company."""
         await self._check_company_access(company_id, user_id)
-        return await self.tender_repo.get_tender_stats(company_id)
+        return await self._cached_stats(
+            f"stats:tenders:{company_id}",
+            lambda: self.tender_repo.get_tender_stats(company_id)
+        )
     
     # Quote Management
     async def create_quote(
@@ -369,7 +378,8 @@ class TenderService(BaseService):
         user_id: UUID,
         status: Optional[QuoteStatus] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Quote]:
         """Get quotes for a tender."""
         tender = await self.tender_repo.get(tender_id)
@@ -379,7 +389,7 @@ class TenderService(BaseService):
         # Check if user has access to view quotes
         await self._check_company_access(tender.company_id, user_id)
         
-        return await self.quote_repo.get_tender_quotes(tender_id, status, skip, limit)
+        return await self.quote_repo.get_tender_quotes(tender_id, status, skip, limit, cursor)
     
     async def get_company_quotes(
         self,
@@ -387,17 +397,46 @@ class TenderService(BaseService):
         user_id: UUID,
         status: Optional[QuoteStatus] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Quote]:
         """Get quotes for a company."""
         await self._check_company_access(company_id, user_id)
         
-        return await self.quote_repo.get_company_quotes(company_id, status, skip, limit)
+        return await self.quote_repo.get_company_quotes(company_id, status, skip, limit, cursor)
     
     async def get_quote_stats(self, company_id: UUID, user_id: UUID) -> Dict[str, Any]:
         """Get quote statistics for a company."""
         await self._check_company_access(company_id, user_id)
-        return await self.quote_repo.get_quote_stats(company_id)
+        return await self._cached_stats(
+            f"stats:quotes:{company_id}",
+            lambda: self.quote_repo.get_quote_stats(company_id)
+        )
+    
+    async def _cached_stats(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Serve dashboard statistics from a short-TTL Redis cache."""
+        if settings.stats_cache_ttl <= 0:
+            return await loader()
+        
+        cached = await redis_client.get(key)
+        if cached:
+            try:
+                return json.loads(cached, parse_float=Decimal)
+            except json.JSONDecodeError:
+                pass
+        
+        stats = await loader()
+        # Decimals are written as JSON numbers and read back as Decimal
+        await redis_client.set(
+            key,
+            json.dumps(stats, default=float),
+            ttl=settings.stats_cache_ttl
+        )
+        return stats
     
     # Document Management
     async def create_tender_document(
@@ -11,12 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
-from app.api.middleware import (
-    RequestIDMiddleware,
-    SecurityHeadersMiddleware,
-    RateLimitMiddleware,
-    MetricsMiddleware,
-)
+from app.api.middleware import RequestPipelineMiddleware
 from app.api.v1.endpoints import health
 try:
     from app.api.v1.endpoints import auth, companies, tenders, forms, kanban, documents, monitoring, files, audit
@@ -40,6 +35,11 @@ from app.core.config import settings
 from app.core.database import init_db, close_db
 from app.core.mongodb import init_mongodb, close_mongodb
 from app.core.redis_client import init_redis, close_redis
+from app.core.storage import close_blob_store
+from app.core.hashing import password_hasher
+from app.core.instrumentation import instrument_cache_lookups
+from app.domains.monitoring.recorder import api_metrics_recorder
+from app.domains.auth.api_keys import api_key_auth
 from app.core.logging import setup_logging
 
 logger = logging.getLogger(__name__)
@@ -66,10 +66,18 @@ async def lifespan(app: FastAPI):
             llm_manager = LLMManager()
             await llm_manager.__aenter__()
             app.state.llm_manager = llm_manager
+            
+            # Count LLM cache hits/misses in the per-request metrics
+            from llm.services import cache_service, extraction_cache_service
+            instrument_cache_lookups(cache_service, "get_cached_result")
+            instrument_cache_lookups(extraction_cache_service, "get")
             logger.info("LLM services initialized successfully")
         except Exception as e:
             logger.warning(f"Failed to initialize LLM services: {e}")
     
+    api_key_auth.start()
+    api_metrics_recorder.start()
+    
     logger.info("CotAi Backend started successfully")
     
     yield
@@ -85,10 +93,18 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Error shutting down LLM services: {e}")
     
+    # Flush batched API key usage before the pool closes
+    await api_key_auth.stop()
+    
+    # Write sampled request metrics still buffered
+    await api_metrics_recorder.stop()
+    
     # Close database connections
     await close_db()
     await close_mongodb()
     await close_redis()
+    await close_blob_store()
+    password_hasher.close()
     
     logger.info("CotAi Backend shutdown complete")
 
@@ -120,11 +136,8 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
     
-    # Custom middleware (order matters - first added is outermost)
-    app.add_middleware(MetricsMiddleware)
-    app.add_middleware(RateLimitMiddleware)
-    app.add_middleware(SecurityHeadersMiddleware)
-    app.add_middleware(RequestIDMiddleware)
+    # Request ID, security headers, rate limiting and metrics in one ASGI layer
+    app.add_middleware(RequestPipelineMiddleware)
     
     # Include routers
     app.include_router(
@@ -3,13 +3,15 @@ Repository base para acesso a dados
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar
 
 from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
 from app.shared.common.base_models import BaseModel
+from app.shared.common.pagination import apply_keyset
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -37,8 +39,13 @@ class BaseRepository(Generic[ModelType], ABC):
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[str] = None,
         order_desc: bool = False,
+        cursor: Optional[str] = None,
     ) -> List[ModelType]:
-        """Busca múltiplos registros com filtros e paginação"""
+        """Busca múltiplos registros com filtros e paginação
+        
+        Com ``cursor``, pagina por keyset sobre (created_at, id) e ignora
+        ``skip`` e ``order_by``.
+        """
         query = select(self.model)
         
         # Aplica filtros
@@ -47,6 +54,10 @@ class BaseRepository(Generic[ModelType], ABC):
                 if hasattr(self.model, field):
                     query = query.where(getattr(self.model, field) == value)
         
+        if cursor:
+            result = await self.session.execute(self.paginate(query, limit=limit, cursor=cursor))
+            return result.scalars().all()
+        
         # Aplica ordenação
         if order_by and hasattr(self.model, order_by):
             order_column = getattr(self.model, order_by)
@@ -61,6 +72,19 @@ class BaseRepository(Generic[ModelType], ABC):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    def paginate(
+        self,
+        query: Select,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Select:
+        """Ordena por (created_at, id) e pagina por cursor ou, sem ele, por offset"""
+        query = apply_keyset(query, self.model, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+    
     async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Conta registros com filtros opcionais"""
         query = select(func.count(self.model.id))
@@ -73,6 +97,67 @@ class BaseRepository(Generic[ModelType], ABC):
         result = await self.session.execute(query)
         return result.scalar() or 0
     
+    async def aggregate_stats(
+        self,
+        counts: Optional[Dict[str, Any]] = None,
+        sums: Optional[Dict[str, Any]] = None,
+        where: Optional[Sequence[Any]] = None,
+        group_by: Optional[Any] = None,
+    ) -> Dict[Any, Any]:
+        """Calcula contagens e somas em uma única consulta
+        
+        Args:
+            counts: rótulo -> condição (``None`` conta todos os registros);
+                cada condição vira ``COUNT(*) FILTER (WHERE ...)``
+            sums: rótulo -> coluna, ou tupla (coluna, condição) para somar
+                apenas os registros que atendem à condição
+            where: condições aplicadas a toda a consulta
+            group_by: coluna de agrupamento opcional
+        
+        Returns:
+            Dicionário rótulo -> valor; com ``group_by``, um dicionário por
+            valor da coluna de agrupamento
+        """
+        columns = []
+        
+        for label, condition in (counts or {}).items():
+            aggregate = func.count(self.model.id)
+            if condition is not None:
+                aggregate = aggregate.filter(condition)
+            columns.append(aggregate.label(label))
+        
+        for label, target in (sums or {}).items():
+            column, condition = target if isinstance(target, tuple) else (target, None)
+            aggregate = func.sum(column)
+            if condition is not None:
+                aggregate = aggregate.filter(condition)
+            columns.append(aggregate.label(label))
+        
+        if group_by is not None:
+            columns.insert(0, group_by.label("group_key"))
+        
+        query = select(*columns).select_from(self.model)
+        if where:
+            query = query.where(*where)
+        
+        result = await self.session.execute(
+            query.group_by(group_by) if group_by is not None else query
+        )
+        
+        labels = list(counts or {}) + list(sums or {})
+        
+        def _row_values(row: Any) -> Dict[str, Any]:
+            mapping = row._mapping
+            return {
+                label: mapping[label] if mapping[label] is not None else 0
+                for label in labels
+            }
+        
+        if group_by is None:
+            return _row_values(result.one())
+        
+        return {row.group_key: _row_values(row) for row in result}
+    
     async def create(self, obj_in: CreateSchemaType) -> ModelType:
         """Cria novo registro"""
         if hasattr(obj_in, 'model_dump'):
@@ -0,0 +1,157 @@
+"""
+Ordenação por chaves fracionárias lexicográficas
+
+Cada item de uma lista ordenada (tarefas de uma coluna, colunas de um board,
+campos de um formulário) guarda uma chave textual em base 36. A ordem da
+lista é a ordem das chaves (comparação binária, ``COLLATE "C"``), e sempre
+existe uma chave entre duas vizinhas: mover um item grava só a linha dele.
+
+Inserções repetidas no mesmo ponto alongam as chaves; passando de
+``REBALANCE_KEY_LENGTH`` a lista é redistribuída em segundo plano com
+chaves curtas e igualmente espaçadas, numa única instrução.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import String, case, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Update
+
+from app.core.exceptions import ValidationException
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Tamanho da coluna e limite a partir do qual a lista é redistribuída
+MAX_KEY_LENGTH = 64
+REBALANCE_KEY_LENGTH = 24
+
+_INDEX = {digit: index for index, digit in enumerate(DIGITS)}
+
+
+def order_key_type() -> String:
+    """Tipo das colunas de ordenação (comparação byte a byte, sem locale)"""
+    return String(MAX_KEY_LENGTH, collation="C")
+
+
+def _validate(key: str) -> None:
+    if not key or key.endswith("0") or any(char not in _INDEX for char in key):
+        raise ValidationException("Invalid order key", field="position")
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """Chave estritamente entre ``low`` e ``high`` (sem zeros à direita)"""
+    if high is not None:
+        # Prefixo comum (``low`` completado com zeros)
+        size = 0
+        while size < len(high) and (low[size] if size < len(low) else "0") == high[size]:
+            size += 1
+        if size:
+            return high[:size] + _midpoint(low[size:], high[size:])
+
+    low_digit = _INDEX[low[0]] if low else 0
+    high_digit = _INDEX[high[0]] if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+
+    # Dígitos consecutivos
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def key_after(low: str) -> str:
+    """Menor incremento após ``low``: anexar ao fim cresce devagar"""
+    for index, char in enumerate(low):
+        if char != DIGITS[-1]:
+            return low[:index] + DIGITS[_INDEX[char] + 1]
+    return low + DIGITS[1]
+
+
+def key_before(high: str) -> str:
+    """Menor decremento antes de ``high``"""
+    for index, char in enumerate(high):
+        digit = _INDEX[char]
+        if digit > 1:
+            return high[:index] + DIGITS[digit - 1]
+        if digit == 1:
+            return high[:index] + DIGITS[0] + DIGITS[-1]
+    raise ValidationException("Invalid order key", field="position")
+
+
+def key_between(low: Optional[str], high: Optional[str]) -> str:
+    """Chave para um item entre ``low`` e ``high`` (None = início/fim da lista)"""
+    if low is not None:
+        _validate(low)
+    if high is not None:
+        _validate(high)
+
+    if low is None and high is None:
+        return DIGITS[BASE // 2]
+    if low is None:
+        return key_before(high)
+    if high is None:
+        return key_after(low)
+    if low >= high:
+        # Chaves repetidas (movimentos concorrentes) até a redistribuição
+        return key_after(low)
+    return _midpoint(low, high)
+
+
+def spread_keys(count: int) -> List[str]:
+    """``count`` chaves curtas e igualmente espaçadas, em ordem"""
+    if count <= 0:
+        return []
+    length = max(math.ceil(math.log(count + 1, BASE)), 1) + 1
+    step = BASE ** length // (count + 1)
+
+    keys = []
+    for position in range(1, count + 1):
+        value = step * position
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip("0"))
+    return keys
+
+
+def needs_rebalance(key: str) -> bool:
+    return len(key) >= REBALANCE_KEY_LENGTH
+
+
+def reorder_statement(model: Any, column: str, keys: Dict[Any, str], *conditions: Any) -> Update:
+    """UPDATE único que grava ``keys`` (id -> chave) via CASE"""
+    table = model.__table__
+    return (
+        update(table)
+        .where(table.c.id.in_(list(keys)), *conditions)
+        .values({column: case(keys, value=table.c.id)})
+    )
+
+
+def ranked_keys(ordered_ids: Sequence[Any]) -> Dict[Any, str]:
+    """Chaves novas para os ids na ordem dada"""
+    return dict(zip(ordered_ids, spread_keys(len(ordered_ids))))
+
+
+def apply_requested_order(current: Sequence[Any], requested: Iterable[Tuple[Any, int]]) -> List[Any]:
+    """
+    Nova ordem completa a partir de pares (id, posição) enviados pelo cliente:
+    os ids pedidos na ordem das posições, seguidos dos demais na ordem atual.
+    Ids desconhecidos são ignorados.
+    """
+    known = set(current)
+    moved = [item_id for item_id, _ in sorted(requested, key=lambda pair: pair[1]) if item_id in known]
+    moved = list(dict.fromkeys(moved))
+    placed = set(moved)
+    return moved + [item_id for item_id in current if item_id not in placed]
+
+
+def sync_order_keys(objects: Iterable[Any], column: str, keys: Dict[Any, str]) -> None:
+    """Reflete as chaves gravadas por ``reorder_statement`` nos objetos já carregados"""
+    for obj in objects:
+        if obj.id in keys:
+            # Sem marcar o objeto como alterado (evita um UPDATE por linha no flush)
+            set_committed_value(obj, column, keys[obj.id])
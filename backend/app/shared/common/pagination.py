@@ -0,0 +1,63 @@
+"""
+Paginação por keyset (cursor) sobre (created_at, id)
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+from app.core.exceptions import ValidationException
+
+# Cabeçalho de resposta com o cursor da próxima página
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, id: Any) -> str:
+    """Gera um cursor opaco para a posição (created_at, id)"""
+    payload = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decodifica um cursor opaco em (created_at, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError) as exc:
+        raise ValidationException("Invalid pagination cursor", field="cursor") from exc
+
+
+def apply_keyset(
+    query: Select,
+    model: Any,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> Select:
+    """Ordena por (created_at, id) e posiciona a consulta após o cursor
+
+    A comparação de tupla usa diretamente um índice em (created_at, id),
+    sem percorrer as linhas das páginas anteriores como o OFFSET.
+    """
+    key = tuple_(model.created_at, model.id)
+
+    if cursor:
+        position = tuple_(*decode_cursor(cursor))
+        query = query.where(key < position if descending else key > position)
+
+    if descending:
+        return query.order_by(model.created_at.desc(), model.id.desc())
+    return query.order_by(model.created_at.asc(), model.id.asc())
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor da próxima página, ou None se esta for a última"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -7,9 +7,11 @@ from uuid import UUID
 
 from sqlalchemy import select, update, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app.shared.common.base_models import BaseModel
+from app.shared.common.pagination import apply_keyset
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
@@ -32,7 +34,8 @@ class BaseRepository(Generic[ModelType]):
         self,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
         """Busca todos os registros com paginação."""
         query = select(self.model)
@@ -42,7 +45,10 @@ class BaseRepository(Generic[ModelType]):
                 if hasattr(self.model, field):
                     query = query.where(getattr(self.model, field) == value)
         
-        query = query.offset(skip).limit(limit)
+        if cursor:
+            query = self.paginate(query, limit=limit, cursor=cursor)
+        else:
+            query = query.offset(skip).limit(limit)
         result = await self.session.execute(query)
         return result.scalars().all()
     
@@ -83,6 +89,73 @@ class BaseRepository(Generic[ModelType]):
         
         result = await self.session.execute(query)
         return result.scalar()
+    
+    def paginate(
+        self,
+        query: Select,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Select:
+        """Ordena por (created_at, id) e pagina por cursor ou, sem ele, por offset."""
+        query = apply_keyset(query, self.model, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+    
+    async def add(self, db_obj: ModelType) -> ModelType:
+        """Persiste uma instância já construída do modelo."""
+        self.session.add(db_obj)
+        await self.session.commit()
+        await self.session.refresh(db_obj)
+        return db_obj
+    
+    async def fetch_all(self, query) -> List[Any]:
+        """Executa a query e retorna todas as entidades."""
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+    
+    async def fetch_first(self, query) -> Optional[Any]:
+        """Executa a query e retorna a primeira entidade."""
+        result = await self.session.execute(query.limit(1))
+        return result.scalars().first()
+    
+    async def fetch_rows(self, query) -> List[Any]:
+        """Executa a query e retorna as linhas (consultas de agregação)."""
+        result = await self.session.execute(query)
+        return list(result.all())
+    
+    async def fetch_count(self, query) -> int:
+        """Conta as linhas retornadas por uma query."""
+        result = await self.session.execute(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )
+        return result.scalar() or 0
+
+
+class SyncBaseRepository(Generic[ModelType]):
+    """
+    Repository base síncrono (interino).
+    
+    Para repositórios ainda não migrados para AsyncSession. Nunca deve ser
+    chamado diretamente no event loop: use ``run_in_sync_session``, que
+    executa a operação no pool de threads limitado.
+    """
+    
+    def __init__(self, model: Type[ModelType], db: Session):
+        self.model = model
+        self.db = db
+    
+    def get_by_id(self, id: UUID) -> Optional[ModelType]:
+        """Busca um registro por ID."""
+        return self.db.get(self.model, id)
+    
+    def create(self, db_obj: ModelType) -> ModelType:
+        """Persiste uma instância já construída do modelo."""
+        self.db.add(db_obj)
+        self.db.commit()
+        self.db.refresh(db_obj)
+        return db_obj
 
 
 class AsyncRepository(BaseRepository[ModelType]):
@@ -2,23 +2,24 @@
 AI Processing Tasks for Celery with LLM Integration.
 """
 
-import asyncio
 import sys
 import os
-from typing import Dict, Any, List, Optional
-from uuid import UUID
+from typing import Callable, Dict, Any, List, Optional
+from uuid import UUID, uuid4
 
-from celery import Task
+from celery import Task, chord
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.tasks.celery_app import celery_app
 from app.tasks.base_task import BaseTask
-from app.core.database import get_async_session
+from app.core.database import async_session_scope
+from app.core.redis_client import get_redis
+from app.domains.documents.bulk import BulkProgress, plan_chunks
+from app.domains.documents.repository import AIProcessingJobRepository
 from app.domains.documents.service import AIProcessingService
-from app.domains.documents.models import AIProcessingJob, Document
+from app.domains.documents.models import AIProcessingJob, Document, ProcessingStatus
 from app.domains.documents.schemas import (
     DocumentCreate,
-    AIJobCreate,
     TextExtractionRequest,
     TenderAnalysisRequest,
     DocumentClassificationRequest,
@@ -42,6 +43,9 @@ except ImportError as e:
 
 logger = get_logger_with_context(component="ai_tasks")
 
+# Base delay (seconds) before a failed bulk document is retried; doubles per attempt
+BULK_RETRY_COUNTDOWN = 60
+
 
 class AIProcessingTask(BaseTask):
     """Base class for AI processing tasks."""
@@ -50,18 +54,18 @@ class AIProcessingTask(BaseTask):
         """Handle task failure."""
         super().on_failure(exc, task_id, args, kwargs, einfo)
         # Update job status to failed
-        asyncio.run(self._update_job_status(task_id, "failed", str(exc)))
+        self.run_async(self._update_job_status(task_id, "failed", str(exc)))
     
     def on_success(self, retval, task_id, args, kwargs):
         """Handle task success."""
         super().on_success(retval, task_id, args, kwargs)
         # Update job status to completed
-        asyncio.run(self._update_job_status(task_id, "completed"))
+        self.run_async(self._update_job_status(task_id, "completed"))
     
     async def _update_job_status(self, task_id: str, status: str, error_message: str = None):
         """Update AI job status."""
         try:
-            async with get_async_session() as db:
+            async with async_session_scope() as db:
                 service = AIProcessingService(db)
                 await service.update_job_status(task_id, status, error_message)
         except Exception as e:
@@ -69,69 +73,34 @@ class AIProcessingTask(BaseTask):
 
 
 @celery_app.task(bind=True, base=AIProcessingTask, name="ai_tasks.process_document")
+@BaseTask.async_task
 def process_document(self, document_id: str, operations: List[str], options: Dict[str, Any] = None):
     """Process a document with specified AI operations."""
-    return asyncio.run(process_document_async(self, document_id, operations, options))
+    return process_document_async(self, document_id, operations, options)
 
 
 async def process_document_async(task: Task, document_id: str, operations: List[str], options: Dict[str, Any] = None):
     """Async version of document processing."""
     try:
         options = options or {}
-        results = {}
         
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             # Update job status to running
             await service.update_job_status(task.request.id, "running")
             
-            for operation in operations:
-                try:
-                    task.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "current_operation": operation,
-                            "completed_operations": list(results.keys()),
-                            "total_operations": len(operations)
-                        }
-                    )
-                    
-                    if operation == "extract_text":
-                        result = await service.extract_text(
-                            UUID(document_id),
-                            force_reprocess=options.get("force_reprocess", False)
-                        )
-                        results["text_extraction"] = result
-                        
-                    elif operation == "analyze_tender":
-                        result = await service.analyze_tender(
-                            UUID(document_id),
-                            analysis_type=options.get("analysis_type", "comprehensive")
-                        )
-                        results["tender_analysis"] = result
-                        
-                    elif operation == "classify":
-                        result = await service.classify_document(
-                            UUID(document_id),
-                            classification_type=options.get("classification_type", "category")
-                        )
-                        results["classification"] = result
-                        
-                    elif operation == "summarize":
-                        result = await service.summarize_document(
-                            UUID(document_id),
-                            summary_type=options.get("summary_type", "brief"),
-                            max_length=options.get("max_length", 500)
-                        )
-                        results["summarization"] = result
-                        
-                    else:
-                        logger.warning(f"Unknown operation: {operation}")
-                        
-                except Exception as e:
-                    logger.error(f"Error in operation {operation}: {e}")
-                    results[operation] = {"error": str(e)}
+            def report(operation: str, completed: List[str]) -> None:
+                task.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "current_operation": operation,
+                        "completed_operations": completed,
+                        "total_operations": len(operations)
+                    }
+                )
+            
+            results = await _run_operations(service, document_id, operations, options, report)
         
         return {
             "document_id": document_id,
@@ -145,84 +114,317 @@ async def process_document_async(task: Task, document_id: str, operations: List[
         raise
 
 
-@celery_app.task(bind=True, base=AIProcessingTask, name="ai_tasks.bulk_process_documents")
-def bulk_process_documents(self, document_ids: List[str], operations: List[str], options: Dict[str, Any] = None):
+async def _run_operations(
+    service: AIProcessingService,
+    document_id: str,
+    operations: List[str],
+    options: Dict[str, Any],
+    report: Optional[Callable[[str, List[str]], None]] = None
+) -> Dict[str, Any]:
+    """Run the requested operations on one document; failures are recorded per operation."""
+    results = {}
+    
+    for operation in operations:
+        try:
+            if report:
+                report(operation, list(results.keys()))
+            
+            if operation == "extract_text":
+                result = await service.extract_text(
+                    UUID(document_id),
+                    force_reprocess=options.get("force_reprocess", False)
+                )
+                results["text_extraction"] = result
+                
+            elif operation == "analyze_tender":
+                result = await service.analyze_tender(
+                    UUID(document_id),
+                    analysis_type=options.get("analysis_type", "comprehensive")
+                )
+                results["tender_analysis"] = result
+                
+            elif operation == "classify":
+                result = await service.classify_document(
+                    UUID(document_id),
+                    classification_type=options.get("classification_type", "category")
+                )
+                results["classification"] = result
+                
+            elif operation == "summarize":
+                result = await service.summarize_document(
+                    UUID(document_id),
+                    summary_type=options.get("summary_type", "brief"),
+                    max_length=options.get("max_length", 500)
+                )
+                results["summarization"] = result
+                
+            else:
+                logger.warning(f"Unknown operation: {operation}")
+                
+        except Exception as e:
+            logger.error(f"Error in operation {operation}: {e}")
+            results[operation] = {"error": str(e)}
+    
+    return results
+
+
+def _operation_errors(results: Dict[str, Any]) -> List[str]:
+    """Error messages of the failed operations in ``results``."""
+    return [
+        f"{operation}: {result['error']}"
+        for operation, result in results.items()
+        if isinstance(result, dict) and "error" in result
+    ]
+
+
+# Bulk pipeline: one dispatcher inserts every job row and fans the batch
+# out as a chord of chunk tasks; documents that fail inside a chunk are
+# retried one by one, and progress is aggregated in Redis (BulkProgress).
+
+@celery_app.task(bind=True, base=BaseTask, name="ai_tasks.bulk_process_documents", autoretry_for=())
+@BaseTask.async_task
+def bulk_process_documents(
+    self,
+    document_ids: List[str],
+    operations: List[str],
+    options: Dict[str, Any] = None,
+    user_id: Optional[str] = None
+):
     """Process multiple documents in bulk."""
-    return asyncio.run(bulk_process_documents_async(self, document_ids, operations, options))
-
-
-async def bulk_process_documents_async(task: Task, document_ids: List[str], operations: List[str], options: Dict[str, Any] = None):
-    """Async version of bulk document processing."""
+    return bulk_process_documents_async(self, document_ids, operations, options, user_id)
+
+
+async def bulk_process_documents_async(
+    task: Task,
+    document_ids: List[str],
+    operations: List[str],
+    options: Dict[str, Any] = None,
+    user_id: Optional[str] = None
+):
+    """Create the batch's job rows in one INSERT and dispatch the chunk chord."""
+    options = options or {}
+    batch_id = task.request.id
+    redis = await get_redis()
+    progress = BulkProgress(redis.client)
+    
+    # Batches queued by the API already have their progress hash
+    if await progress.get(batch_id) is None:
+        await progress.start(batch_id, len(document_ids), user_id or "")
+    
+    items = [[str(uuid4()), document_id] for document_id in document_ids]
+    
     try:
-        options = options or {}
-        results = {}
-        total_documents = len(document_ids)
+        async with async_session_scope() as db:
+            await AIProcessingJobRepository(db).create_jobs_bulk([
+                {
+                    "id": UUID(job_id),
+                    "document_id": UUID(document_id),
+                    "job_type": "document_processing",
+                    "status": ProcessingStatus.PENDING,
+                    "priority": options.get("priority", 5),
+                    "processing_params": {
+                        "batch_id": batch_id,
+                        "operations": operations,
+                        "options": options
+                    },
+                    "created_by": user_id,
+                }
+                for job_id, document_id in items
+            ])
+        
+        chunks = plan_chunks(items)
+        await progress.dispatched(batch_id, len(chunks))
+        chord([
+            process_document_chunk.s(batch_id, chunk, operations, options)
+            for chunk in chunks
+        ])(finish_bulk_batch.si(batch_id))
         
-        async with get_async_session() as db:
+    except Exception as e:
+        logger.error(f"Bulk processing failed: {e}")
+        await progress.abort(batch_id, str(e))
+        raise
+    
+    return {
+        "batch_id": batch_id,
+        "total_documents": len(items),
+        "chunks": len(chunks),
+        "status": "running"
+    }
+
+
+@celery_app.task(bind=True, base=BaseTask, name="ai_tasks.process_document_chunk", autoretry_for=())
+@BaseTask.async_task
+def process_document_chunk(
+    self,
+    batch_id: str,
+    items: List[List[str]],
+    operations: List[str],
+    options: Dict[str, Any] = None
+):
+    """Process one chunk of a bulk batch."""
+    return process_document_chunk_async(self, batch_id, items, operations, options)
+
+
+async def process_document_chunk_async(
+    task: Task,
+    batch_id: str,
+    items: List[List[str]],
+    operations: List[str],
+    options: Dict[str, Any] = None
+):
+    """
+    Process ``items`` ([job_id, document_id] pairs) sequentially.
+    
+    The chunk itself never retries: a failing document is handed to
+    ``retry_bulk_document`` so the rest of the chunk is not processed again.
+    """
+    options = options or {}
+    redis = await get_redis()
+    progress = BulkProgress(redis.client)
+    outcomes = []
+    failed_items = []
+    
+    try:
+        async with async_session_scope() as db:
+            repo = AIProcessingJobRepository(db)
             service = AIProcessingService(db)
+            await repo.mark_jobs_started(
+                [UUID(job_id) for job_id, _ in items],
+                worker_id=task.request.hostname
+            )
             
-            # Update job status to running
-            await service.update_job_status(task.request.id, "running")
+            for job_id, document_id in items:
+                # A savepoint per document: a failed statement aborts only its
+                # own writes, not the session the rest of the chunk shares
+                savepoint = await db.begin_nested()
+                results = await _run_operations(service, document_id, operations, options)
+                if _operation_errors(results):
+                    await savepoint.rollback()
+                    failed_items.append((job_id, document_id))
+                else:
+                    await savepoint.commit()
+                    outcomes.append((UUID(job_id), ProcessingStatus.COMPLETED, results, None))
             
-            for i, document_id in enumerate(document_ids):
-                try:
-                    task.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "current_document": document_id,
-                            "completed_documents": i,
-                            "total_documents": total_documents,
-                            "progress_percentage": int((i / total_documents) * 100)
-                        }
-                    )
-                    
-                    # Create individual processing job for each document
-                    job_data = AIJobCreate(
-                        job_type="document_processing",
-                        document_id=UUID(document_id),
-                        parameters={
-                            "operations": operations,
-                            "options": options
-                        },
-                        priority=options.get("priority", "medium")
-                    )
-                    
-                    job = await service.create_ai_job(job_data)
-                    
-                    # Process the document asynchronously
-                    process_document.delay(document_id, operations, options)
-                    
-                    results[document_id] = {
-                        "job_id": str(job.id),
-                        "status": "queued"
-                    }
-                    
-                except Exception as e:
-                    logger.error(f"Error processing document {document_id}: {e}")
-                    results[document_id] = {"error": str(e)}
+            if outcomes:
+                await repo.finish_jobs_batch(outcomes)
+                
+    except Exception as e:
+        # Nothing of this chunk was recorded: every document retries alone
+        logger.error(f"Bulk chunk failed in batch {batch_id}: {e}")
+        outcomes = []
+        failed_items = [tuple(item) for item in items]
+    
+    for job_id, document_id in failed_items:
+        retry_bulk_document.apply_async(
+            (batch_id, job_id, document_id, operations, options),
+            countdown=BULK_RETRY_COUNTDOWN
+        )
+    
+    await progress.record(
+        batch_id,
+        completed=len(outcomes),
+        retrying=len(failed_items),
+        chunks_done=1
+    )
+    
+    return {
+        "batch_id": batch_id,
+        "completed": len(outcomes),
+        "retrying": len(failed_items)
+    }
+
+
+@celery_app.task(
+    bind=True,
+    base=BaseTask,
+    name="ai_tasks.retry_bulk_document",
+    autoretry_for=(),
+    max_retries=3
+)
+@BaseTask.async_task
+def retry_bulk_document(
+    self,
+    batch_id: str,
+    job_id: str,
+    document_id: str,
+    operations: List[str],
+    options: Dict[str, Any] = None
+):
+    """Retry a single document of a bulk batch."""
+    return retry_bulk_document_async(self, batch_id, job_id, document_id, operations, options)
+
+
+async def retry_bulk_document_async(
+    task: Task,
+    batch_id: str,
+    job_id: str,
+    document_id: str,
+    operations: List[str],
+    options: Dict[str, Any] = None
+):
+    """Re-run one document, backing off until ``max_retries`` before failing its job."""
+    options = options or {}
+    
+    async with async_session_scope() as db:
+        try:
+            results = await _run_operations(
+                AIProcessingService(db), document_id, operations, options
+            )
+            errors = _operation_errors(results)
+        except Exception as e:
+            results, errors = {}, [str(e)]
         
-        return {
-            "total_documents": total_documents,
-            "processed_documents": len(results),
-            "results": results,
-            "status": "completed"
-        }
+        if errors and task.request.retries < task.max_retries:
+            raise task.retry(countdown=BULK_RETRY_COUNTDOWN * 2 ** (task.request.retries + 1))
         
-    except Exception as e:
-        logger.error(f"Bulk processing failed: {e}")
-        raise
+        status = ProcessingStatus.FAILED if errors else ProcessingStatus.COMPLETED
+        await AIProcessingJobRepository(db).finish_jobs_batch([
+            (UUID(job_id), status, results, "; ".join(errors) or None)
+        ])
+    
+    redis = await get_redis()
+    await BulkProgress(redis.client).record(
+        batch_id,
+        completed=0 if errors else 1,
+        failed=1 if errors else 0,
+        retrying=-1
+    )
+    
+    return {"batch_id": batch_id, "job_id": job_id, "status": status.value}
+
+
+@celery_app.task(bind=True, base=BaseTask, name="ai_tasks.finish_bulk_batch", autoretry_for=())
+@BaseTask.async_task
+def finish_bulk_batch(self, batch_id: str):
+    """Chord callback: runs once every chunk of the batch has returned."""
+    return finish_bulk_batch_async(self, batch_id)
+
+
+async def finish_bulk_batch_async(task: Task, batch_id: str):
+    """Log the batch summary once all chunks are done."""
+    redis = await get_redis()
+    batch = await BulkProgress(redis.client).get(batch_id) or {}
+    
+    # Documents still retrying finish later and update the counters themselves
+    logger.info(
+        f"Bulk batch {batch_id} chunks finished: "
+        f"{batch.get('completed', 0)} completed, {batch.get('failed', 0)} failed, "
+        f"{batch.get('retrying', 0)} retrying of {batch.get('total', 0)}"
+    )
+    return batch
 
 
 @celery_app.task(bind=True, base=AIProcessingTask, name="ai_tasks.extract_text")
+@BaseTask.async_task
 def extract_text_task(self, document_id: str, force_reprocess: bool = False):
     """Extract text from a document."""
-    return asyncio.run(extract_text_async(self, document_id, force_reprocess))
+    return extract_text_async(self, document_id, force_reprocess)
 
 
 async def extract_text_async(task: Task, document_id: str, force_reprocess: bool = False):
     """Async text extraction."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             # Update job status
@@ -242,15 +444,16 @@ async def extract_text_async(task: Task, document_id: str, force_reprocess: bool
 
 
 @celery_app.task(bind=True, base=AIProcessingTask, name="ai_tasks.analyze_tender")
+@BaseTask.async_task
 def analyze_tender_task(self, document_id: str, analysis_type: str = "comprehensive"):
     """Analyze a tender document."""
-    return asyncio.run(analyze_tender_async(self, document_id, analysis_type))
+    return analyze_tender_async(self, document_id, analysis_type)
 
 
 async def analyze_tender_async(task: Task, document_id: str, analysis_type: str = "comprehensive"):
     """Async tender analysis."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             # Update job status
@@ -271,15 +474,16 @@ async def analyze_tender_async(task: Task, document_id: str, analysis_type: str
 
 
 @celery_app.task(bind=True, base=AIProcessingTask, name="ai_tasks.classify_document")
+@BaseTask.async_task
 def classify_document_task(self, document_id: str, classification_type: str = "category"):
     """Classify a document."""
-    return asyncio.run(classify_document_async(self, document_id, classification_type))
+    return classify_document_async(self, document_id, classification_type)
 
 
 async def classify_document_async(task: Task, document_id: str, classification_type: str = "category"):
     """Async document classification."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             # Update job status
@@ -300,15 +504,16 @@ async def classify_document_async(task: Task, document_id: str, classification_t
 
 
 @celery_app.task(bind=True, base=AIProcessingTask, name="ai_tasks.summarize_document")
+@BaseTask.async_task
 def summarize_document_task(self, document_id: str, summary_type: str = "brief", max_length: int = 500):
     """Summarize a document."""
-    return asyncio.run(summarize_document_async(self, document_id, summary_type, max_length))
+    return summarize_document_async(self, document_id, summary_type, max_length)
 
 
 async def summarize_document_async(task: Task, document_id: str, summary_type: str = "brief", max_length: int = 500):
     """Async document summarization."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             # Update job status
@@ -330,15 +535,16 @@ async def summarize_document_async(task: Task, document_id: str, summary_type: s
 
 
 @celery_app.task(bind=True, base=BaseTask, name="ai_tasks.cleanup_old_data")
+@BaseTask.async_task
 def cleanup_old_data(self, days: int = 30):
     """Clean up old AI processing data."""
-    return asyncio.run(cleanup_old_data_async(self, days))
+    return cleanup_old_data_async(self, days)
 
 
 async def cleanup_old_data_async(task: Task, days: int = 30):
     """Async cleanup of old data."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             cleaned_count = await service.cleanup_old_data(days)
@@ -355,15 +561,16 @@ async def cleanup_old_data_async(task: Task, days: int = 30):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="ai_tasks.generate_performance_report")
+@BaseTask.async_task
 def generate_performance_report(self, period: str = "7d"):
     """Generate AI performance report."""
-    return asyncio.run(generate_performance_report_async(self, period))
+    return generate_performance_report_async(self, period)
 
 
 async def generate_performance_report_async(task: Task, period: str = "7d"):
     """Async performance report generation."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             metrics = await service.get_performance_metrics(period)
@@ -390,15 +597,16 @@ def periodic_cleanup(self):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="ai_tasks.periodic_analytics_update")
+@BaseTask.async_task
 def periodic_analytics_update(self):
     """Periodic update of AI analytics."""
-    return asyncio.run(periodic_analytics_update_async(self))
+    return periodic_analytics_update_async(self)
 
 
 async def periodic_analytics_update_async(task: Task):
     """Update AI analytics periodically."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = AIProcessingService(db)
             
             # Update performance metrics
@@ -2,10 +2,16 @@
 Classe base para tarefas Celery
 """
 
+import functools
+import time
+from typing import Any, Callable, Coroutine
+
 from celery import Task
 from celery.exceptions import Retry
 
+from app.core.config import settings
 from app.core.logging import get_logger_with_context
+from app.tasks.runtime import worker_runtime
 
 
 class BaseTask(Task):
@@ -22,6 +28,42 @@ class BaseTask(Task):
             task_name=self.name
         )
     
+    @staticmethod
+    def async_task(func: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Any]:
+        """
+        Decorador para tarefas cujo corpo devolve uma corrotina: a corrotina
+        roda no event loop persistente do worker (ver ``run_async``)
+        """
+
+        @functools.wraps(func)
+        def wrapper(self: "BaseTask", *args: Any, **kwargs: Any) -> Any:
+            return self.run_async(func(self, *args, **kwargs))
+
+        return wrapper
+
+    def run_async(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Executa a corrotina no loop do worker, medindo a duração"""
+        start = time.perf_counter()
+        status = "success"
+        try:
+            return worker_runtime.run(coro)
+        except Retry:
+            status = "retry"
+            raise
+        except BaseException:
+            status = "failure"
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            worker_runtime.task_duration.labels(task=self.name, status=status).observe(duration)
+            worker_runtime.tasks_total.labels(task=self.name, status=status).inc()
+            self.logger.info(
+                "Task coroutine finished",
+                task_id=self.request.id,
+                status=status,
+                duration_ms=round(duration * 1000, 2)
+            )
+
     def on_success(self, retval, task_id, args, kwargs):
         """Executado quando a tarefa é bem-sucedida"""
         self.logger.info(
@@ -3,9 +3,11 @@ Configuração do Celery para tarefas assíncronas
 """
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 
 from app.core.config import settings
 from app.core.logging import get_logger_with_context
+from app.tasks.runtime import worker_runtime
 
 logger = get_logger_with_context(component="celery")
 
@@ -20,6 +22,7 @@ celery_app = Celery(
         "app.tasks.report_tasks",
         "app.tasks.maintenance_tasks",
         "app.tasks.llm_tasks",  # New LLM-specific tasks
+        "app.tasks.ordering_tasks",
     ]
 )
 
@@ -84,4 +87,18 @@ if settings.debug:
         task_eager_propagates=True,
     )
 
+
+@worker_process_init.connect
+def start_worker_runtime(**kwargs):
+    """Abre o event loop persistente em cada processo filho do pool"""
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_worker_runtime(**kwargs):
+    """Fecha as conexões compartilhadas ao encerrar o processo"""
+    worker_runtime.stop()
+
+
 logger.info("Celery configured", broker=settings.celery_broker_url)
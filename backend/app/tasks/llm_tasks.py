@@ -2,7 +2,6 @@
 LLM-specific Celery tasks for document processing and AI operations.
 """
 
-import asyncio
 import sys
 import os
 from typing import Dict, Any, List, Optional, Union
@@ -13,6 +12,7 @@ from celery.exceptions import Retry
 
 from app.tasks.celery_app import celery_app
 from app.tasks.base_task import BaseTask
+from app.tasks.runtime import worker_runtime
 from app.core.logging import get_logger_with_context
 
 # Add LLM module to path
@@ -20,7 +20,6 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(o
 sys.path.insert(0, project_root)
 
 try:
-    from llm.manager import LLMManager
     from llm.models import AIProcessingResult, ExtractedTenderData, QuotationStructure
     from llm.exceptions import LLMException, ModelNotAvailableException, ProcessingTimeoutException
     llm_available = True
@@ -53,9 +52,10 @@ class LLMTask(BaseTask):
     autoretry_for=(LLMException,),
     retry_kwargs={'max_retries': 3, 'countdown': 60}
 )
+@BaseTask.async_task
 def extract_document_text(self, file_path: str, file_type: str = None) -> Dict[str, Any]:
     """Extract text from a document file."""
-    return asyncio.run(extract_document_text_async(self, file_path, file_type))
+    return extract_document_text_async(self, file_path, file_type)
 
 
 async def extract_document_text_async(task: Task, file_path: str, file_type: str = None) -> Dict[str, Any]:
@@ -64,7 +64,7 @@ async def extract_document_text_async(task: Task, file_path: str, file_type: str
         raise LLMException("LLM services not available")
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             task.update_state(state="PROGRESS", meta={"status": "extracting_text"})
             
             result = await llm_manager.extract_text(file_path)
@@ -88,9 +88,10 @@ async def extract_document_text_async(task: Task, file_path: str, file_type: str
     autoretry_for=(LLMException,),
     retry_kwargs={'max_retries': 3, 'countdown': 120}
 )
+@BaseTask.async_task
 def analyze_tender_document(self, text: str, document_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
     """Analyze tender document and extract structured data."""
-    return asyncio.run(analyze_tender_document_async(self, text, document_metadata))
+    return analyze_tender_document_async(self, text, document_metadata)
 
 
 async def analyze_tender_document_async(task: Task, text: str, document_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -99,7 +100,7 @@ async def analyze_tender_document_async(task: Task, text: str, document_metadata
         raise LLMException("LLM services not available")
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             task.update_state(state="PROGRESS", meta={"status": "analyzing_tender"})
             
             result = await llm_manager.extract_tender_data(text, document_metadata or {})
@@ -123,9 +124,10 @@ async def analyze_tender_document_async(task: Task, text: str, document_metadata
     autoretry_for=(LLMException,),
     retry_kwargs={'max_retries': 3, 'countdown': 180}
 )
+@BaseTask.async_task
 def generate_quotation(self, tender_data: Dict[str, Any], company_profile: Dict[str, Any] = None) -> Dict[str, Any]:
     """Generate a quotation based on tender data."""
-    return asyncio.run(generate_quotation_async(self, tender_data, company_profile))
+    return generate_quotation_async(self, tender_data, company_profile)
 
 
 async def generate_quotation_async(task: Task, tender_data: Dict[str, Any], company_profile: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -134,7 +136,7 @@ async def generate_quotation_async(task: Task, tender_data: Dict[str, Any], comp
         raise LLMException("LLM services not available")
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             task.update_state(state="PROGRESS", meta={"status": "generating_quotation"})
             
             result = await llm_manager.generate_quotation(tender_data, company_profile or {})
@@ -158,9 +160,10 @@ async def generate_quotation_async(task: Task, tender_data: Dict[str, Any], comp
     autoretry_for=(LLMException,),
     retry_kwargs={'max_retries': 3, 'countdown': 120}
 )
+@BaseTask.async_task
 def analyze_risks(self, tender_data: Dict[str, Any], quotation_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """Analyze risks associated with a tender."""
-    return asyncio.run(analyze_risks_async(self, tender_data, quotation_data))
+    return analyze_risks_async(self, tender_data, quotation_data)
 
 
 async def analyze_risks_async(task: Task, tender_data: Dict[str, Any], quotation_data: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -169,7 +172,7 @@ async def analyze_risks_async(task: Task, tender_data: Dict[str, Any], quotation
         raise LLMException("LLM services not available")
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             task.update_state(state="PROGRESS", meta={"status": "analyzing_risks"})
             
             result = await llm_manager.analyze_risks(tender_data, quotation_data or {})
@@ -195,9 +198,10 @@ async def analyze_risks_async(task: Task, tender_data: Dict[str, Any], quotation
     autoretry_for=(LLMException,),
     retry_kwargs={'max_retries': 2, 'countdown': 300}
 )
+@BaseTask.async_task
 def process_document_batch(self, file_paths: List[str], operations: List[str] = None) -> Dict[str, Any]:
     """Process multiple documents in batch."""
-    return asyncio.run(process_document_batch_async(self, file_paths, operations))
+    return process_document_batch_async(self, file_paths, operations)
 
 
 async def process_document_batch_async(task: Task, file_paths: List[str], operations: List[str] = None) -> Dict[str, Any]:
@@ -209,7 +213,7 @@ async def process_document_batch_async(task: Task, file_paths: List[str], operat
     results = {}
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             total_files = len(file_paths)
             
             for i, file_path in enumerate(file_paths):
@@ -264,9 +268,10 @@ async def process_document_batch_async(task: Task, file_paths: List[str], operat
     autoretry_for=(Exception,),
     retry_kwargs={'max_retries': 2, 'countdown': 30}
 )
+@BaseTask.async_task
 def llm_health_check(self) -> Dict[str, Any]:
     """Perform health check on LLM services."""
-    return asyncio.run(llm_health_check_async(self))
+    return llm_health_check_async(self)
 
 
 async def llm_health_check_async(task: Task) -> Dict[str, Any]:
@@ -275,7 +280,7 @@ async def llm_health_check_async(task: Task) -> Dict[str, Any]:
         return {"status": "unavailable", "message": "LLM services not available"}
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             health_status = await llm_manager.health_check()
             return health_status.dict()
             
@@ -289,9 +294,10 @@ async def llm_health_check_async(task: Task) -> Dict[str, Any]:
     base=LLMTask, 
     name="llm_tasks.cleanup_cache",
 )
+@BaseTask.async_task
 def cleanup_llm_cache(self, max_age_hours: int = 24) -> Dict[str, Any]:
     """Clean up old cache entries."""
-    return asyncio.run(cleanup_llm_cache_async(self, max_age_hours))
+    return cleanup_llm_cache_async(self, max_age_hours)
 
 
 async def cleanup_llm_cache_async(task: Task, max_age_hours: int = 24) -> Dict[str, Any]:
@@ -300,7 +306,7 @@ async def cleanup_llm_cache_async(task: Task, max_age_hours: int = 24) -> Dict[s
         return {"status": "skipped", "message": "LLM services not available"}
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             cleanup_result = await llm_manager.cleanup_cache(max_age_hours)
             return {
                 "status": "completed",
@@ -322,6 +328,7 @@ async def cleanup_llm_cache_async(task: Task, max_age_hours: int = 24) -> Dict[s
     autoretry_for=(LLMException,),
     retry_kwargs={'max_retries': 2, 'countdown': 300}
 )
+@BaseTask.async_task
 def complete_tender_workflow(
     self, 
     file_path: str, 
@@ -329,7 +336,7 @@ def complete_tender_workflow(
     include_risk_analysis: bool = True
 ) -> Dict[str, Any]:
     """Complete end-to-end tender processing workflow."""
-    return asyncio.run(complete_tender_workflow_async(self, file_path, company_profile, include_risk_analysis))
+    return complete_tender_workflow_async(self, file_path, company_profile, include_risk_analysis)
 
 
 async def complete_tender_workflow_async(
@@ -343,7 +350,7 @@ async def complete_tender_workflow_async(
         raise LLMException("LLM services not available")
     
     try:
-        async with LLMManager() as llm_manager:
+        async with worker_runtime.llm_manager() as llm_manager:
             workflow_result = {}
             
             # Step 1: Extract text
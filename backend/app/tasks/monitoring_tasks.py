@@ -2,7 +2,6 @@
 Monitoring and Maintenance Tasks for Celery.
 """
 
-import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
@@ -11,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.tasks.celery_app import celery_app
 from app.tasks.base_task import BaseTask
-from app.core.database import get_async_session
+from app.core.database import async_session_scope
 from app.domains.monitoring.service import MonitoringService
 from app.domains.files.repository import FileRepository, FileQuotaRepository
 from app.domains.audit.repository import AuditLogRepository, DataRetentionPolicyRepository
@@ -21,15 +20,16 @@ logger = get_logger_with_context(component="monitoring_tasks")
 
 
 @celery_app.task(bind=True, base=BaseTask, name="monitoring_tasks.collect_system_metrics")
+@BaseTask.async_task
 def collect_system_metrics(self):
     """Collect system metrics periodically."""
-    return asyncio.run(collect_system_metrics_async(self))
+    return collect_system_metrics_async(self)
 
 
 async def collect_system_metrics_async(task: Task):
     """Async system metrics collection."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = MonitoringService(db)
             
             # Collect current system metrics
@@ -47,15 +47,16 @@ async def collect_system_metrics_async(task: Task):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="monitoring_tasks.check_services_health")
+@BaseTask.async_task
 def check_services_health(self):
     """Check health of all services."""
-    return asyncio.run(check_services_health_async(self))
+    return check_services_health_async(self)
 
 
 async def check_services_health_async(task: Task):
     """Async service health checking."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = MonitoringService(db)
             
             # Get all services and check their health
@@ -95,15 +96,16 @@ async def check_services_health_async(task: Task):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="monitoring_tasks.cleanup_old_metrics")
+@BaseTask.async_task
 def cleanup_old_metrics(self, days: int = 30):
     """Clean up old monitoring metrics."""
-    return asyncio.run(cleanup_old_metrics_async(self, days))
+    return cleanup_old_metrics_async(self, days)
 
 
 async def cleanup_old_metrics_async(task: Task, days: int = 30):
     """Async cleanup of old metrics."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = MonitoringService(db)
             
             # Clean up old data
@@ -125,15 +127,16 @@ async def cleanup_old_metrics_async(task: Task, days: int = 30):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="monitoring_tasks.generate_dashboard_data")
+@BaseTask.async_task
 def generate_dashboard_data(self, period: str = "24h"):
     """Generate dashboard data cache."""
-    return asyncio.run(generate_dashboard_data_async(self, period))
+    return generate_dashboard_data_async(self, period)
 
 
 async def generate_dashboard_data_async(task: Task, period: str = "24h"):
     """Async dashboard data generation."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = MonitoringService(db)
             
             # Generate dashboard data
@@ -155,15 +158,16 @@ async def generate_dashboard_data_async(task: Task, period: str = "24h"):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="monitoring_tasks.analyze_performance_trends")
+@BaseTask.async_task
 def analyze_performance_trends(self, hours: int = 24):
     """Analyze performance trends and create alerts if needed."""
-    return asyncio.run(analyze_performance_trends_async(self, hours))
+    return analyze_performance_trends_async(self, hours)
 
 
 async def analyze_performance_trends_async(task: Task, hours: int = 24):
     """Async performance trends analysis."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = MonitoringService(db)
             
             # Get performance data
@@ -221,15 +225,16 @@ async def analyze_performance_trends_async(task: Task, hours: int = 24):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="monitoring_tasks.update_rate_limit_stats")
+@BaseTask.async_task
 def update_rate_limit_stats(self):
     """Update rate limiting statistics."""
-    return asyncio.run(update_rate_limit_stats_async(self))
+    return update_rate_limit_stats_async(self)
 
 
 async def update_rate_limit_stats_async(task: Task):
     """Async rate limit stats update."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             service = MonitoringService(db)
             
             # Update rate limiting statistics
@@ -249,15 +254,16 @@ async def update_rate_limit_stats_async(task: Task):
 
 # File maintenance tasks
 @celery_app.task(bind=True, base=BaseTask, name="maintenance_tasks.cleanup_orphaned_files")
+@BaseTask.async_task
 def cleanup_orphaned_files(self):
     """Clean up orphaned files."""
-    return asyncio.run(cleanup_orphaned_files_async(self))
+    return cleanup_orphaned_files_async(self)
 
 
 async def cleanup_orphaned_files_async(task: Task):
     """Async cleanup of orphaned files."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             file_repo = FileRepository(db)
             
             # Find and clean up orphaned files
@@ -275,15 +281,16 @@ async def cleanup_orphaned_files_async(task: Task):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="maintenance_tasks.update_quota_usage")
+@BaseTask.async_task
 def update_quota_usage(self):
     """Update user quota usage statistics."""
-    return asyncio.run(update_quota_usage_async(self))
+    return update_quota_usage_async(self)
 
 
 async def update_quota_usage_async(task: Task):
     """Async quota usage update."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             quota_repo = FileQuotaRepository(db)
             
             # Update quota usage for all users
@@ -301,15 +308,16 @@ async def update_quota_usage_async(task: Task):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="maintenance_tasks.execute_retention_policies")
+@BaseTask.async_task
 def execute_retention_policies(self, dry_run: bool = False):
     """Execute data retention policies."""
-    return asyncio.run(execute_retention_policies_async(self, dry_run))
+    return execute_retention_policies_async(self, dry_run)
 
 
 async def execute_retention_policies_async(task: Task, dry_run: bool = False):
     """Async execution of retention policies."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             retention_repo = DataRetentionPolicyRepository(db)
             
             # Execute all active retention policies
@@ -329,15 +337,16 @@ async def execute_retention_policies_async(task: Task, dry_run: bool = False):
 
 
 @celery_app.task(bind=True, base=BaseTask, name="maintenance_tasks.backup_audit_logs")
+@BaseTask.async_task
 def backup_audit_logs(self, days: int = 90):
     """Backup old audit logs."""
-    return asyncio.run(backup_audit_logs_async(self, days))
+    return backup_audit_logs_async(self, days)
 
 
 async def backup_audit_logs_async(task: Task, days: int = 90):
     """Async backup of audit logs."""
     try:
-        async with get_async_session() as db:
+        async with async_session_scope() as db:
             audit_repo = AuditLogRepository(db)
             
             # Backup old audit logs
@@ -0,0 +1,53 @@
+"""
+Ordering maintenance tasks for Celery.
+"""
+
+from typing import Any, Dict
+from uuid import UUID
+
+from celery import Task
+from sqlalchemy import func, select
+
+from app.tasks.celery_app import celery_app
+from app.tasks.base_task import BaseTask
+from app.core.database import AsyncSessionLocal
+from app.domains.kanban.models import BoardColumn, Task as KanbanTask
+from app.domains.kanban.repository import TaskRepository
+from app.domains.kanban.snapshot import board_snapshot_cache
+from app.core.logging import get_logger_with_context
+from app.shared.common.ordering import REBALANCE_KEY_LENGTH
+
+logger = get_logger_with_context(component="ordering_tasks")
+
+
+@celery_app.task(bind=True, base=BaseTask, name="ordering_tasks.rebalance_kanban_column")
+@BaseTask.async_task
+def rebalance_kanban_column(self, column_id: str):
+    """Respace the order keys of a kanban column."""
+    return rebalance_kanban_column_async(self, column_id)
+
+
+async def rebalance_kanban_column_async(task: Task, column_id: str) -> Dict[str, Any]:
+    """Async column rebalancing; repeated requests for a column collapse into one."""
+    async with AsyncSessionLocal() as db:
+        longest = (await db.execute(
+            select(func.max(func.length(KanbanTask.position)))
+            .where(KanbanTask.column_id == UUID(column_id))
+        )).scalar() or 0
+        
+        # An earlier run already shortened the keys
+        if longest < REBALANCE_KEY_LENGTH:
+            return {"column_id": column_id, "status": "skipped"}
+        
+        rebalanced = await TaskRepository(db).rebalance_column(UUID(column_id))
+        await db.commit()
+        
+        # Positions changed: cached board snapshots are stale
+        board_id = (await db.execute(
+            select(BoardColumn.board_id).where(BoardColumn.id == UUID(column_id))
+        )).scalar()
+        if board_id and board_snapshot_cache.enabled:
+            await board_snapshot_cache.invalidate(board_id)
+    
+    logger.info("Kanban column rebalanced", column_id=column_id, tasks=rebalanced)
+    return {"column_id": column_id, "tasks": rebalanced, "status": "completed"}
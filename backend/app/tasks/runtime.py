@@ -0,0 +1,137 @@
+"""
+Runtime assíncrono dos workers Celery
+
+Cada processo worker mantém um único event loop de longa duração. As tarefas
+executam suas corrotinas nele, na própria thread da tarefa, em vez de criar
+um loop novo com ``asyncio.run`` a cada execução; assim o pool do
+``AsyncSessionLocal``, o cliente Redis e o pool HTTP do Ollama são abertos
+uma vez e reutilizados por todas as tarefas do processo, e ``task.request``
+(local à thread no Celery) continua válido dentro das corrotinas.
+
+O loop atende uma tarefa por vez: pensado para os pools prefork e solo.
+"""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Coroutine, Optional, TypeVar
+
+from app.core.database import engine, sync_engine
+from app.core.logging import get_logger_with_context
+from app.core.redis_client import get_redis, redis_client
+
+logger = get_logger_with_context(component="worker_runtime")
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """Event loop persistente e recursos compartilhados de um processo worker"""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.RLock()
+        self._llm_lock: Optional[asyncio.Lock] = None
+        self._llm_manager: Optional[Any] = None
+        self._setup_metrics()
+
+    def _setup_metrics(self) -> None:
+        from prometheus_client import Counter, Histogram
+
+        self.task_duration = Histogram(
+            'celery_task_duration_seconds',
+            'Celery task duration on the worker event loop',
+            ['task', 'status']
+        )
+        self.tasks_total = Counter(
+            'celery_tasks_total',
+            'Celery tasks executed on the worker event loop',
+            ['task', 'status']
+        )
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None
+
+    def start(self) -> None:
+        """Cria o event loop do processo e abre as conexões compartilhadas"""
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self.run(self._open())
+        logger.info("Worker event loop started")
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Executa a corrotina no loop do processo e devolve o resultado"""
+        if self.loop is None:
+            # Pools sem worker_process_init (solo, modo eager)
+            self.start()
+
+        with self._lock:
+            task = self.loop.create_task(coro)
+            try:
+                return self.loop.run_until_complete(task)
+            except BaseException:
+                # SoftTimeLimitExceeded ou término do worker interrompem o
+                # loop: a corrotina não pode ficar pendente para a próxima
+                if not task.done():
+                    task.cancel()
+                    with suppress(BaseException):
+                        self.loop.run_until_complete(task)
+                raise
+
+    async def _open(self) -> None:
+        # Conexões herdadas do processo pai no fork não podem ser usadas
+        # no processo filho: descarta os pools sem fechá-las
+        await engine.dispose(close=False)
+        sync_engine.dispose(close=False)
+        redis_client.client = None
+
+        # O Celery espera o worker_process_init por poucos segundos
+        try:
+            await asyncio.wait_for(get_redis(), timeout=2)
+        except Exception as exc:
+            # O cliente reconecta sob demanda na primeira tarefa
+            redis_client.client = None
+            logger.warning("Redis unavailable at worker start", error=str(exc))
+
+    @asynccontextmanager
+    async def llm_manager(self) -> AsyncIterator[Any]:
+        """Gerenciador LLM compartilhado, inicializado uma vez por processo"""
+        from llm.manager import llm_manager
+
+        if self._llm_lock is None:
+            self._llm_lock = asyncio.Lock()
+        async with self._llm_lock:
+            await llm_manager.initialize()
+        self._llm_manager = llm_manager
+
+        # Não fecha ao sair: os pools pertencem ao processo, não à tarefa
+        yield llm_manager
+
+    async def _close(self) -> None:
+        if self._llm_manager is not None:
+            await self._llm_manager.close()
+            self._llm_manager = None
+        await redis_client.close()
+        redis_client.client = None
+        await engine.dispose()
+
+    def stop(self) -> None:
+        """Fecha as conexões compartilhadas e encerra o event loop"""
+        with self._lock:
+            if self.loop is None:
+                return
+            try:
+                self.run(self._close())
+            except Exception as exc:
+                logger.error("Error closing worker runtime", error=str(exc))
+            self.loop.close()
+            self.loop = None
+            self._llm_lock = None
+        logger.info("Worker event loop stopped")
+
+
+# Instância global por processo
+worker_runtime = WorkerRuntime()
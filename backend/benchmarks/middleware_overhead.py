@@ -0,0 +1,159 @@
+"""
+Per-request overhead of the middleware stack.
+
+Compares three apps serving the same routes:
+
+- ``bare``: no middleware
+- ``legacy``: four ``BaseHTTPMiddleware`` layers doing what the previous
+  SecurityHeaders/RateLimit/RequestID/Metrics stack did (rate limiting
+  is a pass-through here, so Redis is not measured)
+- ``pipeline``: ``RequestPipelineMiddleware`` with rate limiting disabled
+
+Requests are driven straight through the ASGI interface, with no server or
+HTTP client, so the numbers isolate middleware cost. Routes: a hello-world
+JSON endpoint and a ``StreamingResponse`` download.
+
+Run from backend/ with the application environment loaded:
+
+    python -m benchmarks.middleware_overhead --requests 5000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Callable, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.middleware import SECURITY_HEADERS, RequestPipelineMiddleware
+
+DOWNLOAD_CHUNK = b"x" * 64 * 1024
+
+
+def build_app(download_chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/hello")
+    async def hello():
+        return {"hello": "world"}
+
+    @app.get("/download")
+    async def download():
+        async def body():
+            for _ in range(download_chunks):
+                yield DOWNLOAD_CHUNK
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    return app
+
+
+class _Headers(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):
+        response = await call_next(request)
+        response.headers.update(SECURITY_HEADERS)
+        return response
+
+
+class _PassThrough(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):
+        return await call_next(request)
+
+
+class _RequestID(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):
+        request.state.request_id = str(uuid.uuid4())
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        return response
+
+
+class _Timing(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):
+        start = time.perf_counter()
+        response = await call_next(request)
+        request.state.duration = time.perf_counter() - start
+        return response
+
+
+def build_apps(download_chunks: int) -> Dict[str, Callable]:
+    bare = build_app(download_chunks)
+
+    legacy = build_app(download_chunks)
+    for layer in (_Timing, _PassThrough, _Headers, _RequestID):
+        legacy.add_middleware(layer)
+
+    pipeline = build_app(download_chunks)
+    pipeline.add_middleware(RequestPipelineMiddleware, rate_limit=False)
+
+    return {"bare": bare, "legacy": legacy, "pipeline": pipeline}
+
+
+async def request(app: Callable, path: str) -> int:
+    """Send one GET through the ASGI app and return the body size."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    received = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # As a server does: block until the response is done, then disconnect
+        # (StreamingResponse listens for http.disconnect while streaming)
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return received
+
+
+async def measure(app: Callable, path: str, requests: int) -> float:
+    """Mean microseconds per request after a warm-up."""
+    for _ in range(min(200, requests)):
+        await request(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await request(app, path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int, download_chunks: int) -> None:
+    apps = build_apps(download_chunks)
+    for path in ("/hello", "/download"):
+        timings = {name: await measure(app, path, requests) for name, app in apps.items()}
+        print(f"{path} ({requests} requests)")
+        for name, micros in timings.items():
+            overhead = micros - timings["bare"]
+            print(f"  {name:<9} {micros:9.1f} us/req   overhead {overhead:8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--download-chunks", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.download_chunks))
@@ -0,0 +1,23 @@
+"""
+Configuração comum dos testes
+
+Os testes cobrem lógica pura (sem banco, Redis ou rede); as variáveis
+obrigatórias das configurações recebem valores fictícios antes de
+``app.core.config`` ser importado.
+"""
+
+import os
+
+for name, value in {
+    "SECRET_KEY": "test-secret-key",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "MONGODB_DB": "test",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "CELERY_BROKER_URL": "redis://localhost:6379/1",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/2",
+}.items():
+    os.environ.setdefault(name, value)
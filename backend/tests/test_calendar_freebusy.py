@@ -0,0 +1,126 @@
+"""
+Testes da aritmética de intervalos do livre/ocupado
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.domains.calendar.freebusy import (
+    CalendarFreeBusy,
+    availability_intervals,
+    bitmap_intervals,
+    first_free_slots,
+    intersect_intervals,
+    merge_intervals,
+    subtract_intervals,
+    to_day_bitmaps,
+    utc_days,
+)
+from app.domains.calendar.recurrence import get_zone
+
+UTC = timezone.utc
+
+
+def _at(hour, minute=0, day=5):
+    return datetime(2026, 1, day, hour, minute, tzinfo=UTC)
+
+
+def test_merge_joins_overlapping_and_touching_intervals():
+    merged = merge_intervals([
+        (_at(13), _at(14)),
+        (_at(9), _at(10)),
+        (_at(10), _at(11)),
+        (_at(9, 30), _at(9, 45)),
+        (_at(15), _at(15)),
+    ])
+    assert merged == [(_at(9), _at(11)), (_at(13), _at(14))]
+
+
+def test_subtract_splits_and_trims():
+    base = [(_at(8), _at(12)), (_at(13), _at(18))]
+    remove = [(_at(7), _at(9)), (_at(10), _at(11)), (_at(12), _at(13)), (_at(17), _at(19))]
+    assert subtract_intervals(base, remove) == [
+        (_at(9), _at(10)), (_at(11), _at(12)), (_at(13), _at(17)),
+    ]
+    assert subtract_intervals(base, []) == base
+    assert subtract_intervals([(_at(9), _at(10))], [(_at(8), _at(11))]) == []
+
+
+def test_intersect():
+    first = [(_at(8), _at(12)), (_at(14), _at(18))]
+    second = [(_at(11), _at(15)), (_at(17), _at(20))]
+    assert intersect_intervals(first, second) == [
+        (_at(11), _at(12)), (_at(14), _at(15)), (_at(17), _at(18)),
+    ]
+
+
+def _slot(day_of_week, start, end, buffer_minutes=0):
+    return SimpleNamespace(
+        day_of_week=day_of_week, start_time=start, end_time=end, buffer_minutes=buffer_minutes
+    )
+
+
+def test_availability_follows_the_calendar_timezone():
+    # Segunda 09:00-18:00 em São Paulo (UTC-3)
+    intervals = availability_intervals(
+        [_slot(0, "09:00", "18:00")],
+        get_zone("America/Sao_Paulo"),
+        _at(0),
+        _at(0, day=7),
+    )
+    assert intervals == [(_at(12), _at(21))]
+
+
+def test_availability_accepts_end_of_day_and_clips_to_window():
+    intervals = availability_intervals([_slot(0, "20:00", "24:00")], get_zone("UTC"), _at(21), _at(23))
+    assert intervals == [(_at(21), _at(23))]
+
+
+def test_free_busy_applies_buffer_and_answers_is_free():
+    event = SimpleNamespace(start_datetime=_at(12), end_datetime=_at(13))
+    free_busy = CalendarFreeBusy.build(
+        uuid4(),
+        "UTC",
+        [_slot(0, "09:00", "17:00", buffer_minutes=15)],
+        [event],
+        _at(0),
+        _at(0, day=6),
+    )
+    assert free_busy.busy == [(_at(11, 45), _at(13, 15))]
+    assert free_busy.free() == [(_at(9), _at(11, 45)), (_at(13, 15), _at(17))]
+
+    assert free_busy.is_free(_at(9), _at(11, 45))
+    assert not free_busy.is_free(_at(11), _at(12))
+    assert not free_busy.is_free(_at(16), _at(18))
+    assert not free_busy.is_free(_at(7), _at(8))
+    assert free_busy.conflicts(_at(12, 30), _at(14)) == [event]
+    assert free_busy.conflicts(_at(13), _at(14)) == []
+
+
+def test_day_bitmaps_round_trip_across_midnight():
+    free = [(_at(22, 30), _at(1, 15, day=6))]
+    days = utc_days(_at(0), _at(0, day=7))
+    assert days == [date(2026, 1, 5), date(2026, 1, 6)]
+
+    bitmaps = to_day_bitmaps(free, days)
+    intervals = [interval for day in days for interval in bitmap_intervals(day, bitmaps[day])]
+    assert merge_intervals(intervals) == free
+
+
+def test_partial_minutes_count_as_busy():
+    free = [(_at(9, 0) + timedelta(seconds=30), _at(9, 3) + timedelta(seconds=10))]
+    bitmaps = to_day_bitmaps(free, [date(2026, 1, 5)])
+    assert bitmap_intervals(date(2026, 1, 5), bitmaps[date(2026, 1, 5)]) == [(_at(9, 1), _at(9, 3))]
+
+
+def test_first_free_slots_are_aligned_to_the_step():
+    free = [(_at(9, 10), _at(10, 30)), (_at(14), _at(15))]
+    slots = first_free_slots(free, timedelta(minutes=30), limit=4, step=timedelta(minutes=30))
+    assert slots == [
+        (_at(9, 30), _at(10)),
+        (_at(10), _at(10, 30)),
+        (_at(14), _at(14, 30)),
+        (_at(14, 30), _at(15)),
+    ]
+    assert len(first_free_slots(free, timedelta(minutes=30), limit=1, step=timedelta(minutes=30))) == 1
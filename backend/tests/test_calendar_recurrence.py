@@ -0,0 +1,149 @@
+"""
+Testes da expansão de eventos recorrentes
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.domains.calendar.models import EventStatus, RecurrenceType
+from app.domains.calendar.recurrence import (
+    OccurrenceCache,
+    RecurrenceRule,
+    expand_masters,
+    is_cancelled_exception,
+)
+
+UTC = timezone.utc
+SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=UTC)
+
+
+def _master(start, duration=timedelta(hours=1), **rule):
+    return SimpleNamespace(
+        id=uuid4(),
+        calendar_id=uuid4(),
+        updated_at=start,
+        start_datetime=start,
+        end_datetime=start + duration,
+        recurrence_type=rule.pop("recurrence_type", RecurrenceType.WEEKLY),
+        recurrence_interval=rule.pop("recurrence_interval", 1),
+        recurrence_count=rule.pop("recurrence_count", None),
+        recurrence_end_date=rule.pop("recurrence_end_date", None),
+        recurrence_days=rule.pop("recurrence_days", None),
+    )
+
+
+def _starts(master, window_start, window_end, zone=UTC):
+    rule = RecurrenceRule.from_event(master)
+    duration = master.end_datetime - master.start_datetime
+    return list(rule.occurrences(master.start_datetime, duration, window_start, window_end, zone))
+
+
+def test_non_recurring_events_have_no_rule():
+    assert RecurrenceRule.from_event(_master(_utc(2026, 1, 5, 9), recurrence_type=RecurrenceType.NONE)) is None
+
+
+def test_daily_expansion_only_covers_the_window():
+    master = _master(_utc(2026, 1, 1, 9), recurrence_type=RecurrenceType.DAILY)
+    starts = _starts(master, _utc(2026, 3, 10), _utc(2026, 3, 13))
+    assert starts == [_utc(2026, 3, 10, 9), _utc(2026, 3, 11, 9), _utc(2026, 3, 12, 9)]
+
+
+def test_occurrence_overlapping_the_window_start_is_included():
+    master = _master(_utc(2026, 1, 1, 23), duration=timedelta(hours=2), recurrence_type=RecurrenceType.DAILY)
+    starts = _starts(master, _utc(2026, 1, 5), _utc(2026, 1, 5, 12))
+    assert starts == [_utc(2026, 1, 4, 23)]
+
+
+def test_weekly_by_weekday_with_interval():
+    # Segunda-feira; repete às segundas e quartas, semana sim, semana não
+    master = _master(_utc(2026, 1, 5, 14), recurrence_interval=2, recurrence_days=[0, 2])
+    starts = _starts(master, _utc(2026, 1, 1), _utc(2026, 2, 1))
+    assert starts == [
+        _utc(2026, 1, 5, 14), _utc(2026, 1, 7, 14),
+        _utc(2026, 1, 19, 14), _utc(2026, 1, 21, 14),
+    ]
+
+
+def test_count_limits_the_series():
+    master = _master(_utc(2026, 1, 5, 9), recurrence_count=3)
+    starts = _starts(master, _utc(2026, 1, 1), _utc(2027, 1, 1))
+    assert starts == [_utc(2026, 1, 5, 9), _utc(2026, 1, 12, 9), _utc(2026, 1, 19, 9)]
+
+    rule = RecurrenceRule.from_event(master)
+    assert rule.series_end(master.start_datetime, timedelta(hours=1), UTC) == _utc(2026, 1, 19, 10)
+
+
+def test_until_is_inclusive_and_open_series_has_no_end():
+    master = _master(_utc(2026, 1, 5, 9), recurrence_end_date=_utc(2026, 1, 19, 0))
+    assert _starts(master, _utc(2026, 1, 1), _utc(2027, 1, 1))[-1] == _utc(2026, 1, 19, 9)
+
+    open_master = _master(_utc(2026, 1, 5, 9))
+    rule = RecurrenceRule.from_event(open_master)
+    assert rule.series_end(open_master.start_datetime, timedelta(hours=1), UTC) is None
+
+
+def test_monthly_skips_months_without_the_day():
+    master = _master(_utc(2026, 1, 31, 12), recurrence_type=RecurrenceType.MONTHLY)
+    starts = _starts(master, _utc(2026, 1, 1), _utc(2026, 6, 1))
+    assert starts == [_utc(2026, 1, 31, 12), _utc(2026, 3, 31, 12), _utc(2026, 5, 31, 12)]
+
+
+def test_local_time_is_kept_across_daylight_saving():
+    # 09:00 em Nova York: 14:00 UTC no inverno, 13:00 UTC após 08/03/2026
+    start = datetime(2026, 3, 5, 9, tzinfo=NEW_YORK).astimezone(UTC)
+    master = _master(start, recurrence_type=RecurrenceType.DAILY)
+    starts = _starts(master, _utc(2026, 3, 7), _utc(2026, 3, 10), NEW_YORK)
+    assert [value.hour for value in starts] == [14, 13, 13]
+    assert all(value.astimezone(NEW_YORK).hour == 9 for value in starts)
+
+
+def test_rrule_representation():
+    master = _master(
+        _utc(2026, 1, 5, 9),
+        recurrence_interval=2,
+        recurrence_days=[0, 4],
+        recurrence_end_date=_utc(2026, 6, 30, 23, 59),
+    )
+    assert RecurrenceRule.from_event(master).to_rrule() == (
+        "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;UNTIL=20260630T235900Z"
+    )
+
+
+def test_expand_masters_skips_overridden_occurrences():
+    master = _master(_utc(2026, 1, 5, 9), recurrence_type=RecurrenceType.DAILY)
+    exception = SimpleNamespace(
+        parent_event_id=master.id,
+        recurrence_id=_utc(2026, 1, 6, 9),
+        status=EventStatus.CANCELLED,
+    )
+    occurrences = expand_masters(
+        [(master, "America/Sao_Paulo")], [exception], _utc(2026, 1, 5), _utc(2026, 1, 8)
+    )
+    assert [occurrence.start_datetime for occurrence in occurrences] == [
+        _utc(2026, 1, 5, 9), _utc(2026, 1, 7, 9),
+    ]
+    first = occurrences[0]
+    assert first.end_datetime == _utc(2026, 1, 5, 10)
+    assert first.recurrence_id == first.start_datetime
+    assert first.id == master.id
+    assert is_cancelled_exception(exception)
+
+
+def test_occurrence_cache_is_keyed_on_master_updates():
+    cache = OccurrenceCache()
+    master = _master(_utc(2026, 1, 5, 9), recurrence_type=RecurrenceType.DAILY)
+    rule = RecurrenceRule.from_event(master)
+    window = (_utc(2026, 1, 5), _utc(2026, 1, 7))
+
+    assert len(cache.starts(master, rule, *window, SAO_PAULO)) == 2
+
+    master.recurrence_count = 1
+    master.updated_at += timedelta(seconds=1)
+    assert len(cache.starts(master, RecurrenceRule.from_event(master), *window, SAO_PAULO)) == 1
@@ -0,0 +1,120 @@
+"""
+Tests for disk-backed chunked uploads.
+"""
+
+import hashlib
+
+import pytest
+
+from app.core.config import settings
+from app.core.storage import LocalBlobStore
+from app.domains.files import uploads
+from app.domains.files.uploads import ChunkError, UploadSpool, chunk_count
+
+CHUNK_SIZE = 1024
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "storage_local_path", str(tmp_path))
+    blob_store = LocalBlobStore(root=str(tmp_path / "blobs"), chunk_size=CHUNK_SIZE)
+    monkeypatch.setattr(uploads, "blob_store", blob_store)
+    return blob_store
+
+
+async def _body(data: bytes, piece: int = 100):
+    for start in range(0, len(data), piece):
+        yield data[start:start + piece]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_chunk_count():
+    assert chunk_count(0, CHUNK_SIZE) == 1
+    assert chunk_count(CHUNK_SIZE, CHUNK_SIZE) == 1
+    assert chunk_count(CHUNK_SIZE + 1, CHUNK_SIZE) == 2
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_chunks_assemble_into_one_blob(store):
+    data = bytes(range(256)) * 10  # 2560 bytes: chunks of 1024, 1024 and 512
+    chunks = [data[start:start + CHUNK_SIZE] for start in range(0, len(data), CHUNK_SIZE)]
+    spool = UploadSpool("session-1", total_size=len(data), chunk_size=CHUNK_SIZE)
+    await spool.create()
+
+    for chunk_number in (2, 0, 1):
+        chunk = chunks[chunk_number]
+        length = await spool.write_chunk(chunk_number, _body(chunk), _sha256(chunk))
+        assert length == len(chunk)
+
+    digests = await spool.verified_digests()
+    assert digests == [_sha256(chunk) for chunk in chunks]
+
+    blob = await spool.finalize(digests)
+    assert blob.digest == _sha256(data)
+    assert blob.size == len(data)
+    assert not spool.path.exists()
+    assert not spool.digests_dir.exists()
+
+    stored = b"".join([piece async for piece in store.iter_range(blob.digest, 0, len(data) - 1)])
+    assert stored == data
+
+
+@pytest.mark.asyncio
+async def test_resent_chunk_content_is_what_gets_hashed(store):
+    data = b"a" * CHUNK_SIZE + b"b" * CHUNK_SIZE
+    spool = UploadSpool("session-5", total_size=len(data), chunk_size=CHUNK_SIZE)
+    await spool.create()
+
+    # Chunk 0 enters the running hash, then is replaced with other content
+    stale = b"z" * CHUNK_SIZE
+    await spool.write_chunk(0, _body(stale), _sha256(stale))
+    for chunk_number in (0, 1):
+        chunk = data[chunk_number * CHUNK_SIZE:(chunk_number + 1) * CHUNK_SIZE]
+        await spool.write_chunk(chunk_number, _body(chunk), _sha256(chunk))
+
+    blob = await spool.finalize(await spool.verified_digests())
+    assert blob.digest == _sha256(data)
+
+
+@pytest.mark.asyncio
+async def test_missing_chunk_blocks_completion(store):
+    spool = UploadSpool("session-2", total_size=2 * CHUNK_SIZE, chunk_size=CHUNK_SIZE)
+    await spool.create()
+    chunk = b"x" * CHUNK_SIZE
+    await spool.write_chunk(0, _body(chunk), _sha256(chunk))
+
+    with pytest.raises(ChunkError, match="Chunk 1 is missing"):
+        await spool.verified_digests()
+
+
+@pytest.mark.asyncio
+async def test_rejected_chunks(store):
+    spool = UploadSpool("session-3", total_size=CHUNK_SIZE + 10, chunk_size=CHUNK_SIZE)
+    await spool.create()
+
+    with pytest.raises(ChunkError):
+        spool.chunk_length(2)
+    with pytest.raises(ChunkError, match="exceeds"):
+        await spool.write_chunk(1, _body(b"y" * 11), _sha256(b"y" * 11))
+    with pytest.raises(ChunkError, match="expected"):
+        await spool.write_chunk(1, _body(b"y" * 9), _sha256(b"y" * 9))
+    with pytest.raises(ChunkError, match="Checksum"):
+        await spool.write_chunk(1, _body(b"y" * 10), _sha256(b"z" * 10))
+
+    # A failed chunk leaves no digest behind; a correct resend is accepted
+    with pytest.raises(ChunkError, match="Chunk 0 is missing"):
+        await spool.verified_digests()
+    await spool.write_chunk(1, _body(b"y" * 10), _sha256(b"y" * 10))
+
+
+@pytest.mark.asyncio
+async def test_discard_removes_the_spool(store):
+    spool = UploadSpool("session-4", total_size=10, chunk_size=CHUNK_SIZE)
+    await spool.create()
+    await spool.discard()
+
+    assert not spool.path.exists()
+    assert not spool.digests_dir.exists()
@@ -0,0 +1,99 @@
+"""
+Testes das chaves fracionárias de ordenação
+"""
+
+import random
+
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.shared.common.ordering import (
+    MAX_KEY_LENGTH,
+    apply_requested_order,
+    key_between,
+    needs_rebalance,
+    spread_keys,
+)
+
+
+def _assert_between(low, high, key):
+    assert not key.endswith("0")
+    if low is not None:
+        assert low < key
+    if high is not None:
+        assert key < high
+
+
+@pytest.mark.parametrize(
+    "low,high",
+    [
+        (None, None),
+        (None, "i"),
+        ("i", None),
+        ("a", "b"),
+        ("a", "a1"),
+        ("az", "b"),
+        ("zz", None),
+        (None, "01"),
+        ("1", "10001"),
+    ],
+)
+def test_key_between_is_strictly_between(low, high):
+    _assert_between(low, high, key_between(low, high))
+
+
+def test_repeated_inserts_at_the_same_point_stay_ordered():
+    """Inserir sempre logo após o primeiro item alonga a chave, sem quebrar a ordem"""
+    keys = [key_between(None, None)]
+    keys.append(key_between(keys[0], None))
+    for _ in range(200):
+        key = key_between(keys[0], keys[1])
+        _assert_between(keys[0], keys[1], key)
+        keys.insert(1, key)
+    assert keys == sorted(keys)
+    assert needs_rebalance(keys[1])
+
+
+def test_random_moves_keep_a_total_order():
+    rng = random.Random(7)
+    keys = spread_keys(20)
+    for _ in range(500):
+        index = rng.randint(0, len(keys))
+        low = keys[index - 1] if index > 0 else None
+        high = keys[index] if index < len(keys) else None
+        keys.insert(index, key_between(low, high))
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_equal_neighbours_fall_back_to_after():
+    """Movimentos concorrentes podem gravar a mesma chave; a nova fica depois"""
+    assert key_between("i", "i") > "i"
+
+
+@pytest.mark.parametrize("key", ["", "a0", "A", "a-b"])
+def test_invalid_keys_are_rejected(key):
+    with pytest.raises(ValidationException):
+        key_between(key, None)
+
+
+@pytest.mark.parametrize("count", [1, 2, 35, 36, 100, 5000])
+def test_spread_keys_are_short_sorted_and_unique(count):
+    keys = spread_keys(count)
+    assert len(keys) == count
+    assert keys == sorted(keys)
+    assert len(set(keys)) == count
+    assert all(key and not key.endswith("0") and len(key) <= MAX_KEY_LENGTH for key in keys)
+    assert not any(needs_rebalance(key) for key in keys)
+
+
+def test_spread_keys_leave_room_before_and_after():
+    keys = spread_keys(10)
+    _assert_between(None, keys[0], key_between(None, keys[0]))
+    _assert_between(keys[-1], None, key_between(keys[-1], None))
+
+
+def test_apply_requested_order_moves_requested_ids_first():
+    current = ["a", "b", "c", "d"]
+    assert apply_requested_order(current, [("d", 0), ("b", 1), ("x", 2)]) == ["d", "b", "a", "c"]
+    assert apply_requested_order(current, []) == current
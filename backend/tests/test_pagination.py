@@ -0,0 +1,74 @@
+"""
+Testes da paginação por cursor (keyset)
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, select
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import ValidationException
+from app.shared.common.pagination import apply_keyset, decode_cursor, encode_cursor, next_cursor
+
+_items = Table(
+    "items",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime(timezone=True)),
+)
+Item = SimpleNamespace(id=_items.c.id, created_at=_items.c.created_at)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 16, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    item_id = uuid4()
+
+    cursor = encode_cursor(created_at, item_id)
+
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == (created_at, item_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encode_cursor(datetime(2026, 1, 1), "not-a-uuid"),
+        "WyIyMDI2LTAxLTAxIl0",  # lista com um único elemento
+        "bnVsbA",  # null
+    ],
+)
+def test_invalid_cursor_raises_validation_error(cursor):
+    with pytest.raises(ValidationException):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_only_when_the_page_is_full():
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = [SimpleNamespace(created_at=created_at, id=uuid4()) for _ in range(3)]
+
+    assert next_cursor(items, limit=4) is None
+    assert next_cursor([], limit=3) is None
+    assert decode_cursor(next_cursor(items, limit=3)) == (created_at, items[-1].id)
+
+
+def _sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_apply_keyset_orders_and_seeks():
+    cursor = encode_cursor(datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4())
+
+    first_page = _sql(apply_keyset(select(_items), Item))
+    assert "ORDER BY items.created_at DESC, items.id DESC" in first_page
+    assert "WHERE" not in first_page
+
+    descending = _sql(apply_keyset(select(_items), Item, cursor))
+    assert "(items.created_at, items.id) < (" in descending
+
+    ascending = _sql(apply_keyset(select(_items), Item, cursor, descending=False))
+    assert "(items.created_at, items.id) > (" in ascending
+    assert "ORDER BY items.created_at ASC, items.id ASC" in ascending
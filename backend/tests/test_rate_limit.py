@@ -0,0 +1,144 @@
+"""
+Testes do rate limiting GCRA
+
+O script Lua roda no Redis; aqui são verificados os parâmetros que o processo
+envia a ele (intervalo de emissão e capacidade de cada janela) e a contabilidade
+das concessões locais, com um script simulado.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter, RateLimitRule
+
+
+def _policy(**overrides):
+    values = dict(
+        id="policy-1",
+        name="api",
+        user_roles=None,
+        company_plans=None,
+        requests_per_minute=60,
+        requests_per_hour=1000,
+        requests_per_day=None,
+        burst_limit=None,
+        applies_to="user",
+        endpoint_pattern=r"^/api/v1/",
+        method=None,
+        is_global=True,
+        company_id=None,
+        exempt_ips=["10.0.0.0/8"],
+        exempt_users=None,
+        block_duration_seconds=0,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class FakeScript:
+    """Script registrado: grava as chamadas e devolve respostas enfileiradas"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def script(monkeypatch):
+    fake = FakeScript([])
+    client = SimpleNamespace(register_script=lambda source: fake)
+
+    async def fake_get_redis():
+        return SimpleNamespace(client=client)
+
+    monkeypatch.setattr(rate_limit, "get_redis", fake_get_redis)
+    return fake
+
+
+def test_policy_windows_and_burst():
+    rule = RateLimitRule.from_policy(_policy(burst_limit=90, requests_per_day=5000))
+    assert rule.windows == [(60, 60, 90), (3600, 1000, 1000), (86400, 5000, 5000)]
+    assert rule.limit == 60
+    assert rule.company_id is None
+
+
+def test_policies_that_cannot_be_decided_are_ignored():
+    assert RateLimitRule.from_policy(_policy(user_roles=["admin"])) is None
+    assert RateLimitRule.from_policy(_policy(requests_per_minute=None, requests_per_hour=None)) is None
+    assert RateLimitRule.from_policy(_policy(endpoint_pattern="(")) is None
+
+
+def test_rule_matching_exemptions_and_subject():
+    rule = RateLimitRule.from_policy(_policy(applies_to="company", method="post"))
+    assert rule.matches("/api/v1/tenders", "POST", None)
+    assert not rule.matches("/api/v1/tenders", "GET", None)
+    assert not rule.matches("/health", "POST", None)
+
+    assert rule.is_exempt("10.1.2.3", None)
+    assert not rule.is_exempt("192.168.0.1", None)
+    assert not rule.is_exempt("not-an-ip", None)
+
+    assert rule.subject("1.2.3.4", "u1", "c1") == "company:c1"
+    assert rule.subject("1.2.3.4", "u1", None) == "user:u1"
+    assert rule.subject("1.2.3.4", None, None) == "ip:1.2.3.4"
+
+
+@pytest.mark.asyncio
+async def test_script_receives_emission_interval_and_capacity(script, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_local_fraction", 0)
+    script.replies.append([1, 59, 0, 1000])
+    rule = RateLimitRule.from_policy(_policy(burst_limit=90, block_duration_seconds=30))
+
+    result = await RateLimiter().check(rule, "user:u1")
+
+    keys, args = script.calls[0]
+    assert keys == ["rl:policy-1:user:u1:block", "rl:policy-1:user:u1:60", "rl:policy-1:user:u1:3600"]
+    # Sem cobrança pendente; bloqueio em ms; (intervalo em ms, capacidade) por janela
+    assert args == [0, 30000, 1000.0, 90, 3600.0, 1000]
+    assert result.allowed and result.remaining == 59
+    assert result.reset_after == 1.0
+
+
+@pytest.mark.asyncio
+async def test_rejection_reports_retry_after(script, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_local_fraction", 0.5)
+    script.replies.append([0, 0, 1500, 60000])
+    limiter = RateLimiter()
+    rule = RateLimitRule.from_policy(_policy())
+
+    result = await limiter.check(rule, "user:u1")
+
+    assert not result.allowed
+    assert result.retry_after == 1.5
+    # Rejeitado: nenhuma concessão local
+    script.replies.append([0, 0, 500, 60000])
+    await limiter.check(rule, "user:u1")
+    assert len(script.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_local_lease_admits_without_redis_and_charges_later(script, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_local_fraction", 0.1)
+    monkeypatch.setattr(settings, "rate_limit_local_lease_ms", 60000)
+    script.replies.extend([[1, 50, 0, 1000], [1, 44, 0, 1000]])
+    limiter = RateLimiter()
+    rule = RateLimitRule.from_policy(_policy())
+
+    await limiter.check(rule, "user:u1")
+    # 10% das 50 restantes: 5 requisições sem ir ao Redis
+    local = [await limiter.check(rule, "user:u1") for _ in range(5)]
+    assert len(script.calls) == 1
+    assert all(result.allowed for result in local)
+    assert [result.remaining for result in local] == [49, 48, 47, 46, 45]
+
+    # Concessão esgotada: o próximo script cobra as 5 admitidas localmente
+    await limiter.check(rule, "user:u1")
+    assert len(script.calls) == 2
+    assert script.calls[1][1][0] == 5
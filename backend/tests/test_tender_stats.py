@@ -0,0 +1,65 @@
+"""
+Testes das consultas de cotações por empresa (agregação em uma passada)
+"""
+
+from collections import defaultdict
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Mapper
+
+from app.domains.tenders.repository import QuoteRepository
+
+
+class _RecordingSession:
+    """Guarda as consultas executadas e devolve resultados vazios."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(
+            one=lambda: SimpleNamespace(_mapping=defaultdict(lambda: None)),
+            scalars=lambda: SimpleNamespace(all=lambda: []),
+            scalar_one_or_none=lambda: None,
+        )
+
+
+@pytest.fixture(autouse=True)
+def _skip_mapper_configuration(monkeypatch):
+    # Só as colunas entram nas consultas; os relacionamentos entre domínios
+    # não precisam ser resolvidos para compilar o SQL.
+    monkeypatch.setattr(Mapper, "_check_configure", lambda self: None)
+
+
+def _sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_quote_stats_filter_by_supplier_in_one_query():
+    session = _RecordingSession()
+
+    stats = await QuoteRepository(session).get_quote_stats(uuid4())
+
+    assert len(session.statements) == 1
+    sql = _sql(session.statements[0])
+    assert "quotes.supplier_id = " in sql
+    assert "count(quotes.id) FILTER (WHERE quotes.status = " in sql
+    assert stats["total_quotes"] == 0
+    assert stats["average_quote_value"] == 0
+
+
+@pytest.mark.asyncio
+async def test_company_quote_lookups_filter_by_supplier():
+    session = _RecordingSession()
+    repo = QuoteRepository(session)
+
+    await repo.get_company_quotes(uuid4())
+    await repo.get_by_tender_and_company(uuid4(), uuid4())
+
+    for statement in session.statements:
+        assert "quotes.supplier_id = " in _sql(statement.whereclause)
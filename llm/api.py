@@ -5,11 +5,12 @@ REST API endpoints for AI/LLM functionality including document processing,
 tender data extraction, quotation generation, and system monitoring.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import tempfile
+import json
 import os
 import logging
 
@@ -54,6 +55,37 @@ class CacheClearRequest(BaseModel):
     operation: Optional[str] = Field(None, description="Specific operation to clear (or all if None)")
 
 
+# Server-sent events
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Desabilita buffering do nginx
+}
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an event dict as a server-sent event."""
+    return f"event: {event.get('event', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def _sse_stream(
+    events: AsyncIterator[Dict[str, Any]],
+    cleanup_path: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Serialize manager events to SSE, reporting failures as an error event."""
+    try:
+        async for event in events:
+            yield _format_sse(event)
+    except Exception as e:
+        logger.error(f"Streaming failed: {e}")
+        yield _format_sse({"event": "error", "error": str(e)})
+    finally:
+        if cleanup_path:
+            try:
+                os.unlink(cleanup_path)
+            except Exception:
+                pass
+
+
 # Dependency to ensure LLM manager is initialized
 async def get_llm_manager():
     """Dependency to get initialized LLM manager."""
@@ -165,6 +197,36 @@ async def extract_from_upload(
             pass
 
 
+@router.post("/extract/upload/stream", summary="Extract data from uploaded document (SSE)")
+async def extract_from_upload_stream(
+    file: UploadFile = File(...),
+    manager = Depends(get_llm_manager)
+) -> StreamingResponse:
+    """Extract tender data from an uploaded document, streaming fields as server-sent events."""
+    
+    allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain"]
+    if file.content_type not in allowed_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file.content_type}"
+        )
+    
+    # Temporary file is removed when the stream finishes
+    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
+        content = await file.read()
+        temp_file.write(content)
+        temp_file_path = temp_file.name
+    
+    return StreamingResponse(
+        _sse_stream(
+            manager.stream_tender_extraction(temp_file_path),
+            cleanup_path=temp_file_path
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.post("/extract/file", summary="Extract data from file path")
 async def extract_from_file(
     file_path: str,
@@ -224,6 +286,25 @@ async def generate_quotation(
         raise HTTPException(status_code=500, detail=f"Internal processing error: {e}")
 
 
+@router.post("/quotation/generate/stream", summary="Generate quotation from tender data (SSE)")
+async def generate_quotation_stream(
+    request: QuotationRequest,
+    manager = Depends(get_llm_manager)
+) -> StreamingResponse:
+    """Generate the quotation structure, streaming each field as a server-sent event."""
+    
+    try:
+        tender_data = ExtractedTenderData(**request.tender_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid tender data: {e}")
+    
+    return StreamingResponse(
+        _sse_stream(manager.stream_quotation(tender_data)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 # Risk Analysis Endpoints
 @router.post("/risk/analyze", summary="Analyze risks in tender")
 async def analyze_risks(
@@ -7,7 +7,8 @@ a unified interface for the backend application.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Any
 from contextlib import asynccontextmanager
 
 from .services import (
@@ -16,6 +17,8 @@ from .services import (
     PromptManagerService,
     HealthCheckService,
     cache_service,
+    extraction_cache_service,
+    ocr_engine,
     monitoring_service
 )
 from .models import AIProcessingResult, ExtractedTenderData, QuotationStructure
@@ -27,7 +30,7 @@ logger = logging.getLogger(__name__)
 
 class LLMServiceManager:
     """Main service manager for all LLM operations."""
-      def __init__(self):
+    def __init__(self):
         self.text_extraction = TextExtractionService()
         self.ai_processing = AIProcessingService()
         self.prompt_manager = PromptManagerService()
@@ -46,6 +49,7 @@ class LLMServiceManager:
             await self.prompt_manager.initialize()
             await self.ai_processing.initialize()
             await cache_service.initialize()
+            await extraction_cache_service.initialize()
             await monitoring_service.initialize()
             await self.health_check.initialize()
             
@@ -65,6 +69,8 @@ class LLMServiceManager:
         """Close all LLM services."""
         try:
             await cache_service.close()
+            await extraction_cache_service.close()
+            await ocr_engine.close()
             await monitoring_service.close()
             await self.ai_processing.close()
             self._initialized = False
@@ -111,8 +117,12 @@ class LLMServiceManager:
         """
         async with self._monitor_operation("extract_tender_data"):
             try:
-                # Extract text from document
-                text_content = await self.text_extraction.extract_text(file_path)
+                # Extract text from document (served from the content-addressed
+                # extraction cache when the same file bytes were seen before)
+                file_content = await asyncio.to_thread(Path(file_path).read_bytes)
+                text_content = await self.text_extraction.extract_text(
+                    file_content, Path(file_path).name
+                )
                 
                 # Check cache first
                 if use_cache and settings.ai_cache_enabled:
@@ -125,7 +135,17 @@ class LLMServiceManager:
                         return cached_result
                 
                 # Process with AI
-                result = await self.ai_processing.extract_tender_data(text_content)
+                start_time = asyncio.get_event_loop().time()
+                extracted_data = await self.ai_processing.extract_tender_data_from_text(
+                    text_content
+                )
+                result = AIProcessingResult(
+                    success=True,
+                    data=extracted_data.dict(),
+                    processing_time=asyncio.get_event_loop().time() - start_time,
+                    model_used=settings.ollama_default_model,
+                    metadata={"file_path": file_path}
+                )
                 
                 # Cache successful results
                 if result.success and use_cache and settings.ai_cache_enabled:
@@ -146,6 +166,46 @@ class LLMServiceManager:
                     metadata={"file_path": file_path}
                 )
     
+    async def stream_tender_extraction(
+        self,
+        file_path: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extract tender data from a document file, streaming partial results.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Yields:
+            Extraction events (``field``, ``extraction_type``, ``complete``)
+        """
+        async with self._monitor_operation("stream_tender_extraction"):
+            file_content = await asyncio.to_thread(Path(file_path).read_bytes)
+            async for event in self.ai_processing.stream_tender_extraction(
+                file_content, Path(file_path).name
+            ):
+                yield event
+    
+    async def stream_quotation(
+        self,
+        tender_data: ExtractedTenderData
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate the quotation structure for a tender, streaming each field
+        as soon as the model closes it.
+        
+        Args:
+            tender_data: Extracted tender data
+            
+        Yields:
+            Quotation events (``field``, ``complete``)
+        """
+        async with self._monitor_operation("stream_quotation"):
+            async for event in self.ai_processing.stream_quotation_structure(
+                tender_data.reference_terms or {}
+            ):
+                yield event
+    
     async def generate_quotation(
         self,
         tender_data: ExtractedTenderData,
@@ -320,12 +380,14 @@ class LLMServiceManager:
             
             # Get cache stats
             cache_stats = await cache_service.get_cache_stats()
+            extraction_cache_stats = await extraction_cache_service.get_cache_stats()
             
             return {
                 "initialized": self._initialized,
                 "health": health_status.dict(),
                 "monitoring": monitoring_summary,
                 "cache": cache_stats,
+                "extraction_cache": extraction_cache_stats,
                 "services": {
                     "text_extraction": "available",
                     "ai_processing": "available",
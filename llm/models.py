@@ -10,10 +10,13 @@ from pydantic import BaseModel, Field
 class AIProcessingResult(BaseModel):
     """Resultado base do processamento de IA"""
     success: bool
-    processing_time: float
-    model_used: str
+    data: Optional[Dict[str, Any]] = None
+    confidence: Optional[float] = None
+    processing_time: float = 0.0
+    model_used: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     error_message: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
 class ExtractedTenderData(BaseModel):
@@ -7,6 +7,8 @@ caching, and monitoring.
 
 Available Services:
 - TextExtractionService: Extract text from various document formats
+- ExtractionCacheService: Content-addressed cache for extracted text
+- OCREngine: Process-pool OCR with page-level parallelism
 - AIProcessingService: Core LLM integration with Ollama
 - PromptManager: Manage and template AI prompts
 - HealthCheckService: Monitor LLM system health
@@ -14,6 +16,8 @@ Available Services:
 - MonitoringService: AI metrics and performance monitoring
 """
 
+from .extraction_cache import ExtractionCacheService, extraction_cache_service
+from .ocr_engine import OCREngine, ocr_engine
 from .text_extraction import TextExtractionService
 from .ai_processing import AIProcessingService
 from .prompt_manager import PromptManagerService
@@ -23,6 +27,10 @@ from .monitoring import MonitoringService, monitoring_service
 
 __all__ = [
     "TextExtractionService",
+    "ExtractionCacheService",
+    "extraction_cache_service",
+    "OCREngine",
+    "ocr_engine",
     "AIProcessingService", 
     "PromptManagerService",
     "HealthCheckService",
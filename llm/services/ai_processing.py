@@ -6,20 +6,30 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import httpx
+from prometheus_client import Histogram
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from backend.app.core.config import get_settings
 from llm.models import AIProcessingResult, ExtractedTenderData
 from llm.services.text_extraction import TextExtractionService
 from llm.services.prompt_manager import PromptManagerService
+from llm.services.streaming import IncrementalJSONParser
 from llm.exceptions import AIProcessingException, DocumentProcessingException
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Latência das chamadas ao Ollama por endpoint (compartilhada entre instâncias)
+OLLAMA_REQUEST_DURATION = Histogram(
+    'ollama_request_duration_seconds',
+    'Ollama API request duration',
+    ['endpoint', 'status'],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
+
 
 class AIProcessingService:
     """Serviço principal para processamento de IA com Llama 3"""
@@ -29,9 +39,63 @@ class AIProcessingService:
         self.prompt_manager = PromptManagerService()
         self.client_config = {
             "base_url": settings.ollama_api_url,
-            "timeout": settings.ollama_timeout
+            "timeout": settings.ollama_timeout,
+            "http2": settings.ollama_http2,
+            "limits": httpx.Limits(
+                max_connections=settings.ollama_pool_max_connections,
+                max_keepalive_connections=settings.ollama_pool_max_keepalive,
+                keepalive_expiry=settings.ollama_keepalive_expiry
+            )
         }
+        self._client: Optional[httpx.AsyncClient] = None
         self._request_semaphore = asyncio.Semaphore(settings.ai_concurrent_requests)
+    
+    async def initialize(self) -> None:
+        """Abre o cliente HTTP persistente (pool com keep-alive) para o Ollama"""
+        
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(**self.client_config)
+            logger.info(
+                f"Pool HTTP do Ollama aberto: {settings.ollama_api_url} "
+                f"(max_connections={settings.ollama_pool_max_connections}, "
+                f"http2={settings.ollama_http2})"
+            )
+    
+    async def close(self) -> None:
+        """Fecha o cliente HTTP persistente e libera as conexões do pool"""
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Pool HTTP do Ollama fechado")
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Retorna o cliente do pool, abrindo-o sob demanda se necessário"""
+        
+        if self._client is None or self._client.is_closed:
+            await self.initialize()
+        return self._client
+    
+    async def _request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        **kwargs
+    ) -> httpx.Response:
+        """Executa requisição no pool registrando a latência por endpoint"""
+        
+        client = await self._get_client()
+        status = "error"
+        start_time = time.perf_counter()
+        
+        try:
+            response = await client.request(method, endpoint, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            OLLAMA_REQUEST_DURATION.labels(
+                endpoint=endpoint, status=status
+            ).observe(time.perf_counter() - start_time)
         
     @retry(
         stop=stop_after_attempt(settings.ollama_max_retries),
@@ -48,45 +112,130 @@ class AIProcessingService:
         """Chamada robusta para API Ollama com retry automático"""
         
         async with self._request_semaphore:
-            model = model_name or settings.ollama_default_model
-            temp = temperature if temperature is not None else settings.ollama_temperature
-            
-            payload = {
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temp,
-                    "num_ctx": settings.ollama_context_length,
-                    "num_thread": settings.ollama_threads,
-                }
-            }
+            model, payload = self._build_generate_payload(
+                prompt, model_name, temperature, max_tokens, format_json,
+                stream=False
+            )
             
-            if format_json:
-                payload["format"] = "json"
+            start_time = time.time()
             
-            if max_tokens:
-                payload["options"]["num_predict"] = max_tokens
+            try:
+                response = await self._request("POST", "/api/generate", json=payload)
+                response.raise_for_status()
                 
+                result = response.json()
+                ai_response = result.get("response", "")
+                
+                # Logging e métricas
+                processing_time = time.time() - start_time
+                if settings.ai_metrics_enabled:
+                    await self._log_ai_metrics(
+                        model, prompt, ai_response, processing_time
+                    )
+                
+                return ai_response
+                    
+            except httpx.HTTPStatusError as e:
+                error_msg = f"Ollama API Error: {e.response.status_code}"
+                if e.response.text:
+                    error_msg += f" - {e.response.text}"
+                logger.error(error_msg)
+                raise AIProcessingException(error_msg)
+                
+            except httpx.TimeoutException:
+                error_msg = f"Ollama API timeout after {settings.ollama_timeout}s"
+                logger.error(error_msg)
+                raise AIProcessingException(error_msg)
+                
+            except Exception as e:
+                logger.error(f"Unexpected error calling Ollama: {str(e)}")
+                raise AIProcessingException(f"AI service error: {str(e)}")
+    
+    def _build_generate_payload(
+        self, 
+        prompt: str, 
+        model_name: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        format_json: bool,
+        stream: bool
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Monta o payload de /api/generate"""
+        
+        model = model_name or settings.ollama_default_model
+        temp = temperature if temperature is not None else settings.ollama_temperature
+        
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temp,
+                "num_ctx": settings.ollama_context_length,
+                "num_thread": settings.ollama_threads,
+            }
+        }
+        
+        if format_json:
+            payload["format"] = "json"
+        
+        if max_tokens:
+            payload["options"]["num_predict"] = max_tokens
+        
+        return model, payload
+    
+    async def _stream_ollama_api(
+        self, 
+        prompt: str, 
+        model_name: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        format_json: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Chamada em streaming para API Ollama, emitindo tokens à medida que
+        são gerados. Não há retry automático: tokens já emitidos não podem
+        ser reenviados.
+        """
+        
+        async with self._request_semaphore:
+            model, payload = self._build_generate_payload(
+                prompt, model_name, temperature, max_tokens, format_json,
+                stream=True
+            )
+            
+            client = await self._get_client()
+            response_parts: List[str] = []
+            status = "error"
             start_time = time.time()
             
             try:
-                async with httpx.AsyncClient(**self.client_config) as client:
-                    response = await client.post("/api/generate", json=payload)
+                async with client.stream(
+                    "POST", "/api/generate", json=payload
+                ) as response:
+                    status = str(response.status_code)
+                    if response.is_error:
+                        await response.aread()
                     response.raise_for_status()
                     
-                    result = response.json()
-                    ai_response = result.get("response", "")
-                    
-                    # Logging e métricas
-                    processing_time = time.time() - start_time
-                    if settings.ai_metrics_enabled:
-                        await self._log_ai_metrics(
-                            model, prompt, ai_response, processing_time
-                        )
-                    
-                    return ai_response
-                    
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise AIProcessingException(
+                                f"Ollama API Error: {chunk['error']}"
+                            )
+                        
+                        token = chunk.get("response", "")
+                        if token:
+                            response_parts.append(token)
+                            yield token
+                        
+                        if chunk.get("done"):
+                            break
+                
             except httpx.HTTPStatusError as e:
                 error_msg = f"Ollama API Error: {e.response.status_code}"
                 if e.response.text:
@@ -98,10 +247,177 @@ class AIProcessingService:
                 error_msg = f"Ollama API timeout after {settings.ollama_timeout}s"
                 logger.error(error_msg)
                 raise AIProcessingException(error_msg)
+            
+            except AIProcessingException:
+                raise
                 
             except Exception as e:
-                logger.error(f"Unexpected error calling Ollama: {str(e)}")
+                logger.error(f"Unexpected error streaming from Ollama: {str(e)}")
                 raise AIProcessingException(f"AI service error: {str(e)}")
+            
+            finally:
+                processing_time = time.time() - start_time
+                OLLAMA_REQUEST_DURATION.labels(
+                    endpoint="/api/generate", status=status
+                ).observe(processing_time)
+            
+            if settings.ai_metrics_enabled:
+                await self._log_ai_metrics(
+                    model, prompt, "".join(response_parts), processing_time
+                )
+    
+    async def _stream_json_fields(
+        self, 
+        prompt: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Emite os campos de primeiro nível do JSON assim que se fecham"""
+        
+        parser = IncrementalJSONParser()
+        response_parts: List[str] = []
+        
+        async for token in self._stream_ollama_api(prompt):
+            response_parts.append(token)
+            for field, value in parser.feed(token):
+                yield field, value
+        
+        # Campos que o parser incremental não conseguiu fechar (JSON truncado
+        # ou com artefatos) são recuperados pelo parser tolerante
+        if not parser.completed:
+            full_result = await self._safe_json_parse("".join(response_parts))
+            for field, value in full_result.items():
+                if field not in parser.fields:
+                    yield field, value
+    
+    async def stream_tender_extraction(
+        self, 
+        file_content: bytes, 
+        filename: str,
+        extraction_types: List[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extração de dados do edital em streaming
+        
+        Emite eventos ``field`` para cada campo fechado em cada chunk,
+        ``extraction_type`` quando um tipo termina (resultado consolidado)
+        e ``complete`` com o ExtractedTenderData final.
+        """
+        
+        try:
+            document_text = await self.text_extractor.extract_text(
+                file_content, filename
+            )
+        except Exception as e:
+            raise DocumentProcessingException(f"Erro na extração de texto: {str(e)}")
+        
+        if not document_text.strip():
+            raise DocumentProcessingException("Documento não contém texto extraível")
+        
+        text_chunks = await self._chunk_document(document_text)
+        extraction_types = list(dict.fromkeys(extraction_types or [
+            "general_info", "delivery_info", "participation_conditions",
+            "qualification_requirements", "risk_analysis", "reference_terms"
+        ]))
+        
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def stream_chunk(
+            extraction_type: str, 
+            chunk_index: int, 
+            chunk_text: str
+        ) -> Dict[str, Any]:
+            prompt = self.prompt_manager.get_prompt(
+                extraction_type, document_text=chunk_text
+            )
+            fields: Dict[str, Any] = {}
+            async for field, value in self._stream_json_fields(prompt):
+                fields[field] = value
+                await events.put({
+                    "event": "field",
+                    "extraction_type": extraction_type,
+                    "chunk": chunk_index,
+                    "field": field,
+                    "value": value
+                })
+            return fields
+        
+        async def stream_type(extraction_type: str) -> None:
+            # O consumidor espera um evento final por tipo: ele é enfileirado
+            # no finally, mesmo que a consolidação falhe
+            data: Dict[str, Any] = {"error": "Extração interrompida"}
+            try:
+                chunk_results = await asyncio.gather(
+                    *(
+                        stream_chunk(extraction_type, index, chunk)
+                        for index, chunk in enumerate(text_chunks)
+                    ),
+                    return_exceptions=True
+                )
+                partial_results = [
+                    result for result in chunk_results
+                    if not isinstance(result, Exception)
+                ]
+                
+                if partial_results:
+                    data = self._merge_chunk_results(partial_results)
+                else:
+                    error = next(
+                        (r for r in chunk_results if isinstance(r, Exception)), None
+                    )
+                    logger.error(f"Erro na extração {extraction_type}: {str(error)}")
+                    data = {"error": str(error)}
+            except Exception as e:
+                logger.error(f"Erro na extração {extraction_type}: {str(e)}")
+                data = {"error": str(e)}
+            finally:
+                events.put_nowait({
+                    "event": "extraction_type",
+                    "extraction_type": extraction_type,
+                    "data": data
+                })
+        
+        tasks = [
+            asyncio.create_task(stream_type(extraction_type))
+            for extraction_type in extraction_types
+        ]
+        extracted_data: Dict[str, Any] = {}
+        
+        try:
+            while len(extracted_data) < len(extraction_types):
+                event = await events.get()
+                if event["event"] == "extraction_type":
+                    extracted_data[event["extraction_type"]] = event["data"]
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        yield {
+            "event": "complete",
+            "data": ExtractedTenderData(**extracted_data).dict()
+        }
+    
+    async def stream_quotation_structure(
+        self, 
+        reference_terms_data: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Geração da estrutura de cotação em streaming
+        
+        Emite um evento ``field`` por campo do JSON assim que ele se fecha
+        e um evento ``complete`` com a estrutura completa.
+        """
+        
+        formatted_prompt = self.prompt_manager.get_prompt(
+            "quotation_structure",
+            reference_terms=json.dumps(reference_terms_data, indent=2)
+        )
+        
+        result: Dict[str, Any] = {}
+        async for field, value in self._stream_json_fields(formatted_prompt):
+            result[field] = value
+            yield {"event": "field", "field": field, "value": value}
+        
+        yield {"event": "complete", "data": result}
     
     async def _safe_json_parse(self, ai_response: str) -> Dict[str, Any]:
         """Parser robusto para JSON retornado pela IA"""
@@ -154,6 +470,17 @@ class AIProcessingService:
         except Exception as e:
             raise DocumentProcessingException(f"Erro na extração de texto: {str(e)}")
         
+        return await self.extract_tender_data_from_text(
+            document_text, extraction_types
+        )
+    
+    async def extract_tender_data_from_text(
+        self, 
+        document_text: str,
+        extraction_types: List[str] = None
+    ) -> ExtractedTenderData:
+        """Extração de dados do edital a partir do texto já extraído"""
+        
         if not document_text.strip():
             raise DocumentProcessingException("Documento não contém texto extraível")
         
@@ -166,18 +493,24 @@ class AIProcessingService:
             "qualification_requirements", "risk_analysis", "reference_terms"
         ]
         
+        # Tipos executados em paralelo; a concorrência real é limitada
+        # pelo _request_semaphore em _call_ollama_api
+        results = await asyncio.gather(
+            *(
+                self._extract_by_type(text_chunks, extraction_type)
+                for extraction_type in extraction_types
+            ),
+            return_exceptions=True
+        )
+        
         extracted_data = {}
         
-        for extraction_type in extraction_types:
-            try:
-                result = await self._extract_by_type(
-                    text_chunks, extraction_type
-                )
+        for extraction_type, result in zip(extraction_types, results):
+            if isinstance(result, Exception):
+                logger.error(f"Erro na extração {extraction_type}: {str(result)}")
+                extracted_data[extraction_type] = {"error": str(result)}
+            else:
                 extracted_data[extraction_type] = result
-                
-            except Exception as e:
-                logger.error(f"Erro na extração {extraction_type}: {str(e)}")
-                extracted_data[extraction_type] = {"error": str(e)}
         
         return ExtractedTenderData(**extracted_data)
     
@@ -220,22 +553,118 @@ class AIProcessingService:
         text_chunks: List[str], 
         extraction_type: str
     ) -> Dict[str, Any]:
-        """Extração específica por tipo de informação"""
+        """Extração específica por tipo de informação (map-reduce sobre chunks)"""
+        
+        # Map: cada chunk é processado em paralelo sob o _request_semaphore
+        chunk_results = await asyncio.gather(
+            *(
+                self._extract_chunk(chunk, extraction_type)
+                for chunk in text_chunks
+            ),
+            return_exceptions=True
+        )
         
-        prompt_template = self.prompt_manager.get_prompt(extraction_type)
+        partial_results = []
+        for index, result in enumerate(chunk_results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Chunk {index + 1}/{len(text_chunks)} falhou "
+                    f"na extração {extraction_type}: {str(result)}"
+                )
+                continue
+            partial_results.append(result)
         
-        # Para documentos com múltiplos chunks, processa cada um e consolida
-        if len(text_chunks) == 1:
-            document_text = text_chunks[0]
-        else:
-            # Para múltiplos chunks, pode processar todos e consolidar
-            document_text = "\n\n".join(text_chunks[:3])  # Primeiros 3 chunks
+        if not partial_results:
+            raise AIProcessingException(
+                f"Nenhum chunk processado com sucesso para {extraction_type}"
+            )
+        
+        # Reduce: consolida os JSON parciais em um único resultado
+        return self._merge_chunk_results(partial_results)
+    
+    async def _extract_chunk(
+        self, 
+        chunk_text: str, 
+        extraction_type: str
+    ) -> Dict[str, Any]:
+        """Extração de um único chunk do documento"""
         
-        prompt = prompt_template.format(document_text=document_text)
+        prompt = self.prompt_manager.get_prompt(
+            extraction_type, document_text=chunk_text
+        )
         
         ai_response = await self._call_ollama_api(prompt)
         return await self._safe_json_parse(ai_response)
     
+    def _merge_chunk_results(
+        self, 
+        partial_results: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Consolida resultados parciais de cada chunk
+        
+        Regras de reconciliação:
+        - valores escalares: prevalece o primeiro valor não vazio (ordem do documento)
+        - listas: concatenadas sem duplicatas, preservando a ordem
+        - objetos: consolidados recursivamente
+        """
+        
+        merged: Dict[str, Any] = {}
+        
+        for partial in partial_results:
+            if not isinstance(partial, dict):
+                continue
+            for key, value in partial.items():
+                merged[key] = self._merge_values(merged.get(key), value)
+        
+        return merged
+    
+    def _merge_values(self, current: Any, incoming: Any) -> Any:
+        """Reconcilia dois valores de um mesmo campo extraído"""
+        
+        if self._is_empty_value(current):
+            return incoming
+        if self._is_empty_value(incoming):
+            return current
+        
+        if isinstance(current, dict) and isinstance(incoming, dict):
+            merged = dict(current)
+            for key, value in incoming.items():
+                merged[key] = self._merge_values(merged.get(key), value)
+            return merged
+        
+        if isinstance(current, list) or isinstance(incoming, list):
+            current_items = current if isinstance(current, list) else [current]
+            incoming_items = incoming if isinstance(incoming, list) else [incoming]
+            
+            merged_items = list(current_items)
+            seen = {
+                json.dumps(item, sort_keys=True, default=str)
+                for item in current_items
+            }
+            for item in incoming_items:
+                item_key = json.dumps(item, sort_keys=True, default=str)
+                if item_key not in seen:
+                    seen.add(item_key)
+                    merged_items.append(item)
+            return merged_items
+        
+        return current
+    
+    @staticmethod
+    def _is_empty_value(value: Any) -> bool:
+        """Verifica se o valor extraído não contém informação útil"""
+        
+        if value is None:
+            return True
+        if isinstance(value, str):
+            return not value.strip() or value.strip().lower() in (
+                "null", "n/a", "não informado", "nao informado"
+            )
+        if isinstance(value, (list, dict)):
+            return len(value) == 0
+        return False
+    
     async def generate_quotation_structure(
         self, 
         reference_terms_data: Dict[str, Any]
@@ -327,13 +756,12 @@ class AIProcessingService:
         """Lista modelos disponíveis no Ollama"""
         
         try:
-            async with httpx.AsyncClient(**self.client_config) as client:
-                response = await client.get("/api/tags")
-                response.raise_for_status()
-                
-                data = response.json()
-                models = [model["name"] for model in data.get("models", [])]
-                return models
+            response = await self._request("GET", "/api/tags")
+            response.raise_for_status()
+            
+            data = response.json()
+            models = [model["name"] for model in data.get("models", [])]
+            return models
                 
         except Exception as e:
             logger.error(f"Erro ao listar modelos: {str(e)}")
@@ -8,8 +8,9 @@ and reduce redundant LLM calls for similar documents or queries.
 import hashlib
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 import aioredis
 from ..models import CacheEntry, AIProcessingResult
 from ..exceptions import CacheError
@@ -17,6 +18,92 @@ from backend.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Entries removed per script call (bounds how long Redis is blocked)
+INDEX_BATCH_SIZE = 500
+
+# Expiry bound matching every entry
+NO_EXPIRY_LIMIT = 10 ** 12
+
+# Index layout under "{index_prefix}":
+#   entries, op:{operation}, model:{model}  ZSET cache key -> expiry (epoch)
+#   meta                                    HASH cache key -> "length|operation|model"
+#   stats                                   HASH running counters
+#
+# Every key a script touches is passed in KEYS. The scripts share the leading
+# index keys (see CacheService._index_keys):
+#   KEYS[1] entries, KEYS[2] meta, KEYS[3] stats,
+#   KEYS[4] op:{operation}, KEYS[5] model:{model}
+# A cache key's operation and model never change (both are part of the key),
+# so its tag indexes are known before the script runs.
+_UNINDEX_LUA = """
+-- 1 if the entry was indexed, 0 if not, -1 if it is indexed under other tags
+local function unindex(key, operation, model)
+    local meta = redis.call('HGET', KEYS[2], key)
+    if not meta then
+        redis.call('ZREM', KEYS[1], key)
+        return 0
+    end
+    local length, indexed_operation, indexed_model = string.match(meta, '^(%d+)|([^|]*)|(.*)$')
+    if indexed_operation ~= operation or indexed_model ~= model then
+        return -1
+    end
+    redis.call('ZREM', KEYS[1], key)
+    redis.call('ZREM', KEYS[4], key)
+    redis.call('ZREM', KEYS[5], key)
+    redis.call('HDEL', KEYS[2], key)
+    redis.call('HINCRBY', KEYS[3], 'entries', -1)
+    redis.call('HINCRBY', KEYS[3], 'bytes', -tonumber(length))
+    redis.call('HINCRBY', KEYS[3], 'op:' .. operation, -1)
+    redis.call('HINCRBY', KEYS[3], 'model:' .. model, -1)
+    return 1
+end
+"""
+
+# KEYS: index keys, entry; ARGV: value, ttl, expires_at, length, operation, model
+PUT_SCRIPT = _UNINDEX_LUA + """
+local key = KEYS[6]
+unindex(key, ARGV[5], ARGV[6])
+redis.call('SET', key, ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[1], ARGV[3], key)
+redis.call('ZADD', KEYS[4], ARGV[3], key)
+redis.call('ZADD', KEYS[5], ARGV[3], key)
+redis.call('HSET', KEYS[2], key, ARGV[4] .. '|' .. ARGV[5] .. '|' .. ARGV[6])
+redis.call('HINCRBY', KEYS[3], 'entries', 1)
+redis.call('HINCRBY', KEYS[3], 'bytes', ARGV[4])
+redis.call('HINCRBY', KEYS[3], 'op:' .. ARGV[5], 1)
+redis.call('HINCRBY', KEYS[3], 'model:' .. ARGV[6], 1)
+return 1
+"""
+
+# KEYS: index keys, source index, cache keys...; ARGV: max expiry, operation, model
+# Removes the entries expiring by then; stale tag members are just dropped.
+# Entries re-indexed under other tags since the caller grouped them are skipped.
+REMOVE_SCRIPT = _UNINDEX_LUA + """
+local max_expiry = tonumber(ARGV[1])
+local removed = 0
+for i = 7, #KEYS do
+    local key = KEYS[i]
+    local expiry = redis.call('ZSCORE', KEYS[1], key)
+    if not expiry then
+        redis.call('ZREM', KEYS[6], key)
+    elseif tonumber(expiry) <= max_expiry then
+        local unindexed = unindex(key, ARGV[2], ARGV[3])
+        if unindexed >= 0 then
+            redis.call('UNLINK', key)
+            removed = removed + unindexed
+        end
+    end
+end
+return removed
+"""
+
+# KEYS: entry, stats hash
+GET_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+redis.call('HINCRBY', KEYS[2], value and 'hits' or 'misses', 1)
+return value
+"""
+
 
 class CacheService:
     """Redis-based cache service for AI processing results."""
@@ -24,6 +111,10 @@ class CacheService:
     def __init__(self):
         self.redis_client: Optional[aioredis.Redis] = None
         self.cache_prefix = "cotai:llm:"
+        # Secondary indexes and counters; the extraction cache shares the prefix
+        self.index_prefix = f"{self.cache_prefix}idx:"
+        self.extraction_prefix = f"{self.cache_prefix}extraction:"
+        self._scripts: Dict[str, Any] = {}
         
     async def initialize(self) -> None:
         """Initialize Redis connection."""
@@ -47,6 +138,22 @@ class CacheService:
         if self.redis_client:
             await self.redis_client.close()
             
+    def _script(self, name: str, source: str):
+        """Registered Lua script (EVALSHA with automatic reload)."""
+        if name not in self._scripts:
+            self._scripts[name] = self.redis_client.register_script(source)
+        return self._scripts[name]
+            
+    def _index_keys(self, operation: str, model: str) -> List[str]:
+        """Leading KEYS of the index scripts for entries tagged ``operation`` and ``model``."""
+        return [
+            f"{self.index_prefix}entries",
+            f"{self.index_prefix}meta",
+            f"{self.index_prefix}stats",
+            f"{self.index_prefix}op:{operation}",
+            f"{self.index_prefix}model:{model}",
+        ]
+            
     def _generate_cache_key(self, content: str, operation: str, model: str) -> str:
         """Generate a unique cache key for content and operation."""
         content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
@@ -84,13 +191,14 @@ class CacheService:
             )
         except Exception as e:
             raise CacheError(f"Failed to deserialize result: {e}")
-      async def get_cached_result(
+    
+    async def get_cached_result(
         self, 
         content: str, 
         operation: str, 
         model: Optional[str] = None
     ) -> Optional[AIProcessingResult]:
-        """Retrieve cached AI processing result."""
+        """Retrieve cached AI processing result (counting the hit or miss)."""
         if not self.redis_client:
             return None
             
@@ -98,7 +206,9 @@ class CacheService:
         cache_key = self._generate_cache_key(content, operation, model)
         
         try:
-            cached_data = await self.redis_client.get(cache_key)
+            cached_data = await self._script("get", GET_SCRIPT)(
+                keys=[cache_key, f"{self.index_prefix}stats"]
+            )
             if cached_data:
                 result = self._deserialize_result(cached_data)
                 logger.debug(f"Cache hit for operation: {operation}")
@@ -109,7 +219,8 @@ class CacheService:
         except Exception as e:
             logger.warning(f"Cache retrieval failed: {e}")
             return None
-      async def cache_result(
+    
+    async def cache_result(
         self,
         content: str,
         operation: str,
@@ -117,7 +228,7 @@ class CacheService:
         model: Optional[str] = None,
         ttl_hours: Optional[int] = None
     ) -> bool:
-        """Cache AI processing result."""
+        """Cache AI processing result and index it by operation and model."""
         if not self.redis_client:
             return False
             
@@ -129,25 +240,16 @@ class CacheService:
             serialized_result = self._serialize_result(result)
             ttl_seconds = ttl_hours * 3600
             
-            await self.redis_client.setex(
-                cache_key,
-                ttl_seconds,
-                serialized_result
-            )
-            
-            # Store cache metadata
-            metadata_key = f"{cache_key}:meta"
-            metadata = {
-                "operation": operation,
-                "model": model,
-                "cached_at": datetime.utcnow().isoformat(),
-                "ttl_hours": ttl_hours,
-                "content_length": len(content)
-            }
-            await self.redis_client.setex(
-                metadata_key,
-                ttl_seconds,
-                json.dumps(metadata)
+            await self._script("put", PUT_SCRIPT)(
+                keys=[*self._index_keys(operation, model), cache_key],
+                args=[
+                    serialized_result,
+                    ttl_seconds,
+                    int(time.time()) + ttl_seconds,
+                    len(content),
+                    operation,
+                    model,
+                ]
             )
             
             logger.debug(f"Cached result for operation: {operation}")
@@ -157,99 +259,146 @@ class CacheService:
             logger.warning(f"Cache storage failed: {e}")
             return False
     
-    async def invalidate_cache(self, pattern: Optional[str] = None) -> int:
-        """Invalidate cached results by pattern."""
+    async def _remove_indexed(self, source_key: str, max_expiry: float) -> int:
+        """
+        Remove indexed entries from ``source_key`` in bounded batches.
+        
+        Only entries expiring at or before ``max_expiry`` are removed, so a
+        concurrent re-cache of the same key is never dropped by a prune.
+        """
+        removed = 0
+        while True:
+            members = await self.redis_client.zrangebyscore(
+                source_key, "-inf", max_expiry, start=0, num=INDEX_BATCH_SIZE
+            )
+            if not members:
+                return removed
+            removed += await self._remove_members(source_key, max_expiry, members)
+            if len(members) < INDEX_BATCH_SIZE:
+                return removed
+    
+    async def _remove_members(self, source_key: str, max_expiry: float, members: List[str]) -> int:
+        """Run the remove script over ``members``, once per (operation, model) tag pair."""
+        metas = await self.redis_client.hmget(f"{self.index_prefix}meta", members)
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for key, meta in zip(members, metas):
+            # Unindexed members touch no tag index, so any pair will do
+            operation, model = meta.split("|", 2)[1:] if meta else ("", "")
+            groups.setdefault((operation, model), []).append(key)
+        
+        remove = self._script("remove", REMOVE_SCRIPT)
+        removed = 0
+        for (operation, model), keys in groups.items():
+            removed += await remove(
+                keys=[*self._index_keys(operation, model), source_key, *keys],
+                args=[max_expiry, operation, model]
+            )
+        return removed
+    
+    async def invalidate_cache(
+        self,
+        operation: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> int:
+        """
+        Invalidate cached results by tag (operation or model), or all of them.
+        
+        Entries are found through the secondary indexes and removed with
+        UNLINK in bounded batches; Redis is never asked to match the keyspace.
+        """
         if not self.redis_client:
             return 0
             
         try:
-            if pattern:
-                search_pattern = f"{self.cache_prefix}{pattern}*"
+            if operation:
+                source_key = f"{self.index_prefix}op:{operation}"
+            elif model:
+                source_key = f"{self.index_prefix}model:{model}"
             else:
-                search_pattern = f"{self.cache_prefix}*"
-                
-            keys = await self.redis_client.keys(search_pattern)
-            if keys:
-                deleted = await self.redis_client.delete(*keys)
-                logger.info(f"Invalidated {deleted} cache entries")
-                return deleted
-            return 0
+                source_key = f"{self.index_prefix}entries"
+            
+            deleted = await self._remove_indexed(source_key, NO_EXPIRY_LIMIT)
+            if not operation and not model:
+                deleted += await self._sweep_unindexed()
+            
+            logger.info(f"Invalidated {deleted} cache entries")
+            return deleted
             
         except Exception as e:
             logger.error(f"Cache invalidation failed: {e}")
             raise CacheError(f"Failed to invalidate cache: {e}")
     
+    async def _sweep_unindexed(self) -> int:
+        """SCAN for result entries written before the indexes existed."""
+        deleted = 0
+        batch: List[str] = []
+        async for key in self.redis_client.scan_iter(
+            match=f"{self.cache_prefix}*", count=INDEX_BATCH_SIZE
+        ):
+            if key.startswith(self.index_prefix) or key.startswith(self.extraction_prefix):
+                continue
+            batch.append(key)
+            if len(batch) >= INDEX_BATCH_SIZE:
+                deleted += await self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.redis_client.unlink(*batch)
+        return deleted
+    
     async def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
+        """Get cache statistics from the running counters."""
         if not self.redis_client:
             return {}
             
         try:
-            # Get all cache keys
-            cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
-            metadata_keys = [k for k in cache_keys if k.endswith(":meta")]
-            result_keys = [k for k in cache_keys if not k.endswith(":meta")]
+            # Drop index entries whose results have expired (bounded)
+            entries_key = f"{self.index_prefix}entries"
+            now = int(time.time())
+            expired = await self.redis_client.zrangebyscore(
+                entries_key, "-inf", now, start=0, num=INDEX_BATCH_SIZE
+            )
+            if expired:
+                await self._remove_members(entries_key, now, expired)
             
-            # Calculate cache size and statistics
-            total_size = 0
+            counters = await self.redis_client.hgetall(f"{self.index_prefix}stats")
             operations = {}
             models = {}
-            
-            for key in metadata_keys:
-                try:
-                    metadata_str = await self.redis_client.get(key)
-                    if metadata_str:
-                        metadata = json.loads(metadata_str)
-                        operation = metadata.get("operation", "unknown")
-                        model = metadata.get("model", "unknown")
-                        content_length = metadata.get("content_length", 0)
-                        
-                        operations[operation] = operations.get(operation, 0) + 1
-                        models[model] = models.get(model, 0) + 1
-                        total_size += content_length
-                except Exception:
+            for field, value in counters.items():
+                count = int(value)
+                if count <= 0:
                     continue
+                if field.startswith("op:"):
+                    operations[field[3:]] = count
+                elif field.startswith("model:"):
+                    models[field[6:]] = count
+            
+            hits = int(counters.get("hits", 0))
+            misses = int(counters.get("misses", 0))
+            lookups = hits + misses
             
             return {
-                "total_entries": len(result_keys),
-                "total_size_bytes": total_size,
+                "total_entries": max(0, int(counters.get("entries", 0))),
+                "total_size_bytes": max(0, int(counters.get("bytes", 0))),
                 "operations": operations,
                 "models": models,
-                "cache_hit_rate": await self._calculate_hit_rate()
+                "cache_hit_rate": (hits / lookups * 100) if lookups > 0 else 0.0
             }
             
         except Exception as e:
             logger.error(f"Failed to get cache stats: {e}")
             return {}
     
-    async def _calculate_hit_rate(self) -> float:
-        """Calculate cache hit rate from Redis info."""
-        try:
-            info = await self.redis_client.info("stats")
-            hits = info.get("keyspace_hits", 0)
-            misses = info.get("keyspace_misses", 0)
-            total = hits + misses
-            return (hits / total * 100) if total > 0 else 0.0
-        except Exception:
-            return 0.0
-    
     async def cleanup_expired_entries(self) -> int:
-        """Clean up expired cache entries (Redis handles this automatically, but useful for monitoring)."""
+        """Remove index entries and counters of results that Redis has expired."""
         if not self.redis_client:
             return 0
             
         try:
-            # Get all cache keys and check if they exist (expired ones will be gone)
-            cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*:meta")
-            valid_count = 0
-            
-            for key in cache_keys:
-                if await self.redis_client.exists(key):
-                    valid_count += 1
-            
-            expired_count = len(cache_keys) - valid_count
+            expired_count = await self._remove_indexed(
+                f"{self.index_prefix}entries", int(time.time())
+            )
             if expired_count > 0:
-                logger.info(f"Found {expired_count} expired cache entries")
+                logger.info(f"Removed {expired_count} expired cache entries from the index")
                 
             return expired_count
             
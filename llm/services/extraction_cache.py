@@ -0,0 +1,268 @@
+"""
+Text Extraction Cache Service
+
+Content-addressed cache for extracted document text. Entries are keyed by
+the SHA-256 of the raw file bytes plus the extractor version, stored
+gzip-compressed on local disk and indexed in Redis (LRU order and sizes),
+so re-submitted or duplicated documents skip parsing and OCR entirely.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import socket
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+import aioredis
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCacheService:
+    """Disk-backed, Redis-indexed LRU cache for extracted document text."""
+
+    def __init__(self):
+        self.redis_client: Optional[aioredis.Redis] = None
+        self.cache_dir = Path(settings.extraction_cache_dir)
+        self.max_size_bytes = settings.extraction_cache_max_size_mb * 1024 * 1024
+        # Disk is local to each host, so the index is namespaced per host
+        self.index_prefix = f"cotai:llm:extraction:{socket.gethostname()}:"
+        self.lru_key = f"{self.index_prefix}lru"
+        self.sizes_key = f"{self.index_prefix}sizes"
+        self.total_key = f"{self.index_prefix}total_bytes"
+
+    async def initialize(self) -> None:
+        """Create the cache directory and connect the Redis index."""
+        if not settings.extraction_cache_enabled:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            self.redis_client = aioredis.from_url(
+                settings.REDIS_URL,
+                encoding="utf-8",
+                decode_responses=True,
+                retry_on_timeout=True,
+                socket_connect_timeout=5
+            )
+            await self.redis_client.ping()
+            logger.info("Text extraction cache initialized successfully")
+        except Exception as e:
+            # Disk cache keeps working; eviction falls back to a directory walk
+            logger.warning(f"Redis index unavailable for extraction cache: {e}")
+            self.redis_client = None
+
+    async def close(self) -> None:
+        """Close Redis connection."""
+        if self.redis_client:
+            await self.redis_client.close()
+            self.redis_client = None
+
+    @staticmethod
+    def generate_cache_key(
+        file_content: bytes,
+        extractor_version: str,
+        variant: str = ""
+    ) -> str:
+        """Generate the content address for a file and extractor version."""
+        content_hash = hashlib.sha256(file_content).hexdigest()
+        return ExtractionCacheService.build_cache_key(
+            content_hash, extractor_version, variant
+        )
+
+    @staticmethod
+    def build_cache_key(
+        content_hash: str,
+        extractor_version: str,
+        variant: str = ""
+    ) -> str:
+        """Build the content address from an already computed SHA-256."""
+        key = f"{content_hash}-{extractor_version}"
+        return f"{key}-{variant}" if variant else key
+
+    def _entry_path(self, cache_key: str) -> Path:
+        """Path of a cache entry (sharded by the first hash byte)."""
+        return self.cache_dir / cache_key[:2] / f"{cache_key}.txt.gz"
+
+    async def get(self, cache_key: str) -> Optional[str]:
+        """Retrieve extracted text for a content address."""
+        if not settings.extraction_cache_enabled:
+            return None
+
+        loop = asyncio.get_event_loop()
+        try:
+            text = await loop.run_in_executor(None, self._read_entry, cache_key)
+        except Exception as e:
+            logger.warning(f"Extraction cache read failed: {e}")
+            return None
+
+        if text is None:
+            logger.debug(f"Extraction cache miss: {cache_key[:16]}")
+            return None
+
+        await self._touch(cache_key)
+        logger.debug(f"Extraction cache hit: {cache_key[:16]}")
+        return text
+
+    async def put(self, cache_key: str, text: str) -> bool:
+        """Store extracted text under its content address."""
+        if not settings.extraction_cache_enabled:
+            return False
+
+        loop = asyncio.get_event_loop()
+        try:
+            size = await loop.run_in_executor(None, self._write_entry, cache_key, text)
+        except Exception as e:
+            logger.warning(f"Extraction cache write failed: {e}")
+            return False
+
+        try:
+            if self.redis_client:
+                await self._index_entry(cache_key, size)
+            else:
+                await loop.run_in_executor(None, self._evict_local)
+        except Exception as e:
+            logger.warning(f"Extraction cache index update failed: {e}")
+
+        return True
+
+    def _read_entry(self, cache_key: str) -> Optional[str]:
+        """Synchronous read of a cache entry."""
+        path = self._entry_path(cache_key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_entry(self, cache_key: str, text: str) -> int:
+        """Synchronous atomic write of a cache entry; returns its size on disk."""
+        path = self._entry_path(cache_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Unique temp name: concurrent writers of one key must not share it
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(text.encode("utf-8"))
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        return path.stat().st_size
+
+    def _delete_entry(self, cache_key: str) -> None:
+        """Synchronous removal of a cache entry."""
+        try:
+            self._entry_path(cache_key).unlink()
+        except FileNotFoundError:
+            pass
+
+    async def _touch(self, cache_key: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            if self.redis_client:
+                await self.redis_client.zadd(self.lru_key, {cache_key: time.time()})
+            else:
+                os.utime(self._entry_path(cache_key))
+        except Exception as e:
+            logger.debug(f"Extraction cache touch failed: {e}")
+
+    async def _index_entry(self, cache_key: str, size: int) -> None:
+        """Register an entry in the Redis index and enforce the size cap."""
+        previous_size = await self.redis_client.hget(self.sizes_key, cache_key)
+
+        pipe = self.redis_client.pipeline()
+        pipe.zadd(self.lru_key, {cache_key: time.time()})
+        pipe.hset(self.sizes_key, cache_key, size)
+        pipe.incrby(self.total_key, size - int(previous_size or 0))
+        results = await pipe.execute()
+
+        total_bytes = int(results[-1])
+        if total_bytes > self.max_size_bytes:
+            await self._evict_indexed(total_bytes)
+
+    async def _evict_indexed(self, total_bytes: int) -> None:
+        """Evict least recently used entries until under the size cap."""
+        loop = asyncio.get_event_loop()
+        evicted = 0
+
+        while total_bytes > self.max_size_bytes:
+            oldest: List[str] = await self.redis_client.zrange(self.lru_key, 0, 31)
+            if not oldest:
+                break
+
+            sizes = await self.redis_client.hmget(self.sizes_key, oldest)
+            for cache_key in oldest:
+                await loop.run_in_executor(None, self._delete_entry, cache_key)
+
+            freed = sum(int(size or 0) for size in sizes)
+            pipe = self.redis_client.pipeline()
+            pipe.zrem(self.lru_key, *oldest)
+            pipe.hdel(self.sizes_key, *oldest)
+            pipe.decrby(self.total_key, freed)
+            results = await pipe.execute()
+
+            total_bytes = int(results[-1])
+            evicted += len(oldest)
+
+        if evicted:
+            logger.info(f"Evicted {evicted} extraction cache entries")
+
+    def _evict_local(self) -> None:
+        """Directory-walk eviction used when the Redis index is unavailable."""
+        entries: List[Tuple[float, int, Path]] = []
+        total_bytes = 0
+
+        for path in self.cache_dir.glob("*/*.txt.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        if total_bytes <= self.max_size_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            if total_bytes <= self.max_size_bytes:
+                break
+
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        """Get extraction cache statistics."""
+        if not self.redis_client:
+            return {"enabled": settings.extraction_cache_enabled, "indexed": False}
+
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.zcard(self.lru_key)
+            pipe.get(self.total_key)
+            entries, total_bytes = await pipe.execute()
+
+            return {
+                "enabled": settings.extraction_cache_enabled,
+                "indexed": True,
+                "total_entries": entries,
+                "total_size_bytes": int(total_bytes or 0),
+                "max_size_bytes": self.max_size_bytes
+            }
+        except Exception as e:
+            logger.error(f"Failed to get extraction cache stats: {e}")
+            return {}
+
+
+# Global extraction cache service instance
+extraction_cache_service = ExtractionCacheService()
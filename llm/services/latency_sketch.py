@@ -0,0 +1,81 @@
+"""
+Mergeable latency sketch
+
+Log-bucketed histogram in the style of DDSketch: every value falls into a
+bucket whose bounds grow geometrically, so any quantile is answered with a
+bounded relative error. Two sketches merge by adding bucket counts, which
+is what lets each worker flush its buckets with HINCRBY and a reader merge
+all workers and hours without seeing raw samples.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+# Relative error of the reported quantiles
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Values at or below this (seconds) share the lowest bucket
+MIN_VALUE = 1e-6
+MIN_INDEX = math.ceil(math.log(MIN_VALUE) / LOG_GAMMA)
+
+
+def bucket_index(value: float) -> int:
+    """Bucket holding ``value``."""
+    if value <= MIN_VALUE:
+        return MIN_INDEX
+    return math.ceil(math.log(value) / LOG_GAMMA)
+
+
+def bucket_value(index: int) -> float:
+    """Representative value of a bucket (relative error <= RELATIVE_ACCURACY)."""
+    return 2 * GAMMA ** index / (GAMMA + 1)
+
+
+class LatencySketch:
+    """Bucket counts of observed latencies."""
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None):
+        self.counts: Dict[int, int] = dict(counts or {})
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, value: float, weight: int = 1) -> None:
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + weight
+
+    def add_buckets(self, buckets: Iterable[Tuple[int, int]]) -> None:
+        for index, count in buckets:
+            self.counts[index] = self.counts.get(index, 0) + count
+
+    def merge(self, other: "LatencySketch") -> None:
+        self.add_buckets(other.counts.items())
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate ``q`` quantile (0..1), or None when empty."""
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                return bucket_value(index)
+        return bucket_value(max(self.counts))
+
+    def percentiles(self) -> Dict[str, Optional[float]]:
+        return {
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def min(self) -> Optional[float]:
+        return bucket_value(min(self.counts)) if self.counts else None
+
+    def max(self) -> Optional[float]:
+        return bucket_value(max(self.counts)) if self.counts else None
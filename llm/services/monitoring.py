@@ -3,34 +3,129 @@ AI Monitoring Service
 
 Provides comprehensive monitoring and metrics collection for AI operations
 including performance tracking, error monitoring, and usage analytics.
+
+Recording an operation only updates in-memory aggregates; a background task
+flushes them to Redis in one pipeline per interval. Aggregates are kept per
+hour, operation and model in a single Redis hash per hour, with latencies as
+mergeable sketch buckets, so every worker's data adds up with HINCRBY and
+stats (including p50/p95/p99) are read without scanning raw metrics.
 """
 
 import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Optional, Any, Tuple
 import asyncio
-from collections import defaultdict, deque
+from collections import defaultdict
 import aioredis
-from ..models import AIMetric
-from ..exceptions import MonitoringError
+from .latency_sketch import LatencySketch
 from backend.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Field separator inside the hourly hashes: "{operation}|{model}|{kind}"
+FIELD_SEPARATOR = "|"
+
+# (hour, operation, model)
+AggregateKey = Tuple[int, str, str]
+
+
+def _current_hour() -> int:
+    return int(time.time() // 3600)
+
+
+class OperationAggregate:
+    """Counters and latency sketch of one operation/model within one hour."""
+
+    __slots__ = (
+        "total", "successful", "time_sum",
+        "confidence_sum", "confidence_count", "errors", "sketch",
+    )
+
+    def __init__(self):
+        self.total = 0
+        self.successful = 0
+        self.time_sum = 0.0
+        self.confidence_sum = 0.0
+        self.confidence_count = 0
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.sketch = LatencySketch()
+
+    def add(
+        self,
+        success: bool,
+        processing_time: float,
+        confidence: Optional[float],
+        error_type: Optional[str]
+    ) -> None:
+        self.total += 1
+        self.time_sum += processing_time
+        self.sketch.add(processing_time)
+        if success:
+            self.successful += 1
+        elif error_type:
+            self.errors[error_type] += 1
+        if confidence is not None:
+            self.confidence_sum += confidence
+            self.confidence_count += 1
+
+    def merge(self, other: "OperationAggregate") -> None:
+        self.total += other.total
+        self.successful += other.successful
+        self.time_sum += other.time_sum
+        self.confidence_sum += other.confidence_sum
+        self.confidence_count += other.confidence_count
+        for error_type, count in other.errors.items():
+            self.errors[error_type] += count
+        self.sketch.merge(other.sketch)
+
+    def fields(self) -> Dict[str, Any]:
+        """Hash fields (relative to the operation/model) and their increments."""
+        fields: Dict[str, Any] = {
+            "n": self.total,
+            "ok": self.successful,
+            "t": self.time_sum,
+        }
+        if self.confidence_count:
+            fields["cs"] = self.confidence_sum
+            fields["cn"] = self.confidence_count
+        for error_type, count in self.errors.items():
+            fields[f"e:{error_type}"] = count
+        for index, count in self.sketch.counts.items():
+            fields[f"b{index}"] = count
+        return fields
+
+    def add_field(self, kind: str, value: str) -> None:
+        """Apply one field read back from Redis."""
+        if kind == "n":
+            self.total += int(value)
+        elif kind == "ok":
+            self.successful += int(value)
+        elif kind == "t":
+            self.time_sum += float(value)
+        elif kind == "cs":
+            self.confidence_sum += float(value)
+        elif kind == "cn":
+            self.confidence_count += int(value)
+        elif kind.startswith("e:"):
+            self.errors[kind[2:]] += int(value)
+        elif kind.startswith("b"):
+            self.sketch.add_buckets([(int(kind[1:]), int(value))])
+
 
 class MonitoringService:
     """Service for monitoring AI operations and collecting metrics."""
-    
+
     def __init__(self):
         self.redis_client: Optional[aioredis.Redis] = None
         self.metrics_prefix = "cotai:metrics:"
-        self.local_metrics = deque(maxlen=1000)  # Local buffer for metrics
+        # Not yet flushed to Redis (or the only copy when Redis is unavailable)
+        self.pending: Dict[AggregateKey, OperationAggregate] = {}
+        self.local_history: Dict[AggregateKey, OperationAggregate] = {}
         self.operation_counters = defaultdict(int)
         self.error_counters = defaultdict(int)
-        self.performance_history = defaultdict(lambda: deque(maxlen=100))
-        
+        self._flush_task: Optional[asyncio.Task] = None
+
     async def initialize(self) -> None:
         """Initialize monitoring service."""
         try:
@@ -41,16 +136,27 @@ class MonitoringService:
                     decode_responses=True
                 )
                 await self.redis_client.ping()
+                self._flush_task = asyncio.create_task(self._flush_periodically())
             logger.info("AI Monitoring service initialized successfully")
         except Exception as e:
             logger.warning(f"Redis connection failed for monitoring: {e}")
             # Continue without Redis - use local storage only
-    
+            self.redis_client = None
+
     async def close(self) -> None:
         """Close monitoring service connections."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
         if self.redis_client:
+            await self.flush()
             await self.redis_client.close()
-      async def record_operation(
+
+    def _hourly_key(self, hour: int) -> str:
+        return f"{self.metrics_prefix}hourly:{hour}"
+
+    async def record_operation(
         self,
         operation: str,
         success: bool,
@@ -60,145 +166,156 @@ class MonitoringService:
         error_type: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Record an AI operation metric."""
+        """Record an AI operation metric (in memory; flushed in batches)."""
         try:
-            timestamp = datetime.utcnow()
-            metric = AIMetric(
-                operation=operation,
-                timestamp=timestamp,
-                success=success,
-                processing_time=processing_time,
-                model_used=model_used or settings.OLLAMA_MODEL,
-                confidence=confidence,
-                error_type=error_type,
-                metadata=metadata or {}
-            )
-            
-            # Store in local buffer
-            self.local_metrics.append(metric)
-            
+            key = (_current_hour(), operation, model_used or settings.OLLAMA_MODEL)
+            target = self.pending if self.redis_client else self.local_history
+            aggregate = target.get(key)
+            if aggregate is None:
+                if target is self.local_history:
+                    self._prune_local_history(key[0])
+                aggregate = target[key] = OperationAggregate()
+            aggregate.add(success, processing_time, confidence, error_type)
+
             # Update counters
             self.operation_counters[operation] += 1
             if not success and error_type:
                 self.error_counters[error_type] += 1
-            
-            # Update performance history
-            self.performance_history[operation].append(processing_time)
-            
-            # Store in Redis if available
-            if self.redis_client:
-                await self._store_metric_in_redis(metric)
-                
-            logger.debug(f"Recorded metric for operation: {operation}")
-            
+
         except Exception as e:
             logger.error(f"Failed to record operation metric: {e}")
-    
-    async def _store_metric_in_redis(self, metric: AIMetric) -> None:
-        """Store metric in Redis for persistence."""
-        try:
-            # Store individual metric
-            metric_key = f"{self.metrics_prefix}operation:{metric.operation}:{int(metric.timestamp.timestamp())}"
-            metric_data = asdict(metric)
-            metric_data['timestamp'] = metric.timestamp.isoformat()
-            
-            await self.redis_client.hset(
-                metric_key,
-                mapping=metric_data
-            )
-            
-            # Set expiration (keep metrics for configured days)
-            ttl_seconds = settings.AI_METRICS_RETENTION_DAYS * 24 * 3600
-            await self.redis_client.expire(metric_key, ttl_seconds)
-            
-            # Update daily aggregates
-            await self._update_daily_aggregates(metric)
-            
-        except Exception as e:
-            logger.warning(f"Failed to store metric in Redis: {e}")
-    
-    async def _update_daily_aggregates(self, metric: AIMetric) -> None:
-        """Update daily aggregate statistics."""
+
+    def _prune_local_history(self, current_hour: int) -> None:
+        """Drop local aggregates past the retention period."""
+        oldest = current_hour - settings.AI_METRICS_RETENTION_DAYS * 24
+        for key in [key for key in self.local_history if key[0] < oldest]:
+            del self.local_history[key]
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.AI_METRICS_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered aggregates to Redis in one pipeline; returns the count."""
+        if not self.redis_client or not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, {}
+        ttl_seconds = settings.AI_METRICS_RETENTION_DAYS * 24 * 3600
         try:
-            date_key = metric.timestamp.strftime("%Y-%m-%d")
-            aggregate_key = f"{self.metrics_prefix}daily:{date_key}"
-            
-            # Update counters and sums
-            pipe = self.redis_client.pipeline()
-            pipe.hincrby(aggregate_key, f"total_operations", 1)
-            pipe.hincrby(aggregate_key, f"op_{metric.operation}", 1)
-            
-            if metric.success:
-                pipe.hincrby(aggregate_key, "successful_operations", 1)
-                pipe.hincrbyfloat(aggregate_key, "total_processing_time", metric.processing_time)
-            else:
-                pipe.hincrby(aggregate_key, "failed_operations", 1)
-                if metric.error_type:
-                    pipe.hincrby(aggregate_key, f"error_{metric.error_type}", 1)
-            
-            if metric.confidence is not None:
-                pipe.hincrbyfloat(aggregate_key, "total_confidence", metric.confidence)
-                pipe.hincrby(aggregate_key, "confidence_count", 1)
-            
-            # Set expiration for daily aggregates
-            ttl_seconds = settings.AI_METRICS_RETENTION_DAYS * 24 * 3600
-            pipe.expire(aggregate_key, ttl_seconds)
-            
+            pipe = self.redis_client.pipeline(transaction=False)
+            hours = set()
+            for (hour, operation, model), aggregate in batch.items():
+                key = self._hourly_key(hour)
+                hours.add(hour)
+                prefix = f"{operation}{FIELD_SEPARATOR}{model}{FIELD_SEPARATOR}"
+                for kind, value in aggregate.fields().items():
+                    if isinstance(value, float):
+                        pipe.hincrbyfloat(key, prefix + kind, value)
+                    else:
+                        pipe.hincrby(key, prefix + kind, value)
+            for hour in hours:
+                pipe.expire(self._hourly_key(hour), ttl_seconds)
             await pipe.execute()
-            
+            return len(batch)
+
         except Exception as e:
-            logger.warning(f"Failed to update daily aggregates: {e}")
-      async def get_operation_stats(
-        self, 
-        operation: Optional[str] = None, 
+            # Keep the data for the next flush
+            for key, aggregate in batch.items():
+                existing = self.pending.get(key)
+                if existing is None:
+                    self.pending[key] = aggregate
+                else:
+                    existing.merge(aggregate)
+            logger.warning(f"Failed to flush metrics to Redis: {e}")
+            return 0
+
+    async def _load_aggregates(self, hours: int) -> Dict[AggregateKey, OperationAggregate]:
+        """Aggregates of the last ``hours`` hours, merged across workers."""
+        current = _current_hour()
+        window = range(current - hours, current + 1)
+        aggregates: Dict[AggregateKey, OperationAggregate] = {}
+
+        def merge_into(key: AggregateKey, aggregate: OperationAggregate) -> None:
+            existing = aggregates.get(key)
+            if existing is None:
+                existing = aggregates[key] = OperationAggregate()
+            existing.merge(aggregate)
+
+        if self.redis_client:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for hour in window:
+                pipe.hgetall(self._hourly_key(hour))
+            for hour, data in zip(window, await pipe.execute()):
+                for field, value in data.items():
+                    parts = field.split(FIELD_SEPARATOR, 2)
+                    if len(parts) != 3:
+                        continue
+                    operation, model, kind = parts
+                    key = (hour, operation, model)
+                    if key not in aggregates:
+                        aggregates[key] = OperationAggregate()
+                    aggregates[key].add_field(kind, value)
+
+        # This worker's data that is not in Redis yet
+        for source in (self.pending, self.local_history):
+            for key, aggregate in source.items():
+                if key[0] in window:
+                    merge_into(key, aggregate)
+
+        return aggregates
+
+    async def get_operation_stats(
+        self,
+        operation: Optional[str] = None,
         hours: int = 24
     ) -> Dict[str, Any]:
-        """Get operation statistics for the specified time period."""
+        """
+        Get operation statistics for the specified time period.
+
+        The period is rounded out to whole hours. Percentiles come from the
+        merged latency sketches (about 1% relative error).
+        """
         try:
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-            
-            # Filter metrics by time and operation
-            filtered_metrics = [
-                m for m in self.local_metrics
-                if m.timestamp >= cutoff_time and (not operation or m.operation == operation)
-            ]
-            
-            if not filtered_metrics:
+            aggregates = await self._load_aggregates(hours)
+
+            total = OperationAggregate()
+            operation_breakdown: Dict[str, int] = defaultdict(int)
+            model_breakdown: Dict[str, int] = defaultdict(int)
+            for (_, op, model), aggregate in aggregates.items():
+                if operation and op != operation:
+                    continue
+                total.merge(aggregate)
+                operation_breakdown[op] += aggregate.total
+                model_breakdown[model] += aggregate.total
+
+            if total.total == 0:
                 return self._empty_stats()
-            
-            # Calculate statistics
-            total_ops = len(filtered_metrics)
-            successful_ops = sum(1 for m in filtered_metrics if m.success)
-            failed_ops = total_ops - successful_ops
-            
-            processing_times = [m.processing_time for m in filtered_metrics if m.processing_time]
-            confidences = [m.confidence for m in filtered_metrics if m.confidence is not None]
-            
-            stats = {
-                "total_operations": total_ops,
-                "successful_operations": successful_ops,
-                "failed_operations": failed_ops,
-                "success_rate": (successful_ops / total_ops * 100) if total_ops > 0 else 0,
-                "avg_processing_time": sum(processing_times) / len(processing_times) if processing_times else 0,
-                "min_processing_time": min(processing_times) if processing_times else 0,
-                "max_processing_time": max(processing_times) if processing_times else 0,
-                "avg_confidence": sum(confidences) / len(confidences) if confidences else None,
-                "error_breakdown": self._get_error_breakdown(filtered_metrics),
-                "operation_breakdown": self._get_operation_breakdown(filtered_metrics),
+
+            return {
+                "total_operations": total.total,
+                "successful_operations": total.successful,
+                "failed_operations": total.total - total.successful,
+                "success_rate": total.successful / total.total * 100,
+                "avg_processing_time": total.time_sum / total.total,
+                "min_processing_time": total.sketch.min(),
+                "max_processing_time": total.sketch.max(),
+                "processing_time_percentiles": total.sketch.percentiles(),
+                "avg_confidence": (
+                    total.confidence_sum / total.confidence_count
+                    if total.confidence_count else None
+                ),
+                "error_breakdown": dict(total.errors),
+                "operation_breakdown": dict(operation_breakdown),
+                "model_breakdown": dict(model_breakdown),
                 "time_period_hours": hours
             }
-            
-            # Add Redis data if available
-            if self.redis_client:
-                redis_stats = await self._get_redis_stats(operation, hours)
-                stats.update(redis_stats)
-            
-            return stats
-            
+
         except Exception as e:
             logger.error(f"Failed to get operation stats: {e}")
             return self._empty_stats()
-    
+
     def _empty_stats(self) -> Dict[str, Any]:
         """Return empty stats structure."""
         return {
@@ -209,141 +326,113 @@ class MonitoringService:
             "avg_processing_time": 0,
             "min_processing_time": 0,
             "max_processing_time": 0,
+            "processing_time_percentiles": {"p50": None, "p95": None, "p99": None},
             "avg_confidence": None,
             "error_breakdown": {},
             "operation_breakdown": {},
+            "model_breakdown": {},
             "time_period_hours": 0
         }
-    
-    def _get_error_breakdown(self, metrics: List[AIMetric]) -> Dict[str, int]:
-        """Get breakdown of errors by type."""
-        error_counts = defaultdict(int)
-        for metric in metrics:
-            if not metric.success and metric.error_type:
-                error_counts[metric.error_type] += 1
-        return dict(error_counts)
-    
-    def _get_operation_breakdown(self, metrics: List[AIMetric]) -> Dict[str, int]:
-        """Get breakdown of operations by type."""
-        op_counts = defaultdict(int)
-        for metric in metrics:
-            op_counts[metric.operation] += 1
-        return dict(op_counts)
-    
-    async def _get_redis_stats(self, operation: Optional[str], hours: int) -> Dict[str, Any]:
-        """Get additional statistics from Redis."""
-        try:
-            # Get daily aggregates for the specified period
-            end_date = datetime.utcnow().date()
-            start_date = end_date - timedelta(days=max(1, hours // 24))
-            
-            total_redis_ops = 0
-            total_redis_success = 0
-            total_redis_time = 0.0
-            
-            current_date = start_date
-            while current_date <= end_date:
-                date_key = current_date.strftime("%Y-%m-%d")
-                aggregate_key = f"{self.metrics_prefix}daily:{date_key}"
-                
-                if await self.redis_client.exists(aggregate_key):
-                    daily_data = await self.redis_client.hgetall(aggregate_key)
-                    
-                    if operation:
-                        ops_count = int(daily_data.get(f"op_{operation}", 0))
-                    else:
-                        ops_count = int(daily_data.get("total_operations", 0))
-                    
-                    total_redis_ops += ops_count
-                    total_redis_success += int(daily_data.get("successful_operations", 0))
-                    total_redis_time += float(daily_data.get("total_processing_time", 0))
-                
-                current_date += timedelta(days=1)
-            
-            return {
-                "redis_total_operations": total_redis_ops,
-                "redis_successful_operations": total_redis_success,
-                "redis_total_processing_time": total_redis_time
-            }
-            
-        except Exception as e:
-            logger.warning(f"Failed to get Redis stats: {e}")
-            return {}
-    
+
     async def get_performance_trends(self, operation: str, hours: int = 24) -> Dict[str, Any]:
-        """Get performance trends for an operation."""
+        """Get hourly latency percentiles and the overall trend for an operation."""
         try:
-            if operation not in self.performance_history:
-                return {"operation": operation, "trend": "no_data", "recent_times": []}
-            
-            recent_times = list(self.performance_history[operation])
-            if len(recent_times) < 2:
-                return {"operation": operation, "trend": "insufficient_data", "recent_times": recent_times}
-            
-            # Calculate trend
-            mid_point = len(recent_times) // 2
-            first_half_avg = sum(recent_times[:mid_point]) / mid_point
-            second_half_avg = sum(recent_times[mid_point:]) / (len(recent_times) - mid_point)
-            
+            aggregates = await self._load_aggregates(hours)
+
+            hourly: Dict[int, OperationAggregate] = {}
+            for (hour, op, _), aggregate in aggregates.items():
+                if op != operation:
+                    continue
+                if hour not in hourly:
+                    hourly[hour] = OperationAggregate()
+                hourly[hour].merge(aggregate)
+
+            if not hourly:
+                return {"operation": operation, "trend": "no_data", "hourly": []}
+
+            series = [
+                {
+                    "hour": datetime.utcfromtimestamp(hour * 3600).isoformat(),
+                    "operations": hourly[hour].total,
+                    "avg_processing_time": hourly[hour].time_sum / hourly[hour].total,
+                    **hourly[hour].sketch.percentiles()
+                }
+                for hour in sorted(hourly)
+            ]
+            if len(series) < 2:
+                return {"operation": operation, "trend": "insufficient_data", "hourly": series}
+
+            # Compare the operation-weighted average of each half of the period
+            mid_point = len(series) // 2
+            first_half = OperationAggregate()
+            second_half = OperationAggregate()
+            for index, hour in enumerate(sorted(hourly)):
+                (first_half if index < mid_point else second_half).merge(hourly[hour])
+            first_half_avg = first_half.time_sum / first_half.total
+            second_half_avg = second_half.time_sum / second_half.total
+
             if second_half_avg > first_half_avg * 1.1:
                 trend = "degrading"
             elif second_half_avg < first_half_avg * 0.9:
                 trend = "improving"
             else:
                 trend = "stable"
-            
+
             return {
                 "operation": operation,
                 "trend": trend,
-                "recent_times": recent_times,
+                "hourly": series,
                 "first_half_avg": first_half_avg,
                 "second_half_avg": second_half_avg,
+                "first_half_percentiles": first_half.sketch.percentiles(),
+                "second_half_percentiles": second_half.sketch.percentiles(),
                 "change_percentage": ((second_half_avg - first_half_avg) / first_half_avg * 100) if first_half_avg > 0 else 0
             }
-            
+
         except Exception as e:
             logger.error(f"Failed to get performance trends: {e}")
-            return {"operation": operation, "trend": "error", "recent_times": []}
-    
+            return {"operation": operation, "trend": "error", "hourly": []}
+
     async def get_health_summary(self) -> Dict[str, Any]:
         """Get overall health summary of AI operations."""
         try:
             # Get recent stats (last hour)
             recent_stats = await self.get_operation_stats(hours=1)
-            
+
             # Determine health status
             success_rate = recent_stats.get("success_rate", 0)
             avg_time = recent_stats.get("avg_processing_time", 0)
             total_ops = recent_stats.get("total_operations", 0)
-            
+
             if success_rate >= 95 and avg_time < settings.AI_PROCESSING_TIMEOUT * 0.5:
                 health_status = "healthy"
             elif success_rate >= 85 and avg_time < settings.AI_PROCESSING_TIMEOUT * 0.8:
                 health_status = "warning"
             else:
                 health_status = "critical"
-            
+
             # Get active operations
             active_operations = list(self.operation_counters.keys())
-            
+
             # Get most common errors
             top_errors = sorted(
                 self.error_counters.items(),
                 key=lambda x: x[1],
                 reverse=True
             )[:5]
-            
+
             return {
                 "health_status": health_status,
                 "success_rate": success_rate,
                 "avg_processing_time": avg_time,
+                "p95_processing_time": recent_stats["processing_time_percentiles"]["p95"],
                 "total_operations_last_hour": total_ops,
                 "active_operations": active_operations,
                 "top_errors": top_errors,
                 "monitoring_active": True,
                 "timestamp": datetime.utcnow().isoformat()
             }
-            
+
         except Exception as e:
             logger.error(f"Failed to get health summary: {e}")
             return {
@@ -352,42 +441,43 @@ class MonitoringService:
                 "error": str(e),
                 "timestamp": datetime.utcnow().isoformat()
             }
-    
+
     async def reset_metrics(self, operation: Optional[str] = None) -> bool:
         """Reset metrics for a specific operation or all operations."""
         try:
             if operation:
                 # Reset specific operation
                 self.operation_counters[operation] = 0
-                if operation in self.performance_history:
-                    self.performance_history[operation].clear()
-                
-                # Remove from local metrics
-                self.local_metrics = deque(
-                    [m for m in self.local_metrics if m.operation != operation],
-                    maxlen=1000
-                )
+                for source in (self.pending, self.local_history):
+                    for key in [key for key in source if key[1] == operation]:
+                        del source[key]
             else:
                 # Reset all metrics
                 self.operation_counters.clear()
                 self.error_counters.clear()
-                self.performance_history.clear()
-                self.local_metrics.clear()
-            
+                self.pending.clear()
+                self.local_history.clear()
+
             # Clear Redis data if available
             if self.redis_client:
-                if operation:
-                    pattern = f"{self.metrics_prefix}operation:{operation}:*"
-                else:
-                    pattern = f"{self.metrics_prefix}*"
-                
-                keys = await self.redis_client.keys(pattern)
-                if keys:
-                    await self.redis_client.delete(*keys)
-            
+                async for key in self.redis_client.scan_iter(
+                    match=f"{self.metrics_prefix}hourly:*", count=500
+                ):
+                    if not operation:
+                        await self.redis_client.unlink(key)
+                        continue
+                    fields = [
+                        field async for field in self.redis_client.hscan_iter(
+                            key, match=f"{operation}{FIELD_SEPARATOR}*", count=500
+                        )
+                    ]
+                    if fields:
+                        # hscan_iter yields (field, value) pairs
+                        await self.redis_client.hdel(key, *[field for field, _ in fields])
+
             logger.info(f"Reset metrics for operation: {operation or 'all'}")
             return True
-            
+
         except Exception as e:
             logger.error(f"Failed to reset metrics: {e}")
             return False
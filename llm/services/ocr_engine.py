@@ -0,0 +1,250 @@
+"""
+Motor de OCR paralelo para PDFs escaneados
+
+Rasteriza e reconhece páginas em um ProcessPoolExecutor limitado, em
+paralelo entre os núcleos disponíveis, devolvendo os resultados na ordem
+das páginas e reaproveitando páginas já reconhecidas via cache.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from llm.exceptions import DocumentProcessingException
+from llm.services.extraction_cache import extraction_cache_service
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Versão do motor de OCR; incrementar invalida o cache de páginas
+OCR_ENGINE_VERSION = "1.0"
+
+# Modos de qualidade: DPI de rasterização e configuração do Tesseract
+OCR_QUALITY_MODES: Dict[str, Dict[str, Any]] = {
+    "fast": {"dpi": 150, "config": "--oem 1 --psm 3"},
+    "balanced": {"dpi": 200, "config": "--oem 1 --psm 3"},
+    "accurate": {"dpi": 300, "config": "--oem 1 --psm 1"},
+}
+
+# Documentos abertos em cada processo do pool (evita reabrir o PDF por página),
+# pelo hash do conteúdo: o arquivo temporário some ao fim de cada job e seu
+# caminho pode ser reutilizado por outro PDF
+_worker_documents: "OrderedDict[str, Any]" = OrderedDict()
+_WORKER_MAX_OPEN_DOCUMENTS = 4
+
+
+def _config_tag(config: str) -> str:
+    """Configuração do Tesseract em forma segura para chave de cache ("oem-1-psm-3")"""
+    return re.sub(r"[^0-9A-Za-z]+", "-", config).strip("-")
+
+
+def _open_worker_document(pdf_path: str, document_hash: str) -> Any:
+    """Documento do cache do processo; o mais antigo é fechado ao exceder o limite"""
+    import fitz
+
+    doc = _worker_documents.get(document_hash)
+    if doc is not None:
+        _worker_documents.move_to_end(document_hash)
+        return doc
+
+    if len(_worker_documents) >= _WORKER_MAX_OPEN_DOCUMENTS:
+        _, oldest = _worker_documents.popitem(last=False)
+        oldest.close()
+
+    # Aberto a partir dos bytes: nenhum descritor fica preso ao arquivo temporário
+    with open(pdf_path, "rb") as pdf_file:
+        doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
+    _worker_documents[document_hash] = doc
+    return doc
+
+
+def _ocr_page_worker(
+    pdf_path: str,
+    document_hash: str,
+    page_num: int,
+    dpi: int,
+    lang: str,
+    config: str
+) -> str:
+    """Rasteriza e reconhece uma página (executa no processo do pool)"""
+    import fitz
+    from PIL import Image
+    import pytesseract
+
+    page = _open_worker_document(pdf_path, document_hash).load_page(page_num)
+
+    # Tons de cinza direto do pixmap, sem codificar/decodificar PNG
+    zoom = dpi / 72.0
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+    return pytesseract.image_to_string(image, lang=lang, config=config)
+
+
+def _count_pdf_pages(file_content: bytes) -> int:
+    """Conta as páginas do PDF"""
+    import fitz
+
+    with fitz.open(stream=file_content, filetype="pdf") as doc:
+        return len(doc)
+
+
+class OCREngine:
+    """Motor de OCR com paralelismo por página em pool de processos"""
+
+    def __init__(self):
+        self.max_workers = settings.ocr_max_workers or os.cpu_count() or 1
+        self.quality = settings.ocr_quality
+        self.language = settings.ocr_language
+        self.max_pages = settings.ocr_max_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Retorna o pool de processos, criando-o sob demanda"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Pool de OCR iniciado com {self.max_workers} processos")
+        return self._executor
+
+    async def close(self) -> None:
+        """Encerra o pool de processos"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, executor.shutdown)
+            logger.info("Pool de OCR encerrado")
+
+    def _resolve_quality(self, quality: Optional[str]) -> Tuple[int, str]:
+        """Obtém DPI e configuração do Tesseract para o modo de qualidade"""
+        mode = quality or self.quality
+        if mode not in OCR_QUALITY_MODES:
+            raise DocumentProcessingException(f"Modo de qualidade de OCR inválido: {mode}")
+
+        dpi = settings.ocr_dpi or OCR_QUALITY_MODES[mode]["dpi"]
+        return dpi, OCR_QUALITY_MODES[mode]["config"]
+
+    def cache_variant(self, quality: Optional[str] = None) -> str:
+        """Idioma, DPI e configuração que determinam o texto reconhecido"""
+        dpi, config = self._resolve_quality(quality)
+        return f"{self.language}-{dpi}-{_config_tag(config)}"
+
+    async def extract_text(self, file_content: bytes, quality: Optional[str] = None) -> str:
+        """
+        Extrai o texto de todas as páginas do PDF via OCR
+
+        Args:
+            file_content: Conteúdo do PDF em bytes
+            quality: Modo de qualidade (fast, balanced, accurate)
+
+        Returns:
+            Texto reconhecido, na ordem das páginas
+        """
+        text_parts: List[str] = []
+        async for _, text in self.iter_pages(file_content, quality):
+            text_parts.append(text)
+        return "\n".join(text_parts)
+
+    async def iter_pages(
+        self,
+        file_content: bytes,
+        quality: Optional[str] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Reconhece as páginas em paralelo, emitindo-as na ordem do documento
+
+        Mantém no máximo ``2 * max_workers`` páginas em andamento, de modo que
+        a memória não cresce com o número de páginas.
+
+        Args:
+            file_content: Conteúdo do PDF em bytes
+            quality: Modo de qualidade (fast, balanced, accurate)
+
+        Yields:
+            Tuplas (número da página, texto reconhecido)
+        """
+        dpi, config = self._resolve_quality(quality)
+        document_hash = hashlib.sha256(file_content).hexdigest()
+
+        loop = asyncio.get_event_loop()
+        page_count = await loop.run_in_executor(None, _count_pdf_pages, file_content)
+        if self.max_pages:
+            page_count = min(page_count, self.max_pages)
+
+        logger.info(f"OCR de {page_count} páginas ({dpi} DPI, {self.max_workers} processos)")
+
+        # Os processos do pool leem o PDF do disco em vez de receber os bytes
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+            temp_file.write(file_content)
+            pdf_path = temp_file.name
+
+        window = self.max_workers * 2
+        pending: Dict[int, asyncio.Future] = {}
+        next_page = 0
+
+        try:
+            for page_num in range(page_count):
+                while next_page < page_count and next_page - page_num < window:
+                    pending[next_page] = asyncio.ensure_future(
+                        self._ocr_page(pdf_path, document_hash, next_page, dpi, config)
+                    )
+                    next_page += 1
+
+                yield page_num, await pending.pop(page_num)
+        finally:
+            for future in pending.values():
+                future.cancel()
+            try:
+                os.unlink(pdf_path)
+            except OSError:
+                pass
+
+    async def _ocr_page(
+        self,
+        pdf_path: str,
+        document_hash: str,
+        page_num: int,
+        dpi: int,
+        config: str
+    ) -> str:
+        """Reconhece uma página, consultando o cache de páginas"""
+        cache_key = None
+        if settings.ocr_page_cache_enabled:
+            cache_key = extraction_cache_service.build_cache_key(
+                document_hash,
+                f"ocr{OCR_ENGINE_VERSION}",
+                variant=f"{self.language}-{dpi}-{_config_tag(config)}-p{page_num}"
+            )
+            cached_text = await extraction_cache_service.get(cache_key)
+            if cached_text is not None:
+                return cached_text
+
+        loop = asyncio.get_event_loop()
+        text = await loop.run_in_executor(
+            self._get_executor(),
+            _ocr_page_worker,
+            pdf_path,
+            document_hash,
+            page_num,
+            dpi,
+            self.language,
+            config
+        )
+
+        if cache_key:
+            await extraction_cache_service.put(cache_key, text)
+
+        return text
+
+
+# Instância global do motor de OCR
+ocr_engine = OCREngine()
@@ -0,0 +1,124 @@
+"""
+Parser incremental de JSON para respostas em streaming da IA
+
+Permite emitir os campos de primeiro nível de um objeto JSON assim que
+cada valor é fechado, sem esperar o término da geração pelo modelo.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONParser:
+    """Parser incremental para o objeto JSON de primeiro nível"""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expecting = "object"  # object | key | colon | value | after_value
+        self._key: Optional[str] = None
+        self._value_start = -1
+        self.fields: Dict[str, Any] = {}
+        self.completed = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Alimenta o parser com um novo trecho da resposta
+
+        Args:
+            text: Trecho de texto recebido do modelo
+
+        Returns:
+            Lista de pares (campo, valor) fechados neste trecho
+        """
+
+        self._buffer += text
+        emitted: List[Tuple[str, Any]] = []
+
+        while self._pos < len(self._buffer) and not self.completed:
+            char = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(emitted)
+                self._pos += 1
+                continue
+
+            if self._expecting == "object":
+                # Ignora texto antes do JSON (markdown, explicações)
+                if char == "{":
+                    self._depth = 1
+                    self._expecting = "key"
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+                if self._depth == 1 and self._expecting == "value":
+                    self._value_start = self._pos
+            elif char in "{[":
+                if self._depth == 1 and self._expecting == "value":
+                    self._value_start = self._pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._expecting == "value":
+                    self._emit(self._pos + 1, emitted)
+                elif self._depth == 0:
+                    if self._expecting == "value":
+                        self._emit(self._pos, emitted)
+                    self.completed = True
+            elif char == ":" and self._depth == 1 and self._expecting == "colon":
+                self._expecting = "value"
+                self._value_start = self._pos + 1
+            elif char == "," and self._depth == 1:
+                if self._expecting == "value":
+                    self._emit(self._pos, emitted)
+                self._expecting = "key"
+
+            self._pos += 1
+
+        return emitted
+
+    def _close_string(self, emitted: List[Tuple[str, Any]]) -> None:
+        """Trata o fechamento de uma string no primeiro nível"""
+
+        if self._depth != 1:
+            return
+
+        if self._expecting == "key":
+            try:
+                self._key = json.loads(self._buffer[self._string_start:self._pos + 1])
+            except json.JSONDecodeError:
+                self._key = None
+            self._expecting = "colon"
+        elif self._expecting == "value":
+            self._emit(self._pos + 1, emitted)
+
+    def _emit(self, end: int, emitted: List[Tuple[str, Any]]) -> None:
+        """Decodifica o valor corrente e o registra como campo fechado"""
+
+        raw_value = self._buffer[self._value_start:end].strip()
+        self._expecting = "after_value"
+
+        if self._key is None or not raw_value:
+            return
+
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            logger.debug(f"Valor JSON parcial inválido para '{self._key}': {raw_value[:100]}")
+            return
+
+        self.fields[self._key] = value
+        emitted.append((self._key, value))
@@ -9,9 +9,14 @@ from typing import Optional, Dict, Any
 from pathlib import Path
 
 from llm.exceptions import DocumentProcessingException
+from llm.services.extraction_cache import extraction_cache_service
+from llm.services.ocr_engine import ocr_engine
 
 logger = logging.getLogger(__name__)
 
+# Versão do extrator; incrementar invalida o cache de extração
+EXTRACTOR_VERSION = "1.1"
+
 
 class TextExtractionService:
     """Serviço avançado de extração de texto com OCR fallback"""
@@ -29,7 +34,9 @@ class TextExtractionService:
         self, 
         file_content: bytes, 
         filename: str,
-        use_ocr_fallback: bool = True
+        use_ocr_fallback: bool = True,
+        use_cache: bool = True,
+        ocr_quality: Optional[str] = None
     ) -> str:
         """
         Extrai texto de arquivo com fallback para OCR
@@ -38,6 +45,8 @@ class TextExtractionService:
             file_content: Conteúdo do arquivo em bytes
             filename: Nome do arquivo
             use_ocr_fallback: Se deve usar OCR como fallback
+            use_cache: Se deve consultar o cache de extração (SHA-256 do arquivo)
+            ocr_quality: Modo de qualidade do OCR (fast, balanced, accurate)
             
         Returns:
             Texto extraído do arquivo
@@ -46,14 +55,51 @@ class TextExtractionService:
             DocumentProcessingException: Se não conseguir extrair texto
         """
         
-        logger.info(f"Extraindo texto de: {filename}")
-        
         # Determinar extensão do arquivo
         file_extension = Path(filename).suffix.lower()
         
         if file_extension not in self.supported_formats:
             raise DocumentProcessingException(f"Formato não suportado: {file_extension}")
         
+        if not use_cache:
+            return await self._extract_text_uncached(
+                file_content, filename, file_extension, use_ocr_fallback, ocr_quality
+            )
+        
+        # Com OCR, o texto depende também do modo de qualidade (DPI e flags)
+        variant = file_extension.lstrip('.')
+        if use_ocr_fallback and file_extension == '.pdf':
+            variant = f"{variant}-ocr-{ocr_engine.cache_variant(ocr_quality)}"
+        
+        cache_key = extraction_cache_service.generate_cache_key(
+            file_content,
+            EXTRACTOR_VERSION,
+            variant=variant
+        )
+        
+        cached_text = await extraction_cache_service.get(cache_key)
+        if cached_text is not None:
+            logger.info(f"Texto de {filename} obtido do cache de extração")
+            return cached_text
+        
+        text = await self._extract_text_uncached(
+            file_content, filename, file_extension, use_ocr_fallback, ocr_quality
+        )
+        await extraction_cache_service.put(cache_key, text)
+        return text
+    
+    async def _extract_text_uncached(
+        self, 
+        file_content: bytes, 
+        filename: str,
+        file_extension: str,
+        use_ocr_fallback: bool,
+        ocr_quality: Optional[str] = None
+    ) -> str:
+        """Extração efetiva do texto (sem consultar o cache)"""
+        
+        logger.info(f"Extraindo texto de: {filename}")
+        
         try:
             # Tentar extração direta
             extractor = self.supported_formats[file_extension]
@@ -67,7 +113,7 @@ class TextExtractionService:
             # Se não conseguiu extrair texto e OCR está habilitado
             if use_ocr_fallback and file_extension == '.pdf':
                 logger.warning("Tentando extração com OCR...")
-                return await self._extract_with_ocr(file_content)
+                return await self._extract_with_ocr(file_content, ocr_quality)
                 
         except Exception as e:
             logger.error(f"Erro na extração de texto: {str(e)}")
@@ -75,7 +121,7 @@ class TextExtractionService:
             # Último recurso: OCR para PDFs
             if use_ocr_fallback and file_extension == '.pdf':
                 try:
-                    return await self._extract_with_ocr(file_content)
+                    return await self._extract_with_ocr(file_content, ocr_quality)
                 except Exception as ocr_error:
                     raise DocumentProcessingException(
                         f"Falha na extração de texto e OCR: {str(ocr_error)}"
@@ -182,49 +228,18 @@ class TextExtractionService:
             "Formato RTF não suportado ainda"
         )
     
-    async def _extract_with_ocr(self, file_content: bytes) -> str:
-        """Extrai texto usando OCR (Tesseract)"""
+    async def _extract_with_ocr(self, file_content: bytes, quality: Optional[str] = None) -> str:
+        """Extrai texto usando OCR (Tesseract) em pool de processos"""
         try:
             import fitz  # Para converter PDF em imagens
             from PIL import Image
             import pytesseract
             
-            loop = asyncio.get_event_loop()
-            text = await loop.run_in_executor(
-                None, 
-                self._ocr_pdf_sync, 
-                file_content
-            )
-            return text
+            return await ocr_engine.extract_text(file_content, quality)
             
         except ImportError as e:
             raise DocumentProcessingException(f"Dependências de OCR não instaladas: {str(e)}")
     
-    def _ocr_pdf_sync(self, file_content: bytes) -> str:
-        """OCR síncrono para PDF"""
-        import fitz
-        from PIL import Image
-        import pytesseract
-        
-        doc = fitz.open(stream=file_content, filetype="pdf")
-        text_parts = []
-        
-        for page_num in range(min(len(doc), 10)):  # Limitar a 10 páginas por performance
-            page = doc.load_page(page_num)
-            
-            # Converter página em imagem
-            mat = fitz.Matrix(2.0, 2.0)  # Aumentar resolução
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            
-            # Processar com OCR
-            image = Image.open(io.BytesIO(img_data))
-            text = pytesseract.image_to_string(image, lang='por')
-            text_parts.append(text)
-        
-        doc.close()
-        return "\n".join(text_parts)
-    
     def _clean_text(self, text: str) -> str:
         """Limpeza e normalização do texto extraído"""
         